@@ -2,6 +2,7 @@ from database_management.tables import eth_block_table
 from sqlalchemy.sql.base import ReadOnlyColumnCollection
 import pandas as pd
 
+# Automated, in parallel and incrementally, straight into s3: src/pg_to_s3_export_pipeline.py
 # To copy the entire table into CSV
 # \COPY eth_blocks TO '/Users/eugeneleejunping/crypto_non_rt_etl_pipeline/eth_blocks_20250106.csv' WITH (FORMAT 'csv', header TRUE)
 
@@ -1,13 +1,86 @@
 import streamlit as st
 import os
-from typing import Sequence
+from datetime import datetime, timedelta
+
 import pandas as pd
-from sqlalchemy import create_engine, Engine, TextClause, CursorResult, RowMapping, text
-from src.chain_stack_eth_block_etl_pipeline import trigger_etl_pipeline
+from src.analytics.duckdb_query_engine import (
+    DuckDBQueryEngine,
+    create_duckdb_query_engine,
+    duckdb,
+)
+from src.chain_stack_eth_block_etl_pipeline import create_etl_pipeline
+from src.dao.dashboard_read_dao import DashboardReadDAO
+from src.eth_block_etl_pipeline import EthBlockETLPipeline
+from src.job_runner.pipeline_job_runner import (
+    PipelineAlreadyRunningError,
+    PipelineJob,
+    PipelineJobRunner,
+)
+from src.models.chain_stack_models.eth_blocks import ChainStackEthBlockInformationResponse
+from src.utils.background_event_loop import BackgroundEventLoop
+from src.utils.metrics import MetricsServer, start_metrics_server
+
+# POSTGRES_URL is the variable the dashboard used to read; still honoured for existing deployments
+DATABASE_URL = os.getenv("CHAIN_STACK_PG_CONNECTION_STRING") or os.getenv("POSTGRES_URL", "")
+ETH_PIPELINE_NAME: str = "chainstack_eth_blocks"
+
+# tables which can be browsed page by page, with the column used as the keyset pagination key
+PAGINATED_TABLES: dict[str, str] = {
+    "eth_blocks": "block_number",
+    "eth_transactions": "hash",
+    "eth_withdrawals": "id",
+    "eth_transaction_access_list": "id",
+    "pipeline_checkpoint_history": "id",
+}
+
+
+@st.cache_resource
+def get_event_loop() -> BackgroundEventLoop:
+    """
+    one event loop per streamlit server; the DAO's connection pool lives on this loop
+    """
+    return BackgroundEventLoop(name="dashboard-event-loop")
+
+
+@st.cache_resource
+def get_read_dao() -> DashboardReadDAO:
+    """
+    one DAO (connection pool + query cache) shared across reruns and sessions
+    """
+    return DashboardReadDAO(DATABASE_URL)
+
+
+@st.cache_resource
+def get_query_engine() -> DuckDBQueryEngine:
+    """
+    one embedded duckdb per streamlit server; analytical scans run there, not on the ingestion database
+    """
+    return create_duckdb_query_engine()
+
 
-DATABASE_URL = os.getenv("POSTGRES_URL", "")
+@st.cache_resource
+def get_job_runner() -> PipelineJobRunner:
+    """
+    one job runner per streamlit server, so the single-flight lock holds across sessions
+    """
+    return PipelineJobRunner()
 
-engine: Engine = create_engine(DATABASE_URL)
+
+@st.cache_resource
+def get_eth_pipeline() -> EthBlockETLPipeline[ChainStackEthBlockInformationResponse]:
+    """
+    one pipeline per streamlit server, so every run reuses the connection pools of its DAOs;
+    runs never overlap (the job runner is single-flight per pipeline) and all run on the job runner's event loop
+    """
+    return create_etl_pipeline()
+
+
+@st.cache_resource
+def get_metrics_server() -> MetricsServer:
+    """
+    prometheus /metrics endpoint (METRICS_PORT, default 9464) for pipelines run from the dashboard
+    """
+    return start_metrics_server()
 
 
 def toggle_button():
@@ -16,29 +89,109 @@ def toggle_button():
 
 def query_database(query: str) -> pd.DataFrame:
     st.text(f"Running query: {query}")
-    with engine.begin() as conn:
-        query_text_clause: TextClause = text(query)
-        cursor_result: CursorResult = conn.execute(query_text_clause)
-        sequence_of_rows: Sequence[RowMapping] = cursor_result.mappings().all()
-    df = pd.DataFrame(sequence_of_rows)
-    return df
+    return get_event_loop().run(get_read_dao().read_query(query))
+
+
+def read_table_page(table_name: str, after_key: object | None, limit: int) -> pd.DataFrame:
+    return get_event_loop().run(
+        get_read_dao().read_page(
+            table_name=table_name,
+            key_column=PAGINATED_TABLES[table_name],
+            after_key=after_key,
+            limit=limit,
+        )
+    )
+
+
+# analytical scans stream the hot tables out of postgres; they run once per ttl, not on every rerun
+@st.cache_data(ttl=600, show_spinner="Scanning blocks")
+def read_gas_per_day(start_time: datetime, end_time: datetime) -> pd.DataFrame:
+    return get_query_engine().gas_per_day(start_time, end_time)
+
+
+@st.cache_data(ttl=600, show_spinner="Scanning klines")
+def read_volume_per_symbol(start_time: datetime, end_time: datetime) -> pd.DataFrame:
+    return get_query_engine().volume_per_symbol(start_time, end_time)
+
+
+@st.cache_data(ttl=600, show_spinner="Scanning transactions")
+def read_top_senders(limit: int) -> pd.DataFrame:
+    return get_query_engine().top_senders(limit=limit)
+
+
+@st.cache_data(ttl=600)
+def read_analytics_query(query: str) -> pd.DataFrame:
+    return get_query_engine().query_select(query)
+
+
+def read_latest_block_number() -> int:
+    df: pd.DataFrame = get_event_loop().run(
+        get_read_dao().read_query(
+            "SELECT COALESCE(MAX(position), 0) AS block_number FROM pipeline_checkpoint "
+            "WHERE pipeline_name = 'eth_blocks'"
+        )
+    )
+    return int(df["block_number"].iloc[0]) if not df.empty else 0
 
 
 if "button_state" not in st.session_state:
     st.session_state.button_state = False
 
 st.set_page_config(layout="wide")
+get_metrics_server()
 
 st.header("Ethereum ETL Pipeline Dashboard")
 
-# TODO: use a function to query the latest block number from your DAO
-block_number: int = 0
+block_number: int = read_latest_block_number()
 
 st.text(f"Block Number: {block_number}")
 
 if st.button("Trigger Pipeline"):
-    st.text("Pipeline triggered!")
-    trigger_etl_pipeline()
+    try:
+        triggered_job: PipelineJob = get_job_runner().submit(
+            ETH_PIPELINE_NAME,
+            lambda report_progress: get_eth_pipeline().run(
+                progress_callback=report_progress
+            ),
+        )
+        st.text(f"Pipeline triggered! Job ID: {triggered_job.job_id}")
+    except PipelineAlreadyRunningError as e:
+        st.warning(str(e))
+
+
+@st.fragment(run_every=2)
+def show_pipeline_jobs() -> None:
+    """
+    re-renders every 2 seconds on its own, without re-running the rest of the script
+    """
+    jobs: list[PipelineJob] = get_job_runner().list_jobs()
+    if not jobs:
+        return
+    st.dataframe(
+        pd.DataFrame(
+            [
+                {
+                    "job_id": str(job.job_id),
+                    "pipeline": job.pipeline_name,
+                    "status": job.status.value,
+                    "current_block": job.current_block,
+                    "blocks_processed": job.blocks_processed,
+                    "blocks_per_second": round(job.blocks_per_second, 2),
+                    "started_at": job.started_at,
+                    "finished_at": job.finished_at,
+                    "error": job.error,
+                }
+                for job in jobs
+            ]
+        )
+    )
+    for job in jobs:
+        if job.is_active and st.button(f"Cancel job {job.job_id}", key=f"cancel_{job.job_id}"):
+            get_job_runner().cancel(job.job_id)
+            get_read_dao().invalidate_cache()
+
+
+show_pipeline_jobs()
 
 left_col, right_col = st.columns(2)
 
@@ -131,23 +284,91 @@ with left_col:
         REFERENCES eth_blocks (block_number)
 );"""
             )
-        with st.expander("Table: eth_block_import_status"):
+        with st.expander("Table: pipeline_checkpoint"):
             st.code(
-                """CREATE TABLE eth_block_import_status (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),  -- Generate UUID using PostgreSQL function
-    block_number INTEGER NOT NULL,
-    created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL  -- Date of row insertion
-);
-        );"""
+                """CREATE TABLE pipeline_checkpoint (
+    pipeline_name VARCHAR NOT NULL,  -- e.g. eth_blocks
+    shard INTEGER NOT NULL,
+    position BIGINT NOT NULL,  -- Last ingested block number
+    updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,  -- Date of the last update, in place
+    PRIMARY KEY (pipeline_name, shard)
+);"""
             )
     st.text_area(
         "Edit your SQL Query here:",
-        """SELECT * from eth_block_import_status;""",
+        """SELECT * from pipeline_checkpoint;""",
         height=300,
         key="query",
     )
 
 with right_col:
-    # TODO: populate this dataframe with the query
     df = query_database(st.session_state["query"])
     st.dataframe(df)
+    if st.button("Refresh"):
+        get_read_dao().invalidate_cache()
+        st.rerun()
+
+st.subheader("Browse Tables")
+if "page_after_keys" not in st.session_state:
+    # stack of keyset cursors; the last element is the after_key of the current page
+    st.session_state.page_after_keys = [None]
+
+browse_table: str = st.selectbox(
+    "Table",
+    list(PAGINATED_TABLES.keys()),
+    on_change=lambda: st.session_state.update(page_after_keys=[None]),
+)
+page_size: int = st.number_input("Rows per page", min_value=10, max_value=5_000, value=100)
+page_df: pd.DataFrame = read_table_page(
+    browse_table, st.session_state.page_after_keys[-1], int(page_size)
+)
+st.dataframe(page_df)
+
+previous_col, next_col = st.columns(2)
+with previous_col:
+    if st.button("Previous page", disabled=len(st.session_state.page_after_keys) == 1):
+        st.session_state.page_after_keys.pop()
+        st.rerun()
+with next_col:
+    if st.button("Next page", disabled=len(page_df) < page_size):
+        st.session_state.page_after_keys.append(
+            page_df[PAGINATED_TABLES[browse_table]].iloc[-1]
+        )
+        st.rerun()
+
+st.subheader("Analytics")
+if duckdb is None:
+    st.info("Analytics require duckdb: pip install .[analytics]")
+else:
+    # the whole "Until" day is included
+    analytics_end: datetime = datetime.combine(
+        st.date_input("Until", datetime.utcnow()), datetime.min.time()
+    ) + timedelta(days=1)
+    analytics_days: int = int(st.number_input("Days", min_value=1, max_value=3_650, value=30))
+    analytics_start: datetime = analytics_end - timedelta(days=analytics_days)
+    gas_tab, volume_tab, senders_tab, sql_tab = st.tabs(
+        ["Gas per day", "Volume per symbol", "Top senders", "DuckDB SQL"]
+    )
+    with gas_tab:
+        st.dataframe(read_gas_per_day(analytics_start, analytics_end))
+    with volume_tab:
+        st.dataframe(read_volume_per_symbol(analytics_start, analytics_end))
+    with senders_tab:
+        st.dataframe(read_top_senders(limit=100))
+    with sql_tab:
+        # e.g eth_transactions is both its hot rows in postgres and its archived rows in parquet
+        analytics_query: str = st.text_area(
+            "DuckDB SELECT over the postgres tables and the parquet archive",
+            "SELECT COUNT(*) FROM eth_transactions;",
+            height=150,
+        )
+        if st.button("Run query"):
+            try:
+                st.dataframe(read_analytics_query(analytics_query))
+            except (ValueError, duckdb.Error) as e:
+                st.error(str(e))
+    if st.button("Refresh archive catalog"):
+        get_query_engine().refresh()
+        for cached_read in (read_gas_per_day, read_volume_per_symbol, read_top_senders, read_analytics_query):
+            cached_read.clear()
+        st.rerun()
@@ -1,4 +1,6 @@
-from sqlalchemy import MetaData, Table, Column, String, DateTime, Numeric, Integer, func
+from datetime import timedelta
+
+from sqlalchemy import MetaData, Table, Column, String, DateTime, Numeric, Integer, BigInteger, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql.functions import now
 
@@ -90,4 +92,76 @@ provider_to_s3_import_status_table: Table = Table(
     Column("symbol", String, primary_key=True),
     Column("kline_open_time", DateTime(timezone=False), primary_key=True),
     Column("created_at", DateTime(timezone=False), nullable = False, server_default=func.now()),
-)
\ No newline at end of file
+)
+
+"""
+Rollup tables: one OHLCV table per interval, aggregated from the 1m candles in binance_klines_prices
+
+CREATE TABLE IF NOT EXISTS binance_klines_1h(
+  symbol VARCHAR NOT NULL,
+  kline_open_time TIMESTAMP NOT NULL, -- start of the bucket, aligned to the unix epoch like binance's own klines
+  kline_close_time TIMESTAMP NOT NULL, -- end of the bucket - 1ms
+  ... same OHLCV columns as binance_klines_prices ...
+  candle_count INTEGER NOT NULL, -- number of 1m candles in the bucket; less than 60 for a partial 1h bucket
+  updated_at TIMESTAMP NOT NULL,
+  PRIMARY KEY (symbol, kline_open_time)
+)
+"""
+
+# ordered from finest to coarsest
+KLINE_ROLLUP_INTERVALS: dict[str, timedelta] = {
+    "5m": timedelta(minutes=5),
+    "15m": timedelta(minutes=15),
+    "1h": timedelta(hours=1),
+    "4h": timedelta(hours=4),
+    "1d": timedelta(days=1),
+}
+
+
+def create_kline_rollup_table(interval: str) -> Table:
+    return Table(
+        f"binance_klines_{interval}",
+        metadata,
+        Column("symbol", String, nullable=False, primary_key=True),
+        Column("kline_open_time", DateTime, nullable=False, primary_key=True),
+        Column("kline_close_time", DateTime, nullable=False),
+        Column("open_price", Numeric(precision=38, scale=18), nullable=False),
+        Column("high_price", Numeric(precision=38, scale=18), nullable=False),
+        Column("low_price", Numeric(precision=38, scale=18), nullable=False),
+        Column("close_price", Numeric(precision=38, scale=18), nullable=False),
+        Column("volume", Numeric(precision=38, scale=18), nullable=False),
+        Column("quote_asset_volume", Numeric(precision=38, scale=18), nullable=False),
+        Column("number_of_trades", Integer, nullable=False),
+        Column("taker_buy_base_asset_vol", Numeric(precision=38, scale=18), nullable=False),
+        Column(
+            "taker_buy_quote_asset_vol", Numeric(precision=38, scale=18), nullable=False
+        ),
+        Column("candle_count", Integer, nullable=False),
+        Column("updated_at", DateTime, nullable=False, server_default=func.now()),
+    )
+
+
+binance_kline_rollup_tables: dict[str, Table] = {
+    interval: create_kline_rollup_table(interval) for interval in KLINE_ROLLUP_INTERVALS
+}
+
+# ranges of rows moved to parquet in s3 (ColdStorageArchiver); a cataloged range is no longer in postgres
+archive_catalog_table: Table = Table(
+    "archive_catalog",
+    metadata,
+    Column("table_name", String, primary_key=True),  # e.g. binance_klines_prices
+    Column("partition_key", String, primary_key=True),  # e.g. month=2024-01
+    Column("s3_path", String, nullable=False),
+    Column("row_count", BigInteger, nullable=False),
+    Column("sha256", String, nullable=False),  # of the parquet file
+    Column("archived_at", DateTime, nullable=False),
+)
+
+# incremental exports to s3 (PgToS3ExportPipeline): rows created up to exported_until are exported
+s3_export_watermark_table: Table = Table(
+    "s3_export_watermark",
+    metadata,
+    Column("table_name", String, primary_key=True),  # e.g. binance_klines_prices
+    Column("exported_until", DateTime, nullable=False),  # created_at of the exported rows, inclusive
+    Column("updated_at", DateTime, nullable=False),
+)
@@ -0,0 +1,46 @@
+"""create kline rollup tables
+
+Revision ID: 3f6c2a9d41b7
+Revises: e8d1a0a0bbb9
+Create Date: 2026-10-19 09:12:44.183920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6c2a9d41b7'
+down_revision: Union[str, None] = 'e8d1a0a0bbb9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUP_INTERVALS: list[str] = ['5m', '15m', '1h', '4h', '1d']
+
+
+def upgrade() -> None:
+    for interval in ROLLUP_INTERVALS:
+        op.create_table(f'binance_klines_{interval}',
+        sa.Column('symbol', sa.String(), nullable=False),
+        sa.Column('kline_open_time', sa.DateTime(), nullable=False),
+        sa.Column('kline_close_time', sa.DateTime(), nullable=False),
+        sa.Column('open_price', sa.Numeric(precision=38, scale=18), nullable=False),
+        sa.Column('high_price', sa.Numeric(precision=38, scale=18), nullable=False),
+        sa.Column('low_price', sa.Numeric(precision=38, scale=18), nullable=False),
+        sa.Column('close_price', sa.Numeric(precision=38, scale=18), nullable=False),
+        sa.Column('volume', sa.Numeric(precision=38, scale=18), nullable=False),
+        sa.Column('quote_asset_volume', sa.Numeric(precision=38, scale=18), nullable=False),
+        sa.Column('number_of_trades', sa.Integer(), nullable=False),
+        sa.Column('taker_buy_base_asset_vol', sa.Numeric(precision=38, scale=18), nullable=False),
+        sa.Column('taker_buy_quote_asset_vol', sa.Numeric(precision=38, scale=18), nullable=False),
+        sa.Column('candle_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('symbol', 'kline_open_time')
+        )
+
+
+def downgrade() -> None:
+    for interval in reversed(ROLLUP_INTERVALS):
+        op.drop_table(f'binance_klines_{interval}')
@@ -0,0 +1,31 @@
+"""Create s3_export_watermark
+
+Revision ID: 6a2f8e1c0d45
+Revises: 9c1e7b3a5d28
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a2f8e1c0d45'
+down_revision: Union[str, None] = '9c1e7b3a5d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('s3_export_watermark',
+    sa.Column('table_name', sa.String(), nullable=False),
+    sa.Column('exported_until', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('s3_export_watermark')
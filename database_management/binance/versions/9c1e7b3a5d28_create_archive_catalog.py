@@ -0,0 +1,34 @@
+"""Create archive_catalog
+
+Revision ID: 9c1e7b3a5d28
+Revises: 3f6c2a9d41b7
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1e7b3a5d28'
+down_revision: Union[str, None] = '3f6c2a9d41b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('archive_catalog',
+    sa.Column('table_name', sa.String(), nullable=False),
+    sa.Column('partition_key', sa.String(), nullable=False),
+    sa.Column('s3_path', sa.String(), nullable=False),
+    sa.Column('row_count', sa.BigInteger(), nullable=False),
+    sa.Column('sha256', sa.String(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name', 'partition_key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('archive_catalog')
@@ -10,6 +10,13 @@ from sqlalchemy import (
     UUID,
     Integer,
     Index,
+    Boolean,
+    BigInteger,
+    SmallInteger,
+    Numeric,
+    Float,
+    Identity,
+    text,
 )
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.declarative import declarative_base
@@ -54,6 +61,17 @@ eth_block_table = Table(
     Column("transactionsroot", String, nullable=False),
     Column("withdrawalsroot", String, nullable=True),
     Column("created_at", DateTime, nullable=False),  # date you insert the row
+    # false for blocks from a header-only scan, until their transactions are hydrated
+    Column(
+        "transactions_hydrated", Boolean, nullable=False, server_default=text("true")
+    ),
+    Column("transaction_count", Integer, nullable=True),
+    # partial index; the hydration stage only ever looks for the (few) unhydrated blocks
+    Index(
+        "eth_blocks_unhydrated_index",
+        "block_number",
+        postgresql_where=text("NOT transactions_hydrated"),
+    ),
 )
 
 
@@ -88,6 +106,8 @@ eth_transaction_table: Table = Table(
     Column("value", String, nullable=False),
     Column("yparity", String, nullable=True),
     Column("created_at", DateTime, nullable=False),  # date you insert the row
+    # block ranges are archived (and deleted) block by block
+    Index("eth_transactions_block_number_index", "block_number", postgresql_using="btree"),
 )
 
 
@@ -96,8 +116,8 @@ eth_transaction_table: Table = Table(
 eth_transaction_access_list_table: Table = Table(
     "eth_transaction_access_list",
     metadata,
-    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
-    # generate a unique id with uuid.uuid4() -> this is our own id as they didn't provide it
+    # our own id, as they didn't provide one: a UUIDv5 of (transaction_hash, position); see natural_keys.py
+    Column("id", UUID(as_uuid=True), primary_key=True),
     Column(
         "transaction_hash",
         String,
@@ -106,6 +126,7 @@ eth_transaction_access_list_table: Table = Table(
         ),
         nullable=False,
     ),
+    Column("position", Integer, nullable=False),  # index of the item in the transaction's access list
     Column("address", String, nullable=False),
     Column("storagekeys", ARRAY(String), nullable=False),
     Column("created_at", DateTime, nullable=False),  # date you insert the row
@@ -116,8 +137,8 @@ eth_transaction_access_list_table: Table = Table(
 eth_withdrawals_table: Table = Table(
     "eth_withdrawals",
     metadata,
-    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
-    # generate a unique id with uuid.uuid4() -> this is our own id as they didn't provide it
+    # our own id, as they didn't provide one: a UUIDv5 of (block_number, index); see natural_keys.py
+    Column("id", UUID(as_uuid=True), primary_key=True),
     Column(
         "block_number",
         String,
@@ -131,6 +152,80 @@ eth_withdrawals_table: Table = Table(
     Column("created_at", DateTime, nullable=False),  # date you insert the row
 )
 
+# Receipts have a one to one relationship with transactions, but reference blocks;
+# a header-only block has receipts before its transactions are hydrated
+# data class: EthReceiptDTO
+eth_receipts_table: Table = Table(
+    "eth_receipts",
+    metadata,
+    Column("transaction_hash", String, primary_key=True),
+    Column(
+        "block_number",
+        String,
+        ForeignKey("eth_blocks.block_number", name="receipts_to_blocks_fk"),
+        nullable=False,
+    ),
+    Column("blockhash", String, nullable=True),  # can be null for unsealed block
+    Column("transactionindex", String, nullable=False),
+    Column("from_address", String, nullable=False),
+    Column("to_address", String, nullable=True),  # null for contract creations
+    Column("contractaddress", String, nullable=True),
+    Column("cumulativegasused", String, nullable=False),
+    Column("gasused", String, nullable=False),
+    Column("effectivegasprice", String, nullable=True),
+    Column("blobgasused", String, nullable=True),
+    Column("blobgasprice", String, nullable=True),
+    Column("logsbloom", String, nullable=False),
+    Column("status", String, nullable=True),  # null before byzantium
+    Column("root", String, nullable=True),  # set before byzantium
+    Column("type", String, nullable=True),
+    Column("created_at", DateTime, nullable=False),  # date you insert the row
+    Index("eth_receipts_block_number_index", "block_number"),
+)
+
+# Logs have a many to one relationship with receipts; logindex is unique within a block
+# data class: EthLogDTO
+eth_logs_table: Table = Table(
+    "eth_logs",
+    metadata,
+    Column(
+        "block_number",
+        String,
+        ForeignKey("eth_blocks.block_number", name="logs_to_blocks_fk"),
+        primary_key=True,
+    ),
+    Column("logindex", String, primary_key=True),
+    Column("transaction_hash", String, nullable=False),
+    Column("transactionindex", String, nullable=False),
+    Column("address", String, nullable=False),
+    Column("topic0", String, nullable=True),  # event signature; null for anonymous events
+    Column("topic1", String, nullable=True),
+    Column("topic2", String, nullable=True),
+    Column("topic3", String, nullable=True),
+    Column("data", String, nullable=False),
+    Column("removed", Boolean, nullable=False),
+    Column("created_at", DateTime, nullable=False),  # date you insert the row
+    # logs are looked up by contract, and by event
+    Index("eth_logs_address_index", "address"),
+    Index("eth_logs_topic0_index", "topic0"),
+)
+
+# Blob (EIP-4844) and base fee metrics of every block, as numbers instead of hex strings
+# Keyed by the block number as an integer, so there's no foreign key to eth_blocks.block_number (hex)
+# data class: EthBlobMetricsDTO
+eth_blob_metrics_table: Table = Table(
+    "eth_blob_metrics",
+    metadata,
+    Column("block_number", BigInteger, primary_key=True),
+    Column("blob_gas_used", BigInteger, nullable=True),  # null before Dencun
+    Column("excess_blob_gas", BigInteger, nullable=True),
+    Column("blob_count", SmallInteger, nullable=True),
+    Column("base_fee_per_gas", Numeric, nullable=True),  # wei; null before London
+    Column("blob_base_fee", Numeric, nullable=True),  # wei per blob gas
+    Column("blob_gas_used_ratio", Float, nullable=True),
+    Column("created_at", DateTime, nullable=False),  # date you insert the row
+)
+
 # Q: Postgres has BTree and Hash index. Why did we use BTree?
 # A: We will use the index to get the latest block_number; the query relies on an order on block_number
 # Hash indexes don't support ordering
@@ -144,6 +239,48 @@ eth_block_import_status_table: Table = Table(
     Index("block_number_index", "block_number", postgresql_using="btree"),
 )
 
+# one row per pipeline and shard, updated in place by every batch; replaces eth_block_import_status
+pipeline_checkpoint_table: Table = Table(
+    "pipeline_checkpoint",
+    metadata,
+    Column("pipeline_name", String, primary_key=True),  # e.g. eth_blocks
+    Column("shard", Integer, primary_key=True),
+    Column("position", BigInteger, nullable=False),  # e.g. the last ingested block number
+    Column("updated_at", DateTime, nullable=False),
+)
+
+# every checkpoint advance, for audit only; append-only, never read by the pipelines, so no index
+pipeline_checkpoint_history_table: Table = Table(
+    "pipeline_checkpoint_history",
+    metadata,
+    Column("id", BigInteger, Identity(), primary_key=True),
+    Column("pipeline_name", String, nullable=False),
+    Column("shard", Integer, nullable=False),
+    Column("position", BigInteger, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+
+# ranges of rows moved to parquet in s3 (ColdStorageArchiver); a cataloged range is no longer in postgres
+archive_catalog_table: Table = Table(
+    "archive_catalog",
+    metadata,
+    Column("table_name", String, primary_key=True),  # e.g. eth_transactions
+    Column("partition_key", String, primary_key=True),  # e.g. block_range=19000000-19099999
+    Column("s3_path", String, nullable=False),
+    Column("row_count", BigInteger, nullable=False),
+    Column("sha256", String, nullable=False),  # of the parquet file
+    Column("archived_at", DateTime, nullable=False),
+)
+
+# incremental exports to s3 (PgToS3ExportPipeline): rows created up to exported_until are exported
+s3_export_watermark_table: Table = Table(
+    "s3_export_watermark",
+    metadata,
+    Column("table_name", String, primary_key=True),  # e.g. eth_blocks
+    Column("exported_until", DateTime, nullable=False),  # created_at of the exported rows, inclusive
+    Column("updated_at", DateTime, nullable=False),
+)
+
 s3_import_status_table: Table = Table(
     "s3_import_status",
     metadata,
@@ -0,0 +1,69 @@
+"""Create eth_receipts and eth_logs
+
+Revision ID: 5e2b7c81d0af
+Revises: c3f1a9d2e4b7
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2b7c81d0af'
+down_revision: Union[str, None] = 'c3f1a9d2e4b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('eth_receipts',
+    sa.Column('transaction_hash', sa.String(), nullable=False),
+    sa.Column('block_number', sa.String(), nullable=False),
+    sa.Column('blockhash', sa.String(), nullable=True),
+    sa.Column('transactionindex', sa.String(), nullable=False),
+    sa.Column('from_address', sa.String(), nullable=False),
+    sa.Column('to_address', sa.String(), nullable=True),
+    sa.Column('contractaddress', sa.String(), nullable=True),
+    sa.Column('cumulativegasused', sa.String(), nullable=False),
+    sa.Column('gasused', sa.String(), nullable=False),
+    sa.Column('effectivegasprice', sa.String(), nullable=True),
+    sa.Column('blobgasused', sa.String(), nullable=True),
+    sa.Column('blobgasprice', sa.String(), nullable=True),
+    sa.Column('logsbloom', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('root', sa.String(), nullable=True),
+    sa.Column('type', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['block_number'], ['eth_blocks.block_number'], name='receipts_to_blocks_fk'),
+    sa.PrimaryKeyConstraint('transaction_hash')
+    )
+    op.create_index('eth_receipts_block_number_index', 'eth_receipts', ['block_number'], unique=False)
+    op.create_table('eth_logs',
+    sa.Column('block_number', sa.String(), nullable=False),
+    sa.Column('logindex', sa.String(), nullable=False),
+    sa.Column('transaction_hash', sa.String(), nullable=False),
+    sa.Column('transactionindex', sa.String(), nullable=False),
+    sa.Column('address', sa.String(), nullable=False),
+    sa.Column('topic0', sa.String(), nullable=True),
+    sa.Column('topic1', sa.String(), nullable=True),
+    sa.Column('topic2', sa.String(), nullable=True),
+    sa.Column('topic3', sa.String(), nullable=True),
+    sa.Column('data', sa.String(), nullable=False),
+    sa.Column('removed', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['block_number'], ['eth_blocks.block_number'], name='logs_to_blocks_fk'),
+    sa.PrimaryKeyConstraint('block_number', 'logindex')
+    )
+    op.create_index('eth_logs_address_index', 'eth_logs', ['address'], unique=False)
+    op.create_index('eth_logs_topic0_index', 'eth_logs', ['topic0'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('eth_logs_topic0_index', table_name='eth_logs')
+    op.drop_index('eth_logs_address_index', table_name='eth_logs')
+    op.drop_table('eth_logs')
+    op.drop_index('eth_receipts_block_number_index', table_name='eth_receipts')
+    op.drop_table('eth_receipts')
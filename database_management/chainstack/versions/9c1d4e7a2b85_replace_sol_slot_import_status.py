@@ -0,0 +1,51 @@
+"""Replace sol_slot_import_status with the sol_slots pipeline checkpoint
+
+The sol_slots checkpoint is seeded from the latest sol_slot_import_status row, then sol_slot_import_status is dropped
+
+Revision ID: 9c1d4e7a2b85
+Revises: 0b6e3d9f4a71
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1d4e7a2b85'
+down_revision: Union[str, None] = '0b6e3d9f4a71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "INSERT INTO pipeline_checkpoint (pipeline_name, shard, position, updated_at) "
+        "SELECT 'sol_slots', 0, MAX(slot), MAX(created_at) FROM sol_slot_import_status "
+        "HAVING COUNT(*) > 0"
+    )
+    op.execute(
+        "INSERT INTO pipeline_checkpoint_history (pipeline_name, shard, position, created_at) "
+        "SELECT pipeline_name, shard, position, updated_at FROM pipeline_checkpoint "
+        "WHERE pipeline_name = 'sol_slots'"
+    )
+    op.drop_index('sol_slot_index', table_name='sol_slot_import_status', postgresql_using='btree')
+    op.drop_table('sol_slot_import_status')
+
+
+def downgrade() -> None:
+    op.create_table('sol_slot_import_status',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('slot', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('sol_slot_index', 'sol_slot_import_status', ['slot'], unique=False, postgresql_using='btree')
+    op.execute(
+        "INSERT INTO sol_slot_import_status (id, slot, created_at) "
+        "SELECT gen_random_uuid(), position, updated_at FROM pipeline_checkpoint "
+        "WHERE pipeline_name = 'sol_slots'"
+    )
+    op.execute("DELETE FROM pipeline_checkpoint WHERE pipeline_name = 'sol_slots'")
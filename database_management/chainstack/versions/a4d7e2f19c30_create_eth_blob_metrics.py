@@ -0,0 +1,36 @@
+"""Create eth_blob_metrics
+
+Revision ID: a4d7e2f19c30
+Revises: 5e2b7c81d0af
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d7e2f19c30'
+down_revision: Union[str, None] = '5e2b7c81d0af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('eth_blob_metrics',
+    sa.Column('block_number', sa.BigInteger(), nullable=False),
+    sa.Column('blob_gas_used', sa.BigInteger(), nullable=True),
+    sa.Column('excess_blob_gas', sa.BigInteger(), nullable=True),
+    sa.Column('blob_count', sa.SmallInteger(), nullable=True),
+    sa.Column('base_fee_per_gas', sa.Numeric(), nullable=True),
+    sa.Column('blob_base_fee', sa.Numeric(), nullable=True),
+    sa.Column('blob_gas_used_ratio', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('block_number')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('eth_blob_metrics')
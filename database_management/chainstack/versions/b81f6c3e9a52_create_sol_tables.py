@@ -0,0 +1,67 @@
+"""Create sol_blockhash, sol_block, sol_transaction and sol_slot_import_status
+
+Revision ID: b81f6c3e9a52
+Revises: a4d7e2f19c30
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f6c3e9a52'
+down_revision: Union[str, None] = 'a4d7e2f19c30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('sol_blockhash',
+    sa.Column('slot', sa.BigInteger(), nullable=False),
+    sa.Column('blockhash', sa.String(), nullable=False),
+    sa.Column('lastValidBlockHeight', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('slot')
+    )
+    op.create_table('sol_block',
+    sa.Column('slot', sa.BigInteger(), nullable=False),
+    sa.Column('block_height', sa.BigInteger(), nullable=True),
+    sa.Column('block_time', sa.DateTime(), nullable=True),
+    sa.Column('blockhash', sa.String(), nullable=False),
+    sa.Column('parent_slot', sa.BigInteger(), nullable=False),
+    sa.Column('previous_blockhash', sa.String(), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('slot')
+    )
+    op.create_table('sol_transaction',
+    sa.Column('signature', sa.String(), nullable=False),
+    sa.Column('slot', sa.BigInteger(), nullable=False),
+    sa.Column('transaction_index', sa.Integer(), nullable=False),
+    sa.Column('fee', sa.BigInteger(), nullable=True),
+    sa.Column('compute_units_consumed', sa.BigInteger(), nullable=True),
+    sa.Column('err', sa.String(), nullable=True),
+    sa.Column('version', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['slot'], ['sol_block.slot'], name='sol_transactions_to_sol_blocks_fk'),
+    sa.PrimaryKeyConstraint('signature')
+    )
+    op.create_index('sol_transaction_slot_index', 'sol_transaction', ['slot'], unique=False)
+    op.create_table('sol_slot_import_status',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('slot', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('sol_slot_index', 'sol_slot_import_status', ['slot'], unique=False, postgresql_using='btree')
+
+
+def downgrade() -> None:
+    op.drop_index('sol_slot_index', table_name='sol_slot_import_status', postgresql_using='btree')
+    op.drop_table('sol_slot_import_status')
+    op.drop_index('sol_transaction_slot_index', table_name='sol_transaction')
+    op.drop_table('sol_transaction')
+    op.drop_table('sol_block')
+    op.drop_table('sol_blockhash')
@@ -0,0 +1,30 @@
+"""Add eth_blocks.transactions_hydrated and transaction_count
+
+Revision ID: c3f1a9d2e4b7
+Revises: 7b977ba8a1b3
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1a9d2e4b7'
+down_revision: Union[str, None] = '7b977ba8a1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('eth_blocks', sa.Column('transactions_hydrated', sa.Boolean(), server_default=sa.text('true'), nullable=False))
+    op.add_column('eth_blocks', sa.Column('transaction_count', sa.Integer(), nullable=True))
+    op.create_index('eth_blocks_unhydrated_index', 'eth_blocks', ['block_number'], unique=False, postgresql_where=sa.text('NOT transactions_hydrated'))
+
+
+def downgrade() -> None:
+    op.drop_index('eth_blocks_unhydrated_index', table_name='eth_blocks', postgresql_where=sa.text('NOT transactions_hydrated'))
+    op.drop_column('eth_blocks', 'transaction_count')
+    op.drop_column('eth_blocks', 'transactions_hydrated')
@@ -0,0 +1,63 @@
+"""Natural keys for eth_withdrawals and eth_transaction_access_list
+
+Replaces the random uuid4 ids with UUIDv5 ids of the columns identifying each row, as natural_keys.natural_key does:
+- eth_withdrawals: (block_number, index)
+- eth_transaction_access_list: (transaction_hash, position)
+
+Withdrawals duplicated by replayed batches are deleted first, keeping the first copy. Access list rows are never
+deleted: an access list can repeat an entry (EIP-2930; each one is charged), so a replayed copy can't be told apart
+from a repeated entry. Existing rows are numbered in insertion order, so replayed copies keep positions after the list;
+from here on a replay conflicts on (transaction_hash, position) instead of adding rows
+
+Revision ID: d5a90c7e3b18
+Revises: b81f6c3e9a52
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a90c7e3b18'
+down_revision: Union[str, None] = 'b81f6c3e9a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# src.models.database_transfer_objects.natural_keys.NATURAL_KEY_NAMESPACE
+NATURAL_KEY_NAMESPACE: str = '157c990e-3e3a-55a7-8c49-1217e1b673bb'
+
+
+def upgrade() -> None:
+    # uuid_generate_v5 computes the same UUIDv5 as python's uuid.uuid5
+    op.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
+
+    op.execute(
+        "DELETE FROM eth_withdrawals duplicate USING eth_withdrawals original "
+        "WHERE duplicate.block_number = original.block_number AND duplicate.index = original.index "
+        "AND (duplicate.created_at, duplicate.ctid) > (original.created_at, original.ctid)"
+    )
+    op.execute(
+        f"UPDATE eth_withdrawals SET id = uuid_generate_v5('{NATURAL_KEY_NAMESPACE}'::uuid, block_number || ':' || index)"
+    )
+
+    # the position of an item was never stored; the items of a transaction were inserted in access list order
+    op.add_column('eth_transaction_access_list', sa.Column('position', sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE eth_transaction_access_list SET position = ranked.position "
+        "FROM (SELECT ctid, row_number() OVER (PARTITION BY transaction_hash ORDER BY created_at, ctid) - 1 AS position "
+        "FROM eth_transaction_access_list) ranked "
+        "WHERE eth_transaction_access_list.ctid = ranked.ctid"
+    )
+    op.execute(
+        f"UPDATE eth_transaction_access_list "
+        f"SET id = uuid_generate_v5('{NATURAL_KEY_NAMESPACE}'::uuid, transaction_hash || ':' || position)"
+    )
+    op.alter_column('eth_transaction_access_list', 'position', nullable=False)
+
+
+def downgrade() -> None:
+    # natural key ids are valid uuids; they're kept
+    op.drop_column('eth_transaction_access_list', 'position')
@@ -0,0 +1,53 @@
+"""Create pipeline_checkpoint and pipeline_checkpoint_history
+
+The eth_blocks checkpoint is seeded from the latest eth_block_import_status row;
+eth_block_import_status is no longer written, and is kept as is
+
+Revision ID: e7c4b19a2f60
+Revises: d5a90c7e3b18
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c4b19a2f60'
+down_revision: Union[str, None] = 'd5a90c7e3b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('pipeline_checkpoint',
+    sa.Column('pipeline_name', sa.String(), nullable=False),
+    sa.Column('shard', sa.Integer(), nullable=False),
+    sa.Column('position', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('pipeline_name', 'shard')
+    )
+    op.create_table('pipeline_checkpoint_history',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('pipeline_name', sa.String(), nullable=False),
+    sa.Column('shard', sa.Integer(), nullable=False),
+    sa.Column('position', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        "INSERT INTO pipeline_checkpoint (pipeline_name, shard, position, updated_at) "
+        "SELECT 'eth_blocks', 0, MAX(block_number), MAX(created_at) FROM eth_block_import_status "
+        "HAVING COUNT(*) > 0"
+    )
+    op.execute(
+        "INSERT INTO pipeline_checkpoint_history (pipeline_name, shard, position, created_at) "
+        "SELECT pipeline_name, shard, position, updated_at FROM pipeline_checkpoint"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('pipeline_checkpoint_history')
+    op.drop_table('pipeline_checkpoint')
@@ -0,0 +1,36 @@
+"""Create archive_catalog, and index eth_transactions by block_number
+
+Revision ID: f2a8c5d17e94
+Revises: e7c4b19a2f60
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8c5d17e94'
+down_revision: Union[str, None] = 'e7c4b19a2f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('archive_catalog',
+    sa.Column('table_name', sa.String(), nullable=False),
+    sa.Column('partition_key', sa.String(), nullable=False),
+    sa.Column('s3_path', sa.String(), nullable=False),
+    sa.Column('row_count', sa.BigInteger(), nullable=False),
+    sa.Column('sha256', sa.String(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name', 'partition_key')
+    )
+    op.create_index('eth_transactions_block_number_index', 'eth_transactions', ['block_number'], unique=False, postgresql_using='btree')
+
+
+def downgrade() -> None:
+    op.drop_index('eth_transactions_block_number_index', table_name='eth_transactions', postgresql_using='btree')
+    op.drop_table('archive_catalog')
@@ -1,42 +1,62 @@
-from sqlalchemy import (MetaData, Table, Column, String, DateTime, ForeignKey, UUID, Integer, Index)
-
-import uuid
-
-from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy.ext.declarative import declarative_base
-
-# Origin of sqlalchemy; used to define the origin of sqlalchemy
-Base = declarative_base()
+from sqlalchemy import (
+    Table,
+    Column,
+    String,
+    DateTime,
+    ForeignKey,
+    Integer,
+    BigInteger,
+    Index,
+)
 
-# The orchestrator keeping track of all sqlalchemy.Table
-# We assign this to alembic's target_metadata variable, to let alembic keep track of existing tables
-Base = declarative_base()
-metadata: MetaData = MetaData()
+# solana tables live in the chain_stack database, next to the eth tables;
+# they share its metadata, so alembic keeps track of both
+from database_management.chainstack.tables import metadata
 
 # https://docs.chainstack.com/reference/solana-getlatestblockhash
 sol_blockhash_table: Table = Table(
     "sol_blockhash",
     metadata,
-    Column("slot", Integer, primary_key=True),
+    Column("slot", BigInteger, primary_key=True),
     Column("blockhash", String, nullable=False),
-    Column("lastValidBlockHeight", Integer, nullable=False)
+    Column("lastValidBlockHeight", BigInteger, nullable=False),
 )
 
 # https://docs.chainstack.com/reference/solana-getblock
+# data class: SolBlockDTO
 sol_block_table: Table = Table(
     "sol_block",
     metadata,
-    Column("slot", Integer, primary_key=True),
-    Column("block_height", Integer, primary_key=True),
-    Column("block_time", DateTime, nullable=False),
+    Column("slot", BigInteger, primary_key=True),  # a slot holds at most one block
+    Column("block_height", BigInteger, nullable=True),  # null for blocks older than block heights
+    Column("block_time", DateTime, nullable=True),  # null if the node didn't record it
     Column("blockhash", String, nullable=False),
-    Column("parent_slot", Integer, nullable=False) # there must be a parent except for the genesis block which we likely not fetch anyway
-    Column("previous_blockhash", String, nullable=False) # same as above
+    # there must be a parent except for the genesis block which we likely not fetch anyway
+    Column("parent_slot", BigInteger, nullable=False),
+    Column("previous_blockhash", String, nullable=False),  # same as above
+    Column("transaction_count", Integer, nullable=True),  # null if fetched with transactionDetails=none
+    Column("created_at", DateTime, nullable=False),  # date you insert the row
 )
 
-# https://docs.chainstack.com/reference/gettransaction
+# https://docs.chainstack.com/reference/solana-getblock (transactions of a block)
+# Transactions has a many to one relationship with blocks
+# data class: SolTransactionDTO
 sol_transaction_table: Table = Table(
     "sol_transaction",
     metadata,
-    Column("")
-)
\ No newline at end of file
+    Column("signature", String, primary_key=True),  # first signature; the transaction id
+    Column(
+        "slot",
+        BigInteger,
+        ForeignKey("sol_block.slot", name="sol_transactions_to_sol_blocks_fk"),
+        nullable=False,
+    ),
+    Column("transaction_index", Integer, nullable=False),  # position within the block
+    # fee, compute units, err and version are null if fetched with transactionDetails=signatures
+    Column("fee", BigInteger, nullable=True),  # lamports
+    Column("compute_units_consumed", BigInteger, nullable=True),
+    Column("err", String, nullable=True),  # JSON; null if the transaction succeeded
+    Column("version", String, nullable=True),  # "legacy", or "0"
+    Column("created_at", DateTime, nullable=False),  # date you insert the row
+    Index("sol_transaction_slot_index", "slot"),
+)
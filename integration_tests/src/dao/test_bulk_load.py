@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import Engine, Table, create_engine, insert, text
+
+from database_management.chainstack.tables import (
+    pipeline_checkpoint_history_table,
+    pipeline_checkpoint_table,
+)
+from src.dao.bulk_load import BulkLoadMode
+from src.dao.pipeline_checkpoint_dao import PipelineCheckpointDAO
+from src.eth_block_etl_pipeline import ETH_BLOCK_TABLES
+
+PIPELINE_NAME: str = "eth_blocks"
+
+
+@pytest.fixture
+def input_tables() -> list[Table]:
+    return [*ETH_BLOCK_TABLES, pipeline_checkpoint_table, pipeline_checkpoint_history_table]
+
+
+@pytest.fixture
+def engine(create_and_drop_db_and_tables, db_name: str) -> Engine:
+    engine: Engine = create_engine(f"postgresql://localhost:5432/{db_name}")
+    with engine.begin() as conn:
+        conn.execute(
+            insert(pipeline_checkpoint_table).values(
+                pipeline_name=PIPELINE_NAME, shard=0, position=100, updated_at=datetime(2026, 10, 1)
+            )
+        )
+    return engine
+
+
+def read_positions(engine: Engine) -> tuple[list[int], list[int]]:
+    """
+    (checkpoint positions, checkpoint history positions) of the pipeline
+    """
+    with engine.begin() as conn:
+        return (
+            list(conn.execute(text("SELECT position FROM pipeline_checkpoint")).scalars()),
+            list(conn.execute(text("SELECT position FROM pipeline_checkpoint_history ORDER BY id")).scalars()),
+        )
+
+
+class TestBulkLoadModeCheckpointReset:
+    @pytest.mark.asyncio
+    async def test_the_checkpoint_of_emptied_tables_is_reset(self, engine: Engine, db_name: str) -> None:
+        """
+        GIVEN: the checkpoint is at block 100, but the eth tables are empty, as a crash in bulk load mode leaves them
+        WHEN: bulk load mode is entered
+        THEN: the checkpoint is reset, and the reset is recorded in its history
+        """
+        connection_string: str = f"postgresql+asyncpg://localhost:5432/{db_name}"
+        checkpoint_dao: PipelineCheckpointDAO = PipelineCheckpointDAO(connection_string, PIPELINE_NAME)
+        bulk_load_mode: BulkLoadMode = BulkLoadMode(
+            connection_string=connection_string,
+            tables=ETH_BLOCK_TABLES,
+            checkpoint_resets=[checkpoint_dao.reset],
+        )
+        try:
+            await bulk_load_mode.enter()
+
+            assert read_positions(engine) == ([], [0])
+            assert await bulk_load_mode.reset_checkpoints_if_emptied() is False
+        finally:
+            await bulk_load_mode.exit()
+            engine.dispose()
+            await bulk_load_mode._engine.dispose()
+            await checkpoint_dao._engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_the_checkpoint_of_loaded_tables_is_kept(self, engine: Engine, db_name: str) -> None:
+        """
+        GIVEN: the checkpoint is at block 100, and eth_blocks holds rows
+        WHEN: bulk load mode is entered, then exited
+        THEN: the checkpoint is left as is
+        """
+        connection_string: str = f"postgresql+asyncpg://localhost:5432/{db_name}"
+        checkpoint_dao: PipelineCheckpointDAO = PipelineCheckpointDAO(connection_string, PIPELINE_NAME)
+        bulk_load_mode: BulkLoadMode = BulkLoadMode(
+            connection_string=connection_string,
+            tables=ETH_BLOCK_TABLES,
+            checkpoint_resets=[checkpoint_dao.reset],
+        )
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO eth_blocks (block_number, id, jsonrpc, difficulty, extradata, gaslimit, gasused, "
+                    "logsbloom, miner, mixhash, nonce, number, parenthash, receiptsroot, sha3uncles, size, "
+                    "stateroot, timestamp, totaldifficulty, transactionsroot, created_at) "
+                    "VALUES ('0x64', 1, '2.0', '0x0', '0x', '0x0', '0x0', '0x0', '0xm1', '0x0', '0x0', '0x64', "
+                    "'0xb99', '0x0', '0x0', '0x0', '0x0', '0x0', '', '0x0', '2026-10-01')"
+                )
+            )
+        try:
+            async with bulk_load_mode.bulk_load():
+                pass
+
+            assert read_positions(engine) == ([100], [])
+        finally:
+            engine.dispose()
+            await bulk_load_mode._engine.dispose()
+            await checkpoint_dao._engine.dispose()
@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Any, Generator
+
+import pytest
+from sqlalchemy import Engine, Table, create_engine, insert
+
+from database_management.chainstack.tables import eth_block_table
+from src.dao.eth_block_dao import EthBlockDAO
+
+
+@pytest.fixture
+def input_tables() -> list[Table]:
+    return [eth_block_table]
+
+
+def block_row(block_number: int, parent_hash: str, hydrated: bool = True) -> dict[str, Any]:
+    """
+    a block whose hash is its block number, e.g 0xb1 for block 1
+    """
+    return {
+        "block_number": hex(block_number),
+        "id": 1,
+        "jsonrpc": "2.0",
+        "difficulty": "0x0",
+        "extradata": "0x",
+        "gaslimit": "0x1c9c380",
+        "gasused": "0x0",
+        "hash": f"0xb{block_number}",
+        "logsbloom": "0x0",
+        "miner": "0xm1",
+        "mixhash": "0x0",
+        "nonce": "0x0",
+        "number": hex(block_number),
+        "parenthash": parent_hash,
+        "receiptsroot": "0x0",
+        "sha3uncles": "0x0",
+        "size": "0x0",
+        "stateroot": "0x0",
+        "timestamp": "0x0",
+        "totaldifficulty": "",
+        "transactionsroot": "0x0",
+        "created_at": datetime(2025, 1, 6),
+        "transactions_hydrated": hydrated,
+    }
+
+
+@pytest.fixture
+def dao(db_name: str) -> EthBlockDAO:
+    return EthBlockDAO(f"postgresql+asyncpg://localhost:5432/{db_name}")
+
+
+@pytest.fixture
+def insert_blocks(
+    create_and_drop_db_and_tables, db_name: str
+) -> Generator[Any, None, None]:
+    engine: Engine = create_engine(f"postgresql://localhost:5432/{db_name}")
+
+    def insert_rows(rows: list[dict[str, Any]]) -> None:
+        with engine.begin() as conn:
+            conn.execute(insert(eth_block_table).values(rows))
+
+    try:
+        yield insert_rows
+    finally:
+        engine.dispose()
+
+
+class TestEthBlockDAOReadUnhydratedBlockNumbers:
+    @pytest.mark.asyncio
+    async def test_only_the_unhydrated_blocks_of_the_range_are_read(
+        self, insert_blocks, dao: EthBlockDAO
+    ) -> None:
+        """
+        GIVEN: blocks 8 to 17, of which 9, 10, 16 and 17 are header-only
+        WHEN: read_unhydrated_block_numbers is called for blocks 9 to 16
+        THEN: 9, 10 and 16 are returned, in numeric (not hex string) order
+        """
+        insert_blocks(
+            [
+                block_row(block_number, f"0xb{block_number - 1}", hydrated=block_number not in (9, 10, 16, 17))
+                for block_number in range(8, 18)
+            ]
+        )
+        try:
+            assert await dao.read_unhydrated_block_numbers(9, 16) == [9, 10, 16]
+        finally:
+            await dao._engine.dispose()
+
+
+class TestEthBlockDAOReadChainBreaks:
+    @pytest.mark.asyncio
+    async def test_bounds_and_breaks_are_read_in_a_single_query(
+        self, insert_blocks, dao: EthBlockDAO
+    ) -> None:
+        """
+        GIVEN: blocks 8 to 20, without 12 and 13, where 16 doesn't link to 15 (a stale block)
+        WHEN: read_chain_breaks is called for blocks 6 to 22
+        THEN: the stored bounds are 8 and 20, and the breaks are the gap 11 -> 14 and the broken link 15 -> 16,
+              in numeric (not hex string) order
+        """
+        insert_blocks(
+            [
+                block_row(block_number, "0xstale" if block_number == 16 else f"0xb{block_number - 1}")
+                for block_number in range(8, 21)
+                if block_number not in (12, 13)
+            ]
+        )
+        try:
+            assert await dao.read_chain_breaks(6, 22) == (8, 20, [(11, 14, False), (15, 16, False)])
+        finally:
+            await dao._engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_an_unbroken_chain_still_has_bounds(self, insert_blocks, dao: EthBlockDAO) -> None:
+        insert_blocks([block_row(block_number, f"0xb{block_number - 1}") for block_number in range(8, 12)])
+        try:
+            assert await dao.read_chain_breaks(8, 11) == (8, 11, [])
+            assert await dao.read_chain_breaks(20, 30) == (None, None, [])
+        finally:
+            await dao._engine.dispose()
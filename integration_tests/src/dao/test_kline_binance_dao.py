@@ -7,7 +7,7 @@ prevent interference between tests.
 
 Setup per test:
 - A uniquely named Postgres test database is created
-- The binance_klines_prices table is created via SQLAlchemy metadata
+- The binance_klines_prices and 1d rollup tables are created via SQLAlchemy metadata
 
 Teardown per test:
 - The test database is dropped regardless of test outcome
@@ -17,14 +17,14 @@ Real services used:
 """
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Generator, Sequence
 
 import pytest
-from sqlalchemy import Engine, create_engine, text, TextClause, CursorResult, Row
+from sqlalchemy import Engine, create_engine, insert, text, TextClause, CursorResult, Row
 
-from database_management.binance.binance_table import binance_klines_prices_table
+from database_management.binance.binance_table import binance_klines_prices_table, binance_kline_rollup_tables
 from src.dao.kline_binance_dao import KlineBinanceDAO
 from src.models.database_transfer_objects.binance.binance_klines import BinanceKlinePriceDTO
 from src.models.binance_models.binance_klines import Klines
@@ -42,7 +42,7 @@ def db_name() -> str:
 @pytest.fixture
 def create_and_drop_db(db_name: str) -> Generator[None, None, None]:
     """
-    Creates a uniquely named test database with the binance_klines_prices table,
+    Creates a uniquely named test database with the binance_klines_prices and 1d rollup tables,
     then drops the database on teardown regardless of test outcome.
     """
     default_engine: Engine = create_engine(
@@ -60,6 +60,7 @@ def create_and_drop_db(db_name: str) -> Generator[None, None, None]:
         )
         with test_engine.begin() as conn:
             binance_klines_prices_table.create(conn)
+            binance_kline_rollup_tables["1d"].create(conn)
         test_engine.dispose()
         yield
     except Exception as e:
@@ -286,3 +287,82 @@ class TestKlineBinanceDAOInsertJsonToMainTable:
             assert rows[1][0] == SYMBOL
         finally:
             await dao._engine.dispose()
+
+
+class TestKlineBinanceDAOReadKlineGaps:
+    @pytest.mark.asyncio
+    async def test_read_kline_gaps_returns_every_missing_range_per_symbol(
+        self,
+        create_and_drop_db: None,
+        dao: KlineBinanceDAO,
+        sample_kline_dto: BinanceKlinePriceDTO,
+    ) -> None:
+        """
+        GIVEN: BTCUSDC 1m klines opened at 16:00, 16:01 and 16:04, and no ETHBTC klines
+        WHEN: read_kline_gaps is called for both symbols, from 16:00 until 16:06
+        THEN: BTCUSDC is missing 16:02-16:04 and 16:05-16:06, and ETHBTC the whole range
+        """
+        start_time: datetime = datetime(2025, 2, 19, 16, 0)
+        try:
+            async with dao._engine.begin() as conn:
+                await dao.insert_kline(
+                    async_connection=conn,
+                    input=[
+                        sample_kline_dto.model_copy(
+                            update={"kline_open_time": start_time + timedelta(minutes=minute)}
+                        )
+                        for minute in (0, 1, 4)
+                    ],
+                )
+
+            gaps: list[tuple[str, datetime, datetime]] = await dao.read_kline_gaps(
+                [SYMBOL, "ETHBTC"], "1m", start_time, start_time + timedelta(minutes=6)
+            )
+
+            assert gaps == [
+                (SYMBOL, datetime(2025, 2, 19, 16, 2), datetime(2025, 2, 19, 16, 4)),
+                (SYMBOL, datetime(2025, 2, 19, 16, 5), datetime(2025, 2, 19, 16, 6)),
+                ("ETHBTC", datetime(2025, 2, 19, 16, 0), datetime(2025, 2, 19, 16, 6)),
+            ]
+        finally:
+            await dao._engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_read_kline_gaps_floors_start_time_to_the_rollup_bucket(
+        self,
+        create_and_drop_db: None,
+        dao: KlineBinanceDAO,
+        db_name: str,
+        sample_kline_dto: BinanceKlinePriceDTO,
+    ) -> None:
+        """
+        GIVEN: 1d rollups of 2025-02-18 and 2025-02-19
+        WHEN: read_kline_gaps is called with interval 1d, from 2025-02-18 13:00 (mid bucket) until 2025-02-20
+        THEN: there are no gaps; the partial first day is not reported as missing
+        """
+        sync_engine: Engine = create_engine(
+            f"postgresql://{POSTGRES_HOST}:{POSTGRES_PORT}/{db_name}"
+        )
+        with sync_engine.begin() as conn:
+            conn.execute(
+                insert(binance_kline_rollup_tables["1d"]).values(
+                    [
+                        {
+                            **sample_kline_dto.model_dump(exclude={"created_at"}),
+                            "kline_open_time": day,
+                            "kline_close_time": day + timedelta(days=1) - timedelta(milliseconds=1),
+                            "candle_count": 1440,
+                        }
+                        for day in (datetime(2025, 2, 18), datetime(2025, 2, 19))
+                    ]
+                )
+            )
+        sync_engine.dispose()
+        try:
+            gaps: list[tuple[str, datetime, datetime]] = await dao.read_kline_gaps(
+                [SYMBOL], "1d", datetime(2025, 2, 18, 13, 0), datetime(2025, 2, 20)
+            )
+
+            assert gaps == []
+        finally:
+            await dao._engine.dispose()
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Sequence
+
+import pandas as pd
+import pytest
+from sqlalchemy import Engine, Row, Table, create_engine, insert, text
+
+from database_management.binance.binance_table import (
+    KLINE_ROLLUP_INTERVALS,
+    binance_kline_rollup_tables,
+    binance_klines_prices_table,
+)
+from src.dao.kline_rollup_dao import ROLLUP_COLUMNS, KlineRollupDAO
+from src.utils.kline_rollups import resample_klines
+
+SYMBOL: str = "BTCUSDC"
+
+
+@pytest.fixture
+def input_tables() -> list[Table]:
+    return [binance_klines_prices_table, *binance_kline_rollup_tables.values()]
+
+
+def kline_row(open_time: datetime) -> dict[str, Any]:
+    """
+    a 1m candle with 18 digit scale prices and volumes, which float64 can't represent
+    """
+    minute: int = int((open_time - datetime(2026, 3, 29)).total_seconds() // 60)
+    price: Decimal = Decimal("66000.123456789012345678") + Decimal(minute) / 7
+    return {
+        "symbol": SYMBOL,
+        "kline_open_time": open_time,
+        "kline_close_time": open_time + timedelta(minutes=1) - timedelta(milliseconds=1),
+        "open_price": price,
+        "high_price": price + Decimal("0.000000000000000001"),
+        "low_price": price - Decimal("0.000000000000000001"),
+        "close_price": price,
+        "volume": Decimal("0.100000000000000001") * (minute % 11 + 1),
+        "quote_asset_volume": Decimal("12345678901234.123456789012345678"),
+        "number_of_trades": minute,
+        "taker_buy_base_asset_vol": Decimal("0.3"),
+        "taker_buy_quote_asset_vol": Decimal("0.000000000000000007"),
+        "created_at": datetime(2026, 3, 30),
+    }
+
+
+def read_rollups(engine: Engine) -> dict[str, Sequence[Row]]:
+    with engine.begin() as conn:
+        return {
+            interval: conn.execute(
+                text(f"SELECT {ROLLUP_COLUMNS} FROM {table.name} ORDER BY kline_open_time")
+            ).fetchall()
+            for interval, table in binance_kline_rollup_tables.items()
+        }
+
+
+class TestKlineRollupDAOBackfill:
+    @pytest.mark.asyncio
+    async def test_backfilled_rollups_equal_refreshed_rollups(
+        self, create_and_drop_db_and_tables, db_name: str
+    ) -> None:
+        """
+        GIVEN: 90 1m candles, whose NUMERIC(38, 18) values are not representable as float64
+        WHEN: the rollups are built by the incremental SQL refresh, then rebuilt by the backfill
+        THEN: both produce exactly the same rollups
+        """
+        engine: Engine = create_engine(f"postgresql://localhost:5432/{db_name}")
+        dao: KlineRollupDAO = KlineRollupDAO(f"postgresql+asyncpg://localhost:5432/{db_name}")
+        start_time: datetime = datetime(2026, 3, 29, 23)
+        end_time: datetime = start_time + timedelta(minutes=90)
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    insert(binance_klines_prices_table).values(
+                        [kline_row(start_time + timedelta(minutes=minute)) for minute in range(90)]
+                    )
+                )
+            async with dao._engine.begin() as async_conn:
+                await dao.refresh_rollups(async_conn, SYMBOL, start_time, end_time)
+            refreshed_rollups: dict[str, Sequence[Row]] = read_rollups(engine)
+            with engine.begin() as conn:
+                for table in binance_kline_rollup_tables.values():
+                    conn.execute(text(f"TRUNCATE {table.name}"))
+
+            klines_df: pd.DataFrame = await dao.read_base_klines_frame(SYMBOL, start_time, end_time)
+            async with dao._engine.begin() as async_conn:
+                for interval, interval_duration in KLINE_ROLLUP_INTERVALS.items():
+                    await dao.upsert_rollup_frame(
+                        async_conn, interval, resample_klines(klines_df, interval_duration)
+                    )
+
+            assert len(refreshed_rollups["5m"]) == 18
+            assert read_rollups(engine) == refreshed_rollups
+        finally:
+            engine.dispose()
+            await dao._engine.dispose()
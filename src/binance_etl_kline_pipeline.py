@@ -3,6 +3,7 @@ from asyncio import AbstractEventLoop, new_event_loop
 from datetime import datetime
 
 from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
 import logging
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 from dotenv import load_dotenv
@@ -47,57 +48,62 @@ class BinanceToS3ETLPipeline:
         self._engine: AsyncEngine = create_async_engine(connection_string)
 
     async def run(self, symbol: str, kline_open_dt: datetime) -> None:
-        # step 1: get latest file modified date from provider_to_s3_import_status_table
-        latest_kline_modified_dt: datetime | None = (
-            await self._provider_to_s3_import_status_dao.read_latest_kline_import_status(
-                table=self._data_source
+        with METRICS.run("binance_klines_to_s3"):
+            # step 1: get latest file modified date from provider_to_s3_import_status_table
+            latest_kline_modified_dt: datetime | None = (
+                await self._provider_to_s3_import_status_dao.read_latest_kline_import_status(
+                    table=self._data_source
+                )
             )
-        )
-
-        # Step 2: extract klines from Binance API between:
-        # start_date: date after the latest date (make this customizable nonetheless in start and end date are before
-        # the existing dates in database)
-        # end_date: current, or other specified date (make this customizable nonetheless)
-        # TO_DO - start_time to include option of: time after latest_import_status, manual input
-        # TO_DO - end_time to include option of: datetime.utcnow, manual input
-        # start_time: datetime = datetime(2026, 3, 30) # TODO: put this as an input param
-        # if start_time<=latest_s3_modified_date, data exists in s3 and extraction from binance is not necessary
-        # break
-        if latest_kline_modified_dt is not None and kline_open_dt <= latest_kline_modified_dt:
-            return
-        end_time: datetime = datetime.utcnow()
-        end_time_str: str = str(end_time)
-        end_time_str_formatted: str = end_time_str.replace(" ", "_")
-
-        klines: Klines = await self._extractor.extract(
-            symbol=symbol,
-            interval="1m",
-            limit=500,
-            start_time=kline_open_dt,
-            end_time=end_time,
-        )
-        with open(
-            f"klines_{end_time_str_formatted}.json", "w", encoding="utf-8"
-        ) as json_file:
-            json_str = klines.model_dump_json(indent=2)
-            json_file.write(json_str)
-
-        # step 3: save the files into S3 using S3Explorer.upload_files method
-        self._s3_explorer.upload_file(
-            local_file_path=f"klines_{end_time_str_formatted}.json",
-            s3_path=f"binance/klines/2026/{end_time_str_formatted}.json",
-        )
-        # step 4: update provider_to_s3_import_status_table
-        async with self._engine.begin() as conn:
-            binance_to_s3_import_status: BinanceToS3ImportStatusDTO = BinanceToS3ImportStatusDTO(
-                data_source=self._data_source,
-                symbol=symbol,
-                kline_open_time=kline_open_dt,
-                created_at=datetime.utcnow()
-            )
-            await self._provider_to_s3_import_status_dao.insert_latest_import_status(
-                import_status=binance_to_s3_import_status
+
+            # Step 2: extract klines from Binance API between:
+            # start_date: date after the latest date (make this customizable nonetheless in start and end date are before
+            # the existing dates in database)
+            # end_date: current, or other specified date (make this customizable nonetheless)
+            # TO_DO - start_time to include option of: time after latest_import_status, manual input
+            # TO_DO - end_time to include option of: datetime.utcnow, manual input
+            # start_time: datetime = datetime(2026, 3, 30) # TODO: put this as an input param
+            # if start_time<=latest_s3_modified_date, data exists in s3 and extraction from binance is not necessary
+            # break
+            if latest_kline_modified_dt is not None and kline_open_dt <= latest_kline_modified_dt:
+                return
+            end_time: datetime = datetime.utcnow()
+            end_time_str: str = str(end_time)
+            end_time_str_formatted: str = end_time_str.replace(" ", "_")
+
+            try:
+                klines: Klines = await self._extractor.extract(
+                    symbol=symbol,
+                    interval="1m",
+                    limit=500,
+                    start_time=kline_open_dt,
+                    end_time=end_time,
+                )
+            finally:
+                await self._extractor.close()
+            METRICS.increment("rows", len(klines.klines), table="binance_klines")
+            with open(
+                f"klines_{end_time_str_formatted}.json", "w", encoding="utf-8"
+            ) as json_file:
+                json_str = klines.model_dump_json(indent=2)
+                json_file.write(json_str)
+
+            # step 3: save the files into S3 using S3Explorer.upload_files method
+            self._s3_explorer.upload_file(
+                local_file_path=f"klines_{end_time_str_formatted}.json",
+                s3_path=f"binance/klines/2026/{end_time_str_formatted}.json",
             )
+            # step 4: update provider_to_s3_import_status_table
+            async with self._engine.begin() as conn:
+                binance_to_s3_import_status: BinanceToS3ImportStatusDTO = BinanceToS3ImportStatusDTO(
+                    data_source=self._data_source,
+                    symbol=symbol,
+                    kline_open_time=kline_open_dt,
+                    created_at=datetime.utcnow()
+                )
+                await self._provider_to_s3_import_status_dao.insert_latest_import_status(
+                    import_status=binance_to_s3_import_status
+                )
 
 
 
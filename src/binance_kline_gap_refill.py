@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+from dotenv import load_dotenv
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from database_management.binance.binance_table import binance_klines_prices_table
+from src.cold_storage_archiver import archived_kline_month
+from src.dao.archive_dao import ArchiveDAO
+from src.dao.kline_binance_dao import KlineBinanceDAO
+from src.dao.kline_rollup_dao import KlineRollupDAO
+from src.extractors.binance_klines_extractor import BinanceKlinesExtractor
+from src.utils.kline_rollups import BASE_KLINE_INTERVAL, floor_to_interval
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+
+class KlineGap(BaseModel):
+    """
+    1m candles of a symbol opened in [start_time, end_time) which are not stored
+    """
+
+    symbol: str
+    start_time: datetime
+    end_time: datetime
+
+
+def refill_windows(gap: KlineGap, limit: int = 500) -> list[tuple[datetime, datetime]]:
+    """
+    splits a gap into [start, end) windows of at most limit 1m candles, so no request is truncated by binance's limit
+    """
+    window: timedelta = BASE_KLINE_INTERVAL * limit
+    windows: list[tuple[datetime, datetime]] = []
+    window_start: datetime = gap.start_time
+    while window_start < gap.end_time:
+        windows.append((window_start, min(window_start + window, gap.end_time)))
+        window_start += window
+    return windows
+
+
+def exclude_ranges(
+    gaps: list[KlineGap], excluded_ranges: list[tuple[datetime, datetime]]
+) -> list[KlineGap]:
+    """
+    the parts of gaps outside every [start, end) excluded range, e.g archived months
+    """
+    remaining_gaps: list[KlineGap] = gaps
+    for excluded_start, excluded_end in excluded_ranges:
+        split_gaps: list[KlineGap] = []
+        for gap in remaining_gaps:
+            if gap.start_time < excluded_start:
+                split_gaps.append(gap.model_copy(update={"end_time": min(gap.end_time, excluded_start)}))
+            if gap.end_time > excluded_end:
+                split_gaps.append(gap.model_copy(update={"start_time": max(gap.start_time, excluded_end)}))
+        remaining_gaps = split_gaps
+    return remaining_gaps
+
+
+class KlineGapRefill:
+    """
+    Finds the holes in binance_klines_prices (API truncation, exchange downtime, failed runs), and refills only them
+
+    Steps
+    1. Read every symbol's gaps in a single pass (KlineBinanceDAO.read_kline_gaps); with a rollup interval, e.g "1d",
+       a whole missing bucket is refilled, which is cheaper to find over a long history. Months archived to parquet
+       (ColdStorageArchiver) are not gaps; refilling them would undo the archive
+    2. Split every gap into windows of at most limit candles (refill_windows)
+    3. Extract the windows from binance, max_concurrency at a time, and COPY every window into postgres in its own
+       transaction; rollups are refreshed by the dao
+
+    Binance weight is only spent on the missing candles; a window binance has no candles for (exchange downtime) is
+    logged, and found again by the next run
+    """
+
+    def __init__(
+        self,
+        symbols: list[str],
+        kline_dao: KlineBinanceDAO,
+        archive_dao: ArchiveDAO,
+        extractor: BinanceKlinesExtractor,
+        connection_string: str,
+        interval: str = "1m",
+        max_concurrency: int = 4,
+        limit: int = 500,
+    ) -> None:
+        self._symbols: list[str] = symbols
+        self._kline_dao: KlineBinanceDAO = kline_dao
+        self._archive_dao: ArchiveDAO = archive_dao
+        self._extractor: BinanceKlinesExtractor = extractor
+        self._engine: AsyncEngine = create_async_engine(connection_string)
+        self._interval: str = interval
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+        self._limit: int = limit
+
+    async def find_gaps(self, start_time: datetime, end_time: datetime) -> list[KlineGap]:
+        archived_months: list[tuple[datetime, datetime]] = [
+            archived_kline_month(partition_key)
+            for partition_key in await self._archive_dao.read_archived_partitions(binance_klines_prices_table.name)
+        ]
+        gaps: list[KlineGap] = exclude_ranges(
+            [
+                KlineGap(symbol=symbol, start_time=gap_start, end_time=gap_end)
+                for symbol, gap_start, gap_end in await self._kline_dao.read_kline_gaps(
+                    self._symbols, self._interval, start_time, end_time
+                )
+            ],
+            archived_months,
+        )
+        for gap in gaps:
+            logger.warning(f"Kline gap: {gap}")
+        return gaps
+
+    async def run(self, start_time: datetime, end_time: datetime) -> None:
+        with METRICS.run("binance_kline_gap_refill"):
+            gaps: list[KlineGap] = await self.find_gaps(start_time, end_time)
+            try:
+                await asyncio.gather(
+                    *[
+                        self._refill_window(gap.symbol, window_start, window_end)
+                        for gap in gaps
+                        for window_start, window_end in refill_windows(gap, self._limit)
+                    ]
+                )
+            finally:
+                await self._extractor.close()
+
+    async def _refill_window(self, symbol: str, window_start: datetime, window_end: datetime) -> None:
+        async with self._semaphore:
+            # binance's endTime is inclusive
+            klines_table: pa.Table = await self._extractor.extract_columnar(
+                symbol=symbol,
+                interval="1m",
+                limit=self._limit,
+                start_time=window_start,
+                end_time=window_end - timedelta(milliseconds=1),
+            )
+        if klines_table.num_rows == 0:
+            logger.warning(f"Binance has no {symbol} klines between {window_start} and {window_end}")
+            return
+        async with self._engine.begin() as conn:
+            await self._kline_dao.copy_klines_to_db(async_connection=conn, klines_table=klines_table)
+        METRICS.increment("klines_refilled", klines_table.num_rows, symbol=symbol)
+        logger.info(f"Refilled {klines_table.num_rows} {symbol} klines between {window_start} and {window_end}")
+
+
+def trigger_kline_gap_refill() -> None:
+    """
+    refills the gaps of KLINE_SYMBOLS (comma separated) over the last KLINE_GAP_LOOKBACK_DAYS days, up to the last
+    closed candle
+    """
+    load_dotenv()
+    connection_string: str = os.getenv("BINANCE_PG_CONNECTION_STRING", "")
+    end_time: datetime = floor_to_interval(datetime.utcnow(), BASE_KLINE_INTERVAL)
+    start_time: datetime = end_time - timedelta(days=int(os.getenv("KLINE_GAP_LOOKBACK_DAYS", "7")))
+    refill: KlineGapRefill = KlineGapRefill(
+        symbols=os.getenv("KLINE_SYMBOLS", "BTCUSDC").split(","),
+        kline_dao=KlineBinanceDAO(connection_string, rollup_dao=KlineRollupDAO(connection_string)),
+        archive_dao=ArchiveDAO(connection_string),
+        extractor=BinanceKlinesExtractor(),
+        connection_string=connection_string,
+        interval=os.getenv("KLINE_GAP_INTERVAL", "1m"),
+        max_concurrency=int(os.getenv("KLINE_GAP_CONCURRENCY", "4")),
+    )
+    asyncio.run(refill.run(start_time, end_time))
+
+
+if __name__ == "__main__":
+    trigger_kline_gap_refill()
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from database_management.binance.binance_table import KLINE_ROLLUP_INTERVALS
+from src.dao.kline_rollup_dao import KlineRollupDAO
+from src.utils.kline_rollups import floor_to_interval, resample_klines
+from src.utils.logging_utils import setup_logging
+
+logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+
+class KlineRollupBackfill:
+    """
+    Backfills the kline rollup tables from existing 1m klines, e.g after the rollup tables are first created
+
+    Steps, for each day between start and end
+    1. Read the day's 1m klines of the symbol into a DataFrame
+    2. Resample them into every rollup interval in a single vectorised pass per interval
+    3. Upsert every interval's rollups in a single transaction
+
+    The backfill works in whole days (the coarsest rollup), so every bucket it writes is complete
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        start_time: datetime,
+        end_time: datetime,
+        rollup_dao: KlineRollupDAO,
+        connection_string: str,
+    ) -> None:
+        self._symbol: str = symbol
+        self._start_time: datetime = start_time
+        self._end_time: datetime = end_time
+        self._rollup_dao: KlineRollupDAO = rollup_dao
+        self._engine: AsyncEngine = create_async_engine(connection_string)
+
+    async def run(self) -> None:
+        chunk_interval: timedelta = KLINE_ROLLUP_INTERVALS["1d"]
+        chunk_start: datetime = floor_to_interval(self._start_time, chunk_interval)
+        while chunk_start < self._end_time:
+            chunk_end: datetime = chunk_start + chunk_interval
+            await self.run_for_chunk(chunk_start, chunk_end)
+            chunk_start = chunk_end
+
+    async def run_for_chunk(self, chunk_start: datetime, chunk_end: datetime) -> None:
+        klines_df: pd.DataFrame = await self._rollup_dao.read_base_klines_frame(
+            self._symbol, chunk_start, chunk_end
+        )
+        if klines_df.empty:
+            logger.info(f"No klines for {self._symbol} between {chunk_start} and {chunk_end}")
+            return
+        async with self._engine.begin() as conn:
+            for interval, interval_duration in KLINE_ROLLUP_INTERVALS.items():
+                rollup_df: pd.DataFrame = resample_klines(klines_df, interval_duration)
+                await self._rollup_dao.upsert_rollup_frame(conn, interval, rollup_df)
+        logger.info(
+            f"Backfilled rollups of {len(klines_df)} klines for {self._symbol} between {chunk_start} and {chunk_end}"
+        )
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    connection_string: str = os.getenv("BINANCE_PG_CONNECTION_STRING", "")
+    backfill: KlineRollupBackfill = KlineRollupBackfill(
+        symbol="BTCUSDC",
+        start_time=datetime(2026, 3, 1),
+        end_time=datetime(2026, 4, 1),
+        rollup_dao=KlineRollupDAO(connection_string),
+        connection_string=connection_string,
+    )
+    asyncio.run(backfill.run())
@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import aclosing
+
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+
+from src.chainstack.asynchronous.solana.get_block import TransactionDetails
+from src.chainstack.asynchronous.solana.get_slot import get_finalized_slot
+from src.dao.pipeline_checkpoint_dao import PipelineCheckpointDAO
+from src.dao.sol_block_dao import SolBlockDAO
+from src.extractors.chain_stack_sol_block_extractor import ChainStackSolBlockExtractor
+from src.models.database_transfer_objects.pipeline_checkpoint import PipelineCheckpointDTO
+from src.models.database_transfer_objects.sol_block import SolBlockDTO, SolTransactionDTO
+from src.utils.adaptive_batch import AdaptiveBatchController, BatchResult
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+load_dotenv()
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+# the pipeline_checkpoint row of the solana tables; its position is the last ingested slot
+SOL_SLOTS_CHECKPOINT: str = "sol_slots"
+
+SolBlockDTOs = tuple[list[SolBlockDTO], list[SolTransactionDTO]]
+
+
+class SolBlockETLPipeline:
+    """
+    Ingests finalized solana blocks from chainstack into postgres, by slot
+
+    Responsible for
+    - listing the slots of every batch which hold a block (getBlocks), so skipped slots cost nothing
+    - fetching every block of a batch concurrently, and converting each one as soon as it arrives
+    - extracting the next batch while the current one is loaded; extraction and loading overlap
+    - loading every batch with COPY, with its end slot as the checkpoint, in a single transaction
+    - running only on the leader replica (PipelineCheckpointDAO.leadership); the others are hot standbys
+    - sizing every batch (in slots) from the weight and commit latency of the last (AdaptiveBatchController)
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        extractor: ChainStackSolBlockExtractor,
+        checkpoint_dao: PipelineCheckpointDAO,
+        block_dao: SolBlockDAO,
+        slots_per_run: int = 10_000,
+        batch_controller: AdaptiveBatchController | None = None,
+    ) -> None:
+        self._engine: AsyncEngine = create_async_engine(connection_string)
+        self._extractor: ChainStackSolBlockExtractor = extractor
+        self._checkpoint_dao: PipelineCheckpointDAO = checkpoint_dao
+        self._block_dao: SolBlockDAO = block_dao
+        self._slots_per_run: int = slots_per_run
+        # a solana block holds ~1000 transactions (vote transactions included); narrow rows, so more per commit
+        self._batch_controller: AdaptiveBatchController = (
+            batch_controller
+            or AdaptiveBatchController(
+                name="chainstack_sol_blocks",
+                initial_batch_size=20,
+                max_batch_size=500,
+                target_transactions=50_000,
+            )
+        )
+
+    async def run(self) -> None:
+        """
+        Entry point of SolBlockETLPipeline
+
+        1. Fetch the latest ingested slot from the sol_slots pipeline checkpoint
+            - the first run starts slots_per_run slots before the finalized slot; older slots are rarely kept by nodes
+        2. Fetch the latest finalized slot
+        3. Extract and Load at most slots_per_run slots, batch by batch
+            - while batch N is loaded, batch N + 1 is already being extracted
+            - every batch, with the checkpoint advanced to its end slot, is a single transaction
+        """
+        try:
+            async with self._checkpoint_dao.leadership() as is_leader:
+                if not is_leader:
+                    logger.info("chainstack_sol_blocks is led by another replica; standing by")
+                    return
+                await self._run_as_leader()
+        finally:
+            await self._extractor.close()
+
+    async def _run_as_leader(self) -> None:
+        finalized_slot: int = await get_finalized_slot()
+        checkpoint: PipelineCheckpointDTO | None = await self._checkpoint_dao.read_checkpoint()
+        start_slot: int = (
+            checkpoint.position + 1
+            if checkpoint is not None
+            else max(finalized_slot - self._slots_per_run + 1, 0)
+        )
+        end_slot: int = min(finalized_slot, start_slot + self._slots_per_run - 1)
+        if start_slot > end_slot:
+            logger.info(f"No new finalized slots after slot {start_slot - 1}")
+            return
+
+        with METRICS.run("chainstack_sol_blocks"):
+            next_batch: tuple[int, asyncio.Task[SolBlockDTOs]] | None = self._schedule_batch(
+                start_slot, end_slot
+            )
+            try:
+                while next_batch is not None:
+                    batch_end_slot, extract_task = next_batch
+                    batch_slots: int = batch_end_slot - start_slot + 1
+                    block_dtos, transaction_dtos = await extract_task
+                    # extract the next batch while this one is loaded
+                    next_batch = self._schedule_batch(batch_end_slot + 1, end_slot)
+                    commit_start_time: float = time.perf_counter()
+                    await self.insert_dtos_and_advance_checkpoint(
+                        block_dtos, transaction_dtos, start_slot, batch_end_slot
+                    )
+                    self._batch_controller.record_batch(
+                        BatchResult(
+                            blocks=batch_slots,
+                            transactions=len(transaction_dtos),
+                            size_bytes=0,  # not measured; sized by transactions and commit latency
+                            commit_seconds=time.perf_counter() - commit_start_time,
+                        )
+                    )
+                    start_slot = batch_end_slot + 1
+            finally:
+                if next_batch is not None:
+                    next_batch[1].cancel()
+
+    def _schedule_batch(
+        self, start_slot: int, end_slot: int
+    ) -> tuple[int, asyncio.Task[SolBlockDTOs]] | None:
+        """
+        starts extracting the next batch of slots from start_slot; returns (its end slot, its extraction)
+        """
+        if start_slot > end_slot:
+            return None
+        batch_end_slot: int = min(start_slot + self._batch_controller.batch_size - 1, end_slot)
+        return batch_end_slot, asyncio.ensure_future(
+            self.extract_and_convert(start_slot, batch_end_slot)
+        )
+
+    async def extract_and_convert(self, start_slot: int, end_slot: int) -> SolBlockDTOs:
+        """
+        the DTOs of every block from start_slot to end_slot (inclusive), in completion order
+        """
+        block_dtos: list[SolBlockDTO] = []
+        transaction_dtos: list[SolTransactionDTO] = []
+        with METRICS.timer("extract"):
+            slots: list[int] = await self._extractor.extract_slots(start_slot, end_slot)
+            skipped_slots: int = end_slot - start_slot + 1 - len(slots)
+            async with aclosing(self._extractor.stream(slots, ordered=False)) as extracted_blocks:
+                async for _, single_block in extracted_blocks:
+                    if single_block.skipped:
+                        # listed by getBlocks, but since cleaned up from the node's ledger
+                        skipped_slots += 1
+                        continue
+                    block_dtos.append(SolBlockDTO.from_block_response(single_block))
+                    transaction_dtos.extend(SolTransactionDTO.from_block_response(single_block))
+        METRICS.increment("blocks", len(block_dtos))
+        METRICS.increment("skipped_slots", skipped_slots)
+        return block_dtos, transaction_dtos
+
+    async def insert_dtos_and_advance_checkpoint(
+        self,
+        sol_block_dtos: list[SolBlockDTO],
+        sol_transaction_dtos: list[SolTransactionDTO],
+        start_slot: int,
+        end_slot: int,
+    ) -> None:
+        async with self._engine.begin() as async_connection:
+            # blocks first; transactions have a foreign key to sol_block.slot
+            # COPY-ed one after the other, as COPY holds the connection
+            await self._block_dao.insert_blocks(
+                async_connection=async_connection, input=sol_block_dtos
+            )
+            await self._block_dao.insert_transactions(
+                async_connection=async_connection, input=sol_transaction_dtos
+            )
+            # the checkpoint only moves if every insert succeeded; CheckpointConflictError rolls the batch back
+            await self._checkpoint_dao.advance(
+                async_connection=async_connection,
+                start_position=start_slot,
+                end_position=end_slot,
+            )
+        # counted once the batch is committed
+        METRICS.increment("rows", len(sol_block_dtos), table="sol_block")
+        METRICS.increment("rows", len(sol_transaction_dtos), table="sol_transaction")
+
+
+def create_etl_pipeline(
+    transaction_details: TransactionDetails = "full",
+) -> SolBlockETLPipeline:
+    """
+    transaction_details (full, signatures or none) is how much of every transaction is fetched and loaded;
+    signatures is several times smaller than full, none loads sol_block only
+    """
+    connection_string: str = os.getenv("CHAIN_STACK_PG_CONNECTION_STRING", "")
+    return SolBlockETLPipeline(
+        connection_string=connection_string,
+        extractor=ChainStackSolBlockExtractor(transaction_details=transaction_details),
+        checkpoint_dao=PipelineCheckpointDAO(
+            connection_string=connection_string, pipeline_name=SOL_SLOTS_CHECKPOINT
+        ),
+        block_dao=SolBlockDAO(),
+    )
+
+
+def trigger_etl_pipeline() -> None:
+    transaction_details: str = os.getenv("SOL_TRANSACTION_DETAILS", "full")
+    if transaction_details not in ("full", "signatures", "none"):
+        raise ValueError(f"Invalid SOL_TRANSACTION_DETAILS: {transaction_details}")
+    asyncio.run(create_etl_pipeline(transaction_details=transaction_details).run())  # type: ignore[arg-type]
+
+
+if __name__ == "__main__":
+    trigger_etl_pipeline()
@@ -1,53 +1,129 @@
 import asyncio
-from typing import Any
+from typing import Any, Callable, TypeVar
 
 import aiohttp
 from dotenv import load_dotenv
 import json
 import os
 
-from retry import retry
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+)
 
 from src.chainstack.exceptions.chainstack_client_error import ChainStackClientError
 from src.models.chain_stack_models.eth_blocks import (
     ChainStackEthBlockInformationResponse,
 )
+from src.utils.http_client import SharedClientSession, client_session, iter_body, read_json
+from src.utils.metrics import METRICS
+from src.utils.streaming_json import StreamingJsonArraySplitter
 
 load_dotenv()
 
+TRANSACTION_OUTPUT = TypeVar("TRANSACTION_OUTPUT")
+# bytes read from the response body at a time, by stream_block_information
+STREAM_CHUNK_SIZE: int = 64 * 1024
+
 
+# tenacity, unlike retry.retry, awaits the coroutine; so failed requests are actually retried
 @retry(
-    exceptions=(aiohttp.ClientError, ChainStackClientError),
-    tries=5,
-    delay=0.1,
-    max_delay=0.3375,
-    backoff=1.5,
-    jitter=(-0.01, 0.01),
+    retry=retry_if_exception_type((aiohttp.ClientError, ChainStackClientError)),
+    wait=wait_exponential(multiplier=0.1, exp_base=1.5, max=0.3375) + wait_random(-0.01, 0.01),
+    stop=stop_after_attempt(5),
+    reraise=True,
+    before_sleep=METRICS.record_retry,
 )
-async def get_block_information(
-    block_number: str,
-) -> ChainStackEthBlockInformationResponse:
+async def get_raw_block_information(
+    block_number: str, full_transactions: bool = True, session: SharedClientSession | None = None
+) -> dict[str, Any]:
+    """
+    returns the eth_getBlockByNumber JSON-RPC response as is, so it can be cached before parsing
+
+    with full_transactions=False, transactions are only returned as hashes; a 50-100x smaller header-only payload
+    """
     url = os.getenv("CHAIN_STACK_URL", "")
     payload: str = json.dumps(
         {
             "method": "eth_getBlockByNumber",
-            "params": [block_number, True],  # set to True
+            "params": [block_number, full_transactions],
             "id": 1,
             "jsonrpc": "2.0",
         }
     )
     headers: dict[str, str] = {"Content-Type": "application/json"}
 
-    async with aiohttp.ClientSession() as client:
+    async with client_session(session) as client:
         async with client.post(url, headers=headers, data=payload) as response:
             if response.status == 200:
-                response_dict: dict[str, Any] = await response.json()
+                response_dict: dict[str, Any] = await read_json(response, provider="chainstack")
             else:
                 # can happen when chainstack server is down
                 raise ChainStackClientError(
                     f"Received non-status code 200: {response.status}"
                 )
 
+    return response_dict
+
+
+@retry(
+    retry=retry_if_exception_type((aiohttp.ClientError, ChainStackClientError)),
+    wait=wait_exponential(multiplier=0.1, exp_base=1.5, max=0.3375) + wait_random(-0.01, 0.01),
+    stop=stop_after_attempt(5),
+    reraise=True,
+    before_sleep=METRICS.record_retry,
+)
+async def stream_block_information(
+    block_number: str,
+    transaction_converter: Callable[[dict[str, Any]], TRANSACTION_OUTPUT],
+    session: SharedClientSession | None = None,
+) -> tuple[dict[str, Any], list[TRANSACTION_OUTPUT]]:
+    """
+    streaming alternative to get_raw_block_information, for very large blocks
+
+    the response body is read incrementally; each transaction is passed to transaction_converter as soon as it is read,
+    so only its output is kept, instead of the whole parsed response
+
+    returns (the response with result.transactions = [], the converted transactions in order)
+    """
+    url = os.getenv("CHAIN_STACK_URL", "")
+    payload: str = json.dumps(
+        {
+            "method": "eth_getBlockByNumber",
+            "params": [block_number, True],
+            "id": 1,
+            "jsonrpc": "2.0",
+        }
+    )
+    headers: dict[str, str] = {"Content-Type": "application/json"}
+    splitter: StreamingJsonArraySplitter = StreamingJsonArraySplitter(
+        array_path=("result", "transactions")
+    )
+    converted_transactions: list[TRANSACTION_OUTPUT] = []
+
+    async with client_session(session) as client:
+        async with client.post(url, headers=headers, data=payload) as response:
+            if response.status != 200:
+                # can happen when chainstack server is down
+                raise ChainStackClientError(
+                    f"Received non-status code 200: {response.status}"
+                )
+            async for chunk in iter_body(response, provider="chainstack", chunk_size=STREAM_CHUNK_SIZE):
+                converted_transactions.extend(
+                    transaction_converter(raw_transaction)
+                    for raw_transaction in splitter.feed(chunk)
+                )
+
+    return splitter.close(), converted_transactions
+
+
+async def get_block_information(
+    block_number: str,
+) -> ChainStackEthBlockInformationResponse:
+    response_dict: dict[str, Any] = await get_raw_block_information(block_number)
     response_model: ChainStackEthBlockInformationResponse = (
         ChainStackEthBlockInformationResponse.from_json(block_number, response_dict)
     )
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import os
+from typing import Any
+
+import aiohttp
+from dotenv import load_dotenv
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+)
+
+from src.chainstack.exceptions.chainstack_client_error import ChainStackClientError
+from src.models.chain_stack_models.eth_receipt import ChainStackEthBlockReceiptsResponse
+from src.utils.http_client import SharedClientSession, client_session, read_json
+from src.utils.metrics import METRICS
+
+load_dotenv()
+
+
+@retry(
+    retry=retry_if_exception_type((aiohttp.ClientError, ChainStackClientError)),
+    wait=wait_exponential(multiplier=0.1, exp_base=1.5, max=0.3375) + wait_random(-0.01, 0.01),
+    stop=stop_after_attempt(5),
+    reraise=True,
+    before_sleep=METRICS.record_retry,
+)
+async def get_raw_block_receipts(
+    block_number: str, session: SharedClientSession | None = None
+) -> dict[str, Any]:
+    """
+    returns the eth_getBlockReceipts JSON-RPC response as is; every receipt of the block, with its logs,
+    in a single call instead of one eth_getTransactionReceipt per transaction
+    """
+    url: str = os.getenv("CHAIN_STACK_URL", "")
+    payload: str = json.dumps(
+        {
+            "method": "eth_getBlockReceipts",
+            "params": [block_number],
+            "id": 1,
+            "jsonrpc": "2.0",
+        }
+    )
+    headers: dict[str, str] = {"Content-Type": "application/json"}
+
+    async with client_session(session) as client:
+        async with client.post(url, headers=headers, data=payload) as response:
+            if response.status == 200:
+                response_dict: dict[str, Any] = await read_json(response, provider="chainstack")
+            else:
+                # can happen when chainstack server is down
+                raise ChainStackClientError(
+                    f"Received non-status code 200: {response.status}"
+                )
+
+    return response_dict
+
+
+async def get_block_receipts(block_number: str) -> ChainStackEthBlockReceiptsResponse:
+    response_dict: dict[str, Any] = await get_raw_block_receipts(block_number)
+    return ChainStackEthBlockReceiptsResponse.from_json(block_number, response_dict)
+
+
+if __name__ == "__main__":
+    block_receipts: ChainStackEthBlockReceiptsResponse = asyncio.run(
+        get_block_receipts(hex(20846330))
+    )
+    print(len(block_receipts.result))
@@ -0,0 +1,78 @@
+import asyncio
+import json
+import os
+from typing import Any
+
+import aiohttp
+from dotenv import load_dotenv
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+)
+
+from src.chainstack.exceptions.chainstack_client_error import ChainStackClientError
+from src.models.chain_stack_models.eth_fee_history import ChainStackEthFeeHistoryResponse
+from src.utils.http_client import SharedClientSession, client_session, read_json
+from src.utils.metrics import METRICS
+
+load_dotenv()
+
+# nodes serve at most 1024 blocks of fee history per call
+MAX_FEE_HISTORY_BLOCKS: int = 1024
+
+
+@retry(
+    retry=retry_if_exception_type((aiohttp.ClientError, ChainStackClientError)),
+    wait=wait_exponential(multiplier=0.1, exp_base=1.5, max=0.3375) + wait_random(-0.01, 0.01),
+    stop=stop_after_attempt(5),
+    reraise=True,
+    before_sleep=METRICS.record_retry,
+)
+async def get_raw_fee_history(
+    block_count: int, newest_block: str, session: SharedClientSession | None = None
+) -> dict[str, Any]:
+    """
+    returns the eth_feeHistory JSON-RPC response as is, for the block_count blocks up to newest_block (inclusive);
+    the base fee and blob base fee of every block, without reward percentiles
+    """
+    if not 1 <= block_count <= MAX_FEE_HISTORY_BLOCKS:
+        raise ValueError(f"block_count must be between 1 and {MAX_FEE_HISTORY_BLOCKS}")
+    url: str = os.getenv("CHAIN_STACK_URL", "")
+    payload: str = json.dumps(
+        {
+            "method": "eth_feeHistory",
+            "params": [hex(block_count), newest_block, []],
+            "id": 1,
+            "jsonrpc": "2.0",
+        }
+    )
+    headers: dict[str, str] = {"Content-Type": "application/json"}
+
+    async with client_session(session) as client:
+        async with client.post(url, headers=headers, data=payload) as response:
+            if response.status == 200:
+                response_dict: dict[str, Any] = await read_json(response, provider="chainstack")
+            else:
+                # can happen when chainstack server is down
+                raise ChainStackClientError(
+                    f"Received non-status code 200: {response.status}"
+                )
+
+    return response_dict
+
+
+async def get_fee_history(
+    block_count: int, newest_block: str, session: SharedClientSession | None = None
+) -> ChainStackEthFeeHistoryResponse:
+    response_dict: dict[str, Any] = await get_raw_fee_history(block_count, newest_block, session)
+    return ChainStackEthFeeHistoryResponse.from_json(response_dict)
+
+
+if __name__ == "__main__":
+    fee_history: ChainStackEthFeeHistoryResponse = asyncio.run(
+        get_fee_history(5, hex(20846334))
+    )
+    print(fee_history.result.baseFeePerBlobGas)
@@ -1,13 +1,94 @@
+import asyncio
 import json
 import os
-from typing import Any
+from typing import Any, Literal
+
 import aiohttp
-import asyncio
-import dotenv
-from retry import retry
+from dotenv import load_dotenv
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+)
 
 from src.chainstack.exceptions.chainstack_client_error import ChainStackClientError
+from src.models.chain_stack_models.sol_block import (
+    SKIPPED_SLOT_ERROR_CODES,
+    ChainStackSolBlockResponse,
+)
+from src.utils.http_client import SharedClientSession, client_session, read_json
+from src.utils.metrics import METRICS
+
+load_dotenv()
+
+# full: every transaction with its status metadata; signatures: only their signatures; none: only the block
+TransactionDetails = Literal["full", "signatures", "none"]
+
+
+@retry(
+    retry=retry_if_exception_type((aiohttp.ClientError, ChainStackClientError)),
+    wait=wait_exponential(multiplier=0.1, exp_base=1.5, max=0.3375) + wait_random(-0.01, 0.01),
+    stop=stop_after_attempt(5),
+    reraise=True,
+    before_sleep=METRICS.record_retry,
+)
+async def get_raw_block(
+    slot: int, transaction_details: TransactionDetails = "full", session: SharedClientSession | None = None
+) -> dict[str, Any]:
+    """
+    returns the getBlock JSON-RPC response as is
+
+    a skipped slot is answered with an error, not a block; it's returned as is, rather than retried
+    rewards are never requested, and transactions are json encoded (the smallest encoding holding signatures)
+    """
+    url: str = os.getenv("CHAIN_STACK_SOL_URL", "")
+    payload: str = json.dumps(
+        {
+            "method": "getBlock",
+            "params": [
+                slot,
+                {
+                    "encoding": "json",
+                    "transactionDetails": transaction_details,
+                    "rewards": False,
+                    "maxSupportedTransactionVersion": 0,
+                    "commitment": "finalized",
+                },
+            ],
+            "id": 1,
+            "jsonrpc": "2.0",
+        }
+    )
+    headers: dict[str, str] = {"Content-Type": "application/json"}
+
+    async with client_session(session) as client:
+        async with client.post(url, headers=headers, data=payload) as response:
+            if response.status == 200:
+                response_dict: dict[str, Any] = await read_json(
+                    response, provider="chainstack_solana"
+                )
+            else:
+                # can happen when chainstack server is down
+                raise ChainStackClientError(
+                    f"Received non-status code 200: {response.status}"
+                )
+
+    error: dict[str, Any] | None = response_dict.get("error")
+    if error is not None and error.get("code") not in SKIPPED_SLOT_ERROR_CODES:
+        # e.g -32004, block not available for slot yet
+        raise ChainStackClientError(f"getBlock failed for slot {slot}: {error}")
+    return response_dict
+
+
+async def get_block(
+    slot: int, transaction_details: TransactionDetails = "full", session: SharedClientSession | None = None
+) -> ChainStackSolBlockResponse:
+    response_dict: dict[str, Any] = await get_raw_block(slot, transaction_details, session)
+    return ChainStackSolBlockResponse.from_json(slot, response_dict)
 
-dotenv.load_dotenv()
 
-async def get_block()
\ No newline at end of file
+if __name__ == "__main__":
+    block: ChainStackSolBlockResponse = asyncio.run(get_block(300_000_000, "signatures"))
+    print(block.result.blockhash if block.result is not None else "skipped")
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import os
+from typing import Any
+
+import aiohttp
+from dotenv import load_dotenv
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+)
+
+from src.chainstack.exceptions.chainstack_client_error import ChainStackClientError
+from src.utils.http_client import SharedClientSession, client_session, read_json
+from src.utils.metrics import METRICS
+
+load_dotenv()
+
+# nodes serve at most 500,000 slots per getBlocks call
+MAX_GET_BLOCKS_SLOTS: int = 500_000
+
+
+@retry(
+    retry=retry_if_exception_type((aiohttp.ClientError, ChainStackClientError)),
+    wait=wait_exponential(multiplier=0.1, exp_base=1.5, max=0.3375) + wait_random(-0.01, 0.01),
+    stop=stop_after_attempt(5),
+    reraise=True,
+    before_sleep=METRICS.record_retry,
+)
+async def get_blocks(
+    start_slot: int, end_slot: int, session: SharedClientSession | None = None
+) -> list[int]:
+    """
+    the slots from start_slot to end_slot (inclusive) which hold a finalized block, in ascending order
+
+    a single call tells which slots were skipped, so none of them cost a getBlock call
+    """
+    if not 0 <= end_slot - start_slot < MAX_GET_BLOCKS_SLOTS:
+        raise ValueError(f"a getBlocks range must hold between 1 and {MAX_GET_BLOCKS_SLOTS} slots")
+    url: str = os.getenv("CHAIN_STACK_SOL_URL", "")
+    payload: str = json.dumps(
+        {
+            "method": "getBlocks",
+            "params": [start_slot, end_slot, {"commitment": "finalized"}],
+            "id": 1,
+            "jsonrpc": "2.0",
+        }
+    )
+    headers: dict[str, str] = {"Content-Type": "application/json"}
+
+    async with client_session(session) as client:
+        async with client.post(url, headers=headers, data=payload) as response:
+            if response.status == 200:
+                response_dict: dict[str, Any] = await read_json(
+                    response, provider="chainstack_solana"
+                )
+            else:
+                # can happen when chainstack server is down
+                raise ChainStackClientError(
+                    f"Received non-status code 200: {response.status}"
+                )
+
+    if "result" not in response_dict:
+        raise ChainStackClientError(
+            f"getBlocks failed for slots {start_slot} to {end_slot}: {response_dict.get('error')}"
+        )
+    return response_dict["result"]
+
+
+if __name__ == "__main__":
+    print(asyncio.run(get_blocks(300_000_000, 300_000_100)))
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import os
+from typing import Any
+
+import aiohttp
+from dotenv import load_dotenv
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+)
+
+from src.chainstack.exceptions.chainstack_client_error import ChainStackClientError
+from src.utils.http_client import SharedClientSession, client_session, read_json
+from src.utils.metrics import METRICS
+
+load_dotenv()
+
+
+@retry(
+    retry=retry_if_exception_type((aiohttp.ClientError, ChainStackClientError)),
+    wait=wait_exponential(multiplier=0.1, exp_base=1.5, max=0.3375) + wait_random(-0.01, 0.01),
+    stop=stop_after_attempt(5),
+    reraise=True,
+    before_sleep=METRICS.record_retry,
+)
+async def get_finalized_slot(session: SharedClientSession | None = None) -> int:
+    """
+    the latest finalized slot; slots up to it will never be rolled back
+    """
+    url: str = os.getenv("CHAIN_STACK_SOL_URL", "")
+    payload: str = json.dumps(
+        {
+            "method": "getSlot",
+            "params": [{"commitment": "finalized"}],
+            "id": 1,
+            "jsonrpc": "2.0",
+        }
+    )
+    headers: dict[str, str] = {"Content-Type": "application/json"}
+
+    async with client_session(session) as client:
+        async with client.post(url, headers=headers, data=payload) as response:
+            if response.status == 200:
+                response_dict: dict[str, Any] = await read_json(
+                    response, provider="chainstack_solana"
+                )
+            else:
+                # can happen when chainstack server is down
+                raise ChainStackClientError(
+                    f"Received non-status code 200: {response.status}"
+                )
+
+    if "result" not in response_dict:
+        raise ChainStackClientError(f"getSlot failed: {response_dict.get('error')}")
+    return response_dict["result"]
+
+
+if __name__ == "__main__":
+    print(asyncio.run(get_finalized_slot()))
@@ -0,0 +1,238 @@
+import asyncio
+import datetime
+import hashlib
+import logging
+import os
+import tempfile
+from contextlib import aclosing
+
+import pyarrow.parquet as pq
+from dotenv import load_dotenv
+
+from database_management.binance.binance_table import binance_klines_prices_table
+from database_management.chainstack.tables import (
+    eth_transaction_access_list_table,
+    eth_transaction_table,
+)
+from src.dao.archive_dao import (
+    ArchiveDAO,
+    ArchiveRange,
+    ArchiveSlice,
+    ArchiveVerificationError,
+)
+from src.dao.pipeline_checkpoint_dao import PipelineCheckpointDAO
+from src.eth_block_etl_pipeline import ETH_BLOCKS_CHECKPOINT
+from src.file_explorer.s3_file_explorer import S3Explorer
+from src.models.database_transfer_objects.archive_catalog import ArchiveCatalogEntryDTO
+from src.models.database_transfer_objects.pipeline_checkpoint import PipelineCheckpointDTO
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+from src.utils.parquet_archive import (
+    PARQUET_FOOTER_READ_SIZE,
+    archive_s3_path,
+    parquet_footer_size,
+    parquet_metadata_of_footer,
+    sha256_of_file,
+)
+
+load_dotenv()
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+
+def eth_transactions_archive_range(start_block_number: int, end_block_number: int) -> ArchiveRange:
+    """
+    the transactions of blocks start_block_number to end_block_number (inclusive), with their access lists;
+    eth_blocks itself stays in postgres
+    """
+    # block numbers are stored as hex strings; a range is a list of them
+    params: dict[str, list[str]] = {
+        "block_numbers": [
+            hex(block_number) for block_number in range(start_block_number, end_block_number + 1)
+        ]
+    }
+    return ArchiveRange(
+        partition_key=f"block_range={start_block_number}-{end_block_number}",
+        slices=[
+            ArchiveSlice(
+                eth_transaction_access_list_table,
+                "transaction_hash IN "
+                "(SELECT hash FROM eth_transactions WHERE block_number = ANY(:block_numbers))",
+                params,
+            ),
+            ArchiveSlice(eth_transaction_table, "block_number = ANY(:block_numbers)", params),
+        ],
+    )
+
+
+def kline_month_bounds(year: int, month: int) -> tuple[datetime.datetime, datetime.datetime]:
+    """
+    the open times [month start, next month start) of the klines of a month
+    """
+    return datetime.datetime(year, month, 1), datetime.datetime(year + month // 12, month % 12 + 1, 1)
+
+
+def archived_kline_month(partition_key: str) -> tuple[datetime.datetime, datetime.datetime]:
+    """
+    the open times of an archived kline month, from its partition key; e.g month=2024-01
+    """
+    year, month = partition_key.removeprefix("month=").split("-")
+    return kline_month_bounds(int(year), int(month))
+
+
+def kline_month_archive_range(year: int, month: int) -> ArchiveRange:
+    """
+    the 1m klines of every symbol opened in the month; the rollup tables stay in postgres
+    """
+    month_start, next_month_start = kline_month_bounds(year, month)
+    return ArchiveRange(
+        partition_key=f"month={year:04d}-{month:02d}",
+        slices=[
+            ArchiveSlice(
+                binance_klines_prices_table,
+                "kline_open_time >= :month_start AND kline_open_time < :next_month_start",
+                {"month_start": month_start, "next_month_start": next_month_start},
+            )
+        ],
+    )
+
+
+class ColdStorageArchiver:
+    """
+    Moves closed ranges of rows from postgres to parquet in s3
+
+    Steps, for each table of an archive range
+    1. Stream its rows into a local parquet file, record batch by record batch
+    2. Upload the file to s3, in the hive style partition of its range (archive_s3_path)
+    3. Verify the uploaded object: its sha256, streamed back chunk by chunk, and its row count, from its parquet footer
+
+    Then a single transaction deletes the range from postgres, and records it in archive_catalog;
+    rolled back unless exactly the rows exported are deleted. An archived range is skipped, so a failed run is re-run as is
+    """
+
+    def __init__(
+        self, archive_dao: ArchiveDAO, s3_explorer: S3Explorer, chunk_size: int = 50_000
+    ) -> None:
+        self._archive_dao: ArchiveDAO = archive_dao
+        self._s3_explorer: S3Explorer = s3_explorer
+        self._chunk_size: int = chunk_size
+
+    async def archive(self, archive_range: ArchiveRange) -> None:
+        if await self._archive_dao.read_archived_tables(archive_range.partition_key):
+            logger.info(f"{archive_range.partition_key} is already archived")
+            return
+        with METRICS.run("cold_storage_archival"):
+            entries: list[ArchiveCatalogEntryDTO] = [
+                await self._export(archive_slice, archive_range.partition_key)
+                for archive_slice in archive_range.slices
+            ]
+            await self._archive_dao.delete_and_catalog(archive_range, entries)
+
+    async def _export(
+        self, archive_slice: ArchiveSlice, partition_key: str
+    ) -> ArchiveCatalogEntryDTO:
+        table_name: str = archive_slice.table.name
+        s3_path: str = archive_s3_path(table_name, partition_key)
+        row_count: int = 0
+        with tempfile.TemporaryDirectory() as local_directory:
+            local_file_path: str = os.path.join(local_directory, f"{table_name}.parquet")
+            with METRICS.timer("archive_export"):
+                with pq.ParquetWriter(
+                    local_file_path, archive_slice.schema, compression="zstd"
+                ) as parquet_writer:
+                    async with aclosing(
+                        self._archive_dao.stream_record_batches(archive_slice, self._chunk_size)
+                    ) as record_batches:
+                        async for record_batch in record_batches:
+                            parquet_writer.write_batch(record_batch)
+                            row_count += record_batch.num_rows
+            sha256: str = sha256_of_file(local_file_path)
+            # boto3 is blocking
+            await asyncio.to_thread(self._s3_explorer.upload_file, local_file_path, s3_path)
+        await asyncio.to_thread(self._verify, s3_path, row_count, sha256)
+        METRICS.increment("rows", row_count, table=table_name, direction="archive")
+        return ArchiveCatalogEntryDTO(
+            table_name=table_name,
+            partition_key=partition_key,
+            s3_path=s3_path,
+            row_count=row_count,
+            sha256=sha256,
+            archived_at=datetime.datetime.utcnow(),
+        )
+
+    def _verify(self, s3_path: str, row_count: int, sha256: str) -> None:
+        """
+        memory is bounded by a chunk of the object, and its footer; never the whole object
+        """
+        digest = hashlib.sha256()
+        for chunk in self._s3_explorer.iter_object(s3_path):
+            digest.update(chunk)
+        archived_sha256: str = digest.hexdigest()
+        if archived_sha256 != sha256:
+            raise ArchiveVerificationError(
+                f"{s3_path} has sha256 {archived_sha256}, {sha256} was uploaded"
+            )
+        tail: bytes = self._s3_explorer.read_tail(s3_path, PARQUET_FOOTER_READ_SIZE)
+        if parquet_footer_size(tail) > len(tail):
+            # a footer larger than PARQUET_FOOTER_READ_SIZE, e.g of very many row groups
+            tail = self._s3_explorer.read_tail(s3_path, parquet_footer_size(tail))
+        archived_row_count: int = parquet_metadata_of_footer(tail).num_rows
+        if archived_row_count != row_count:
+            raise ArchiveVerificationError(
+                f"{s3_path} has {archived_row_count} rows, {row_count} were exported"
+            )
+
+
+def create_s3_explorer() -> S3Explorer:
+    return S3Explorer(
+        bucket_name=os.getenv("AWS_S3_BUCKET", ""),
+        endpoint_url=os.getenv("AWS_S3_ENDPOINT", ""),
+        access_key_id=os.getenv("AWS_ACCESS_KEY_ID", ""),
+        secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", ""),
+    )
+
+
+async def archive_eth_transactions(start_block_number: int, end_block_number: int) -> None:
+    """
+    only blocks behind the eth_blocks checkpoint are closed; the pipeline still writes into any later one
+    """
+    connection_string: str = os.getenv("CHAIN_STACK_PG_CONNECTION_STRING", "")
+    checkpoint: PipelineCheckpointDTO | None = await PipelineCheckpointDAO(
+        connection_string=connection_string, pipeline_name=ETH_BLOCKS_CHECKPOINT
+    ).read_checkpoint()
+    if checkpoint is None or end_block_number > checkpoint.position:
+        raise ValueError(
+            f"Blocks up to {end_block_number} are not all ingested yet; checkpoint: {checkpoint}"
+        )
+    archiver: ColdStorageArchiver = ColdStorageArchiver(
+        archive_dao=ArchiveDAO(connection_string), s3_explorer=create_s3_explorer()
+    )
+    await archiver.archive(eth_transactions_archive_range(start_block_number, end_block_number))
+
+
+async def archive_kline_month(year: int, month: int) -> None:
+    """
+    only past months are closed
+    """
+    archive_range: ArchiveRange = kline_month_archive_range(year, month)
+    next_month_start: datetime.datetime = archive_range.slices[0].params["next_month_start"]
+    if next_month_start > datetime.datetime.utcnow():
+        raise ValueError(f"{year:04d}-{month:02d} is not over yet")
+    archiver: ColdStorageArchiver = ColdStorageArchiver(
+        archive_dao=ArchiveDAO(os.getenv("BINANCE_PG_CONNECTION_STRING", "")),
+        s3_explorer=create_s3_explorer(),
+    )
+    await archiver.archive(archive_range)
+
+
+def trigger_eth_transactions_archival(start_block_number: int, end_block_number: int) -> None:
+    asyncio.run(archive_eth_transactions(start_block_number, end_block_number))
+
+
+def trigger_kline_month_archival(year: int, month: int) -> None:
+    asyncio.run(archive_kline_month(year, month))
+
+
+if __name__ == "__main__":
+    trigger_kline_month_archival(2025, 1)
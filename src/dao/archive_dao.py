@@ -0,0 +1,154 @@
+import logging
+from typing import Any, AsyncGenerator, Sequence
+
+import pyarrow as pa
+from sqlalchemy import CursorResult, Table, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncResult, create_async_engine
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+
+from src.models.database_transfer_objects.archive_catalog import ArchiveCatalogEntryDTO
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+from src.utils.parquet_archive import arrow_schema_of, rows_to_record_batch
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+
+class ArchiveVerificationError(Exception):
+    """
+    an archived file, or the rows deleted after it, don't match the rows exported
+    """
+
+    pass
+
+
+class ArchiveSlice:
+    """
+    the rows of a single table in an archive range: SELECT ... FROM table WHERE where_clause
+    """
+
+    def __init__(self, table: Table, where_clause: str, params: dict[str, Any]) -> None:
+        self.table: Table = table
+        self.where_clause: str = where_clause
+        self.params: dict[str, Any] = params
+        self.schema: pa.Schema = arrow_schema_of(table)
+
+
+class ArchiveRange:
+    """
+    a closed range of rows, archived (and deleted) as a whole, e.g the transactions of blocks 19000000 to 19099999
+
+    slices are in deletion order: tables referencing another first
+    """
+
+    def __init__(self, partition_key: str, slices: Sequence[ArchiveSlice]) -> None:
+        self.partition_key: str = partition_key
+        self.slices: Sequence[ArchiveSlice] = slices
+
+
+class ArchiveDAO:
+    """
+    DAO responsible for moving archive ranges out of postgres
+
+    Responsible for
+    - reading the archive_catalog; which ranges of which tables are already archived, and where
+    - streaming the rows of an archive slice as arrow record batches, through a server-side cursor
+    - deleting an archived range, and cataloging it, in a single transaction; rolled back unless exactly the rows
+      exported are deleted
+
+    Table: archive_catalog, and the archived tables
+    """
+
+    def __init__(self, connection_string: str) -> None:
+        self._engine: AsyncEngine = create_async_engine(connection_string)
+
+    @retry(
+        retry=retry_if_exception_type(SQLAlchemyError),
+        wait=wait_exponential(multiplier=0.1, exp_base=1.5, max=0.3375),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def read_archived_tables(self, partition_key: str) -> set[str]:
+        async with self._engine.begin() as async_conn:
+            cursor_result: CursorResult = await async_conn.execute(
+                text("SELECT table_name FROM archive_catalog WHERE partition_key = :partition_key"),
+                {"partition_key": partition_key},
+            )
+        return set(cursor_result.scalars())
+
+    @retry(
+        retry=retry_if_exception_type(SQLAlchemyError),
+        wait=wait_exponential(multiplier=0.1, exp_base=1.5, max=0.3375),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def read_archived_partitions(self, table_name: str) -> list[str]:
+        """
+        the partition keys of every archived range of table_name, e.g month=2024-01
+        """
+        async with self._engine.begin() as async_conn:
+            cursor_result: CursorResult = await async_conn.execute(
+                text(
+                    "SELECT partition_key FROM archive_catalog WHERE table_name = :table_name "
+                    "ORDER BY partition_key"
+                ),
+                {"table_name": table_name},
+            )
+        return list(cursor_result.scalars())
+
+    async def stream_record_batches(
+        self, archive_slice: ArchiveSlice, chunk_size: int = 50_000
+    ) -> AsyncGenerator[pa.RecordBatch, None]:
+        """
+        the rows of archive_slice, in primary key order, chunk_size rows per record batch
+        """
+        column_list: str = ", ".join(column.name for column in archive_slice.table.columns)
+        order_by: str = ", ".join(column.name for column in archive_slice.table.primary_key.columns)
+        async with self._engine.begin() as async_conn:
+            async_result: AsyncResult = await async_conn.stream(
+                text(
+                    f"SELECT {column_list} FROM {archive_slice.table.name} "
+                    f"WHERE {archive_slice.where_clause} ORDER BY {order_by}"
+                ),
+                archive_slice.params,
+            )
+            async for rows in async_result.partitions(chunk_size):
+                yield rows_to_record_batch(archive_slice.schema, rows)
+
+    @METRICS.timed("delete_archived_range")
+    async def delete_and_catalog(
+        self, archive_range: ArchiveRange, entries: Sequence[ArchiveCatalogEntryDTO]
+    ) -> None:
+        """
+        entries are the catalog entries of archive_range's slices, one per slice
+        """
+        entry_by_table: dict[str, ArchiveCatalogEntryDTO] = {
+            entry.table_name: entry for entry in entries
+        }
+        async with self._engine.begin() as async_conn:
+            for archive_slice in archive_range.slices:
+                entry: ArchiveCatalogEntryDTO = entry_by_table[archive_slice.table.name]
+                cursor_result: CursorResult = await async_conn.execute(
+                    text(
+                        f"DELETE FROM {archive_slice.table.name} WHERE {archive_slice.where_clause}"
+                    ),
+                    archive_slice.params,
+                )
+                # e.g a replayed batch wrote into the range after it was exported
+                if cursor_result.rowcount != entry.row_count:
+                    raise ArchiveVerificationError(
+                        f"{entry.row_count} rows of {entry.table_name} archived to {entry.s3_path}, "
+                        f"but {cursor_result.rowcount} rows in postgres"
+                    )
+            await async_conn.execute(
+                text(
+                    "INSERT INTO archive_catalog(table_name, partition_key, s3_path, row_count, sha256, archived_at) "
+                    "VALUES (:table_name, :partition_key, :s3_path, :row_count, :sha256, :archived_at)"
+                ),
+                [entry.model_dump() for entry in entries],
+            )
+        logger.info(f"Archived {archive_range.partition_key} of {list(entry_by_table)}")
@@ -20,6 +20,7 @@ from sqlalchemy.dialects.postgresql import insert, Insert
 from database_management.binance.binance_table import provider_to_s3_import_status_table
 from src.models.database_transfer_objects.binance_to_s3_import_status import BinanceToS3ImportStatusDTO
 from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
 
 logger = logging.getLogger(__name__)
 setup_logging(logger)
@@ -30,10 +31,12 @@ class ProviderToS3ImportStatusDAO:
         self._engine: AsyncEngine = create_async_engine(connection_string)
         self._table: Table = provider_to_s3_import_status_table
 
+    @METRICS.timed("insert_provider_to_s3_import_status")
     @retry(
         wait=wait_fixed(0.01),
         stop=stop_after_attempt(5),
         reraise=True,
+        before_sleep=METRICS.record_retry,
     )
     async def insert_latest_import_status(self, import_status: BinanceToS3ImportStatusDTO) -> None:
         # values take in a dict, hence the need to convert the dto to a dict
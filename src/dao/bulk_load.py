@@ -0,0 +1,214 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Sequence
+
+from sqlalchemy import ForeignKeyConstraint, Index, Table, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.schema import CreateIndex
+
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+# resets a checkpoint of the tables (e.g PipelineCheckpointDAO.reset), within the given transaction;
+# returns whether there was one to reset
+CheckpointReset = Callable[[AsyncConnection], Awaitable[bool]]
+
+
+def foreign_keys_of(tables: Sequence[Table]) -> list[ForeignKeyConstraint]:
+    """
+    every named foreign key of the tables, or referencing them from another table of their metadata
+
+    both have to go; postgres refuses to change the logged status of a table referenced by, or referencing, another
+    """
+    table_names: set[str] = {table.name for table in tables}
+    metadata_tables: list[Table] = list(tables[0].metadata.tables.values()) if tables else []
+    return sorted(
+        (
+            foreign_key
+            for table in metadata_tables
+            for foreign_key in table.foreign_key_constraints
+            if foreign_key.name is not None
+            and (table.name in table_names or foreign_key.referred_table.name in table_names)
+        ),
+        key=lambda foreign_key: str(foreign_key.name),
+    )
+
+
+def indexes_of(tables: Sequence[Table]) -> list[Index]:
+    """
+    every secondary index of the tables; primary keys are kept, ON CONFLICT needs them
+    """
+    return sorted(
+        (index for table in tables for index in table.indexes),
+        key=lambda index: str(index.name),
+    )
+
+
+def create_index_sql(index: Index) -> str:
+    return str(CreateIndex(index, if_not_exists=True).compile(dialect=postgresql.dialect()))
+
+
+def add_foreign_key_sql(foreign_key: ForeignKeyConstraint) -> str:
+    """
+    NOT VALID: existing rows are checked later, by VALIDATE CONSTRAINT, without blocking writes
+    """
+    columns: str = ", ".join(column.name for column in foreign_key.columns)
+    referred_columns: str = ", ".join(element.column.name for element in foreign_key.elements)
+    return (
+        f"ALTER TABLE {foreign_key.parent.name} ADD CONSTRAINT {foreign_key.name} "
+        f"FOREIGN KEY ({columns}) REFERENCES {foreign_key.referred_table.name} ({referred_columns}) NOT VALID"
+    )
+
+
+class BulkLoadMode:
+    """
+    Switches tables into a bulk load mode for large historical backfills, and back
+
+    Responsible for
+    - enter: dropping the foreign keys and secondary indexes of the tables, then SET UNLOGGED;
+      every row loaded meanwhile skips the foreign key checks, the index maintenance and the WAL
+    - exit: SET LOGGED, rebuilding the indexes in parallel (a connection each), re-adding the foreign keys as NOT VALID,
+      validating them in parallel, then ANALYZE
+
+    Indexes and foreign keys are rebuilt from the sqlalchemy tables, not from what was dropped; so exit only creates
+    what is missing, and can be re-run as is after a crashed backfill
+
+    A postgres crash empties every unlogged table, including the rows they held before the backfill; but the
+    checkpoints committed with those rows (e.g pipeline_checkpoint, s3_import_status) are logged, and survive
+    so on enter, and again on exit, if every table is empty, checkpoint_resets are run, in the same transaction;
+    the next run then reloads everything, instead of resuming past rows which are gone
+    (an empty table can only be emptied this way, or never have been loaded; resetting is right for both)
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        tables: Sequence[Table],
+        parallelism: int = 4,
+        maintenance_work_mem: str = "1GB",
+        checkpoint_resets: Sequence[CheckpointReset] = (),
+    ) -> None:
+        self._engine: AsyncEngine = create_async_engine(connection_string)
+        self._tables: Sequence[Table] = tables
+        self._checkpoint_resets: Sequence[CheckpointReset] = checkpoint_resets
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(parallelism)
+        self._maintenance_work_mem: str = maintenance_work_mem
+
+    @asynccontextmanager
+    async def bulk_load(self) -> AsyncIterator[None]:
+        """
+        the tables are in bulk load mode inside the block; always switched back, so no table is left unlogged
+        """
+        await self.enter()
+        try:
+            yield
+        finally:
+            await self.exit()
+
+    async def enter(self) -> None:
+        with METRICS.timer("bulk_load_enter"):
+            # e.g the previous bulk load crashed, and never exited
+            await self.reset_checkpoints_if_emptied()
+            async with self._engine.begin() as async_connection:
+                for foreign_key in foreign_keys_of(self._tables):
+                    await async_connection.execute(
+                        text(
+                            f"ALTER TABLE {foreign_key.parent.name} "
+                            f"DROP CONSTRAINT IF EXISTS {foreign_key.name}"
+                        )
+                    )
+                for index in indexes_of(self._tables):
+                    await async_connection.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+                for table in self._tables:
+                    await async_connection.execute(text(f"ALTER TABLE {table.name} SET UNLOGGED"))
+        logger.info(f"Bulk load mode on for {[table.name for table in self._tables]}")
+
+    async def exit(self) -> None:
+        with METRICS.timer("bulk_load_exit"):
+            # every table is rewritten into the WAL once, instead of row by row
+            await asyncio.gather(
+                *[
+                    self._execute(f"ALTER TABLE {table.name} SET LOGGED")
+                    for table in self._tables
+                ]
+            )
+            await asyncio.gather(
+                *[
+                    self._execute(
+                        create_index_sql(index),
+                        f"SET LOCAL maintenance_work_mem = '{self._maintenance_work_mem}'",
+                    )
+                    for index in indexes_of(self._tables)
+                ]
+            )
+            missing_foreign_keys: list[ForeignKeyConstraint] = await self._missing_foreign_keys()
+            async with self._engine.begin() as async_connection:
+                for foreign_key in missing_foreign_keys:
+                    await async_connection.execute(text(add_foreign_key_sql(foreign_key)))
+            # VALIDATE CONSTRAINT only takes a SHARE UPDATE EXCLUSIVE lock; tables stay readable and writable
+            await asyncio.gather(
+                *[
+                    self._execute(
+                        f"ALTER TABLE {foreign_key.parent.name} VALIDATE CONSTRAINT {foreign_key.name}"
+                    )
+                    for foreign_key in foreign_keys_of(self._tables)
+                ]
+            )
+            await asyncio.gather(*[self._execute(f"ANALYZE {table.name}") for table in self._tables])
+            # e.g postgres crashed during this bulk load
+            await self.reset_checkpoints_if_emptied()
+        logger.info(f"Bulk load mode off for {[table.name for table in self._tables]}")
+
+    async def reset_checkpoints_if_emptied(self) -> bool:
+        """
+        runs every checkpoint reset if every table is empty; returns whether any checkpoint was reset
+        """
+        if not self._checkpoint_resets:
+            return False
+        async with self._engine.begin() as async_connection:
+            for table in self._tables:
+                if (
+                    await async_connection.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table.name})"))
+                ).scalar_one():
+                    return False
+            reset: list[bool] = [
+                await checkpoint_reset(async_connection) for checkpoint_reset in self._checkpoint_resets
+            ]
+        if not any(reset):
+            # e.g an initial backfill
+            return False
+        logger.warning(
+            f"{[table.name for table in self._tables]} are empty, e.g emptied by a crash in bulk load mode; "
+            "their checkpoints were reset"
+        )
+        return True
+
+    async def _missing_foreign_keys(self) -> list[ForeignKeyConstraint]:
+        async with self._engine.begin() as async_connection:
+            existing_names: set[str] = set(
+                (
+                    await async_connection.execute(
+                        text("SELECT conname FROM pg_constraint WHERE contype = 'f'")
+                    )
+                ).scalars()
+            )
+        return [
+            foreign_key
+            for foreign_key in foreign_keys_of(self._tables)
+            if foreign_key.name not in existing_names
+        ]
+
+    async def _execute(self, statement: str, *settings: str) -> None:
+        """
+        runs statement in its own transaction (and connection), at most parallelism at a time
+        """
+        async with self._semaphore:
+            async with self._engine.begin() as async_connection:
+                for setting in settings:
+                    await async_connection.execute(text(setting))
+                await async_connection.execute(text(statement))
@@ -0,0 +1,43 @@
+import uuid
+from typing import Any, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def copy_records_into_table(
+    async_connection: AsyncConnection,
+    table_name: str,
+    columns: Sequence[str],
+    records: Sequence[tuple[Any, ...]],
+) -> None:
+    """
+    bulk inserts records (tuples in columns order) into table_name, within async_connection's transaction
+
+    1. records are COPY-ed (binary) into a temporary table, dropped on commit
+    2. INSERT INTO table_name SELECT FROM the temporary table, skipping existing rows
+
+    COPY skips the per-row parse / plan of an executemany INSERT; ON CONFLICT keeps re-ingestion idempotent
+    """
+    if not records:
+        return
+    # unique, so 2 tables can be copied concurrently on the same transaction
+    temp_table_name: str = f"temp_{table_name}_{uuid.uuid4().hex}"
+    column_list: str = ", ".join(columns)
+    await async_connection.execute(
+        text(
+            f"CREATE TEMPORARY TABLE {temp_table_name} "
+            f"(LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+    )
+    dbapi_pooled_conn = await async_connection.get_raw_connection()
+    dbapi_conn = dbapi_pooled_conn.driver_connection
+    await dbapi_conn.copy_records_to_table(  # type: ignore[union-attr]
+        temp_table_name, records=records, columns=list(columns)
+    )
+    await async_connection.execute(
+        text(
+            f"INSERT INTO {table_name} ({column_list}) "
+            f"SELECT {column_list} FROM {temp_table_name} ON CONFLICT DO NOTHING"
+        )
+    )
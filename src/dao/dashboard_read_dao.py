@@ -0,0 +1,169 @@
+import asyncio
+import os
+import re
+from typing import Any, Sequence
+
+import pandas as pd
+import pyarrow as pa
+from dotenv import load_dotenv
+from sqlalchemy import Row, TextClause, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncResult, create_async_engine
+from tenacity import retry, wait_fixed, stop_after_attempt
+import logging
+
+from src.utils.logging_utils import setup_logging
+from src.utils.ttl_cache import TTLCache, make_query_cache_key
+
+logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+# only plain identifiers can be interpolated into keyset pagination queries
+IDENTIFIER_PATTERN: re.Pattern[str] = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def dataframe_size_in_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True).sum())
+
+
+class DashboardReadDAO:
+    """
+    Read-only DAO backing the streamlit dashboard
+
+    Responsible for
+    - running ad-hoc queries, cached by (query, params) with a TTL and size-bounded LRU eviction
+    - paginating large tables with keyset pagination (WHERE key > :after_key ORDER BY key LIMIT :limit)
+
+    Results are streamed through a server-side cursor and loaded column by column into Arrow-backed DataFrames,
+    so a query against a table with millions of rows only ever materialises max_rows rows
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        cache: TTLCache[pd.DataFrame] | None = None,
+        max_rows: int = 10_000,
+    ) -> None:
+        self._engine: AsyncEngine = create_async_engine(connection_string)
+        self._cache: TTLCache[pd.DataFrame] = cache or TTLCache(
+            max_entries=128,
+            ttl_seconds=30,
+            max_bytes=256 * 1024 * 1024,
+            sizer=dataframe_size_in_bytes,
+        )
+        self._max_rows: int = max_rows
+
+    @staticmethod
+    def _to_arrow_column(column_values: Sequence[Any]) -> pa.Array:
+        try:
+            arrow_column: pa.Array = pa.array(column_values)
+            if not isinstance(arrow_column.type, pa.BaseExtensionType):
+                return arrow_column
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        # mixed or unsupported python types (e.g UUID) fall back to their string form
+        return pa.array(
+            [None if value is None else str(value) for value in column_values],
+            type=pa.string(),
+        )
+
+    @staticmethod
+    def rows_to_dataframe(column_names: Sequence[str], rows: Sequence[Row]) -> pd.DataFrame:
+        """
+        transposes rows into columns once, and builds an Arrow-backed DataFrame from the columns
+        avoids building one dict per row (RowMapping) before pandas re-transposes them into columns
+        """
+        columns: list[tuple[Any, ...]] = (
+            list(zip(*rows)) if rows else [() for _ in column_names]
+        )
+        arrow_columns: dict[str, pa.Array] = {}
+        for column_name, column_values in zip(column_names, columns):
+            arrow_columns[column_name] = DashboardReadDAO._to_arrow_column(column_values)
+        return pa.table(arrow_columns).to_pandas(types_mapper=pd.ArrowDtype)
+
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    async def _fetch_dataframe(
+        self, query_text_clause: TextClause, params: dict[str, Any]
+    ) -> pd.DataFrame:
+        try:
+            async with self._engine.begin() as async_conn:
+                async_result: AsyncResult = await async_conn.stream(
+                    query_text_clause, params
+                )
+                column_names: list[str] = list(async_result.keys())
+                rows: Sequence[Row] = await async_result.fetchmany(self._max_rows)
+                await async_result.close()
+        except SQLAlchemyError:
+            logger.exception("Failed to run dashboard query")
+            raise
+        return self.rows_to_dataframe(column_names, rows)
+
+    async def read_query(
+        self,
+        query: str,
+        params: dict[str, Any] | None = None,
+        use_cache: bool = True,
+    ) -> pd.DataFrame:
+        """
+        runs a query and returns at most max_rows rows as a DataFrame
+
+        identical (query, params) pairs are served from the cache until their TTL expires
+        """
+        cache_key = make_query_cache_key(query, params)
+        if use_cache:
+            cached_df: pd.DataFrame | None = self._cache.get(cache_key)
+            if cached_df is not None:
+                return cached_df
+
+        df: pd.DataFrame = await self._fetch_dataframe(text(query), params or {})
+        self._cache.put(cache_key, df)
+        return df
+
+    async def read_page(
+        self,
+        table_name: str,
+        key_column: str,
+        after_key: Any | None = None,
+        limit: int = 1_000,
+    ) -> pd.DataFrame:
+        """
+        reads a single page of a table ordered by key_column, starting after after_key
+
+        keyset pagination uses the index on key_column, so page N costs the same as page 1, unlike OFFSET
+        pass the last key_column value of the previous page as after_key to get the next page
+        """
+        for identifier in (table_name, key_column):
+            if not IDENTIFIER_PATTERN.match(identifier):
+                raise ValueError(f"Invalid SQL identifier: {identifier}")
+        limit = min(limit, self._max_rows)
+        if after_key is None:
+            query: str = f'SELECT * FROM "{table_name}" ORDER BY "{key_column}" LIMIT :limit'
+            params: dict[str, Any] = {"limit": limit}
+        else:
+            query = (
+                f'SELECT * FROM "{table_name}" WHERE "{key_column}" > :after_key '
+                f'ORDER BY "{key_column}" LIMIT :limit'
+            )
+            params = {"after_key": after_key, "limit": limit}
+        return await self.read_query(query, params)
+
+    def invalidate_cache(self) -> None:
+        self._cache.invalidate()
+
+    async def dispose(self) -> None:
+        await self._engine.dispose()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    dao: DashboardReadDAO = DashboardReadDAO(
+        os.getenv("CHAIN_STACK_PG_CONNECTION_STRING", "")
+    )
+    first_page: pd.DataFrame = asyncio.run(
+        dao.read_page(table_name="eth_blocks", key_column="block_number", limit=10)
+    )
+    print(first_page)
@@ -0,0 +1,79 @@
+import logging
+from typing import Any
+from decimal import Decimal
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
+from tenacity import retry, stop_after_attempt, wait_fixed
+
+from src.dao.copy_utils import copy_records_into_table
+from src.models.database_transfer_objects.eth_blob_metrics import EthBlobMetricsDTO
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+BLOB_METRICS_COLUMNS: tuple[str, ...] = (
+    "block_number",
+    "blob_gas_used",
+    "excess_blob_gas",
+    "blob_count",
+    "base_fee_per_gas",
+    "blob_base_fee",
+    "blob_gas_used_ratio",
+    "created_at",
+)
+
+
+def to_numeric(value: int | None) -> Decimal | None:
+    # binary COPY encodes NUMERIC columns from Decimal
+    return Decimal(value) if value is not None else None
+
+
+class EthBlobMetricsDAO:
+    """
+    DAO responsible for bulk loading eth_blob_metrics
+
+    Table: eth_blob_metrics
+    """
+
+    @staticmethod
+    def to_records(input: list[EthBlobMetricsDTO]) -> list[tuple[Any, ...]]:
+        """
+        rows in BLOB_METRICS_COLUMNS order, as COPY takes them
+        """
+        return [
+            (
+                single_input.block_number,
+                single_input.blob_gas_used,
+                single_input.excess_blob_gas,
+                single_input.blob_count,
+                to_numeric(single_input.base_fee_per_gas),
+                to_numeric(single_input.blob_base_fee),
+                single_input.blob_gas_used_ratio,
+                single_input.created_at,
+            )
+            for single_input in input
+        ]
+
+    @METRICS.timed("copy_eth_blob_metrics")
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def insert_blob_metrics(
+        self, async_connection: AsyncConnection, input: list[EthBlobMetricsDTO]
+    ) -> None:
+        try:
+            await copy_records_into_table(
+                async_connection=async_connection,
+                table_name="eth_blob_metrics",
+                columns=BLOB_METRICS_COLUMNS,
+                records=self.to_records(input),
+            )
+        except SQLAlchemyError:
+            logger.exception("Unable to copy blob metrics into eth_blob_metrics")
+            raise
@@ -1,4 +1,5 @@
 import os
+from typing import Any, Sequence
 
 from tenacity import retry, wait_fixed, stop_after_attempt
 from sqlalchemy import (
@@ -11,6 +12,7 @@ from sqlalchemy import (
     insert,
     select,
     Column,
+    bindparam,
 )
 from sqlalchemy.exc import SQLAlchemyError, OperationalError, DisconnectionError
 
@@ -26,11 +28,45 @@ import asyncio
 import io
 
 from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
 
 logger = logging.getLogger(__name__)
 setup_logging(logger)
 
 
+BLOCK_COLUMNS: tuple[str, ...] = (
+    "block_number",
+    "id",
+    "jsonrpc",
+    "basefeepergas",
+    "blobgasused",
+    "difficulty",
+    "excessblobgas",
+    "extradata",
+    "gaslimit",
+    "gasused",
+    "hash",
+    "logsbloom",
+    "miner",
+    "mixhash",
+    "nonce",
+    "number",
+    "parentbeaconblockroot",
+    "parenthash",
+    "receiptsroot",
+    "sha3uncles",
+    "size",
+    "stateroot",
+    "timestamp",
+    "totaldifficulty",
+    "transactionsroot",
+    "withdrawalsroot",
+    "created_at",
+    "transactions_hydrated",
+    "transaction_count",
+)
+
+
 class EthBlockDAO:
     """
     DAO responsible for CRUD operations into quick_node.eth_transactions table
@@ -46,6 +82,46 @@ class EthBlockDAO:
         self._engine: AsyncEngine = create_async_engine(connection_string)
         self._table: Table = eth_block_table
 
+    @staticmethod
+    def to_records(input: list[EthBlockDTO]) -> list[tuple[Any, ...]]:
+        """
+        rows in BLOCK_COLUMNS order, as COPY takes them
+        """
+        return [
+            (
+                single_input.block_number,
+                single_input.id,
+                single_input.jsonrpc,
+                single_input.baseFeePerGas,
+                single_input.blobGasUsed,
+                single_input.difficulty,
+                single_input.excessBlobGas,
+                single_input.extraData,
+                single_input.gasLimit,
+                single_input.gasUsed,
+                single_input.hash,
+                single_input.logsBloom,
+                single_input.miner,
+                single_input.mixHash,
+                single_input.nonce,
+                single_input.number,
+                single_input.parentBeaconBlockRoot,
+                single_input.parentHash,
+                single_input.receiptsRoot,
+                single_input.sha3Uncles,
+                single_input.size,
+                single_input.stateRoot,
+                single_input.timestamp,
+                single_input.totalDifficulty,
+                single_input.transactionsRoot,
+                single_input.withdrawalsRoot,
+                single_input.created_at,
+                single_input.transactionsHydrated,
+                single_input.transactionCount,
+            )
+            for single_input in input
+        ]
+
     @retry(
         wait=wait_fixed(0.01),
         stop=stop_after_attempt(5),
@@ -59,7 +135,8 @@ class EthBlockDAO:
             "SELECT block_number, id, jsonrpc, basefeepergas, blobgasused, difficulty, excessblobgas, "
             "extradata, gaslimit, gasused, hash, logsbloom, miner, mixhash, nonce, number, "
             "parentbeaconblockroot, parenthash, receiptsroot, sha3uncles, size, stateroot, "
-            "timestamp, totaldifficulty, transactionsroot, withdrawalsroot, created_at "
+            "timestamp, totaldifficulty, transactionsroot, withdrawalsroot, created_at, "
+            "transactions_hydrated, transaction_count "
             "FROM eth_blocks WHERE block_number = :block_number limit 1"
         )
         query_text_clause: TextClause = text(query_block_by_id)
@@ -75,39 +152,43 @@ class EthBlockDAO:
         else:
             eth_block_dto: EthBlockDTO = EthBlockDTO(
                 block_number=block_number,
-                id=single_row[0],
-                jsonrpc=single_row[1],
-                baseFeePerGas=single_row[2],
-                blobGasUsed=single_row[3],
-                difficulty=single_row[4],
-                excessBlobGas=single_row[5],
-                extraData=single_row[6],
-                gasLimit=single_row[7],
-                gasUsed=single_row[8],
-                hash=single_row[9],
-                logsBloom=single_row[10],
-                miner=single_row[11],
-                mixHash=single_row[12],
-                nonce=single_row[13],
-                number=single_row[14],
-                parentBeaconBlockRoot=single_row[15],
-                parentHash=single_row[16],
-                receiptsRoot=single_row[17],
-                sha3Uncles=single_row[18],
-                size=single_row[19],
-                stateRoot=single_row[20],
-                timestamp=single_row[21],
-                totalDifficulty=single_row[22],
-                transactionsRoot=single_row[23],
-                withdrawalsRoot=single_row[24],
-                created_at=single_row[25],
+                id=single_row[1],
+                jsonrpc=single_row[2],
+                baseFeePerGas=single_row[3],
+                blobGasUsed=single_row[4],
+                difficulty=single_row[5],
+                excessBlobGas=single_row[6],
+                extraData=single_row[7],
+                gasLimit=single_row[8],
+                gasUsed=single_row[9],
+                hash=single_row[10],
+                logsBloom=single_row[11],
+                miner=single_row[12],
+                mixHash=single_row[13],
+                nonce=single_row[14],
+                number=single_row[15],
+                parentBeaconBlockRoot=single_row[16],
+                parentHash=single_row[17],
+                receiptsRoot=single_row[18],
+                sha3Uncles=single_row[19],
+                size=single_row[20],
+                stateRoot=single_row[21],
+                timestamp=single_row[22],
+                totalDifficulty=single_row[23],
+                transactionsRoot=single_row[24],
+                withdrawalsRoot=single_row[25],
+                created_at=single_row[26],
+                transactionsHydrated=single_row[27],
+                transactionCount=single_row[28],
             )
             return eth_block_dto
 
+    @METRICS.timed("insert_eth_blocks")
     @retry(
         wait=wait_fixed(0.01),
         stop=stop_after_attempt(5),
-        reraise=True
+        reraise=True,
+        before_sleep=METRICS.record_retry,
     )
     async def insert_blocks(
         self, async_connection: AsyncConnection, input: list[EthBlockDTO]
@@ -119,15 +200,18 @@ class EthBlockDAO:
             "INSERT into eth_blocks (block_number, id, jsonrpc, basefeepergas, blobgasused, difficulty, excessblobgas, "
             "extradata, gaslimit, gasused, hash, logsbloom, miner, mixhash, nonce, number, "
             "parentbeaconblockroot, parenthash, receiptsroot, sha3uncles, size, stateroot, "
-            "timestamp, totaldifficulty, transactionsroot, withdrawalsroot, created_at) values ("
+            "timestamp, totaldifficulty, transactionsroot, withdrawalsroot, created_at, "
+            "transactions_hydrated, transaction_count) values ("
             ":block_number, :id, :jsonrpc, :basefeepergas, :blobgasused, :difficulty, :excessblobgas, "
             ":extradata, :gaslimit, :gasused, :hash, :logsbloom, :miner, :mixhash, :nonce, :number, "
             ":parentbeaconblockroot, :parenthash, :receiptsroot, :sha3uncles, :size, :stateroot, "
-            ":timestamp, :totaldifficulty, :transactionsroot, :withdrawalsroot, :created_at) ON CONFLICT DO NOTHING "
+            ":timestamp, :totaldifficulty, :transactionsroot, :withdrawalsroot, :created_at, "
+            ":transactions_hydrated, :transaction_count) ON CONFLICT DO NOTHING "
             "RETURNING block_number, id, jsonrpc, basefeepergas, blobgasused, difficulty, excessblobgas, "
             "extradata, gaslimit, gasused, hash, logsbloom, miner, mixhash, nonce, number, "
             "parentbeaconblockroot, parenthash, receiptsroot, sha3uncles, size, stateroot, "
-            "timestamp, totaldifficulty, transactionsroot, withdrawalsroot, created_at"
+            "timestamp, totaldifficulty, transactionsroot, withdrawalsroot, created_at, "
+            "transactions_hydrated, transaction_count"
         )
         insert_text_clause: TextClause = text(insert_block)
 
@@ -166,11 +250,117 @@ class EthBlockDAO:
                     "transactionsroot": single_input.transactionsRoot,
                     "withdrawalsroot": single_input.withdrawalsRoot,
                     "created_at": single_input.created_at,
+                    "transactions_hydrated": single_input.transactionsHydrated,
+                    "transaction_count": single_input.transactionCount,
                 }
                 for single_input in input
             ],
         )
 
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    async def read_unhydrated_block_numbers(
+        self, start_block_number: int, end_block_number: int
+    ) -> list[int]:
+        """
+        block numbers between start_block_number and end_block_number (inclusive), in order,
+        of header-only blocks whose transactions are not hydrated yet
+
+        block_number is a hex string, so the range is read as its list of block numbers; with
+        eth_blocks_unhydrated_index, only the unhydrated blocks of the range are read
+        """
+        query_text_clause: TextClause = text(
+            "SELECT block_number FROM eth_blocks "
+            "WHERE NOT transactions_hydrated AND block_number = ANY(:block_numbers)"
+        )
+        async with self._engine.begin() as async_conn:
+            cursor_result: CursorResult = await async_conn.execute(
+                query_text_clause,
+                {
+                    "block_numbers": [
+                        hex(block_number) for block_number in range(start_block_number, end_block_number + 1)
+                    ]
+                },
+            )
+        return sorted(int(row[0], 16) for row in cursor_result.fetchall())
+
+    @METRICS.timed("read_eth_chain_breaks")
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def read_chain_breaks(
+        self, start_block_number: int, end_block_number: int
+    ) -> tuple[int | None, int | None, list[tuple[int, int, bool]]]:
+        """
+        the first and last stored block numbers between start_block_number and end_block_number (inclusive), if any,
+        and every break in the chain between them, in a single query and pass (LAG, MIN and MAX over the blocks in
+        block number order)
+
+        a break is (previous stored block number, block number, whether its parenthash is the previous block's hash);
+        either blocks are missing in between, or they are consecutive and don't link
+        """
+        # block_number is a hex string; the range is read through the primary key, then sorted by its numeric value
+        # the first block has no previous block; it is always returned, for the bounds it carries
+        # (the whole chunk is windowed before the filter)
+        query: TextClause = text(
+            "SELECT first_number, last_number, previous_number, number, "
+            "parenthash IS NOT DISTINCT FROM previous_hash FROM ("
+            "SELECT number, parenthash, "
+            "LAG(number) OVER (ORDER BY number) AS previous_number, "
+            "LAG(hash) OVER (ORDER BY number) AS previous_hash, "
+            "MIN(number) OVER () AS first_number, "
+            "MAX(number) OVER () AS last_number "
+            "FROM ("
+            "SELECT ('x' || lpad(substr(block_number, 3), 16, '0'))::bit(64)::bigint AS number, hash, parenthash "
+            "FROM eth_blocks WHERE block_number = ANY(:block_numbers)"
+            ") AS chunk"
+            ") AS links "
+            "WHERE previous_number IS NULL "
+            "OR number <> previous_number + 1 OR parenthash IS DISTINCT FROM previous_hash"
+        )
+        params: dict[str, list[str]] = {
+            "block_numbers": [
+                hex(block_number) for block_number in range(start_block_number, end_block_number + 1)
+            ]
+        }
+        async with self._engine.begin() as async_conn:
+            rows: Sequence[Row] = (await async_conn.execute(query, params)).fetchall()
+        if not rows:
+            return None, None, []
+        return (
+            rows[0][0],
+            rows[0][1],
+            [(row[2], row[3], row[4]) for row in rows if row[2] is not None],
+        )
+
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def mark_transactions_hydrated(
+        self, async_connection: AsyncConnection, block_numbers: list[str]
+    ) -> None:
+        """
+        block_numbers are hex strings, e.g 0x13e1c2a
+        """
+        if not block_numbers:
+            return
+        query_text_clause: TextClause = text(
+            "UPDATE eth_blocks SET transactions_hydrated = true "
+            "WHERE block_number IN :block_numbers"
+        ).bindparams(bindparam("block_numbers", expanding=True))
+        await async_connection.execute(
+            query_text_clause, {"block_numbers": block_numbers}
+        )
+
     @retry(
         wait=wait_fixed(0.01),
         stop=stop_after_attempt(5),
@@ -205,12 +395,21 @@ class EthBlockDAO:
         """
         # for safety, seek(0) to the start of buffer
         csv_buffer.seek(0)
+        # CSVs exported before a column was added don't have it; copy by header, and let the rest default
+        header_columns: list[str] = (
+            csv_buffer.readline().decode("utf-8").strip().split(",")
+        )
+        csv_buffer.seek(0)
 
         dbapi_pooled_conn = await conn.get_raw_connection()
         dbapi_conn = dbapi_pooled_conn.driver_connection
         try:
             await dbapi_conn.copy_to_table(  # type: ignore[union-attr]
-                temp_table.name, source=csv_buffer, format="csv", header=True
+                temp_table.name,
+                source=csv_buffer,
+                columns=header_columns,
+                format="csv",
+                header=True,
             )
         except SQLAlchemyError:
             logger.exception("Unable to copy to temporary table")
@@ -239,10 +438,12 @@ class EthBlockDAO:
             logger.exception("Unable to insert from temporary table to main table")
             raise
 
+    @METRICS.timed("copy_eth_blocks")
     @retry(
         wait=wait_fixed(0.01),
         stop=stop_after_attempt(5),
-        reraise=True
+        reraise=True,
+        before_sleep=METRICS.record_retry,
     )
     async def insert_csv_to_main_table(self, csv_buffer: io.BytesIO) -> None:
         """
@@ -266,6 +467,11 @@ class EthBlockDAO:
                         col.type,
                         *col.constraints,
                         primary_key=col.primary_key,
+                        server_default=(
+                            col.server_default.arg  # type: ignore[attr-defined]
+                            if col.server_default is not None
+                            else None
+                        ),
                     )
                     for col in self._table.columns
                 ],
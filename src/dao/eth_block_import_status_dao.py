@@ -12,6 +12,7 @@ from src.models.database_transfer_objects.eth_block_import_status import (
     EthBlockImportStatusDTO,
 )
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncConnection
+from src.utils.metrics import METRICS
 
 
 class EthBlockImportStatusDAO:
@@ -58,6 +59,7 @@ class EthBlockImportStatusDAO:
             )
             return eth_block_import_status_dto
 
+    @METRICS.timed("insert_eth_block_import_status")
     @retry.retry(
         exceptions=SQLAlchemyError,
         tries=5,
@@ -0,0 +1,81 @@
+import logging
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
+from tenacity import retry, stop_after_attempt, wait_fixed
+
+from src.dao.copy_utils import copy_records_into_table
+from src.models.database_transfer_objects.eth_log import EthLogDTO
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+LOG_COLUMNS: tuple[str, ...] = (
+    "block_number",
+    "logindex",
+    "transaction_hash",
+    "transactionindex",
+    "address",
+    "topic0",
+    "topic1",
+    "topic2",
+    "topic3",
+    "data",
+    "removed",
+    "created_at",
+)
+
+
+class EthLogDAO:
+    """
+    DAO responsible for bulk loading eth_logs
+
+    Table: eth_logs
+    """
+
+    @staticmethod
+    def to_records(input: list[EthLogDTO]) -> list[tuple[Any, ...]]:
+        """
+        rows in LOG_COLUMNS order, as COPY takes them
+        """
+        return [
+            (
+                single_input.block_number,
+                single_input.logIndex,
+                single_input.transaction_hash,
+                single_input.transactionIndex,
+                single_input.address,
+                single_input.topic0,
+                single_input.topic1,
+                single_input.topic2,
+                single_input.topic3,
+                single_input.data,
+                single_input.removed,
+                single_input.created_at,
+            )
+            for single_input in input
+        ]
+
+    @METRICS.timed("copy_eth_logs")
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def insert_logs(
+        self, async_connection: AsyncConnection, input: list[EthLogDTO]
+    ) -> None:
+        try:
+            await copy_records_into_table(
+                async_connection=async_connection,
+                table_name="eth_logs",
+                columns=LOG_COLUMNS,
+                records=self.to_records(input),
+            )
+        except SQLAlchemyError:
+            logger.exception("Unable to copy logs into eth_logs")
+            raise
@@ -0,0 +1,91 @@
+import logging
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
+from tenacity import retry, stop_after_attempt, wait_fixed
+
+from src.dao.copy_utils import copy_records_into_table
+from src.models.database_transfer_objects.eth_receipt import EthReceiptDTO
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+RECEIPT_COLUMNS: tuple[str, ...] = (
+    "transaction_hash",
+    "block_number",
+    "blockhash",
+    "transactionindex",
+    "from_address",
+    "to_address",
+    "contractaddress",
+    "cumulativegasused",
+    "gasused",
+    "effectivegasprice",
+    "blobgasused",
+    "blobgasprice",
+    "logsbloom",
+    "status",
+    "root",
+    "type",
+    "created_at",
+)
+
+
+class EthReceiptDAO:
+    """
+    DAO responsible for bulk loading eth_receipts
+
+    Table: eth_receipts
+    """
+
+    @staticmethod
+    def to_records(input: list[EthReceiptDTO]) -> list[tuple[Any, ...]]:
+        """
+        rows in RECEIPT_COLUMNS order, as COPY takes them
+        """
+        return [
+            (
+                single_input.transaction_hash,
+                single_input.block_number,
+                single_input.blockHash,
+                single_input.transactionIndex,
+                single_input.from_address,
+                single_input.to_address,
+                single_input.contractAddress,
+                single_input.cumulativeGasUsed,
+                single_input.gasUsed,
+                single_input.effectiveGasPrice,
+                single_input.blobGasUsed,
+                single_input.blobGasPrice,
+                single_input.logsBloom,
+                single_input.status,
+                single_input.root,
+                single_input.type,
+                single_input.created_at,
+            )
+            for single_input in input
+        ]
+
+    @METRICS.timed("copy_eth_receipts")
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def insert_receipts(
+        self, async_connection: AsyncConnection, input: list[EthReceiptDTO]
+    ) -> None:
+        try:
+            await copy_records_into_table(
+                async_connection=async_connection,
+                table_name="eth_receipts",
+                columns=RECEIPT_COLUMNS,
+                records=self.to_records(input),
+            )
+        except SQLAlchemyError:
+            logger.exception("Unable to copy receipts into eth_receipts")
+            raise
@@ -1,15 +1,26 @@
-from typing import Sequence
+from typing import Any
 
 import retry
 from sqlalchemy import TextClause, text, CursorResult, Row
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncConnection
+from src.utils.metrics import METRICS
 
 from src.models.database_transfer_objects.eth_transaction_access_list import (
     EthTransactionAccessListDTO,
 )
 
 
+ACCESS_LIST_COLUMNS: tuple[str, ...] = (
+    "id",
+    "transaction_hash",
+    "position",
+    "address",
+    "storagekeys",
+    "created_at",
+)
+
+
 class EthTransactionAccessListDAO:
     """
     DAO responsible for CRUD operations into quick_node.eth_transaction_access_list table
@@ -24,6 +35,23 @@ class EthTransactionAccessListDAO:
     def __init__(self, connection_string: str) -> None:
         self._engine: AsyncEngine = create_async_engine(connection_string)
 
+    @staticmethod
+    def to_records(input: list[EthTransactionAccessListDTO]) -> list[tuple[Any, ...]]:
+        """
+        rows in ACCESS_LIST_COLUMNS order, as COPY takes them
+        """
+        return [
+            (
+                single_input.id,
+                single_input.transaction_hash,
+                single_input.position,
+                single_input.address,
+                single_input.storageKeys,
+                single_input.created_at,
+            )
+            for single_input in input
+        ]
+
     @retry.retry(
         exceptions=SQLAlchemyError,
         tries=5,
@@ -36,7 +64,7 @@ class EthTransactionAccessListDAO:
         self, id: str
     ) -> EthTransactionAccessListDTO | None:
         query_transaction_access_list_by_id: str = (
-            "SELECT id, transaction_hash, address, storagekeys, created_at "
+            "SELECT id, transaction_hash, position, address, storagekeys, created_at "
             "FROM eth_transaction_access_list WHERE id = :id limit 1"
         )
         query_text_clause: TextClause = text(query_transaction_access_list_by_id)
@@ -52,15 +80,17 @@ class EthTransactionAccessListDAO:
         else:
             eth_transaction_access_list_dto: EthTransactionAccessListDTO = (
                 EthTransactionAccessListDTO(
-                    id=single_row[0],
+                    id=str(single_row[0]),
                     transaction_hash=single_row[1],
-                    address=single_row[2],
-                    storageKeys=single_row[3],
-                    created_at=single_row[4],
+                    position=single_row[2],
+                    address=single_row[3],
+                    storageKeys=single_row[4],
+                    created_at=single_row[5],
                 )
             )
             return eth_transaction_access_list_dto
 
+    @METRICS.timed("insert_eth_transaction_access_list")
     @retry.retry(
         exceptions=SQLAlchemyError,
         tries=5,
@@ -77,19 +107,20 @@ class EthTransactionAccessListDAO:
         if not input:
             print("insert_transaction_access_list: No input. Exiting")
             return
+        # ids are natural keys; items which already exist (e.g from a replayed batch) are skipped, not duplicated
         insert_block: str = (
-            "INSERT into eth_transaction_access_list (id, transaction_hash, address, storagekeys, created_at) values ("
-            ":id, :transaction_hash, :address, :storagekeys, :created_at) ON CONFLICT DO NOTHING "
-            "RETURNING id, transaction_hash, address, storagekeys, created_at"
+            "INSERT into eth_transaction_access_list (id, transaction_hash, position, address, storagekeys, created_at) "
+            "values (:id, :transaction_hash, :position, :address, :storagekeys, :created_at) ON CONFLICT DO NOTHING"
         )
         insert_text_clause: TextClause = text(insert_block)
 
-        cursor_result: CursorResult = await async_connection.execute(
+        await async_connection.execute(
             insert_text_clause,
             [
                 {
                     "id": single_input.id,
                     "transaction_hash": single_input.transaction_hash,
+                    "position": single_input.position,
                     "address": single_input.address,
                     "storagekeys": single_input.storageKeys,
                     "created_at": single_input.created_at,
@@ -97,10 +128,3 @@ class EthTransactionAccessListDAO:
                 for single_input in input
             ],
         )
-        inserted_rows: Sequence[Row] = cursor_result.fetchall()
-        if inserted_rows:
-            return None
-        else:
-            # okay to raise error; after 5 retries, this exception stops the data pipeline
-            # this is by design; it is better for the data pipeline to stop, than to silently fail
-            raise SQLAlchemyError("Failed to insert blocks. Retrying...")
@@ -1,16 +1,43 @@
 import asyncio
 import datetime
+from typing import Any
 
 import retry
 from sqlalchemy import TextClause, text, CursorResult, Row
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncConnection
+from src.utils.metrics import METRICS
 
 from src.dao.eth_block_dao import EthBlockDAO
 from src.models.database_transfer_objects.eth_blocks import EthBlockDTO
 from src.models.database_transfer_objects.eth_transaction import EthTransactionDTO
 
 
+TRANSACTION_COLUMNS: tuple[str, ...] = (
+    "hash",
+    "block_id",
+    "blockhash",
+    "block_number",
+    "chainid",
+    "from_address",
+    "gas",
+    "gasprice",
+    "input",
+    "maxfeepergas",
+    "maxpriorityfeepergas",
+    "nonce",
+    "r",
+    "s",
+    "to_address",
+    "transactionindex",
+    "type",
+    "v",
+    "value",
+    "yparity",
+    "created_at",
+)
+
+
 class EthTransactionDAO:
     """
     DAO responsible for CRUD operations into quick_node.eth_transactions table
@@ -25,6 +52,38 @@ class EthTransactionDAO:
     def __init__(self, connection_string: str) -> None:
         self._engine: AsyncEngine = create_async_engine(connection_string)
 
+    @staticmethod
+    def to_records(input: list[EthTransactionDTO]) -> list[tuple[Any, ...]]:
+        """
+        rows in TRANSACTION_COLUMNS order, as COPY takes them
+        """
+        return [
+            (
+                single_input.hash,
+                single_input.block_id,
+                single_input.blockHash,
+                single_input.blockNumber,
+                single_input.chainId,
+                single_input.from_address,
+                single_input.gas,
+                single_input.gasPrice,
+                single_input.input,
+                single_input.maxFeePerGas,
+                single_input.maxPriorityFeePerGas,
+                single_input.nonce,
+                single_input.r,
+                single_input.s,
+                single_input.to_address,
+                single_input.transactionIndex,
+                single_input.type,
+                single_input.v,
+                single_input.value,
+                single_input.yParity,
+                single_input.created_at,
+            )
+            for single_input in input
+        ]
+
     @retry.retry(
         exceptions=SQLAlchemyError,
         tries=5,
@@ -78,6 +137,7 @@ class EthTransactionDAO:
             )
             return eth_transaction_dto
 
+    @METRICS.timed("insert_eth_transactions")
     @retry.retry(
         exceptions=SQLAlchemyError,
         tries=5,
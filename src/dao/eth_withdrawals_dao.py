@@ -1,10 +1,24 @@
+from typing import Any
+
 import retry
 from sqlalchemy import TextClause, text, CursorResult, Row
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncConnection
+from src.utils.metrics import METRICS
 from src.models.database_transfer_objects.eth_withdrawals import EthWithdrawalDTO
 
 
+WITHDRAWAL_COLUMNS: tuple[str, ...] = (
+    "id",
+    "block_number",
+    "address",
+    "amount",
+    "index",
+    "validatorindex",
+    "created_at",
+)
+
+
 class EthWithdrawalDAO:
     """
     DAO responsible for CRUD operations into quick_node.eth_withdrawals table
@@ -19,6 +33,24 @@ class EthWithdrawalDAO:
     def __init__(self, connection_string: str) -> None:
         self._engine: AsyncEngine = create_async_engine(connection_string)
 
+    @staticmethod
+    def to_records(input: list[EthWithdrawalDTO]) -> list[tuple[Any, ...]]:
+        """
+        rows in WITHDRAWAL_COLUMNS order, as COPY takes them
+        """
+        return [
+            (
+                single_input.id,
+                single_input.block_number,
+                single_input.address,
+                single_input.amount,
+                single_input.index,
+                single_input.validatorIndex,
+                single_input.created_at,
+            )
+            for single_input in input
+        ]
+
     @retry.retry(
         exceptions=SQLAlchemyError,
         tries=5,
@@ -54,6 +86,7 @@ class EthWithdrawalDAO:
             )
             return eth_withdrawal_dto
 
+    @METRICS.timed("insert_eth_withdrawals")
     @retry.retry(
         exceptions=SQLAlchemyError,
         tries=5,
@@ -68,10 +101,10 @@ class EthWithdrawalDAO:
         if not input:
             print("insert_withdrawals: No input. Exiting")
             return
+        # ids are natural keys; withdrawals which already exist (e.g from a replayed batch) are skipped, not duplicated
         insert_block: str = (
-            "INSERT into eth_withdrawals (id, block_number, address, amount, index, validatorIndex, created_at) values ("
-            ":id, :block_number, :address, :amount, :index, :validatorIndex, :created_at) NOT CONFLICT DO NOTHING "
-            "RETURNING id, block_id, address, amount, index, validatorIndex, created_at"
+            "INSERT into eth_withdrawals (id, block_number, address, amount, index, validatorindex, created_at) values ("
+            ":id, :block_number, :address, :amount, :index, :validatorindex, :created_at) ON CONFLICT DO NOTHING"
         )
         insert_text_clause: TextClause = text(insert_block)
 
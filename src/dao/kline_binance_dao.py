@@ -1,4 +1,9 @@
+import json
 import os
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from sqlalchemy import (
     TextClause,
     text,
@@ -6,18 +11,26 @@ from sqlalchemy import (
     Row,
     Table
 )
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncConnection
-from datetime import datetime
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import logging
 import asyncio
 from tenacity import retry, wait_fixed, stop_after_attempt
 from io import BytesIO
 
-from src.models.binance_models.binance_klines import Klines
+from src.models.binance_models.binance_klines_arrow import KLINE_ARROW_SCHEMA, kline_records_to_arrow_table
 from src.models.database_transfer_objects.binance.binance_klines import BinanceKlinePriceDTO
+from src.dao.kline_rollup_dao import KlineRollupDAO
+from src.utils.kline_rollups import BASE_KLINE_INTERVAL, floor_to_interval
 from src.utils.logging_utils import setup_logging
-from database_management.binance.binance_table import binance_klines_prices_table
+from src.utils.metrics import METRICS
+from database_management.binance.binance_table import (
+    KLINE_ROLLUP_INTERVALS,
+    binance_kline_rollup_tables,
+    binance_klines_prices_table,
+)
 
 logger = logging.getLogger(__name__)
 setup_logging(logger)
@@ -29,12 +42,15 @@ class KlineBinanceDAO:
 
     Responsible for
     - read single kline by
-    - inserting
+    - inserting DTOs, or bulk COPY-ing columnar (Arrow) klines
+    - finding the missing candles of symbols (read_kline_gaps)
+    - refreshing the 5m/15m/1h/4h/1d rollups touched by inserted klines, when a rollup_dao is given
     """
-    def __init__(self, connection_string: str) -> None:
+    def __init__(self, connection_string: str, rollup_dao: KlineRollupDAO | None = None) -> None:
         self._engine: AsyncEngine = create_async_engine(connection_string)
         self._table: Table = binance_klines_prices_table
         self._temp_table_name: str | None = None
+        self._rollup_dao: KlineRollupDAO | None = rollup_dao
 
     @retry(
         wait=wait_fixed(0.01),
@@ -75,10 +91,66 @@ class KlineBinanceDAO:
             )
             return binance_kline_dto
 
+    @METRICS.timed("read_binance_kline_gaps")
     @retry(
         wait=wait_fixed(0.01),
         stop=stop_after_attempt(5),
-        reraise=True
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def read_kline_gaps(
+        self, symbols: list[str], interval: str, start_time: datetime, end_time: datetime
+    ) -> list[tuple[str, datetime, datetime]]:
+        """
+        every missing range [gap start, gap end) of candles opened in [start_time, end_time), per symbol; start_time is
+        floored to the interval
+        interval: "1m" (binance_klines_prices), or a rollup interval, e.g "1d" to find missing days cheaply
+
+        a single pass: LEAD over every symbol's open times, bracketed by a sentinel candle just before start_time and
+        one at end_time, so missing candles at either end (or a symbol without candles) are gaps too
+        """
+        table: Table = (
+            self._table if interval == "1m" else binance_kline_rollup_tables[interval]
+        )
+        interval_duration: timedelta = (
+            BASE_KLINE_INTERVAL if interval == "1m" else KLINE_ROLLUP_INTERVALS[interval]
+        )
+        # buckets are aligned to the unix epoch; an unaligned start_time would be a gap up to the next bucket
+        start_time = floor_to_interval(start_time, interval_duration)
+        query: str = (
+            "WITH candles AS ("
+            f"SELECT symbol, kline_open_time FROM {table.name} "
+            "WHERE symbol = ANY(:symbols) AND kline_open_time >= :start_time AND kline_open_time < :end_time "
+            "UNION ALL SELECT symbol, CAST(:start_time AS TIMESTAMP) - CAST(:interval AS INTERVAL) "
+            "FROM unnest(CAST(:symbols AS TEXT[])) AS symbol "
+            "UNION ALL SELECT symbol, CAST(:end_time AS TIMESTAMP) FROM unnest(CAST(:symbols AS TEXT[])) AS symbol"
+            ") "
+            "SELECT symbol, kline_open_time + CAST(:interval AS INTERVAL), next_open_time FROM ("
+            "SELECT symbol, kline_open_time, "
+            "LEAD(kline_open_time) OVER (PARTITION BY symbol ORDER BY kline_open_time) AS next_open_time "
+            "FROM candles"
+            ") AS links "
+            "WHERE next_open_time > kline_open_time + CAST(:interval AS INTERVAL) "
+            "ORDER BY symbol, next_open_time"
+        )
+        async with self._engine.begin() as async_conn:
+            cursor_result: CursorResult = await async_conn.execute(
+                text(query),
+                {
+                    "symbols": symbols,
+                    "interval": interval_duration,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                },
+            )
+        return [(row[0], row[1], row[2]) for row in cursor_result.fetchall()]
+
+    @METRICS.timed("insert_binance_klines")
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
     )
     async def insert_kline(self, async_connection: AsyncConnection, input: list[BinanceKlinePriceDTO]) -> None:
         if not input:
@@ -125,30 +197,98 @@ class KlineBinanceDAO:
         _: CursorResult = await async_connection.execute(
             insert_text_clause, rows_to_insert
         )
+        METRICS.increment("rows", len(rows_to_insert), table=self._table.name)
+
+        if self._rollup_dao is not None:
+            open_times_by_symbol: dict[str, list[datetime]] = {}
+            for single_input in input:
+                open_times_by_symbol.setdefault(single_input.symbol, []).append(single_input.kline_open_time)  # type: ignore[arg-type]
+            for symbol, open_times in open_times_by_symbol.items():
+                await self._rollup_dao.refresh_rollups(
+                    async_connection=async_connection,
+                    symbol=symbol,
+                    start_open_time=min(open_times),
+                    end_open_time=max(open_times),
+                )
 
     async def insert_json_to_main_table(self, json_buffer: BytesIO) -> None:
+        """
+        inserts a Klines JSON file (as written to S3 by BinanceToS3ETLPipeline) through the columnar COPY path
+        """
         json_buffer.seek(0)
-        klines: Klines = Klines.model_validate_json(json_buffer.read())
-        if not klines.klines:
+        klines_json: dict[str, Any] = json.loads(json_buffer.read())
+        klines_table: pa.Table = kline_records_to_arrow_table(klines_json.get("klines", []))
+        if klines_table.num_rows == 0:
             return
-        symbol: str = klines.klines[0].symbol
-        dtos: list[BinanceKlinePriceDTO] = BinanceKlinePriceDTO.from_service_klines(symbol, klines)
         async with self._engine.begin() as conn:
-            await self.insert_kline(async_connection=conn, input=dtos)
-
-    # async def copy_klines_to_db(self, async_connection: AsyncConnection, data_buffer: BytesIO) -> None:
-    #     raw_adapt = await async_connection.get_raw_connection()
-    #     # ***WARNING***: private attribute; can break in future SQLAlchemy versions
-    #     actual_asyncpg_conn = raw_adapt._connection
-    #
-    #     data_buffer.seek(0)
-    #     columns = [col.name for col in self._table.columns]
-    #     await actual_asyncpg_conn.copy_to_table(
-    #         table_name=self._temp_table_name,
-    #         source=data_buffer,
-    #         columns=colu3mns,
-    #         format=
-    #     )
+            await self.copy_klines_to_db(async_connection=conn, klines_table=klines_table)
+
+    @METRICS.timed("copy_binance_klines")
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def copy_klines_to_db(self, async_connection: AsyncConnection, klines_table: pa.Table) -> None:
+        """
+        bulk inserts a KLINE_ARROW_SCHEMA table, without building a python object per kline
+
+        1. Arrow columns are written as CSV in C (pyarrow.csv)
+        2. the CSV is COPY-ed into a temporary table, dropped on commit
+        3. INSERT INTO binance_klines_prices SELECT FROM the temporary table, skipping existing klines
+        4. rollups touched by the klines are refreshed, if a rollup_dao is given
+        """
+        if klines_table.num_rows == 0:
+            return
+        klines_table = klines_table.select(KLINE_ARROW_SCHEMA.names).cast(KLINE_ARROW_SCHEMA)
+
+        csv_buffer: BytesIO = BytesIO()
+        pa_csv.write_csv(klines_table, csv_buffer)
+        csv_buffer.seek(0)
+
+        temp_table_name: str = (
+            f"temp_{self._table.name}_{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}"
+        )
+        columns: str = ", ".join(KLINE_ARROW_SCHEMA.names)
+        try:
+            await async_connection.execute(
+                text(
+                    f"CREATE TEMPORARY TABLE {temp_table_name} "
+                    f"(LIKE {self._table.name} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+            )
+            dbapi_pooled_conn = await async_connection.get_raw_connection()
+            dbapi_conn = dbapi_pooled_conn.driver_connection
+            await dbapi_conn.copy_to_table(  # type: ignore[union-attr]
+                temp_table_name,
+                source=csv_buffer,
+                columns=KLINE_ARROW_SCHEMA.names,
+                format="csv",
+                header=True,
+            )
+            await async_connection.execute(
+                text(
+                    f"INSERT INTO {self._table.name} ({columns}) "
+                    f"SELECT {columns} FROM {temp_table_name} ON CONFLICT DO NOTHING"
+                )
+            )
+        except SQLAlchemyError:
+            logger.exception("Unable to copy klines into binance_klines_prices")
+            raise
+        METRICS.increment("rows", klines_table.num_rows, table=self._table.name)
+
+        if self._rollup_dao is not None:
+            open_time_ranges: pa.Table = klines_table.group_by("symbol").aggregate(
+                [("kline_open_time", "min"), ("kline_open_time", "max")]
+            )
+            for open_time_range in open_time_ranges.to_pylist():
+                await self._rollup_dao.refresh_rollups(
+                    async_connection=async_connection,
+                    symbol=open_time_range["symbol"],
+                    start_open_time=open_time_range["kline_open_time_min"],
+                    end_open_time=open_time_range["kline_open_time_max"],
+                )
 
 
 if __name__ == "__main__":
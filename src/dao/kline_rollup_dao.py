@@ -0,0 +1,321 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Sequence
+
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import CursorResult, Row, Table, TextClause, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from tenacity import retry, wait_fixed, stop_after_attempt
+
+from database_management.binance.binance_table import (
+    KLINE_ROLLUP_INTERVALS,
+    binance_kline_rollup_tables,
+    binance_klines_prices_table,
+)
+from src.models.database_transfer_objects.binance.binance_klines import BinanceKlinePriceDTO
+from src.utils.kline_rollups import (
+    BASE_KLINE_INTERVAL,
+    KLINE_AGGREGATIONS,
+    floor_to_interval,
+    select_rollup_interval,
+)
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+ROLLUP_COLUMNS: str = (
+    "symbol, kline_open_time, kline_close_time, open_price, high_price, low_price, close_price, volume, "
+    "quote_asset_volume, number_of_trades, taker_buy_base_asset_vol, taker_buy_quote_asset_vol, candle_count"
+)
+
+
+def aggregate_klines_query(source_table: str, count_expression: str) -> str:
+    """
+    SELECT which aggregates the candles of source_table into :bucket sized buckets, for a single :symbol,
+    between :start_time (inclusive) and :end_time (exclusive)
+
+    date_bin with a 1970-01-01 origin aligns buckets to the unix epoch, the same alignment binance uses
+    """
+    return (
+        "SELECT symbol, "
+        "date_bin(CAST(:bucket AS INTERVAL), kline_open_time, TIMESTAMP '1970-01-01') AS bucket_open_time, "
+        "(array_agg(open_price ORDER BY kline_open_time))[1] AS open_price, "
+        "max(high_price) AS high_price, "
+        "min(low_price) AS low_price, "
+        "(array_agg(close_price ORDER BY kline_open_time DESC))[1] AS close_price, "
+        "sum(volume) AS volume, "
+        "sum(quote_asset_volume) AS quote_asset_volume, "
+        "sum(number_of_trades) AS number_of_trades, "
+        "sum(taker_buy_base_asset_vol) AS taker_buy_base_asset_vol, "
+        "sum(taker_buy_quote_asset_vol) AS taker_buy_quote_asset_vol, "
+        f"{count_expression} AS candle_count "
+        f"FROM {source_table} "
+        "WHERE symbol = :symbol AND kline_open_time >= :start_time AND kline_open_time < :end_time "
+        "GROUP BY symbol, bucket_open_time"
+    )
+
+
+class KlineRollupDAO:
+    """
+    DAO responsible for the 5m/15m/1h/4h/1d OHLCV rollup tables of binance.binance_klines_prices
+
+    Responsible for
+    - incrementally refreshing only the rollup buckets touched by newly inserted 1m candles
+    - upserting rollups computed by a backfill (see src/binance_kline_rollup_backfill.py)
+    - reading candles of any interval from the coarsest rollup which can serve it
+
+    Each rollup is built from the next finer one (1m -> 5m -> 15m -> 1h -> 4h -> 1d),
+    so refreshing a 1d bucket aggregates 6 rows of 4h instead of 1440 rows of 1m
+
+    Tables: binance.binance_klines_5m, binance_klines_15m, binance_klines_1h, binance_klines_4h, binance_klines_1d
+    """
+
+    def __init__(self, connection_string: str) -> None:
+        self._engine: AsyncEngine = create_async_engine(connection_string)
+        self._tables: dict[str, Table] = binance_kline_rollup_tables
+
+    @staticmethod
+    def _source_for(interval: str) -> tuple[str, str]:
+        """
+        returns (source table, candle count expression) used to build the rollup of an interval
+        """
+        intervals: list[str] = list(KLINE_ROLLUP_INTERVALS.keys())
+        index: int = intervals.index(interval)
+        if index == 0:
+            return binance_klines_prices_table.name, "count(*)"
+        return binance_kline_rollup_tables[intervals[index - 1]].name, "sum(candle_count)"
+
+    @METRICS.timed("refresh_kline_rollups")
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def refresh_rollups(
+        self,
+        async_connection: AsyncConnection,
+        symbol: str,
+        start_open_time: datetime,
+        end_open_time: datetime,
+    ) -> None:
+        """
+        recomputes every rollup bucket containing a 1m candle opened between start_open_time and end_open_time
+
+        runs on the caller's connection, so rollups commit (or roll back) together with the 1m candles
+        """
+        for interval, bucket in KLINE_ROLLUP_INTERVALS.items():
+            source_table, count_expression = self._source_for(interval)
+            upsert_rollup: str = (
+                f"INSERT INTO {self._tables[interval].name} ({ROLLUP_COLUMNS}, updated_at) "
+                "SELECT symbol, bucket_open_time, "
+                "bucket_open_time + CAST(:bucket AS INTERVAL) - INTERVAL '1 millisecond', "
+                "open_price, high_price, low_price, close_price, volume, quote_asset_volume, number_of_trades, "
+                "taker_buy_base_asset_vol, taker_buy_quote_asset_vol, candle_count, now() "
+                f"FROM ({aggregate_klines_query(source_table, count_expression)}) AS buckets "
+                "ON CONFLICT (symbol, kline_open_time) DO UPDATE SET "
+                "kline_close_time = EXCLUDED.kline_close_time, open_price = EXCLUDED.open_price, "
+                "high_price = EXCLUDED.high_price, low_price = EXCLUDED.low_price, "
+                "close_price = EXCLUDED.close_price, volume = EXCLUDED.volume, "
+                "quote_asset_volume = EXCLUDED.quote_asset_volume, number_of_trades = EXCLUDED.number_of_trades, "
+                "taker_buy_base_asset_vol = EXCLUDED.taker_buy_base_asset_vol, "
+                "taker_buy_quote_asset_vol = EXCLUDED.taker_buy_quote_asset_vol, "
+                "candle_count = EXCLUDED.candle_count, updated_at = EXCLUDED.updated_at"
+            )
+            try:
+                await async_connection.execute(
+                    text(upsert_rollup),
+                    {
+                        "bucket": bucket,
+                        "symbol": symbol,
+                        "start_time": floor_to_interval(start_open_time, bucket),
+                        "end_time": floor_to_interval(end_open_time, bucket) + bucket,
+                    },
+                )
+            except SQLAlchemyError:
+                logger.exception(f"Failed to refresh {interval} rollup of {symbol}")
+                raise
+
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    async def read_base_klines_frame(
+        self, symbol: str, start_open_time: datetime, end_open_time: datetime
+    ) -> pd.DataFrame:
+        """
+        reads the 1m candles of a symbol opened in [start_open_time, end_open_time) into a DataFrame
+
+        NUMERIC columns are kept as Decimal (object) columns, so resampled rollups are exact, the same as the
+        incremental SQL path; float64 would round 18 digit scale prices and volumes
+        """
+        query: str = (
+            f"SELECT symbol, kline_open_time, {', '.join(KLINE_AGGREGATIONS.keys())} "
+            "FROM binance_klines_prices "
+            "WHERE symbol = :symbol AND kline_open_time >= :start_time AND kline_open_time < :end_time "
+            "ORDER BY kline_open_time"
+        )
+        async with self._engine.begin() as async_conn:
+            cursor_result: CursorResult = await async_conn.execute(
+                text(query),
+                {"symbol": symbol, "start_time": start_open_time, "end_time": end_open_time},
+            )
+        rows: Sequence[Row] = cursor_result.fetchall()
+        klines_df: pd.DataFrame = pd.DataFrame(
+            rows, columns=["symbol", "kline_open_time", *KLINE_AGGREGATIONS.keys()]
+        )
+        klines_df["number_of_trades"] = klines_df["number_of_trades"].astype("int64")
+        klines_df["kline_open_time"] = pd.to_datetime(klines_df["kline_open_time"])
+        return klines_df
+
+    @METRICS.timed("upsert_kline_rollups")
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def upsert_rollup_frame(
+        self, async_connection: AsyncConnection, interval: str, rollup_df: pd.DataFrame
+    ) -> None:
+        """
+        upserts rollup rows produced by src.utils.kline_rollups.resample_klines, from Decimal columns
+        (see read_base_klines_frame)
+        """
+        if rollup_df.empty:
+            return
+        table_name: str = self._tables[interval].name
+        upsert_rollup: str = (
+            f"INSERT INTO {table_name} ({ROLLUP_COLUMNS}, updated_at) VALUES ("
+            ":symbol, :kline_open_time, :kline_close_time, :open_price, :high_price, :low_price, :close_price, "
+            ":volume, :quote_asset_volume, :number_of_trades, :taker_buy_base_asset_vol, "
+            ":taker_buy_quote_asset_vol, :candle_count, now()) "
+            "ON CONFLICT (symbol, kline_open_time) DO UPDATE SET "
+            "kline_close_time = EXCLUDED.kline_close_time, open_price = EXCLUDED.open_price, "
+            "high_price = EXCLUDED.high_price, low_price = EXCLUDED.low_price, "
+            "close_price = EXCLUDED.close_price, volume = EXCLUDED.volume, "
+            "quote_asset_volume = EXCLUDED.quote_asset_volume, number_of_trades = EXCLUDED.number_of_trades, "
+            "taker_buy_base_asset_vol = EXCLUDED.taker_buy_base_asset_vol, "
+            "taker_buy_quote_asset_vol = EXCLUDED.taker_buy_quote_asset_vol, "
+            "candle_count = EXCLUDED.candle_count, updated_at = EXCLUDED.updated_at"
+        )
+        rows_to_upsert: list[dict[str, Any]] = [
+            {
+                **record,
+                "kline_open_time": record["kline_open_time"].to_pydatetime(),
+                "kline_close_time": record["kline_close_time"].to_pydatetime(),
+                "number_of_trades": int(record["number_of_trades"]),
+                "candle_count": int(record["candle_count"]),
+            }
+            for record in rollup_df.to_dict(orient="records")
+        ]
+        try:
+            await async_connection.execute(text(upsert_rollup), rows_to_upsert)
+        except SQLAlchemyError:
+            logger.exception(f"Failed to upsert {interval} rollup frame")
+            raise
+
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    async def read_klines(
+        self,
+        symbol: str,
+        interval: timedelta,
+        start_open_time: datetime,
+        end_open_time: datetime,
+    ) -> list[BinanceKlinePriceDTO]:
+        """
+        reads candles of any whole-minute interval opened in [start_open_time, end_open_time)
+
+        the coarsest rollup which evenly divides the interval is used as the source, e.g
+        - 1h is read straight from binance_klines_1h
+        - 2h is aggregated from 2 rows of binance_klines_1h per candle
+        - 3m falls back to aggregating binance_klines_prices
+        """
+        source_interval: str | None = select_rollup_interval(interval)
+        if source_interval is None:
+            source_table: str = binance_klines_prices_table.name
+            source_duration: timedelta = BASE_KLINE_INTERVAL
+            count_expression: str = "count(*)"
+        else:
+            source_table = self._tables[source_interval].name
+            source_duration = KLINE_ROLLUP_INTERVALS[source_interval]
+            count_expression = "sum(candle_count)"
+
+        if source_duration == interval:
+            query: str = (
+                "SELECT symbol, kline_open_time, kline_close_time, open_price, high_price, low_price, close_price, "
+                "volume, quote_asset_volume, number_of_trades, taker_buy_base_asset_vol, taker_buy_quote_asset_vol "
+                f"FROM {source_table} "
+                "WHERE symbol = :symbol AND kline_open_time >= :start_time AND kline_open_time < :end_time "
+                "ORDER BY kline_open_time"
+            )
+        else:
+            query = (
+                "SELECT symbol, bucket_open_time, "
+                "bucket_open_time + CAST(:bucket AS INTERVAL) - INTERVAL '1 millisecond', "
+                "open_price, high_price, low_price, close_price, volume, quote_asset_volume, number_of_trades, "
+                "taker_buy_base_asset_vol, taker_buy_quote_asset_vol "
+                f"FROM ({aggregate_klines_query(source_table, count_expression)}) AS buckets "
+                "ORDER BY bucket_open_time"
+            )
+        query_text_clause: TextClause = text(query)
+        try:
+            async with self._engine.begin() as async_conn:
+                cursor_result: CursorResult = await async_conn.execute(
+                    query_text_clause,
+                    {
+                        "bucket": interval,
+                        "symbol": symbol,
+                        "start_time": start_open_time,
+                        "end_time": end_open_time,
+                    },
+                )
+            rows: Sequence[Row] = cursor_result.fetchall()
+        except SQLAlchemyError:
+            logger.exception(f"Failed to read {interval} klines of {symbol}")
+            raise
+
+        created_at: datetime = datetime.utcnow()
+        return [
+            BinanceKlinePriceDTO(
+                symbol=single_row[0],
+                kline_open_time=single_row[1],
+                kline_close_time=single_row[2],
+                open_price=single_row[3],
+                high_price=single_row[4],
+                low_price=single_row[5],
+                close_price=single_row[6],
+                volume=single_row[7],
+                quote_asset_volume=single_row[8],
+                number_of_trades=single_row[9],
+                taker_buy_base_asset_vol=single_row[10],
+                taker_buy_quote_asset_vol=single_row[11],
+                created_at=created_at,
+            )
+            for single_row in rows
+        ]
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    rollup_dao: KlineRollupDAO = KlineRollupDAO(os.getenv("BINANCE_PG_CONNECTION_STRING", ""))
+    two_hour_klines: list[BinanceKlinePriceDTO] = asyncio.run(
+        rollup_dao.read_klines(
+            symbol="BTCUSDC",
+            interval=timedelta(hours=2),
+            start_open_time=datetime(2026, 3, 29),
+            end_open_time=datetime(2026, 3, 30),
+        )
+    )
+    print(two_hour_klines)
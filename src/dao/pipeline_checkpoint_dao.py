@@ -0,0 +1,235 @@
+import datetime
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import TextClause, text, CursorResult, Row
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncConnection
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+
+from src.models.database_transfer_objects.pipeline_checkpoint import PipelineCheckpointDTO
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+
+class CheckpointConflictError(Exception):
+    """
+    the checkpoint was moved by someone else (e.g another replica) since the batch was started
+    """
+
+    pass
+
+
+def next_checkpoint_position(
+    current_position: int | None, start_position: int, end_position: int, exclusive: bool
+) -> int | None:
+    """
+    the checkpoint position after the batch start_position to end_position (inclusive), or None to leave it as is
+
+    exclusive: the batch must continue the checkpoint exactly (current_position + 1), else CheckpointConflictError;
+    without a checkpoint yet (current_position None), the first batch may start anywhere (e.g the solana pipeline
+    starts near the finalized slot)
+    otherwise (e.g backfills and replays): the checkpoint only moves if the batch extends it without a gap
+    """
+    if exclusive and current_position is None:
+        return end_position
+    current_position = current_position or 0
+    if exclusive:
+        if start_position != current_position + 1:
+            raise CheckpointConflictError(
+                f"Checkpoint is at {current_position}, batch starts at {start_position}"
+            )
+        return end_position
+    if start_position > current_position + 1 or end_position <= current_position:
+        return None
+    return end_position
+
+
+class PipelineCheckpointDAO:
+    """
+    DAO responsible for the checkpoint of a pipeline shard: a single row, updated in place
+
+    Responsible for
+    - reading the checkpoint; a primary key lookup
+    - advancing it within the transaction of its batch, under pg_advisory_xact_lock; the batch is rolled back if the
+      checkpoint was moved meanwhile (CheckpointConflictError)
+    - appending every advance to pipeline_checkpoint_history, for audit
+    - leader election: only the replica holding the session advisory lock of the shard runs; the others are standbys
+
+    Tables: pipeline_checkpoint, pipeline_checkpoint_history
+    """
+
+    def __init__(self, connection_string: str, pipeline_name: str, shard: int = 0) -> None:
+        self._engine: AsyncEngine = create_async_engine(connection_string)
+        self._pipeline_name: str = pipeline_name
+        self._shard: int = shard
+
+    @retry(
+        retry=retry_if_exception_type(SQLAlchemyError),
+        wait=wait_exponential(multiplier=0.1, exp_base=1.5, max=0.3375),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def read_checkpoint(self) -> PipelineCheckpointDTO | None:
+        async with self._engine.begin() as async_conn:
+            cursor_result: CursorResult = await async_conn.execute(
+                text(
+                    "SELECT pipeline_name, shard, position, updated_at FROM pipeline_checkpoint "
+                    "WHERE pipeline_name = :pipeline_name AND shard = :shard"
+                ),
+                {"pipeline_name": self._pipeline_name, "shard": self._shard},
+            )
+
+        single_row: Row | None = cursor_result.fetchone()
+        if not single_row:
+            return None
+        return PipelineCheckpointDTO(
+            pipeline_name=single_row[0],
+            shard=single_row[1],
+            position=single_row[2],
+            updated_at=single_row[3],
+        )
+
+    @METRICS.timed("advance_pipeline_checkpoint")
+    async def advance(
+        self,
+        async_connection: AsyncConnection,
+        start_position: int,
+        end_position: int,
+        exclusive: bool = True,
+    ) -> None:
+        """
+        moves the checkpoint to end_position once the batch start_position to end_position is published, as decided by
+        next_checkpoint_position; not retried, a failed statement aborts the whole batch transaction anyway
+
+        the transaction lock serializes every advance of the shard, including the very first (no row to lock yet);
+        it is released with the batch transaction
+        """
+        await async_connection.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:lock_name), :shard)"),
+            {"lock_name": f"checkpoint:{self._pipeline_name}", "shard": self._shard},
+        )
+        current_position: int | None = (
+            await async_connection.execute(
+                text(
+                    "SELECT position FROM pipeline_checkpoint "
+                    "WHERE pipeline_name = :pipeline_name AND shard = :shard"
+                ),
+                {"pipeline_name": self._pipeline_name, "shard": self._shard},
+            )
+        ).scalar_one_or_none()
+        position: int | None = next_checkpoint_position(
+            current_position=current_position,
+            start_position=start_position,
+            end_position=end_position,
+            exclusive=exclusive,
+        )
+        if position is None:
+            return
+
+        now: datetime.datetime = datetime.datetime.utcnow()
+        upsert_checkpoint: TextClause = text(
+            "INSERT INTO pipeline_checkpoint(pipeline_name, shard, position, updated_at) "
+            "VALUES (:pipeline_name, :shard, :position, :updated_at) "
+            "ON CONFLICT (pipeline_name, shard) DO UPDATE "
+            "SET position = EXCLUDED.position, updated_at = EXCLUDED.updated_at"
+        )
+        await async_connection.execute(
+            upsert_checkpoint,
+            {
+                "pipeline_name": self._pipeline_name,
+                "shard": self._shard,
+                "position": position,
+                "updated_at": now,
+            },
+        )
+        await async_connection.execute(
+            text(
+                "INSERT INTO pipeline_checkpoint_history(pipeline_name, shard, position, created_at) "
+                "VALUES (:pipeline_name, :shard, :position, :created_at)"
+            ),
+            {
+                "pipeline_name": self._pipeline_name,
+                "shard": self._shard,
+                "position": position,
+                "created_at": now,
+            },
+        )
+
+    async def reset(self, async_connection: AsyncConnection) -> bool:
+        """
+        deletes the checkpoint, so the next run starts over; e.g after its tables lost their rows (BulkLoadMode)
+        the reset is recorded in pipeline_checkpoint_history as position 0; returns whether there was a checkpoint
+        """
+        await async_connection.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:lock_name), :shard)"),
+            {"lock_name": f"checkpoint:{self._pipeline_name}", "shard": self._shard},
+        )
+        deleted: CursorResult = await async_connection.execute(
+            text(
+                "DELETE FROM pipeline_checkpoint "
+                "WHERE pipeline_name = :pipeline_name AND shard = :shard"
+            ),
+            {"pipeline_name": self._pipeline_name, "shard": self._shard},
+        )
+        if not deleted.rowcount:
+            return False
+        await async_connection.execute(
+            text(
+                "INSERT INTO pipeline_checkpoint_history(pipeline_name, shard, position, created_at) "
+                "VALUES (:pipeline_name, :shard, 0, :created_at)"
+            ),
+            {
+                "pipeline_name": self._pipeline_name,
+                "shard": self._shard,
+                "created_at": datetime.datetime.utcnow(),
+            },
+        )
+        return True
+
+    @asynccontextmanager
+    async def leadership(self) -> AsyncIterator[bool]:
+        """
+        yields whether this replica is the leader of the shard, i.e holds its session advisory lock; never waits for it
+
+        the lock is held by a dedicated connection for the whole block, and released at the end of it
+        if that connection is lost, the lock goes with it and a standby may take over; advance still rejects any
+        batch overlapping the new leader's, so no block is ingested twice
+        """
+        lock_parameters: dict[str, str | int] = {
+            "lock_name": f"leader:{self._pipeline_name}",
+            "shard": self._shard,
+        }
+        async with self._engine.connect() as async_connection:
+            is_leader: bool = bool(
+                (
+                    await async_connection.execute(
+                        text("SELECT pg_try_advisory_lock(hashtext(:lock_name), :shard)"),
+                        lock_parameters,
+                    )
+                ).scalar_one()
+            )
+            # the session lock outlives the transaction; nothing stays idle in transaction meanwhile
+            await async_connection.commit()
+            try:
+                yield is_leader
+            finally:
+                if is_leader:
+                    try:
+                        # a pooled connection is reused, not closed; its session lock has to be released explicitly
+                        await async_connection.execute(
+                            text("SELECT pg_advisory_unlock(hashtext(:lock_name), :shard)"),
+                            lock_parameters,
+                        )
+                        await async_connection.commit()
+                    except SQLAlchemyError:
+                        logger.exception(
+                            f"Unable to release the leader lock of {self._pipeline_name}, shard {self._shard}"
+                        )
+                        # closing the connection releases the lock with its session
+                        await async_connection.invalidate()
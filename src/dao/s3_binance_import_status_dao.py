@@ -21,6 +21,7 @@ import logging
 from database_management.binance.binance_table import s3_to_db_import_status_table
 from src.models.database_transfer_objects.s3_import_status import S3ToDBImportStatusDTO
 from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
 
 logger = logging.getLogger(__name__)
 setup_logging(logger)
@@ -31,10 +32,12 @@ class S3ImportStatusDAO:
         self._engine: AsyncEngine = create_async_engine(connection_string)
         self._table: Table = s3_to_db_import_status_table
 
+    @METRICS.timed("insert_s3_import_status")
     @retry(
         wait=wait_fixed(0.01), # ~10ms before attempts
         stop=stop_after_attempt(5), # equivalent to 5 retries
-        reraise=True
+        reraise=True,
+        before_sleep=METRICS.record_retry,
     )
     async def insert_latest_import_status(
         self, import_status: S3ToDBImportStatusDTO, conn: AsyncConnection
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from sqlalchemy import CursorResult, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+
+from src.utils.metrics import METRICS
+
+
+class S3ExportWatermarkDAO:
+    """
+    DAO responsible for the watermarks of incremental exports to s3
+
+    Responsible for
+    - reading the watermark of a table; None before its first export
+    - moving it, once every file of an export is uploaded
+
+    Table: s3_export_watermark
+    """
+
+    def __init__(self, connection_string: str) -> None:
+        self._engine: AsyncEngine = create_async_engine(connection_string)
+
+    @retry(
+        retry=retry_if_exception_type(SQLAlchemyError),
+        wait=wait_exponential(multiplier=0.1, exp_base=1.5, max=0.3375),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def read_watermark(self, table_name: str) -> datetime | None:
+        async with self._engine.begin() as async_conn:
+            cursor_result: CursorResult = await async_conn.execute(
+                text("SELECT exported_until FROM s3_export_watermark WHERE table_name = :table_name"),
+                {"table_name": table_name},
+            )
+        return cursor_result.scalar_one_or_none()
+
+    @retry(
+        retry=retry_if_exception_type(SQLAlchemyError),
+        wait=wait_exponential(multiplier=0.1, exp_base=1.5, max=0.3375),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def update_watermark(self, table_name: str, exported_until: datetime) -> None:
+        async with self._engine.begin() as async_conn:
+            await async_conn.execute(
+                text(
+                    "INSERT INTO s3_export_watermark(table_name, exported_until, updated_at) "
+                    "VALUES (:table_name, :exported_until, :updated_at) "
+                    "ON CONFLICT (table_name) DO UPDATE "
+                    "SET exported_until = EXCLUDED.exported_until, updated_at = EXCLUDED.updated_at"
+                ),
+                {
+                    "table_name": table_name,
+                    "exported_until": exported_until,
+                    "updated_at": datetime.utcnow(),
+                },
+            )
@@ -7,6 +7,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncConnection
 from sqlalchemy import (
     Table,
+    delete,
     insert,
     Insert,
     Select,
@@ -21,6 +22,7 @@ import logging
 from database_management.chainstack.tables import s3_import_status_table
 from src.models.database_transfer_objects.s3_import_status import S3ToDBImportStatusDTO
 from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
 
 logger = logging.getLogger(__name__)
 setup_logging(logger)
@@ -31,10 +33,12 @@ class S3ImportStatusDAO:
         self._engine: AsyncEngine = create_async_engine(connection_string)
         self._table: Table = s3_import_status_table
 
+    @METRICS.timed("insert_s3_import_status")
     @retry(
         wait=wait_fixed(0.01), # ~10ms before attempts
         stop=stop_after_attempt(5), # equivalent to 5 retries
-        reraise=True
+        reraise=True,
+        before_sleep=METRICS.record_retry,
     )
     async def insert_latest_import_status(
         self, import_status: S3ToDBImportStatusDTO, conn: AsyncConnection
@@ -48,6 +52,16 @@ class S3ImportStatusDAO:
             logger.exception("Failed to insert latest import status")
             raise
 
+    async def reset(self, conn: AsyncConnection, data_source: str) -> bool:
+        """
+        deletes the import status of data_source, so every file is loaded again; e.g after its table lost its rows
+        (BulkLoadMode); returns whether there was one
+        """
+        deleted: CursorResult = await conn.execute(
+            delete(self._table).where(self._table.c.data_source == data_source)
+        )
+        return bool(deleted.rowcount)
+
     @retry(
         wait=wait_fixed(0.01),  # ~10ms before attempts
         stop=stop_after_attempt(5),  # equivalent to 5 retries
@@ -0,0 +1,109 @@
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
+from tenacity import retry, stop_after_attempt, wait_fixed
+
+from src.dao.copy_utils import copy_records_into_table
+from src.models.database_transfer_objects.sol_block import SolBlockDTO, SolTransactionDTO
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+SOL_BLOCK_COLUMNS: tuple[str, ...] = (
+    "slot",
+    "block_height",
+    "block_time",
+    "blockhash",
+    "parent_slot",
+    "previous_blockhash",
+    "transaction_count",
+    "created_at",
+)
+
+SOL_TRANSACTION_COLUMNS: tuple[str, ...] = (
+    "signature",
+    "slot",
+    "transaction_index",
+    "fee",
+    "compute_units_consumed",
+    "err",
+    "version",
+    "created_at",
+)
+
+
+class SolBlockDAO:
+    """
+    DAO responsible for bulk loading solana blocks, and their transactions
+
+    Tables: sol_block, sol_transaction
+    """
+
+    @METRICS.timed("copy_sol_block")
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def insert_blocks(
+        self, async_connection: AsyncConnection, input: list[SolBlockDTO]
+    ) -> None:
+        try:
+            await copy_records_into_table(
+                async_connection=async_connection,
+                table_name="sol_block",
+                columns=SOL_BLOCK_COLUMNS,
+                records=[
+                    (
+                        single_input.slot,
+                        single_input.block_height,
+                        single_input.block_time,
+                        single_input.blockhash,
+                        single_input.parent_slot,
+                        single_input.previous_blockhash,
+                        single_input.transaction_count,
+                        single_input.created_at,
+                    )
+                    for single_input in input
+                ],
+            )
+        except SQLAlchemyError:
+            logger.exception("Unable to copy blocks into sol_block")
+            raise
+
+    @METRICS.timed("copy_sol_transaction")
+    @retry(
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def insert_transactions(
+        self, async_connection: AsyncConnection, input: list[SolTransactionDTO]
+    ) -> None:
+        try:
+            await copy_records_into_table(
+                async_connection=async_connection,
+                table_name="sol_transaction",
+                columns=SOL_TRANSACTION_COLUMNS,
+                records=[
+                    (
+                        single_input.signature,
+                        single_input.slot,
+                        single_input.transaction_index,
+                        single_input.fee,
+                        single_input.compute_units_consumed,
+                        single_input.err,
+                        single_input.version,
+                        single_input.created_at,
+                    )
+                    for single_input in input
+                ],
+            )
+        except SQLAlchemyError:
+            logger.exception("Unable to copy transactions into sol_transaction")
+            raise
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
+
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+
+class StagedRows:
+    """
+    the rows of a batch for a single table; records are tuples in columns order
+    """
+
+    def __init__(
+        self, table_name: str, columns: Sequence[str], records: Sequence[tuple[Any, ...]]
+    ) -> None:
+        self.table_name: str = table_name
+        self.columns: Sequence[str] = columns
+        self.records: Sequence[tuple[Any, ...]] = records
+        # unlogged, and unique to the batch; a temporary table would only be visible to the connection copying into it
+        self.staging_table_name: str = f"stage_{uuid.uuid4().hex[:12]}_{table_name}"
+
+
+class StagedBatchLoader:
+    """
+    Loads a batch of rows into several tables, with the tables loaded in parallel, and still all or nothing
+
+    Responsible for
+    1. staging: every table's rows are COPY-ed into an unlogged staging table, each on its own pooled connection,
+       all in parallel; a single asyncpg connection runs one statement at a time, so this is the only way to overlap them
+    2. publishing: a single short transaction moves every staging table into its table (INSERT ... SELECT, in the
+       given order; foreign keys still apply), then runs publish (e.g advancing the import status)
+    3. dropping the staging tables, whether the batch was published or not
+
+    Nothing is visible until the publish transaction commits; publishing only moves rows within the server
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine: AsyncEngine = engine
+
+    async def load(
+        self,
+        rows: Sequence[StagedRows],
+        publish: Callable[[AsyncConnection], Awaitable[None]],
+    ) -> None:
+        """
+        rows must be ordered by foreign key: referenced tables first
+        """
+        rows_to_stage: list[StagedRows] = [single_rows for single_rows in rows if single_rows.records]
+        try:
+            with METRICS.timer("stage"):
+                await asyncio.gather(*[self._stage(single_rows) for single_rows in rows_to_stage])
+            with METRICS.timer("publish"):
+                async with self._engine.begin() as async_connection:
+                    for single_rows in rows_to_stage:
+                        column_list: str = ", ".join(single_rows.columns)
+                        # existing rows (e.g from a replayed batch) are skipped, as with copy_records_into_table
+                        await async_connection.execute(
+                            text(
+                                f"INSERT INTO {single_rows.table_name} ({column_list}) "
+                                f"SELECT {column_list} FROM {single_rows.staging_table_name} "
+                                f"ON CONFLICT DO NOTHING"
+                            )
+                        )
+                    await publish(async_connection)
+        finally:
+            await self._drop_staging_tables(rows_to_stage)
+
+    @retry(
+        retry=retry_if_exception_type(SQLAlchemyError),
+        wait=wait_fixed(0.01),
+        stop=stop_after_attempt(5),
+        reraise=True,
+        before_sleep=METRICS.record_retry,
+    )
+    async def _stage(self, rows: StagedRows) -> None:
+        async with self._engine.begin() as async_connection:
+            # a retried stage starts over from an empty staging table
+            await async_connection.execute(text(f"DROP TABLE IF EXISTS {rows.staging_table_name}"))
+            await async_connection.execute(
+                text(
+                    f"CREATE UNLOGGED TABLE {rows.staging_table_name} "
+                    f"(LIKE {rows.table_name} INCLUDING DEFAULTS)"
+                )
+            )
+            dbapi_pooled_conn = await async_connection.get_raw_connection()
+            dbapi_conn = dbapi_pooled_conn.driver_connection
+            await dbapi_conn.copy_records_to_table(  # type: ignore[union-attr]
+                rows.staging_table_name, records=rows.records, columns=list(rows.columns)
+            )
+
+    async def _drop_staging_tables(self, rows: Sequence[StagedRows]) -> None:
+        if not rows:
+            return
+        try:
+            async with self._engine.begin() as async_connection:
+                for single_rows in rows:
+                    await async_connection.execute(
+                        text(f"DROP TABLE IF EXISTS {single_rows.staging_table_name}")
+                    )
+        except SQLAlchemyError:
+            # never hides the error of the load itself; a leftover staging table is only wasted space
+            logger.exception("Unable to drop staging tables")
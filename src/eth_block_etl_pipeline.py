@@ -0,0 +1,763 @@
+import asyncio
+import logging
+import time
+from asyncio import Future
+from contextlib import aclosing
+from functools import partial
+from typing import Any, Callable, Generic, Sequence, TypeVar
+
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncConnection, AsyncEngine
+
+from database_management.chainstack.tables import (
+    eth_blob_metrics_table,
+    eth_block_table,
+    eth_logs_table,
+    eth_receipts_table,
+    eth_transaction_access_list_table,
+    eth_transaction_table,
+    eth_withdrawals_table,
+)
+from src.dao.bulk_load import BulkLoadMode
+from src.dao.eth_blob_metrics_dao import BLOB_METRICS_COLUMNS, EthBlobMetricsDAO
+from src.dao.eth_block_dao import BLOCK_COLUMNS, EthBlockDAO
+from src.dao.eth_transaction_access_list_dao import (
+    ACCESS_LIST_COLUMNS,
+    EthTransactionAccessListDAO,
+)
+from src.dao.eth_transactions_dao import TRANSACTION_COLUMNS, EthTransactionDAO
+from src.dao.eth_logs_dao import LOG_COLUMNS, EthLogDAO
+from src.dao.eth_receipts_dao import RECEIPT_COLUMNS, EthReceiptDAO
+from src.dao.eth_withdrawals_dao import WITHDRAWAL_COLUMNS, EthWithdrawalDAO
+from src.dao.pipeline_checkpoint_dao import PipelineCheckpointDAO
+from src.dao.staged_batch_loader import StagedBatchLoader, StagedRows
+from src.extractors.abstract_extractor import BaseExtractor
+from src.extractors.chain_stack_block_extractor import ChainStackBlockExtractor
+from src.extractors.chain_stack_fee_history_extractor import ChainStackFeeHistoryExtractor
+from src.models.chain_stack_models.eth_access_list_item import ChainStackEthAccessListItem
+from src.models.chain_stack_models.eth_blocks import (
+    ChainStackEthBlockInformationResponse,
+)
+from src.models.chain_stack_models.eth_fee_history import ChainStackEthFeeHistoryResponse
+from src.models.chain_stack_models.eth_receipt import ChainStackEthBlockReceiptsResponse
+from src.models.chain_stack_models.eth_transaction import ChainStackEthTransaction
+from src.models.database_transfer_objects.eth_blob_metrics import EthBlobMetricsDTO
+from src.models.database_transfer_objects.eth_blocks import EthBlockDTO
+from src.models.database_transfer_objects.eth_log import EthLogDTO
+from src.models.database_transfer_objects.eth_receipt import EthReceiptDTO
+from src.models.database_transfer_objects.eth_transaction import EthTransactionDTO
+from src.models.database_transfer_objects.eth_transaction_access_list import (
+    EthTransactionAccessListDTO,
+)
+from src.models.database_transfer_objects.eth_withdrawals import EthWithdrawalDTO
+from src.models.database_transfer_objects.pipeline_checkpoint import PipelineCheckpointDTO
+from src.models.quick_node_models.eth_access_list_item import QuickNodeEthAccessListItem
+from src.models.quick_node_models.eth_blocks import QuickNodeEthBlockInformationResponse
+from src.models.quick_node_models.eth_transaction import QuickNodeEthTransaction
+from src.utils.logging_utils import setup_logging
+from src.utils.adaptive_batch import AdaptiveBatchController, BatchResult
+from src.utils.metrics import METRICS
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+ETH_BLOCK = TypeVar(
+    "ETH_BLOCK", QuickNodeEthBlockInformationResponse, ChainStackEthBlockInformationResponse
+)
+
+# every table a batch of blocks is loaded into; switched into bulk load mode by backfill(bulk_mode=True)
+ETH_BLOCK_TABLES: list[Table] = [
+    eth_block_table,
+    eth_transaction_table,
+    eth_withdrawals_table,
+    eth_transaction_access_list_table,
+    eth_receipts_table,
+    eth_logs_table,
+    eth_blob_metrics_table,
+]
+
+# the pipeline_checkpoint row of the eth tables; one per database, whichever provider fills them
+ETH_BLOCKS_CHECKPOINT: str = "eth_blocks"
+
+EthBlockDTOs = tuple[
+    list[EthBlockDTO],
+    list[EthTransactionDTO],
+    list[EthWithdrawalDTO],
+    list[EthTransactionAccessListDTO],
+]
+
+
+async def no_results() -> list[Any]:
+    """
+    stands in for an optional extraction stage which is disabled
+    """
+    return []
+
+
+class EthBlockDTOMapper:
+    """
+    Converts the blocks (and receipts) of any ETH provider into DTOs
+
+    Both providers serve the same JSON-RPC payloads, so a single mapper serves both;
+    subclass it to change how a provider's blocks are mapped
+    """
+
+    @staticmethod
+    def transaction_to_dtos(
+        block_id: int | None, input: QuickNodeEthTransaction | ChainStackEthTransaction
+    ) -> tuple[EthTransactionDTO, list[EthTransactionAccessListDTO]]:
+        """
+        a transaction, and its access list items
+        """
+        eth_transaction_dto: EthTransactionDTO = EthTransactionDTO.from_eth_transaction(
+            block_id=block_id, input=input
+        )
+        # a Sequence of either item, so mypy keeps the item types; list[A] | list[B] is iterated as BaseModel
+        access_list: Sequence[QuickNodeEthAccessListItem | ChainStackEthAccessListItem] = (
+            input.accessList or []
+        )
+        access_list_item_dtos: list[EthTransactionAccessListDTO] = [
+            EthTransactionAccessListDTO.from_eth_access_list_item(
+                transaction_hash=input.hash,
+                position=position,
+                input=single_access_list_item,
+            )
+            for position, single_access_list_item in enumerate(access_list)
+        ]
+        return eth_transaction_dto, access_list_item_dtos
+
+    @staticmethod
+    def receipts_to_dto(
+        input: list[ChainStackEthBlockReceiptsResponse],
+    ) -> tuple[list[EthReceiptDTO], list[EthLogDTO]]:
+        """
+        flattens the receipts of every block into receipt DTOs, and their logs into log DTOs
+        """
+        batch_of_receipts_dto: list[EthReceiptDTO] = []
+        batch_of_logs_dto: list[EthLogDTO] = []
+        for single_block_receipts in input:
+            for single_receipt in single_block_receipts.result:
+                batch_of_receipts_dto.append(
+                    EthReceiptDTO.from_eth_receipt(
+                        block_number=single_block_receipts.block_number,
+                        input=single_receipt,
+                    )
+                )
+                batch_of_logs_dto.extend(
+                    EthLogDTO.from_eth_log(
+                        block_number=single_block_receipts.block_number, input=single_log
+                    )
+                    for single_log in single_receipt.logs
+                )
+        return batch_of_receipts_dto, batch_of_logs_dto
+
+    @staticmethod
+    def blob_metrics_to_dto(
+        input: list[QuickNodeEthBlockInformationResponse]
+        | list[ChainStackEthBlockInformationResponse],
+        fee_histories: list[ChainStackEthFeeHistoryResponse],
+    ) -> list[EthBlobMetricsDTO]:
+        """
+        the blob gas and fees of every block; fees are looked up in the fee histories covering the block, if any
+        """
+        fees_by_block_number: dict[int, tuple[str, str | None, float | None]] = {}
+        for single_fee_history in fee_histories:
+            fee_history = single_fee_history.result
+            for index, block_number in enumerate(single_fee_history.block_numbers()):
+                fees_by_block_number[block_number] = (
+                    fee_history.baseFeePerGas[index],
+                    fee_history.baseFeePerBlobGas[index] if fee_history.baseFeePerBlobGas else None,
+                    fee_history.blobGasUsedRatio[index] if fee_history.blobGasUsedRatio else None,
+                )
+        batch_of_blob_metrics_dto: list[EthBlobMetricsDTO] = []
+        for single_block in input:
+            base_fee_per_gas, blob_base_fee, blob_gas_used_ratio = fees_by_block_number.get(
+                int(single_block.block_number, 16), (None, None, None)
+            )
+            batch_of_blob_metrics_dto.append(
+                EthBlobMetricsDTO.from_block(
+                    single_block,
+                    base_fee_per_gas=base_fee_per_gas,
+                    blob_base_fee=blob_base_fee,
+                    blob_gas_used_ratio=blob_gas_used_ratio,
+                )
+            )
+        return batch_of_blob_metrics_dto
+
+    @staticmethod
+    def blocks_to_dto(
+        input: list[QuickNodeEthBlockInformationResponse]
+        | list[ChainStackEthBlockInformationResponse],
+    ) -> EthBlockDTOs:
+        """
+        every block is converted into 4 types of DTOs:
+        - Block
+        - Transaction
+            - Transaction Access List Item
+        - Withdrawal
+        """
+        batch_of_blocks_dto: list[EthBlockDTO] = []
+        batch_of_transactions_dto: list[EthTransactionDTO] = []
+        batch_of_withdrawals_dto: list[EthWithdrawalDTO] = []
+        batch_of_transactions_access_list_items_dto: list[
+            EthTransactionAccessListDTO
+        ] = []
+
+        for single_block in input:
+            eth_block_dto: EthBlockDTO = EthBlockDTO.from_block_information_response(
+                single_block
+            )
+            withdrawal_dto_list: list[EthWithdrawalDTO] = [
+                EthWithdrawalDTO.from_quick_node_withdrawal(
+                    block_number=single_block.block_number, input=single_withdrawal
+                )
+                for single_withdrawal in single_block.result.withdrawals
+            ]
+            transaction_dto_list: list[EthTransactionDTO] = []
+            access_list_items_dto_list: list[EthTransactionAccessListDTO] = []
+
+            for single_transaction in single_block.result.transactions:
+                (
+                    eth_transaction_dto,
+                    single_transaction_eth_access_list_items,
+                ) = EthBlockDTOMapper.transaction_to_dtos(
+                    block_id=single_block.id, input=single_transaction
+                )
+                transaction_dto_list.append(eth_transaction_dto)
+                access_list_items_dto_list.extend(
+                    single_transaction_eth_access_list_items
+                )
+
+            batch_of_blocks_dto.append(eth_block_dto)
+            batch_of_transactions_dto.extend(transaction_dto_list)
+            batch_of_withdrawals_dto.extend(withdrawal_dto_list)
+            batch_of_transactions_access_list_items_dto.extend(
+                access_list_items_dto_list
+            )
+        return (
+            batch_of_blocks_dto,
+            batch_of_transactions_dto,
+            batch_of_withdrawals_dto,
+            batch_of_transactions_access_list_items_dto,
+        )
+
+
+class EthBlockProviderAdapter(Generic[ETH_BLOCK]):
+    """
+    Everything EthBlockETLPipeline needs to know about a provider
+
+    - name: names the pipeline's metrics and batch size decisions, e.g chainstack_eth_blocks
+    - connection_string: every provider is loaded into its own database
+    - extractor: extracts the provider's blocks, by block number
+    - receipts_extractor: if given, every batch also loads eth_receipts and eth_logs, atomically with its blocks
+    - fee_history_extractor: if given, every batch also loads eth_blob_metrics; a single eth_feeHistory call per batch
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connection_string: str,
+        extractor: BaseExtractor[int, ETH_BLOCK],
+        receipts_extractor: BaseExtractor[int, ChainStackEthBlockReceiptsResponse] | None = None,
+        fee_history_extractor: ChainStackFeeHistoryExtractor | None = None,
+    ) -> None:
+        self.name: str = name
+        self.connection_string: str = connection_string
+        self.extractor: BaseExtractor[int, ETH_BLOCK] = extractor
+        self.receipts_extractor: (
+            BaseExtractor[int, ChainStackEthBlockReceiptsResponse] | None
+        ) = receipts_extractor
+        self.fee_history_extractor: ChainStackFeeHistoryExtractor | None = fee_history_extractor
+
+    async def close(self) -> None:
+        """
+        closes the pooled connections of every extractor
+        """
+        for extractor in (self.extractor, self.receipts_extractor, self.fee_history_extractor):
+            if extractor is not None:
+                await extractor.close()
+
+
+class EthBlockETLPipeline(Generic[ETH_BLOCK]):
+    """
+    Ingests ethereum blocks from any provider into postgres
+
+    Responsible for
+    - extracting batches of blocks (and receipts) through the provider adapter
+    - converting them into DTOs with the DTO mapper, block by block as each one is extracted
+    - loading every batch, its tables in parallel, then publishing it with its checkpoint in a single transaction
+    - running only on the leader replica (PipelineCheckpointDAO.leadership); the others are hot standbys
+    - sizing every batch from the weight and commit latency of the last (AdaptiveBatchController)
+    """
+
+    def __init__(
+        self,
+        provider: EthBlockProviderAdapter[ETH_BLOCK],
+        checkpoint_dao: PipelineCheckpointDAO,
+        block_dao: EthBlockDAO,
+        transaction_dao: EthTransactionDAO,
+        transaction_access_list_dao: EthTransactionAccessListDAO,
+        withdrawal_dao: EthWithdrawalDAO,
+        dto_mapper: EthBlockDTOMapper | None = None,
+        batch_size: int = 100,
+        streaming: bool = False,
+        batch_controller: AdaptiveBatchController | None = None,
+    ) -> None:
+        """
+        with streaming, block responses are parsed incrementally, and each transaction is converted to DTOs as soon as
+        it is read; requires a ChainStackBlockExtractor, and bypasses its raw block cache
+        """
+        if streaming and not isinstance(provider.extractor, ChainStackBlockExtractor):
+            raise ValueError("streaming requires a ChainStackBlockExtractor")
+        self._provider: EthBlockProviderAdapter[ETH_BLOCK] = provider
+        self._engine: AsyncEngine = create_async_engine(provider.connection_string)
+        self._checkpoint_dao: PipelineCheckpointDAO = checkpoint_dao
+        self._block_dao: EthBlockDAO = block_dao
+        self._transaction_dao: EthTransactionDAO = transaction_dao
+        self._transaction_access_list_dao: EthTransactionAccessListDAO = (
+            transaction_access_list_dao
+        )
+        self._withdrawal_dao: EthWithdrawalDAO = withdrawal_dao
+        self._receipt_dao: EthReceiptDAO = EthReceiptDAO()
+        self._log_dao: EthLogDAO = EthLogDAO()
+        self._blob_metrics_dao: EthBlobMetricsDAO = EthBlobMetricsDAO()
+        self._staged_batch_loader: StagedBatchLoader = StagedBatchLoader(self._engine)
+        self._dto_mapper: EthBlockDTOMapper = dto_mapper or EthBlockDTOMapper()
+        self._batch_size: int = batch_size
+        # batch_size is only the initial size; every batch is then sized by the weight and commit latency of the last
+        self._batch_controller: AdaptiveBatchController = (
+            batch_controller
+            or AdaptiveBatchController(name=provider.name, initial_batch_size=batch_size)
+        )
+        self._streaming: bool = streaming
+
+    async def run(
+        self, progress_callback: Callable[[int, int], None] | None = None
+    ) -> None:
+        """
+        Entry point of ETLPipeline
+
+        Runs the ETL Pipeline to
+        1. Fetch latest ingested eth block_number from the pipeline checkpoint
+        2. Fetch current latest block_number of the provider
+        3. Extract and Load
+            Extract the new ethereum blocks from the provider (latest ingest eth block_number + 1 to current latest block number)
+            - Done in batches, of (initially) 100
+                3.1: Extract 100 block information from the provider
+                3.2: Convert the 100 blocks (service level data class) into DTOs (This is nested, you will get 4 types of DTOs from a single block)
+                    - Block
+                    - Transaction
+                        - Transaction Access List Item
+                    - Withdrawal
+                3.3 Insert all into postgres (DAO)
+                3.4 Advance the pipeline checkpoint to the latest block number
+
+        Step 3 must be atomic; single transaction; all or nothing.
+            - We don't want to miss out any blocks
+            - If any fails, we rollback, and let next run fix it
+
+        Only the leader replica runs; on a standby, run returns right away
+
+        progress_callback, if given, is called after every committed batch with
+        (end block number of the batch, number of blocks in the batch)
+        """
+        try:
+            async with self._checkpoint_dao.leadership() as is_leader:
+                if not is_leader:
+                    logger.info(f"{self._provider.name} is led by another replica; standing by")
+                    return
+                await self._run_as_leader(progress_callback)
+        finally:
+            await self._provider.close()
+
+    async def _run_as_leader(self, progress_callback: Callable[[int, int], None] | None) -> None:
+        # Step 1: Fetch latest ingested eth block_number from the pipeline checkpoint
+        checkpoint: PipelineCheckpointDTO | None = await self._checkpoint_dao.read_checkpoint()
+        # if the checkpoint doesn't exist; first time ingesting
+        start_block_number: int = (checkpoint.position if checkpoint is not None else 0) + 1
+        # Step 2: Fetch current latest block_number of the provider
+        # IMPORTANT: THIS SINGLE LINE PROTECTS YOUR WALLET
+        # Temporarily ingest 100 blocks per run
+        end_block_number: str = hex(
+            start_block_number + 100
+        )  # await get_latest_block_number()
+        end_block_number_int: int = int(end_block_number[2:], 16)
+
+        with METRICS.run(self._provider.name):
+            start: int = start_block_number
+            while start <= end_block_number_int:
+                # Step 3: Extract, and Load
+                batch_end_block_number: int = min(
+                    start + self._batch_controller.batch_size - 1, end_block_number_int
+                )
+                batch_result: BatchResult = await self.run_for_batch(
+                    start, batch_end_block_number
+                )
+                self._batch_controller.record_batch(batch_result)
+                if progress_callback is not None:
+                    progress_callback(
+                        batch_end_block_number, batch_end_block_number - start + 1
+                    )
+                start = batch_end_block_number + 1
+
+    async def replay(self, start_block_number: int, end_block_number: int) -> None:
+        """
+        Re-ingests blocks start_block_number to end_block_number (inclusive) from the raw block cache,
+        e.g after a change to the DTO mapper or to the table schemas
+
+        Requires an extractor in replay mode; every batch is a local CPU + database job, with no provider calls
+        """
+        await self._run_range(f"{self._provider.name}_replay", start_block_number, end_block_number)
+
+    async def backfill(
+        self, start_block_number: int, end_block_number: int, bulk_mode: bool = False
+    ) -> None:
+        """
+        Ingests the historical blocks start_block_number to end_block_number (inclusive)
+
+        with bulk_mode, the tables are in bulk load mode (BulkLoadMode) for the whole backfill: no foreign key checks,
+        no secondary indexes, no WAL; they are rebuilt, validated and logged again at the end
+        only for initial backfills; a postgres crash meanwhile empties the tables, and the checkpoint is reset with
+        them (see BulkLoadMode); nothing else should read them meanwhile
+        """
+        if not bulk_mode:
+            await self._run_range(
+                f"{self._provider.name}_backfill", start_block_number, end_block_number
+            )
+            return
+        bulk_load_mode: BulkLoadMode = BulkLoadMode(
+            connection_string=self._provider.connection_string,
+            tables=ETH_BLOCK_TABLES,
+            checkpoint_resets=[self._checkpoint_dao.reset],
+        )
+        async with bulk_load_mode.bulk_load():
+            await self._run_range(
+                f"{self._provider.name}_bulk_backfill", start_block_number, end_block_number
+            )
+
+    async def _run_range(
+        self, run_name: str, start_block_number: int, end_block_number: int
+    ) -> None:
+        try:
+            with METRICS.run(run_name):
+                start: int = start_block_number
+                while start <= end_block_number:
+                    batch_end_block_number: int = min(
+                        start + self._batch_controller.batch_size - 1, end_block_number
+                    )
+                    # the checkpoint belongs to run; a range only moves it if it extends it
+                    self._batch_controller.record_batch(
+                        await self.run_for_batch(start, batch_end_block_number, exclusive=False)
+                    )
+                    start = batch_end_block_number + 1
+        finally:
+            await self._provider.close()
+
+    async def run_for_batch(
+        self, start_block_number: int, end_block_number: int, exclusive: bool = True
+    ) -> BatchResult:
+        """
+        Running the ETL pipeline to ingest ethereum blocks from start_block_number to end_block_number
+
+        1 to 100 -> 100 blocks
+
+        1. Use extractor to fetch 100 blocks (service level data class instances)
+        2. Convert the service level data class instances into database transfer objects
+        3. Insert the 100 DTOs into database
+        4. advance the pipeline checkpoint to end_block_number
+
+        All 4 steps must be atomic; under a single transaction. It's all or nothing, so we don't miss out any blocks
+        exclusive: the batch is rolled back unless it continues the checkpoint exactly (CheckpointConflictError);
+        otherwise the checkpoint is only advanced if the batch extends it (PipelineCheckpointDAO.advance)
+
+        If anything goes wrong, panic, raise an exception, and let the data pipeline crash
+        """
+        # Step 3.1 and 3.2: Extract 100 blocks, and convert them into DTOs
+        (
+            batch_of_blocks,
+            (
+                eth_block_dtos,
+                eth_transaction_dtos,
+                eth_withdrawal_dtos,
+                eth_transaction_access_list_dtos,
+            ),
+            eth_receipt_dtos,
+            eth_log_dtos,
+            eth_blob_metrics_dtos,
+        ) = await self.extract_and_convert(start_block_number, end_block_number)
+
+        # Step 3.3 Insert all into postgres (DAO)
+        # both save and insert step must be done with a single shared sqlalcheny.AsyncConnection (to be part of a single transaction)
+        commit_start_time: float = time.perf_counter()
+        await self.insert_dtos_and_update_import_status(
+            eth_block_dtos=eth_block_dtos,
+            eth_transaction_dtos=eth_transaction_dtos,
+            eth_withdrawal_dtos=eth_withdrawal_dtos,
+            eth_transaction_access_list_dtos=eth_transaction_access_list_dtos,
+            start_block_number=start_block_number,
+            end_block_number=end_block_number,
+            exclusive=exclusive,
+            eth_receipt_dtos=eth_receipt_dtos,
+            eth_log_dtos=eth_log_dtos,
+            eth_blob_metrics_dtos=eth_blob_metrics_dtos,
+        )
+        return BatchResult(
+            blocks=len(batch_of_blocks),
+            transactions=len(eth_transaction_dtos),
+            size_bytes=sum(int(single_block.result.size, 16) for single_block in batch_of_blocks),
+            commit_seconds=time.perf_counter() - commit_start_time,
+        )
+
+    async def extract_and_convert(
+        self, start_block_number: int, end_block_number: int
+    ) -> tuple[
+        list[ETH_BLOCK],
+        EthBlockDTOs,
+        list[EthReceiptDTO],
+        list[EthLogDTO],
+        list[EthBlobMetricsDTO],
+    ]:
+        """
+        blocks start_block_number to end_block_number (inclusive), their DTOs, their receipt and log DTOs,
+        and their blob metric DTOs
+
+        receipts and fee history, if any, are fetched concurrently with their blocks
+        blocks are converted as each one is extracted; when streaming, even each transaction is
+        """
+        with METRICS.timer("extract"):
+            if self._streaming:
+                extract_blocks_future: Future = asyncio.ensure_future(
+                    self._extract_streaming(start_block_number, end_block_number)
+                )
+            else:
+                extract_blocks_future = asyncio.ensure_future(
+                    self._extract_and_convert_blocks(start_block_number, end_block_number)
+                )
+            batch_of_receipts: list[ChainStackEthBlockReceiptsResponse]
+            batch_of_fee_histories: list[ChainStackEthFeeHistoryResponse]
+            extracted_blocks, batch_of_receipts, batch_of_fee_histories = await asyncio.gather(
+                extract_blocks_future,
+                (
+                    self._provider.receipts_extractor.extract_many(
+                        range(start_block_number, end_block_number + 1)
+                    )
+                    if self._provider.receipts_extractor is not None
+                    else no_results()
+                ),
+                (
+                    self._provider.fee_history_extractor.extract(
+                        start_block_number, end_block_number
+                    )
+                    if self._provider.fee_history_extractor is not None
+                    else no_results()
+                ),
+            )
+            batch_of_blocks: list[ETH_BLOCK]
+            eth_block_dtos: EthBlockDTOs
+            block_conversion_seconds: float
+            # already converted, block by block, while the rest of the batch was still being extracted
+            batch_of_blocks, eth_block_dtos, block_conversion_seconds = extracted_blocks
+        METRICS.increment("blocks", len(batch_of_blocks))
+
+        conversion_start_time: float = time.perf_counter()
+        eth_receipt_dtos, eth_log_dtos = self._dto_mapper.receipts_to_dto(
+            input=batch_of_receipts
+        )
+        eth_blob_metrics_dtos: list[EthBlobMetricsDTO] = (
+            self._dto_mapper.blob_metrics_to_dto(
+                input=batch_of_blocks, fee_histories=batch_of_fee_histories
+            )
+            if self._provider.fee_history_extractor is not None
+            else []
+        )
+        # a single dto_conversion per batch, including the blocks converted during extraction
+        METRICS.observe(
+            "dto_conversion",
+            block_conversion_seconds + time.perf_counter() - conversion_start_time,
+        )
+        return (
+            batch_of_blocks,
+            eth_block_dtos,
+            eth_receipt_dtos,
+            eth_log_dtos,
+            eth_blob_metrics_dtos,
+        )
+
+    async def _extract_and_convert_blocks(
+        self, start_block_number: int, end_block_number: int
+    ) -> tuple[list[ETH_BLOCK], EthBlockDTOs, float]:
+        """
+        blocks, their DTOs, and the seconds spent converting them
+
+        every block is converted as soon as it is extracted (in completion order), while the slower blocks of the batch
+        are still in flight, instead of after the slowest block has returned
+        """
+        conversion_seconds: float = 0.0
+        batch_of_blocks: list[ETH_BLOCK] = []
+        eth_block_dtos: list[EthBlockDTO] = []
+        eth_transaction_dtos: list[EthTransactionDTO] = []
+        eth_withdrawal_dtos: list[EthWithdrawalDTO] = []
+        eth_transaction_access_list_dtos: list[EthTransactionAccessListDTO] = []
+        async with aclosing(
+            self._provider.extractor.stream(
+                range(start_block_number, end_block_number + 1), ordered=False
+            )
+        ) as extracted_blocks:
+            async for _, single_block in extracted_blocks:
+                batch_of_blocks.append(single_block)
+                conversion_start_time: float = time.perf_counter()
+                block_dtos, transaction_dtos, withdrawal_dtos, access_list_dtos = (
+                    self._dto_mapper.blocks_to_dto(input=[single_block])
+                )
+                conversion_seconds += time.perf_counter() - conversion_start_time
+                eth_block_dtos.extend(block_dtos)
+                eth_transaction_dtos.extend(transaction_dtos)
+                eth_withdrawal_dtos.extend(withdrawal_dtos)
+                eth_transaction_access_list_dtos.extend(access_list_dtos)
+        return (
+            batch_of_blocks,
+            (
+                eth_block_dtos,
+                eth_transaction_dtos,
+                eth_withdrawal_dtos,
+                eth_transaction_access_list_dtos,
+            ),
+            conversion_seconds,
+        )
+
+    async def _extract_streaming(
+        self, start_block_number: int, end_block_number: int
+    ) -> tuple[list[ChainStackEthBlockInformationResponse], EthBlockDTOs, float]:
+        """
+        blocks without transactions, their DTOs, and the seconds spent converting the blocks; every transaction is
+        converted to DTOs as soon as it is read, and its block_id is set once the block is known
+        """
+        assert isinstance(self._provider.extractor, ChainStackBlockExtractor)
+        streamed_blocks: list[
+            tuple[
+                ChainStackEthBlockInformationResponse,
+                list[tuple[EthTransactionDTO, list[EthTransactionAccessListDTO]]],
+            ]
+        ] = await self._provider.extractor.extract_streaming(
+            start_block_number=start_block_number,
+            end_block_number=end_block_number,
+            transaction_converter=partial(self._dto_mapper.transaction_to_dtos, None),
+        )
+        batch_of_blocks: list[ChainStackEthBlockInformationResponse] = [
+            block for block, _ in streamed_blocks
+        ]
+        conversion_start_time: float = time.perf_counter()
+        (
+            eth_block_dtos,
+            eth_transaction_dtos,
+            eth_withdrawal_dtos,
+            eth_transaction_access_list_dtos,
+        ) = self._dto_mapper.blocks_to_dto(input=batch_of_blocks)
+        for single_block, single_block_dtos in streamed_blocks:
+            for eth_transaction_dto, access_list_item_dtos in single_block_dtos:
+                eth_transaction_dto.block_id = single_block.id
+                eth_transaction_dtos.append(eth_transaction_dto)
+                eth_transaction_access_list_dtos.extend(access_list_item_dtos)
+        return (
+            batch_of_blocks,
+            (
+                eth_block_dtos,
+                eth_transaction_dtos,
+                eth_withdrawal_dtos,
+                eth_transaction_access_list_dtos,
+            ),
+            time.perf_counter() - conversion_start_time,
+        )
+
+    async def insert_dtos_and_update_import_status(
+        self,
+        eth_block_dtos: list[EthBlockDTO],
+        eth_transaction_dtos: list[EthTransactionDTO],
+        eth_withdrawal_dtos: list[EthWithdrawalDTO],
+        eth_transaction_access_list_dtos: list[EthTransactionAccessListDTO],
+        start_block_number: int,
+        end_block_number: int,
+        exclusive: bool = True,
+        eth_receipt_dtos: list[EthReceiptDTO] | None = None,
+        eth_log_dtos: list[EthLogDTO] | None = None,
+        eth_blob_metrics_dtos: list[EthBlobMetricsDTO] | None = None,
+    ) -> None:
+        """
+        loads every table of the batch in parallel, each on its own connection (StagedBatchLoader); then a single
+        transaction publishes them all, and advances the pipeline checkpoint to end_block_number
+
+        I.E, if any table fails to load, or the checkpoint was moved meanwhile, nothing is published
+        """
+        staged_rows: list[StagedRows] = [
+            # ordered by foreign key: blocks, then transactions and withdrawals, then access lists
+            StagedRows("eth_blocks", BLOCK_COLUMNS, self._block_dao.to_records(eth_block_dtos)),
+            StagedRows(
+                "eth_transactions",
+                TRANSACTION_COLUMNS,
+                self._transaction_dao.to_records(eth_transaction_dtos),
+            ),
+            StagedRows(
+                "eth_withdrawals",
+                WITHDRAWAL_COLUMNS,
+                self._withdrawal_dao.to_records(eth_withdrawal_dtos),
+            ),
+            StagedRows(
+                "eth_transaction_access_list",
+                ACCESS_LIST_COLUMNS,
+                self._transaction_access_list_dao.to_records(eth_transaction_access_list_dtos),
+            ),
+            StagedRows(
+                "eth_receipts", RECEIPT_COLUMNS, self._receipt_dao.to_records(eth_receipt_dtos or [])
+            ),
+            StagedRows("eth_logs", LOG_COLUMNS, self._log_dao.to_records(eth_log_dtos or [])),
+            StagedRows(
+                "eth_blob_metrics",
+                BLOB_METRICS_COLUMNS,
+                self._blob_metrics_dao.to_records(eth_blob_metrics_dtos or []),
+            ),
+        ]
+
+        async def publish_checkpoint(async_connection: AsyncConnection) -> None:
+            # Step 3.4 Advance the pipeline checkpoint to the latest block number
+            await self._checkpoint_dao.advance(
+                async_connection=async_connection,
+                start_position=start_block_number,
+                end_position=end_block_number,
+                exclusive=exclusive,
+            )
+
+        await self._staged_batch_loader.load(staged_rows, publish=publish_checkpoint)
+        # counted once the batch is committed
+        METRICS.increment("rows", len(eth_block_dtos), table="eth_blocks")
+        METRICS.increment("rows", len(eth_transaction_dtos), table="eth_transactions")
+        METRICS.increment("rows", len(eth_withdrawal_dtos), table="eth_withdrawals")
+        METRICS.increment(
+            "rows", len(eth_transaction_access_list_dtos), table="eth_transaction_access_list"
+        )
+        METRICS.increment("rows", len(eth_receipt_dtos or []), table="eth_receipts")
+        METRICS.increment("rows", len(eth_log_dtos or []), table="eth_logs")
+        METRICS.increment("rows", len(eth_blob_metrics_dtos or []), table="eth_blob_metrics")
+
+
+def create_eth_block_etl_pipeline(
+    provider: EthBlockProviderAdapter[ETH_BLOCK],
+    streaming: bool = False,
+    batch_size: int = 100,
+) -> EthBlockETLPipeline[ETH_BLOCK]:
+    """
+    EthBlockETLPipeline, with every DAO pointed at the provider's database
+    """
+    return EthBlockETLPipeline(
+        provider=provider,
+        checkpoint_dao=PipelineCheckpointDAO(
+            connection_string=provider.connection_string, pipeline_name=ETH_BLOCKS_CHECKPOINT
+        ),
+        block_dao=EthBlockDAO(connection_string=provider.connection_string),
+        transaction_dao=EthTransactionDAO(connection_string=provider.connection_string),
+        transaction_access_list_dao=EthTransactionAccessListDAO(
+            connection_string=provider.connection_string
+        ),
+        withdrawal_dao=EthWithdrawalDAO(connection_string=provider.connection_string),
+        batch_size=batch_size,
+        streaming=streaming,
+    )
@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import os
+from typing import Any, Literal, Sequence
+
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+from src.chain_stack_eth_block_etl_pipeline import create_etl_pipeline
+from src.dao.eth_block_dao import EthBlockDAO
+from src.dao.pipeline_checkpoint_dao import PipelineCheckpointDAO
+from src.eth_block_etl_pipeline import ETH_BLOCKS_CHECKPOINT, EthBlockETLPipeline
+from src.models.database_transfer_objects.pipeline_checkpoint import PipelineCheckpointDTO
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+load_dotenv()
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+
+class RepairRange(BaseModel):
+    """
+    blocks start_block_number to end_block_number (inclusive) to repair
+
+    missing: the blocks are not stored
+    hash_mismatch: the blocks are stored, but don't link (parenthash); e.g one of them is from a reorged fork
+    """
+
+    start_block_number: int
+    end_block_number: int
+    reason: Literal["missing", "hash_mismatch"]
+
+
+def repair_ranges(
+    start_block_number: int,
+    end_block_number: int,
+    first_block_number: int | None,
+    last_block_number: int | None,
+    chain_breaks: Sequence[tuple[int, int, bool]],
+) -> list[RepairRange]:
+    """
+    the repair ranges of start_block_number to end_block_number, from its stored bounds and chain breaks
+    (EthBlockDAO.read_chain_breaks)
+    """
+    if first_block_number is None or last_block_number is None:
+        return [
+            RepairRange(
+                start_block_number=start_block_number,
+                end_block_number=end_block_number,
+                reason="missing",
+            )
+        ]
+    ranges: list[RepairRange] = []
+    if first_block_number > start_block_number:
+        ranges.append(
+            RepairRange(
+                start_block_number=start_block_number,
+                end_block_number=first_block_number - 1,
+                reason="missing",
+            )
+        )
+    for previous_block_number, block_number, _ in chain_breaks:
+        if block_number > previous_block_number + 1:
+            ranges.append(
+                RepairRange(
+                    start_block_number=previous_block_number + 1,
+                    end_block_number=block_number - 1,
+                    reason="missing",
+                )
+            )
+        else:
+            ranges.append(
+                RepairRange(
+                    start_block_number=previous_block_number,
+                    end_block_number=block_number,
+                    reason="hash_mismatch",
+                )
+            )
+    if last_block_number < end_block_number:
+        ranges.append(
+            RepairRange(
+                start_block_number=last_block_number + 1,
+                end_block_number=end_block_number,
+                reason="missing",
+            )
+        )
+    return ranges
+
+
+def merge_repair_ranges(ranges: Sequence[RepairRange]) -> list[RepairRange]:
+    """
+    ranges of the same reason which overlap or touch (e.g across chunks) are merged
+    """
+    merged: list[RepairRange] = []
+    for repair_range in sorted(
+        ranges, key=lambda single_range: (single_range.reason, single_range.start_block_number)
+    ):
+        if (
+            merged
+            and merged[-1].reason == repair_range.reason
+            and repair_range.start_block_number <= merged[-1].end_block_number + 1
+        ):
+            merged[-1].end_block_number = max(
+                merged[-1].end_block_number, repair_range.end_block_number
+            )
+        else:
+            merged.append(repair_range.model_copy())
+    return sorted(merged, key=lambda single_range: single_range.start_block_number)
+
+
+class EthChainVerifier:
+    """
+    Verifies that eth_blocks is a contiguous chain, and repairs it
+
+    Responsible for
+    - verify: finding the missing blocks, and the consecutive blocks which don't link (parenthash), chunk by chunk,
+      max_concurrency chunks at a time; every chunk also reads the block before it, so links across chunks are checked
+    - repair: re-ingesting the missing ranges through the pipeline's run_for_batch
+
+    Mismatched ranges are only reported: run_for_batch never overwrites a stored block, so the stale blocks have to
+    be deleted first
+    """
+
+    def __init__(
+        self,
+        block_dao: EthBlockDAO,
+        pipeline: EthBlockETLPipeline[Any] | None = None,
+        chunk_size: int = 10_000,
+        max_concurrency: int = 4,
+        repair_batch_size: int = 100,
+    ) -> None:
+        self._block_dao: EthBlockDAO = block_dao
+        self._pipeline: EthBlockETLPipeline[Any] | None = pipeline
+        self._chunk_size: int = chunk_size
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+        self._repair_batch_size: int = repair_batch_size
+
+    async def verify(self, start_block_number: int, end_block_number: int) -> list[RepairRange]:
+        with METRICS.timer("verify_eth_chain"):
+            chunk_ranges: list[list[RepairRange]] = await asyncio.gather(
+                *[
+                    self._verify_chunk(
+                        chunk_start, min(chunk_start + self._chunk_size - 1, end_block_number)
+                    )
+                    for chunk_start in range(start_block_number, end_block_number + 1, self._chunk_size)
+                ]
+            )
+        ranges: list[RepairRange] = merge_repair_ranges(
+            [repair_range for single_chunk_ranges in chunk_ranges for repair_range in single_chunk_ranges]
+        )
+        for reason in ("missing", "hash_mismatch"):
+            METRICS.increment(
+                "chain_repair_blocks",
+                sum(
+                    repair_range.end_block_number - repair_range.start_block_number + 1
+                    for repair_range in ranges
+                    if repair_range.reason == reason
+                ),
+                reason=reason,
+            )
+        for repair_range in ranges:
+            logger.warning(f"Chain break: {repair_range}")
+        return ranges
+
+    async def _verify_chunk(
+        self, start_block_number: int, end_block_number: int
+    ) -> list[RepairRange]:
+        async with self._semaphore:
+            # from the block before the chunk, to check the link into the chunk
+            first_block_number, last_block_number, chain_breaks = (
+                await self._block_dao.read_chain_breaks(
+                    max(start_block_number - 1, 0), end_block_number
+                )
+            )
+        # the block before the chunk is verified with its own chunk; only its link into the chunk is checked here
+        return repair_ranges(
+            start_block_number, end_block_number, first_block_number, last_block_number, chain_breaks
+        )
+
+    async def repair(self, ranges: Sequence[RepairRange]) -> None:
+        """
+        re-ingests every missing range, repair_batch_size blocks per batch
+        """
+        if self._pipeline is None:
+            raise ValueError("repair requires a pipeline")
+        for repair_range in ranges:
+            if repair_range.reason != "missing":
+                logger.warning(f"Not repaired, delete the stale blocks first: {repair_range}")
+                continue
+            for batch_start in range(
+                repair_range.start_block_number, repair_range.end_block_number + 1, self._repair_batch_size
+            ):
+                # a repair only moves the checkpoint if it extends it
+                await self._pipeline.run_for_batch(
+                    batch_start,
+                    min(batch_start + self._repair_batch_size - 1, repair_range.end_block_number),
+                    exclusive=False,
+                )
+            logger.info(f"Repaired {repair_range}")
+
+
+async def verify_eth_chain(
+    start_block_number: int = 1, end_block_number: int | None = None, repair: bool = False
+) -> list[RepairRange]:
+    """
+    verifies start_block_number up to end_block_number, by default the eth_blocks checkpoint; with repair, the
+    missing ranges are re-ingested from chainstack
+    """
+    connection_string: str = os.getenv("CHAIN_STACK_PG_CONNECTION_STRING", "")
+    if end_block_number is None:
+        checkpoint: PipelineCheckpointDTO | None = await PipelineCheckpointDAO(
+            connection_string=connection_string, pipeline_name=ETH_BLOCKS_CHECKPOINT
+        ).read_checkpoint()
+        end_block_number = checkpoint.position if checkpoint is not None else 0
+    verifier: EthChainVerifier = EthChainVerifier(
+        block_dao=EthBlockDAO(connection_string=connection_string),
+        pipeline=create_etl_pipeline() if repair else None,
+    )
+    ranges: list[RepairRange] = await verifier.verify(start_block_number, end_block_number)
+    if repair:
+        await verifier.repair(ranges)
+    return ranges
+
+
+def trigger_chain_verification() -> None:
+    """
+    REPAIR_CHAIN_GAPS=true re-ingests the missing ranges
+    """
+    repair: bool = os.getenv("REPAIR_CHAIN_GAPS", "false").lower() == "true"
+    asyncio.run(verify_eth_chain(repair=repair))
+
+
+if __name__ == "__main__":
+    trigger_chain_verification()
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import os
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+
+from src.dao.eth_block_dao import EthBlockDAO
+from src.dao.eth_transaction_access_list_dao import EthTransactionAccessListDAO
+from src.dao.eth_transactions_dao import EthTransactionDAO
+from src.eth_block_etl_pipeline import EthBlockDTOMapper
+from src.extractors.chain_stack_block_extractor import ChainStackBlockExtractor
+from src.extractors.multi_provider_block_extractor import (
+    MultiProviderBlockExtractor,
+    create_eth_block_extractor,
+)
+from src.models.chain_stack_models.eth_blocks import (
+    ChainStackEthBlockInformationResponse,
+)
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+from src.utils.raw_block_cache import create_raw_block_cache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+
+class EthTransactionHydrationPipeline:
+    """
+    Second stage of a header-only scan: fetches full transaction bodies, only for the blocks which need them
+
+    Responsible for
+    - finding the unhydrated blocks (eth_blocks.transactions_hydrated = false) within a block range
+    - fetching those blocks with full transactions, in batches
+    - inserting their transactions and access lists, and marking the blocks hydrated, in a single transaction
+
+    Blocks which are already hydrated are never refetched, so hydrating a range twice is a no-op
+    """
+
+    def __init__(
+        self,
+        block_dao: EthBlockDAO,
+        transaction_dao: EthTransactionDAO,
+        transaction_access_list_dao: EthTransactionAccessListDAO,
+        extractor: ChainStackBlockExtractor
+        | MultiProviderBlockExtractor[ChainStackEthBlockInformationResponse],
+        batch_size: int = 100,
+    ) -> None:
+        self._engine: AsyncEngine = create_async_engine(
+            os.getenv("CHAIN_STACK_PG_CONNECTION_STRING", "")
+        )
+        self._block_dao: EthBlockDAO = block_dao
+        self._transaction_dao: EthTransactionDAO = transaction_dao
+        self._transaction_access_list_dao: EthTransactionAccessListDAO = (
+            transaction_access_list_dao
+        )
+        self._extractor: (
+            ChainStackBlockExtractor
+            | MultiProviderBlockExtractor[ChainStackEthBlockInformationResponse]
+        ) = extractor
+        self._batch_size: int = batch_size
+
+    async def run(self, start_block_number: int, end_block_number: int) -> None:
+        """
+        hydrates every unhydrated block between start_block_number and end_block_number (inclusive)
+        """
+        block_numbers: list[int] = await self._block_dao.read_unhydrated_block_numbers(
+            start_block_number, end_block_number
+        )
+        logger.info(
+            f"Hydrating {len(block_numbers)} blocks between {start_block_number} and {end_block_number}"
+        )
+        try:
+            with METRICS.run("chainstack_eth_transaction_hydration"):
+                for start in range(0, len(block_numbers), self._batch_size):
+                    await self.hydrate_block_numbers(
+                        block_numbers[start : start + self._batch_size]
+                    )
+        finally:
+            await self._extractor.close()
+
+    async def hydrate_block_numbers(self, block_numbers: list[int]) -> None:
+        """
+        fetches block_numbers with full transactions, then, in a single transaction
+        1. inserts their transactions
+        2. inserts their transaction access lists; foreign key to transactions
+        3. marks the blocks hydrated
+        """
+        with METRICS.timer("extract"):
+            blocks: list[ChainStackEthBlockInformationResponse] = (
+                await self._extractor.extract_block_numbers(block_numbers)
+            )
+        METRICS.increment("blocks", len(blocks))
+
+        with METRICS.timer("dto_conversion"):
+            (
+                _,
+                eth_transaction_dtos,
+                _,
+                eth_transaction_access_list_dtos,
+            ) = EthBlockDTOMapper.blocks_to_dto(input=blocks)
+
+        async with self._engine.begin() as async_connection:
+            await self._transaction_dao.insert_transactions(
+                async_connection=async_connection, input=eth_transaction_dtos
+            )
+            await self._transaction_access_list_dao.insert_transaction_access_list(
+                async_connection=async_connection,
+                input=eth_transaction_access_list_dtos,
+            )
+            await self._block_dao.mark_transactions_hydrated(
+                async_connection=async_connection,
+                block_numbers=[single_block.block_number for single_block in blocks],
+            )
+        METRICS.increment("rows", len(eth_transaction_dtos), table="eth_transactions")
+        METRICS.increment(
+            "rows", len(eth_transaction_access_list_dtos), table="eth_transaction_access_list"
+        )
+
+
+def create_hydration_pipeline() -> EthTransactionHydrationPipeline:
+    connection_string: str = os.getenv("CHAIN_STACK_PG_CONNECTION_STRING", "")
+    extractor: (
+        ChainStackBlockExtractor
+        | MultiProviderBlockExtractor[ChainStackEthBlockInformationResponse]
+    )
+    if os.getenv("QUICK_NODE_URL"):
+        extractor = create_eth_block_extractor(raw_block_cache=create_raw_block_cache())
+    else:
+        extractor = ChainStackBlockExtractor(raw_block_cache=create_raw_block_cache())
+    return EthTransactionHydrationPipeline(
+        block_dao=EthBlockDAO(connection_string=connection_string),
+        transaction_dao=EthTransactionDAO(connection_string=connection_string),
+        transaction_access_list_dao=EthTransactionAccessListDAO(
+            connection_string=connection_string
+        ),
+        extractor=extractor,
+        batch_size=100,
+    )
+
+
+def trigger_hydration(start_block_number: int, end_block_number: int) -> None:
+    asyncio.run(create_hydration_pipeline().run(start_block_number, end_block_number))
+
+
+if __name__ == "__main__":
+    trigger_hydration(0, 100)
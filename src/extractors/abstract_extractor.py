@@ -1,22 +1,116 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from collections import deque
+from contextlib import aclosing
+from typing import AsyncGenerator, Awaitable, Callable, Generic, Iterable, Iterator, TypeVar
 
 from pydantic import BaseModel
 
+from src.utils.http_client import SharedClientSession
+
+EXTRACTION_KEY = TypeVar("EXTRACTION_KEY")
 EXTRACTED_BASE_MODEL = TypeVar("EXTRACTED_BASE_MODEL", bound=BaseModel)
 
 
-class BaseExtractor(ABC, Generic[EXTRACTED_BASE_MODEL]):
+class BaseExtractor(ABC, Generic[EXTRACTION_KEY, EXTRACTED_BASE_MODEL]):
     """
     An extractor is responsible for extracting data from a data source like quicknode
 
     this is an abstract extractor (unimplemented extractor) that enforces extractors to follow this implementation:
 
-    they must implement an async extract method
+    they must implement an async extract_one method, which extracts a single key (e.g a block number, or a symbol)
+
+    and get, for free:
+    - stream: extracts many keys, yielding each result as it is ready, in key order or in completion order
+    - extract_many: extracts many keys into a list, in key order
+    - _session: a SharedClientSession for its requests, so connections are pooled across keys; closed with close()
     """
 
+    def __init__(
+        self, max_concurrency: int = 50, session: SharedClientSession | None = None
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._max_concurrency: int = max_concurrency
+        self._session: SharedClientSession = session or SharedClientSession()
+
+    async def close(self) -> None:
+        """
+        closes the pooled connections; the extractor can still be used afterwards, with a new session
+        """
+        await self._session.close()
+
     @abstractmethod
-    async def extract(
-        self, start_block_number: int, end_block_number: int
-    ) -> EXTRACTED_BASE_MODEL:
+    async def extract_one(self, key: EXTRACTION_KEY) -> EXTRACTED_BASE_MODEL:
         raise NotImplementedError()
+
+    async def stream(
+        self,
+        keys: Iterable[EXTRACTION_KEY],
+        ordered: bool = True,
+        max_concurrency: int | None = None,
+    ) -> AsyncGenerator[tuple[EXTRACTION_KEY, EXTRACTED_BASE_MODEL], None]:
+        """
+        yields (key, result) for every key; in the order of keys if ordered, else as soon as each result is ready
+
+        - concurrency: at most max_concurrency (default: the extractor's) keys are extracted at once
+        - backpressure: results which have not been consumed yet count towards max_concurrency, so a slow consumer
+          stops new requests instead of buffering an unbounded number of results
+        - cancellation: the first failure is raised, and every request still in flight is cancelled; the same happens
+          when the consumer stops early, once the generator is closed (e.g with contextlib.aclosing)
+        """
+        async with aclosing(self._stream(self.extract_one, keys, ordered, max_concurrency)) as results:
+            async for key, result in results:
+                yield key, result
+
+    async def _stream(
+        self,
+        extract: Callable[[EXTRACTION_KEY], Awaitable[EXTRACTED_BASE_MODEL]],
+        keys: Iterable[EXTRACTION_KEY],
+        ordered: bool,
+        max_concurrency: int | None,
+    ) -> AsyncGenerator[tuple[EXTRACTION_KEY, EXTRACTED_BASE_MODEL], None]:
+        """
+        stream, with extract instead of extract_one
+        """
+        limit: int = max_concurrency or self._max_concurrency
+        pending_keys: Iterator[EXTRACTION_KEY] = iter(keys)
+        in_flight: deque[tuple[EXTRACTION_KEY, asyncio.Task[EXTRACTED_BASE_MODEL]]] = deque()
+
+        def fill() -> None:
+            if len(in_flight) >= limit:
+                return
+            for key in pending_keys:
+                in_flight.append((key, asyncio.ensure_future(extract(key))))
+                if len(in_flight) >= limit:
+                    return
+
+        try:
+            fill()
+            while in_flight:
+                if ordered:
+                    key, task = in_flight[0]
+                    result: EXTRACTED_BASE_MODEL = await task
+                    in_flight.popleft()
+                    yield key, result
+                else:
+                    done, _ = await asyncio.wait(
+                        [task for _, task in in_flight], return_when=asyncio.FIRST_COMPLETED
+                    )
+                    finished: list[tuple[EXTRACTION_KEY, asyncio.Task[EXTRACTED_BASE_MODEL]]] = [
+                        (key, task) for key, task in in_flight if task in done
+                    ]
+                    for key, task in finished:
+                        in_flight.remove((key, task))
+                        yield key, task.result()
+                fill()
+        finally:
+            for _, task in in_flight:
+                task.cancel()
+            await asyncio.gather(*[task for _, task in in_flight], return_exceptions=True)
+
+    async def extract_many(self, keys: Iterable[EXTRACTION_KEY]) -> list[EXTRACTED_BASE_MODEL]:
+        """
+        every result of stream, in the order of keys
+        """
+        return [result async for _, result in self.stream(keys)]
@@ -4,6 +4,8 @@ from tenacity import retry, wait_fixed, stop_after_attempt
 from typing import Any
 from asyncio import AbstractEventLoop
 import logging
+from src.extractors.abstract_extractor import BaseExtractor
+from src.utils.http_client import client_session, read_json
 from src.utils.logging_utils import setup_logging
 
 from src.models.binance_models.binance_exchange_info import ExchangeInfo
@@ -12,7 +14,7 @@ logger: logging.Logger = logging.getLogger(__name__)
 setup_logging(logger)
 
 
-class BinanceExchangeInfoExtractor:
+class BinanceExchangeInfoExtractor(BaseExtractor[str, ExchangeInfo]):
     """
     extract the exchange info from Binance into S3
 
@@ -23,13 +25,12 @@ class BinanceExchangeInfoExtractor:
     Ideally, the BinanceExchangeInfoExtractor does not have to query the symbols bc it is unlikely to have a change soon
     """
 
-    @staticmethod
     @retry(
         wait=wait_fixed(0.01),  # ~10ms between attempts
         stop=stop_after_attempt(5),  # equivalent to 5 retries/attempts
         reraise=True,  # re-raise the last exception if all attempts fail
     )
-    async def extract(symbol: str) -> ExchangeInfo:
+    async def extract(self, symbol: str) -> ExchangeInfo:
         """
         given an input symbol, extract the exchange info regarding the symbol
         current extractor supports extraction of 1 symbol, multiple symbols can be extracted by tweaking the url string
@@ -37,11 +38,11 @@ class BinanceExchangeInfoExtractor:
         """
         url: str = f"https://api.binance.com/api/v3/exchangeInfo?symbol={symbol}"
         try:
-            async with aiohttp.ClientSession() as client:
+            async with client_session(self._session) as client:
                 async with client.get(url) as response:
                     if response.status == 200:
                         # happy path
-                        data: dict[str, Any] = await response.json()
+                        data: dict[str, Any] = await read_json(response, provider="binance")
                         exchange_info: ExchangeInfo = ExchangeInfo.model_validate(data)
                         return exchange_info
                     else:
@@ -54,13 +55,19 @@ class BinanceExchangeInfoExtractor:
             logger.error(e)
             raise e
 
+    async def extract_one(self, key: str) -> ExchangeInfo:
+        """
+        the exchange info of a single symbol; stream / extract_many fetch many symbols concurrently
+        """
+        return await self.extract(symbol=key)
+
 
 if __name__ == "__main__":
     event_loop: AbstractEventLoop = asyncio.new_event_loop()
     symbol: str = "ETHBTC"
-    response: ExchangeInfo = event_loop.run_until_complete(
-        BinanceExchangeInfoExtractor.extract(symbol=symbol)
-    )
+    extractor: BinanceExchangeInfoExtractor = BinanceExchangeInfoExtractor()
+    response: ExchangeInfo = event_loop.run_until_complete(extractor.extract(symbol=symbol))
+    event_loop.run_until_complete(extractor.close())
     # pprint(response)
     with open("exchange_info.json", "w", encoding="utf-8") as json_file:
         json_str = response.model_dump_json(indent=2)
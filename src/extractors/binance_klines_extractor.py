@@ -1,42 +1,53 @@
 import asyncio
 import aiohttp
+import pyarrow as pa
 from typing import Any
 from asyncio import AbstractEventLoop
 from datetime import datetime
 from tenacity import retry, wait_fixed, stop_after_attempt
 from src.utils.logging_utils import setup_logging
+from src.utils.http_client import client_session, read_json
+from src.utils.metrics import METRICS
 import logging
 
-from src.models.binance_models.binance_klines import Klines
+from src.extractors.abstract_extractor import BaseExtractor
+from src.models.binance_models.binance_klines import Klines, KlinesRequest
+from src.models.binance_models.binance_klines_arrow import raw_klines_to_arrow_table
 
 logger: logging.Logger = logging.getLogger(__name__)
 setup_logging(logger)
 
 
-class BinanceKlinesExtractor:
+class BinanceKlinesExtractor(BaseExtractor[KlinesRequest, Klines]):
     """
     extract the klines info from Binance into S3
 
     Responsible for
     - extracting the klines info given a symbol
     - inserting the latest klines details into a s3 table
+    - streaming many symbols / time windows at once, one KlinesRequest each (stream, extract_many)
 
     API docs: https://developers.binance.com/docs/binance-spot-api-docs/rest-api/market-data-endpoints
     """
 
-    @staticmethod
+    @METRICS.timed("extract_binance_klines")
     @retry(
         wait=wait_fixed(0.01),  # ~10ms before attempts
         stop=stop_after_attempt(5),  # equivalent to 5 retries
         reraise=True,  # re-raise the last exception if all attempts fail
+        before_sleep=METRICS.record_retry,
     )
-    async def extract(
+    async def extract_raw(
+        self,
         symbol: str,
         interval: str,
         limit: int = 500,
         start_time: datetime | None = None,
         end_time: datetime | None = None,
-    ) -> Klines:
+    ) -> list[list[int | str]]:
+        """
+        returns the klines exactly as binance serves them, one list of 12 values per kline
+        """
         url: str = "https://api.binance.com/api/v3/klines"
 
         start_timestamp = int(start_time.timestamp() * 1000) if start_time else None
@@ -51,13 +62,12 @@ class BinanceKlinesExtractor:
         }
 
         try:
-            async with aiohttp.ClientSession() as client:
+            async with client_session(self._session) as client:
                 async with client.get(url, params=params) as response:
                     if response.status == 200:
                         # happy path
-                        data: list[list[int | str]] = await response.json()
-                        k_lines: Klines = Klines.from_json(symbol=symbol, raw_data=data)
-                        return k_lines
+                        data: list[list[int | str]] = await read_json(response, provider="binance")
+                        return data
                     else:
                         raise aiohttp.ClientError(
                             f"Received non-status code 200: {response.status}"
@@ -67,6 +77,45 @@ class BinanceKlinesExtractor:
             logger.error(e)
             raise e
 
+    async def extract(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int = 500,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> Klines:
+        data: list[list[int | str]] = await self.extract_raw(
+            symbol=symbol, interval=interval, limit=limit, start_time=start_time, end_time=end_time
+        )
+        return Klines.from_json(symbol=symbol, raw_data=data)
+
+    async def extract_one(self, key: KlinesRequest) -> Klines:
+        return await self.extract(
+            symbol=key.symbol,
+            interval=key.interval,
+            limit=key.limit,
+            start_time=key.start_time,
+            end_time=key.end_time,
+        )
+
+    async def extract_columnar(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int = 500,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> pa.Table:
+        """
+        returns the klines as a KLINE_ARROW_SCHEMA table, ready for KlineBinanceDAO.copy_klines_to_db
+        skips the per-kline pydantic models of extract
+        """
+        data: list[list[int | str]] = await self.extract_raw(
+            symbol=symbol, interval=interval, limit=limit, start_time=start_time, end_time=end_time
+        )
+        return raw_klines_to_arrow_table(symbol=symbol, raw_data=data)
+
 
 if __name__ == "__main__":
     event_loop: AbstractEventLoop = asyncio.new_event_loop()
@@ -75,8 +124,9 @@ if __name__ == "__main__":
     limit: int = 500
     start_time: datetime = datetime(2026, 2, 10)
     end_time: datetime = datetime(2026, 2, 11)
+    extractor: BinanceKlinesExtractor = BinanceKlinesExtractor()
     response: Klines = event_loop.run_until_complete(
-        BinanceKlinesExtractor.extract(
+        extractor.extract(
             symbol=symbol,
             interval=interval,
             limit=limit,
@@ -84,6 +134,7 @@ if __name__ == "__main__":
             end_time=end_time,
         )
     )
+    event_loop.run_until_complete(extractor.close())
     print(response)
     # with open("klines.json", "w", encoding="utf-8") as json_file:
     #     json_str = response.model_dump_json(indent=2)
@@ -1,39 +1,140 @@
 import asyncio
 import json
-from asyncio import Future
-from typing import Any
+from typing import Any, Callable, TypeVar
 
+from src.extractors.raw_block_cache_extractor import RawBlockCacheExtractor
 from src.models.chain_stack_models.eth_blocks import (
     ChainStackEthBlockInformationResponse,
 )
-from src.chainstack.asynchronous.get_block_information import get_block_information
+from src.models.chain_stack_models.eth_transaction import ChainStackEthTransaction
+from src.chainstack.asynchronous.get_block_information import (
+    get_raw_block_information,
+    stream_block_information,
+)
+from src.chainstack.asynchronous.get_latest_block import get_latest_block_number
+from src.utils.raw_block_cache import RawBlockCache
 from asyncio import AbstractEventLoop, new_event_loop
 
+TRANSACTION_OUTPUT = TypeVar("TRANSACTION_OUTPUT")
+
+
+class ChainStackBlockExtractor(RawBlockCacheExtractor[ChainStackEthBlockInformationResponse]):
+    """
+    Extracts blocks from chainstack
+
+    With a raw_block_cache, every fetched block is cached on disk before parsing, and cached blocks are never refetched
+    With replay, blocks are only read from the cache; a missing block raises RawBlockCacheMissError
+    With full_transactions=False, only block headers and transaction hashes are fetched (a header-only scan);
+    those are cached apart from full blocks
+    """
+
+    PROVIDER: str = "chainstack"
+
+    def __init__(
+        self,
+        raw_block_cache: RawBlockCache | None = None,
+        replay: bool = False,
+        full_transactions: bool = True,
+        max_concurrency: int = 50,
+    ) -> None:
+        super().__init__(
+            raw_block_cache=raw_block_cache,
+            replay=replay,
+            max_concurrency=max_concurrency,
+            fetch_chain_head=get_latest_block_number,
+        )
+        self._full_transactions: bool = full_transactions
+        self._cache_provider: str = (
+            self.PROVIDER if full_transactions else f"{self.PROVIDER}_headers"
+        )
+
+    def cache_providers(self) -> list[str]:
+        return [self._cache_provider]
+
+    async def fetch_raw_block(self, block_number: str) -> tuple[str, dict[str, Any]]:
+        return self._cache_provider, await get_raw_block_information(
+            block_number, full_transactions=self._full_transactions, session=self._session
+        )
+
+    def parse_raw_block(
+        self, block_number: str, raw_block: dict[str, Any]
+    ) -> ChainStackEthBlockInformationResponse:
+        return ChainStackEthBlockInformationResponse.from_json(block_number, raw_block)
 
-class ChainStackBlockExtractor:
     async def extract(
         self, start_block_number: int, end_block_number: int
     ) -> list[ChainStackEthBlockInformationResponse]:
         """
-        Fires (end_block_number - start_block_number + 1) async queries to quicknode
+        Queries chainstack for blocks start_block_number to end_block_number (inclusive) which are not cached,
+        at most max_concurrency at once
 
         100 - 1 + 1 = 100 queries
 
-        Await for all blocks to return, then return
+        Await for all blocks to return, then return; use stream to process each block as soon as it returns
         """
-        for curr_block_number in range(start_block_number, end_block_number + 1):
-            print(hex(curr_block_number))
+        return await self.extract_many(range(start_block_number, end_block_number + 1))
+
+    async def extract_block_numbers(
+        self, block_numbers: list[int]
+    ) -> list[ChainStackEthBlockInformationResponse]:
+        """
+        same as extract, for block numbers which need not be contiguous, e.g blocks to hydrate
+        """
+        return await self.extract_many(block_numbers)
+
+    async def extract_streaming(
+        self,
+        start_block_number: int,
+        end_block_number: int,
+        transaction_converter: Callable[[ChainStackEthTransaction], TRANSACTION_OUTPUT],
+    ) -> list[tuple[ChainStackEthBlockInformationResponse, list[TRANSACTION_OUTPUT]]]:
+        """
+        streaming alternative to extract, for batches of very large blocks
+
+        every transaction is parsed and passed to transaction_converter as soon as it is read off the response,
+        so peak memory is bounded by the converted output, plus the largest transaction of each in-flight block,
+        instead of every block's full parsed response
+
+        returns (block without transactions, its converted transactions) per block;
+        block.result.transactionHashes is still filled in
+        bypasses the raw block cache, as a raw response is never held in full
+        """
+        if self._replay or not self._full_transactions:
+            raise ValueError("extract_streaming fetches full blocks from chainstack; not in replay or header-only mode")
+
+        def convert(raw_transaction: dict[str, Any]) -> tuple[str, TRANSACTION_OUTPUT]:
+            transaction: ChainStackEthTransaction = ChainStackEthTransaction.from_json(raw_transaction)
+            return transaction.hash, transaction_converter(transaction)
+
+        # same concurrency limit as stream
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self._max_concurrency)
 
-        async_futures: list[Future[ChainStackEthBlockInformationResponse]] = [
-            asyncio.ensure_future(get_block_information(hex(curr_block_number)))
-            for curr_block_number in range(start_block_number, end_block_number + 1)
-        ]
+        async def stream_block(
+            block_number: int,
+        ) -> tuple[dict[str, Any], list[tuple[str, TRANSACTION_OUTPUT]]]:
+            async with semaphore:
+                return await stream_block_information(hex(block_number), convert, session=self._session)
 
-        all_blocks_future: Future[list[ChainStackEthBlockInformationResponse]] = (
-            asyncio.gather(*async_futures)
+        streamed_blocks: list[tuple[dict[str, Any], list[tuple[str, TRANSACTION_OUTPUT]]]] = (
+            await asyncio.gather(
+                *[
+                    stream_block(block_number)
+                    for block_number in range(start_block_number, end_block_number + 1)
+                ]
+            )
         )
-        result: list[ChainStackEthBlockInformationResponse] = await all_blocks_future
-        return result
+        blocks: list[tuple[ChainStackEthBlockInformationResponse, list[TRANSACTION_OUTPUT]]] = []
+        for block_number, (raw_header, converted_transactions) in zip(
+            range(start_block_number, end_block_number + 1), streamed_blocks
+        ):
+            block: ChainStackEthBlockInformationResponse = (
+                ChainStackEthBlockInformationResponse.from_json(hex(block_number), raw_header)
+            )
+            block.result.transactionHashes = [
+                transaction_hash for transaction_hash, _ in converted_transactions
+            ]
+            blocks.append((block, [output for _, output in converted_transactions]))
+        return blocks
 
 
 if __name__ == "__main__":
@@ -42,6 +143,7 @@ if __name__ == "__main__":
     result: list[ChainStackEthBlockInformationResponse] = event_loop.run_until_complete(
         extractor.extract(start_block_number=20846330, end_block_number=20846334)
     )
+    event_loop.run_until_complete(extractor.close())
     serialized_result_dict: list[dict[str, Any]] = [
         single_model.model_dump() for single_model in result
     ]
@@ -0,0 +1,52 @@
+from typing import Any
+
+from src.chainstack.asynchronous.get_block_receipts import get_raw_block_receipts
+from src.chainstack.asynchronous.get_latest_block import get_latest_block_number
+from src.extractors.raw_block_cache_extractor import RawBlockCacheExtractor
+from src.models.chain_stack_models.eth_receipt import ChainStackEthBlockReceiptsResponse
+from src.utils.raw_block_cache import RawBlockCache
+
+
+class ChainStackBlockReceiptsExtractor(RawBlockCacheExtractor[ChainStackEthBlockReceiptsResponse]):
+    """
+    Extracts every receipt of a block from chainstack, with one eth_getBlockReceipts call per block
+
+    Same concurrency and raw cache read-through as ChainStackBlockExtractor; receipts are cached under their own provider
+    key (chainstack_receipts), apart from blocks
+    """
+
+    PROVIDER: str = "chainstack_receipts"
+
+    def __init__(
+        self,
+        raw_block_cache: RawBlockCache | None = None,
+        replay: bool = False,
+        max_concurrency: int = 50,
+    ) -> None:
+        super().__init__(
+            raw_block_cache=raw_block_cache,
+            replay=replay,
+            max_concurrency=max_concurrency,
+            fetch_chain_head=get_latest_block_number,
+        )
+
+    def cache_providers(self) -> list[str]:
+        return [self.PROVIDER]
+
+    async def fetch_raw_block(self, block_number: str) -> tuple[str, dict[str, Any]]:
+        return self.PROVIDER, await get_raw_block_receipts(block_number, session=self._session)
+
+    def parse_raw_block(
+        self, block_number: str, raw_block: dict[str, Any]
+    ) -> ChainStackEthBlockReceiptsResponse:
+        return ChainStackEthBlockReceiptsResponse.from_json(block_number, raw_block)
+
+    async def extract(
+        self, start_block_number: int, end_block_number: int
+    ) -> list[ChainStackEthBlockReceiptsResponse]:
+        return await self.extract_many(range(start_block_number, end_block_number + 1))
+
+    async def extract_block_numbers(
+        self, block_numbers: list[int]
+    ) -> list[ChainStackEthBlockReceiptsResponse]:
+        return await self.extract_many(block_numbers)
@@ -0,0 +1,40 @@
+from src.chainstack.asynchronous.get_fee_history import (
+    MAX_FEE_HISTORY_BLOCKS,
+    get_fee_history,
+)
+from src.extractors.abstract_extractor import BaseExtractor
+from src.models.chain_stack_models.eth_fee_history import ChainStackEthFeeHistoryResponse
+
+
+class ChainStackFeeHistoryExtractor(
+    BaseExtractor[tuple[int, int], ChainStackEthFeeHistoryResponse]
+):
+    """
+    Extracts the base fee and blob base fee history of block ranges from chainstack, with eth_feeHistory
+
+    A range is split into calls of at most 1024 blocks (the node limit), so a batch of blocks costs a single call;
+    keys are (start block number, end block number), inclusive
+
+    Fee history is never cached; it is a few bytes per block
+    """
+
+    PROVIDER: str = "chainstack_fee_history"
+
+    def __init__(self, max_concurrency: int = 10) -> None:
+        super().__init__(max_concurrency=max_concurrency)
+
+    async def extract_one(self, key: tuple[int, int]) -> ChainStackEthFeeHistoryResponse:
+        start_block_number, end_block_number = key
+        return await get_fee_history(
+            block_count=end_block_number - start_block_number + 1,
+            newest_block=hex(end_block_number),
+            session=self._session,
+        )
+
+    async def extract(
+        self, start_block_number: int, end_block_number: int
+    ) -> list[ChainStackEthFeeHistoryResponse]:
+        return await self.extract_many(
+            (start, min(start + MAX_FEE_HISTORY_BLOCKS - 1, end_block_number))
+            for start in range(start_block_number, end_block_number + 1, MAX_FEE_HISTORY_BLOCKS)
+        )
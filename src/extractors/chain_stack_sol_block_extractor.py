@@ -0,0 +1,44 @@
+from src.chainstack.asynchronous.solana.get_block import TransactionDetails, get_block
+from src.chainstack.asynchronous.solana.get_blocks import MAX_GET_BLOCKS_SLOTS, get_blocks
+from src.extractors.abstract_extractor import BaseExtractor
+from src.models.chain_stack_models.sol_block import ChainStackSolBlockResponse
+
+
+class ChainStackSolBlockExtractor(BaseExtractor[int, ChainStackSolBlockResponse]):
+    """
+    Extracts solana blocks from chainstack, by slot
+
+    Responsible for
+    - listing the slots of a slot range which hold a block (getBlocks); skipped slots are never fetched
+    - fetching those blocks concurrently (getBlock), with transaction_details of full, signatures or none
+
+    Solana produces ~2.5 blocks a second, so many more blocks are in flight at once than for ethereum
+    """
+
+    PROVIDER: str = "chainstack_solana"
+
+    def __init__(
+        self, transaction_details: TransactionDetails = "full", max_concurrency: int = 100
+    ) -> None:
+        super().__init__(max_concurrency=max_concurrency)
+        self._transaction_details: TransactionDetails = transaction_details
+
+    async def extract_one(self, key: int) -> ChainStackSolBlockResponse:
+        return await get_block(
+            slot=key, transaction_details=self._transaction_details, session=self._session
+        )
+
+    async def extract_slots(self, start_slot: int, end_slot: int) -> list[int]:
+        """
+        the slots from start_slot to end_slot (inclusive) which hold a block
+        """
+        slots: list[int] = []
+        for chunk_start_slot in range(start_slot, end_slot + 1, MAX_GET_BLOCKS_SLOTS):
+            slots.extend(
+                await get_blocks(
+                    chunk_start_slot,
+                    min(chunk_start_slot + MAX_GET_BLOCKS_SLOTS - 1, end_slot),
+                    session=self._session,
+                )
+            )
+        return slots
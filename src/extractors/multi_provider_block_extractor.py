@@ -0,0 +1,299 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from functools import partial
+from typing import Any, Awaitable, Callable, TypeVar
+
+from pydantic import BaseModel
+
+from src.extractors.raw_block_cache_extractor import ChainHeadFetcher, RawBlockCacheExtractor
+from src.models.chain_stack_models.eth_blocks import (
+    ChainStackEthBlockInformationResponse,
+)
+from src.models.chain_stack_models.eth_receipt import ChainStackEthBlockReceiptsResponse
+from src.utils.http_client import SharedClientSession
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+from src.utils.raw_block_cache import RawBlockCache
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+BLOCK_MODEL = TypeVar("BLOCK_MODEL", bound=BaseModel)
+# hex block number -> raw JSON-RPC response, e.g src.chainstack.asynchronous.get_raw_block_information
+RawBlockFetcher = Callable[[str], Awaitable[dict[str, Any]]]
+
+
+class BlockProvider(BaseModel):
+    name: str
+    fetch_raw_block: RawBlockFetcher
+
+
+class ProviderHealth:
+    """
+    Rolling latency and error statistics of a single provider, over its last window requests
+
+    score (lower is healthier) is the p95 latency, inflated by the error rate:
+    a provider failing 10% of requests scores as if it were 2x slower
+    """
+
+    def __init__(self, window: int = 200, default_latency_seconds: float = 0.5) -> None:
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._default_latency_seconds: float = default_latency_seconds
+
+    def record_success(self, latency_seconds: float) -> None:
+        self._latencies.append(latency_seconds)
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        self._outcomes.append(False)
+
+    def record_abandoned(self, elapsed_seconds: float) -> None:
+        """
+        a request cancelled because the other provider answered first took at least elapsed_seconds
+        """
+        self._latencies.append(elapsed_seconds)
+
+    def latency_percentile(self, percentile: float) -> float:
+        if not self._latencies:
+            return self._default_latency_seconds
+        sorted_latencies: list[float] = sorted(self._latencies)
+        index: int = min(int(len(sorted_latencies) * percentile / 100), len(sorted_latencies) - 1)
+        return sorted_latencies[index]
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    @property
+    def score(self) -> float:
+        return self.latency_percentile(95) * (1 + 10 * self.error_rate)
+
+
+class MultiProviderBlockExtractor(RawBlockCacheExtractor[BLOCK_MODEL]):
+    """
+    Extracts blocks from several providers serving identical payloads, e.g chainstack and quicknode
+
+    Responsible for
+    - routing every block request to the currently healthiest provider (lowest ProviderHealth.score)
+    - hedging: if the provider hasn't answered within its own p95 latency, the same request is sent to the next
+      provider, and whichever answers first wins; so a 100 block batch is bounded by the fast provider,
+      instead of the slowest straggler
+    - failover: if a provider fails (after its own retries), the request moves to the next provider immediately
+    - reading through the raw block cache, under the name of the provider which served each block; only blocks
+      confirmed behind fetch_chain_head are cached
+
+    The hedge delay is clamped to [min_hedge_delay_seconds, max_hedge_delay_seconds]
+    The providers' fetchers should request through session, so close() closes their connections
+    """
+
+    def __init__(
+        self,
+        providers: list[BlockProvider],
+        parse_raw_block: Callable[[str, dict[str, Any]], BLOCK_MODEL],
+        raw_block_cache: RawBlockCache | None = None,
+        replay: bool = False,
+        min_hedge_delay_seconds: float = 0.05,
+        max_hedge_delay_seconds: float = 2.0,
+        chain: str = "ethereum",
+        max_concurrency: int = 50,
+        fetch_chain_head: ChainHeadFetcher | None = None,
+        session: SharedClientSession | None = None,
+    ) -> None:
+        super().__init__(
+            raw_block_cache=raw_block_cache,
+            replay=replay,
+            chain=chain,
+            max_concurrency=max_concurrency,
+            fetch_chain_head=fetch_chain_head,
+            session=session,
+        )
+        if not providers:
+            raise ValueError("MultiProviderBlockExtractor requires at least one provider")
+        self._providers: list[BlockProvider] = providers
+        self._health: dict[str, ProviderHealth] = {
+            provider.name: ProviderHealth() for provider in providers
+        }
+        self._parse_raw_block: Callable[[str, dict[str, Any]], BLOCK_MODEL] = parse_raw_block
+        self._min_hedge_delay_seconds: float = min_hedge_delay_seconds
+        self._max_hedge_delay_seconds: float = max_hedge_delay_seconds
+
+    def provider_health(self, provider_name: str) -> ProviderHealth:
+        return self._health[provider_name]
+
+    def rank_providers(self) -> list[BlockProvider]:
+        """
+        providers, healthiest first; ties keep the configured order
+        """
+        return sorted(self._providers, key=lambda provider: self._health[provider.name].score)
+
+    def hedge_delay(self, provider: BlockProvider) -> float:
+        return min(
+            max(self._health[provider.name].latency_percentile(95), self._min_hedge_delay_seconds),
+            self._max_hedge_delay_seconds,
+        )
+
+    async def _fetch_from(self, provider: BlockProvider, block_number: str) -> dict[str, Any]:
+        start_time: float = time.perf_counter()
+        try:
+            raw_block: dict[str, Any] = await provider.fetch_raw_block(block_number)
+        except asyncio.CancelledError:
+            self._health[provider.name].record_abandoned(time.perf_counter() - start_time)
+            raise
+        except Exception:
+            self._health[provider.name].record_failure()
+            METRICS.increment("provider_errors", provider=provider.name)
+            raise
+        latency_seconds: float = time.perf_counter() - start_time
+        self._health[provider.name].record_success(latency_seconds)
+        METRICS.observe(f"fetch_raw_block_{provider.name}", latency_seconds)
+        return raw_block
+
+    async def fetch_raw_block(self, block_number: str) -> tuple[str, dict[str, Any]]:
+        """
+        fetches a single block with hedging and failover; returns (name of the provider which answered, raw response)
+
+        raises the last provider error if every provider failed
+        """
+        remaining_providers: list[BlockProvider] = self.rank_providers()
+        in_flight: dict[asyncio.Future, BlockProvider] = {}
+        last_error: BaseException | None = None
+
+        def send_to_next_provider() -> None:
+            provider: BlockProvider = remaining_providers.pop(0)
+            in_flight[asyncio.ensure_future(self._fetch_from(provider, block_number))] = provider
+
+        send_to_next_provider()
+        try:
+            while in_flight:
+                # hedge after the p95 latency of the most recently asked provider
+                timeout: float | None = (
+                    self.hedge_delay(list(in_flight.values())[-1]) if remaining_providers else None
+                )
+                done, _ = await asyncio.wait(
+                    in_flight.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    METRICS.increment("hedged_requests", provider=remaining_providers[0].name)
+                    send_to_next_provider()
+                    continue
+                for finished in done:
+                    provider: BlockProvider = in_flight.pop(finished)
+                    if finished.exception() is None:
+                        return provider.name, finished.result()
+                    last_error = finished.exception()
+                    logger.warning(f"{provider.name} failed to return block {block_number}: {last_error!r}")
+                if not in_flight and remaining_providers:
+                    # failover; every provider asked so far has failed
+                    send_to_next_provider()
+        finally:
+            for pending in in_flight:
+                pending.cancel()
+        assert last_error is not None
+        raise last_error
+
+    def cache_providers(self) -> list[str]:
+        return [provider.name for provider in self._providers]
+
+    def parse_raw_block(self, block_number: str, raw_block: dict[str, Any]) -> BLOCK_MODEL:
+        return self._parse_raw_block(block_number, raw_block)
+
+    async def extract(
+        self, start_block_number: int, end_block_number: int
+    ) -> list[BLOCK_MODEL]:
+        """
+        extracts blocks start_block_number to end_block_number (inclusive), in order
+        """
+        return await self.extract_many(range(start_block_number, end_block_number + 1))
+
+    async def extract_block_numbers(self, block_numbers: list[int]) -> list[BLOCK_MODEL]:
+        """
+        same as extract, for block numbers which need not be contiguous, e.g blocks to hydrate
+        """
+        return await self.extract_many(block_numbers)
+
+
+def create_eth_block_extractor(
+    raw_block_cache: RawBlockCache | None = None,
+    replay: bool = False,
+    full_transactions: bool = True,
+) -> MultiProviderBlockExtractor[ChainStackEthBlockInformationResponse]:
+    """
+    hedged chainstack + quicknode extractor; both serve the same eth_getBlockByNumber payload
+
+    with full_transactions=False, header-only blocks are fetched, and cached apart from full blocks
+    both providers request through the extractor's session
+    """
+    name_suffix: str = "" if full_transactions else "_headers"
+    from src.chainstack.asynchronous.get_block_information import (
+        get_raw_block_information as get_chainstack_raw_block_information,
+    )
+    from src.chainstack.asynchronous.get_latest_block import get_latest_block_number
+    from src.quick_node.asynchronous.get_block_information import (
+        get_raw_block_information as get_quick_node_raw_block_information,
+    )
+
+    session: SharedClientSession = SharedClientSession()
+    return MultiProviderBlockExtractor(
+        providers=[
+            BlockProvider(
+                name=f"chainstack{name_suffix}",
+                fetch_raw_block=partial(
+                    get_chainstack_raw_block_information,
+                    full_transactions=full_transactions,
+                    session=session,
+                ),
+            ),
+            BlockProvider(
+                name=f"quicknode{name_suffix}",
+                fetch_raw_block=partial(
+                    get_quick_node_raw_block_information,
+                    full_transactions=full_transactions,
+                    session=session,
+                ),
+            ),
+        ],
+        parse_raw_block=ChainStackEthBlockInformationResponse.from_json,
+        raw_block_cache=raw_block_cache,
+        replay=replay,
+        fetch_chain_head=get_latest_block_number,
+        session=session,
+    )
+
+
+def create_eth_block_receipts_extractor(
+    raw_block_cache: RawBlockCache | None = None, replay: bool = False
+) -> MultiProviderBlockExtractor[ChainStackEthBlockReceiptsResponse]:
+    """
+    hedged chainstack + quicknode eth_getBlockReceipts extractor
+    """
+    from src.chainstack.asynchronous.get_block_receipts import (
+        get_raw_block_receipts as get_chainstack_raw_block_receipts,
+    )
+    from src.chainstack.asynchronous.get_latest_block import get_latest_block_number
+    from src.quick_node.asynchronous.get_block_receipts import (
+        get_raw_block_receipts as get_quick_node_raw_block_receipts,
+    )
+
+    session: SharedClientSession = SharedClientSession()
+    return MultiProviderBlockExtractor(
+        providers=[
+            BlockProvider(
+                name="chainstack_receipts",
+                fetch_raw_block=partial(get_chainstack_raw_block_receipts, session=session),
+            ),
+            BlockProvider(
+                name="quicknode_receipts",
+                fetch_raw_block=partial(get_quick_node_raw_block_receipts, session=session),
+            ),
+        ],
+        parse_raw_block=ChainStackEthBlockReceiptsResponse.from_json,
+        raw_block_cache=raw_block_cache,
+        replay=replay,
+        fetch_chain_head=get_latest_block_number,
+        session=session,
+    )
@@ -1,35 +1,55 @@
-import asyncio
-from asyncio import Future
+from typing import Any
 
-from src.extractors.abstract_extractor import BaseExtractor
+from src.extractors.raw_block_cache_extractor import RawBlockCacheExtractor
 from src.models.quick_node_models.eth_blocks import QuickNodeEthBlockInformationResponse
-from src.quick_node.asynchronous.get_block_information import get_block_information
+from src.quick_node.asynchronous.get_block_information import get_raw_block_information
+from src.quick_node.asynchronous.get_latest_block import get_latest_block_number
+from src.utils.raw_block_cache import RawBlockCache
 
 
-class QuickNodeBlockExtractor(BaseExtractor[QuickNodeEthBlockInformationResponse]):
-    async def extract(  # type: ignore[override]
+class QuickNodeBlockExtractor(RawBlockCacheExtractor[QuickNodeEthBlockInformationResponse]):
+    """
+    Extracts blocks from quicknode
+
+    With a raw_block_cache, every fetched block is cached on disk before parsing, and cached blocks are never refetched
+    With replay, blocks are only read from the cache; a missing block raises RawBlockCacheMissError
+    """
+
+    PROVIDER: str = "quicknode"
+
+    def __init__(
+        self,
+        raw_block_cache: RawBlockCache | None = None,
+        replay: bool = False,
+        max_concurrency: int = 50,
+    ) -> None:
+        super().__init__(
+            raw_block_cache=raw_block_cache,
+            replay=replay,
+            max_concurrency=max_concurrency,
+            fetch_chain_head=get_latest_block_number,
+        )
+
+    def cache_providers(self) -> list[str]:
+        return [self.PROVIDER]
+
+    async def fetch_raw_block(self, block_number: str) -> tuple[str, dict[str, Any]]:
+        return self.PROVIDER, await get_raw_block_information(block_number, session=self._session)
+
+    def parse_raw_block(
+        self, block_number: str, raw_block: dict[str, Any]
+    ) -> QuickNodeEthBlockInformationResponse:
+        return QuickNodeEthBlockInformationResponse.from_json(block_number, raw_block)
+
+    async def extract(
         self, start_block_number: int, end_block_number: int
     ) -> list[QuickNodeEthBlockInformationResponse]:
         """
-        Fires (end_block_number - start_block_number + 1) async queries to quicknode
+        Queries quicknode for blocks start_block_number to end_block_number (inclusive) which are not cached,
+        at most max_concurrency at once
 
         100 - 1 + 1 = 100 queries
 
-        Await for all blocks to return, then return
+        Await for all blocks to return, then return; use stream to process each block as soon as it returns
         """
-        print(
-            f"start_block_number: {start_block_number}, end_block_number: {end_block_number}"
-        )
-        for curr_block_number in range(start_block_number, end_block_number + 1):
-            print(hex(curr_block_number))
-
-        async_futures: list[Future[QuickNodeEthBlockInformationResponse]] = [
-            asyncio.ensure_future(get_block_information(hex(curr_block_number)))
-            for curr_block_number in range(start_block_number, end_block_number + 1)
-        ]
-
-        all_blocks_future: Future[list[QuickNodeEthBlockInformationResponse]] = (
-            asyncio.gather(*async_futures)
-        )
-        result: list[QuickNodeEthBlockInformationResponse] = await all_blocks_future
-        return result
+        return await self.extract_many(range(start_block_number, end_block_number + 1))
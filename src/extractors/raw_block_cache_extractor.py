@@ -0,0 +1,166 @@
+import asyncio
+import logging
+from abc import abstractmethod
+from collections import defaultdict
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Awaitable, Callable, Iterable
+
+from src.extractors.abstract_extractor import EXTRACTED_BASE_MODEL, BaseExtractor
+from src.utils.http_client import SharedClientSession
+from src.utils.logging_utils import setup_logging
+from src.utils.raw_block_cache import RawBlockCache, RawBlockCacheMissError
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+# hex number of the latest block, e.g src.chainstack.asynchronous.get_latest_block.get_latest_block_number
+ChainHeadFetcher = Callable[[], Awaitable[str]]
+
+
+class RawBlockCacheExtractor(BaseExtractor[int, EXTRACTED_BASE_MODEL]):
+    """
+    An extractor of raw JSON-RPC block responses, read through a raw block cache a batch at a time
+
+    they must implement
+    - cache_providers: the provider names cached blocks are read under, in order of preference
+    - fetch_raw_block: fetches a single block; returns (the provider name to cache it under, raw response)
+    - parse_raw_block: parses a raw response into its model
+
+    and get, for free, a stream which
+    - reads every cached block of the batch with a single get_many per provider, before fetching anything
+    - fetches only the missing blocks, with the concurrency, backpressure and cancellation of BaseExtractor.stream
+      - unless replay, where a missing block raises RawBlockCacheMissError instead of making a (billed) provider call
+    - caches the fetched blocks with a single put_many per provider, once the batch is consumed or closed
+
+    responses without a result (e.g blocks past the chain head) are returned, but never cached
+    neither are blocks less than confirmations behind the chain head (fetch_chain_head), which a reorg may still
+    replace; the head is only refetched once a batch goes past the last known one
+    without fetch_chain_head, every fetched block is cached; only for blocks which can't be reorged anymore
+
+    SQLite and zlib work runs in a worker thread, off the event loop
+    """
+
+    def __init__(
+        self,
+        raw_block_cache: RawBlockCache | None = None,
+        replay: bool = False,
+        chain: str = "ethereum",
+        max_concurrency: int = 50,
+        fetch_chain_head: ChainHeadFetcher | None = None,
+        confirmations: int = 64,
+        session: SharedClientSession | None = None,
+    ) -> None:
+        super().__init__(max_concurrency=max_concurrency, session=session)
+        if replay and raw_block_cache is None:
+            raise ValueError("replay requires a raw_block_cache")
+        self._raw_block_cache: RawBlockCache | None = raw_block_cache
+        self._replay: bool = replay
+        self._chain: str = chain
+        self._fetch_chain_head: ChainHeadFetcher | None = fetch_chain_head
+        self._confirmations: int = confirmations
+        # the highest block number known to be at least confirmations behind the chain head
+        self._last_confirmed_block_number: int = -1
+
+    @abstractmethod
+    def cache_providers(self) -> list[str]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def fetch_raw_block(self, block_number: str) -> tuple[str, dict[str, Any]]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def parse_raw_block(self, block_number: str, raw_block: dict[str, Any]) -> EXTRACTED_BASE_MODEL:
+        raise NotImplementedError()
+
+    async def extract_one(self, key: int) -> EXTRACTED_BASE_MODEL:
+        """
+        a single block, read through the raw block cache
+        """
+        return (await self.extract_many([key]))[0]
+
+    async def stream(
+        self,
+        keys: Iterable[int],
+        ordered: bool = True,
+        max_concurrency: int | None = None,
+    ) -> AsyncGenerator[tuple[int, EXTRACTED_BASE_MODEL], None]:
+        block_numbers: list[int] = list(keys)
+        cached_blocks: dict[int, dict[str, Any]] = await self._read_cached_blocks(block_numbers)
+        missing_block_numbers: list[int] = [
+            block_number for block_number in block_numbers if block_number not in cached_blocks
+        ]
+        if self._replay and missing_block_numbers:
+            raise RawBlockCacheMissError(
+                f"{len(missing_block_numbers)} {self._chain} blocks from {'/'.join(self.cache_providers())} "
+                f"are not cached, e.g {missing_block_numbers[:5]}"
+            )
+        # provider name -> (block number, raw response) fetched from it during this batch
+        fetched_blocks: defaultdict[str, list[tuple[int, dict[str, Any]]]] = defaultdict(list)
+
+        async def extract(block_number: int) -> EXTRACTED_BASE_MODEL:
+            raw_block: dict[str, Any] | None = cached_blocks.get(block_number)
+            if raw_block is None:
+                provider_name: str
+                provider_name, raw_block = await self.fetch_raw_block(hex(block_number))
+                if raw_block.get("result") is not None:
+                    fetched_blocks[provider_name].append((block_number, raw_block))
+            return self.parse_raw_block(hex(block_number), raw_block)
+
+        try:
+            async with aclosing(
+                self._stream(extract, block_numbers, ordered, max_concurrency)
+            ) as results:
+                async for block_number, block in results:
+                    yield block_number, block
+        finally:
+            if self._raw_block_cache is not None and fetched_blocks:
+                await self._cache_confirmed_blocks(self._raw_block_cache, fetched_blocks)
+
+    async def _read_cached_blocks(self, block_numbers: list[int]) -> dict[int, dict[str, Any]]:
+        cached_blocks: dict[int, dict[str, Any]] = {}
+        if self._raw_block_cache is None:
+            return cached_blocks
+        for provider_name in self.cache_providers():
+            missing_block_numbers: list[int] = [
+                block_number for block_number in block_numbers if block_number not in cached_blocks
+            ]
+            if not missing_block_numbers:
+                break
+            cached_blocks.update(
+                await asyncio.to_thread(
+                    self._raw_block_cache.get_many, self._chain, provider_name, missing_block_numbers
+                )
+            )
+        return cached_blocks
+
+    async def _cache_confirmed_blocks(
+        self,
+        raw_block_cache: RawBlockCache,
+        fetched_blocks: dict[str, list[tuple[int, dict[str, Any]]]],
+    ) -> None:
+        """
+        caches the fetched blocks which are at least confirmations behind the chain head
+        failing to read the chain head only skips caching; the batch itself has been extracted
+        """
+        highest_block_number: int = max(
+            block_number for raw_blocks in fetched_blocks.values() for block_number, _ in raw_blocks
+        )
+        if self._fetch_chain_head is not None and highest_block_number > self._last_confirmed_block_number:
+            try:
+                self._last_confirmed_block_number = (
+                    int(await self._fetch_chain_head(), 16) - self._confirmations
+                )
+            except Exception as error:
+                logger.warning(f"Fetched blocks are not cached, the chain head is unknown: {error!r}")
+                return
+        for provider_name, raw_blocks in fetched_blocks.items():
+            confirmed_blocks: list[tuple[int, dict[str, Any]]] = [
+                (block_number, raw_block)
+                for block_number, raw_block in raw_blocks
+                if self._fetch_chain_head is None or block_number <= self._last_confirmed_block_number
+            ]
+            if confirmed_blocks:
+                await asyncio.to_thread(
+                    raw_block_cache.put_many, self._chain, provider_name, confirmed_blocks
+                )
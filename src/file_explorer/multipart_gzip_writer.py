@@ -0,0 +1,82 @@
+import asyncio
+import zlib
+
+from src.file_explorer.s3_file_explorer import S3Explorer
+
+# s3's minimum, for every part but the last
+MIN_PART_SIZE: int = 5 * 1024 * 1024
+
+
+class MultipartGzipWriter:
+    """
+    Streams bytes into a gzip compressed s3 object, part by part, without ever holding the whole object
+
+    Responsible for
+    - compressing every chunk written, as a single gzip stream
+    - uploading a part as soon as part_size compressed bytes are buffered; boto3 is blocking, so in a thread
+    - completing the upload on close, or aborting it, so no part is left behind; a completed object can be deleted
+
+    Writes are awaited one at a time; a slow upload slows down the writer, instead of buffering without bound
+    """
+
+    def __init__(self, s3_explorer: S3Explorer, s3_path: str, part_size: int = 16 * 1024 * 1024) -> None:
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes")
+        self._s3_explorer: S3Explorer = s3_explorer
+        self.s3_path: str = s3_path
+        self._part_size: int = part_size
+        # wbits | 16: gzip header and trailer, so the object is a plain .gz file
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        self._buffer: bytearray = bytearray()
+        self._upload_id: str | None = None
+        self._etags: list[str] = []
+        self.uncompressed_bytes: int = 0
+
+    async def write(self, chunk: bytes) -> None:
+        self.uncompressed_bytes += len(chunk)
+        self._buffer += self._compressor.compress(chunk)
+        if len(self._buffer) >= self._part_size:
+            await self._upload_part(bytes(self._buffer))
+            self._buffer.clear()
+
+    async def close(self) -> None:
+        """
+        uploads the last part, and completes the object
+        """
+        self._buffer += self._compressor.flush()
+        await self._upload_part(bytes(self._buffer))
+        self._buffer.clear()
+        assert self._upload_id is not None
+        await asyncio.to_thread(
+            self._s3_explorer.complete_multipart_upload, self.s3_path, self._upload_id, self._etags
+        )
+        # nothing left to abort
+        self._upload_id = None
+
+    async def abort(self) -> None:
+        if self._upload_id is not None:
+            await asyncio.to_thread(
+                self._s3_explorer.abort_multipart_upload, self.s3_path, self._upload_id
+            )
+            self._upload_id = None
+
+    async def delete(self) -> None:
+        """
+        deletes the object completed by close
+        """
+        await asyncio.to_thread(self._s3_explorer.delete_file, self.s3_path)
+
+    async def _upload_part(self, body: bytes) -> None:
+        if self._upload_id is None:
+            self._upload_id = await asyncio.to_thread(
+                self._s3_explorer.start_multipart_upload, self.s3_path
+            )
+        self._etags.append(
+            await asyncio.to_thread(
+                self._s3_explorer.upload_part,
+                self.s3_path,
+                self._upload_id,
+                len(self._etags) + 1,
+                body,
+            )
+        )
@@ -8,6 +8,7 @@ from mypy_boto3_s3.client import S3Client
 from mypy_boto3_s3.paginator import ListObjectsV2Paginator
 
 from src.models.file_info.file_info import FileInfo
+from src.utils.metrics import METRICS
 
 
 class S3Explorer:
@@ -30,17 +31,93 @@ class S3Explorer:
         """
         uploads local file to the specified s3 path
         """
-        self._client.upload_file(local_file_path, self.bucket_name, s3_path)
+        with METRICS.timer("s3_upload"):
+            self._client.upload_file(local_file_path, self.bucket_name, s3_path)
+        METRICS.increment("bytes", os.path.getsize(local_file_path), direction="upload")
+
+    def start_multipart_upload(self, s3_path: str) -> str:
+        """
+        starts a multipart upload to s3_path, and returns its upload id
+        """
+        return self._client.create_multipart_upload(Bucket=self.bucket_name, Key=s3_path)["UploadId"]
+
+    def upload_part(self, s3_path: str, upload_id: str, part_number: int, body: bytes) -> str:
+        """
+        uploads part part_number (from 1) of a multipart upload, and returns its ETag
+        every part but the last must be at least 5 MiB
+        """
+        with METRICS.timer("s3_upload_part"):
+            etag: str = self._client.upload_part(
+                Bucket=self.bucket_name,
+                Key=s3_path,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body,
+            )["ETag"]
+        METRICS.increment("bytes", len(body), direction="upload")
+        return etag
+
+    def complete_multipart_upload(self, s3_path: str, upload_id: str, etags: list[str]) -> None:
+        """
+        etags of every part, in part order; the object only exists once completed
+        """
+        self._client.complete_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=s3_path,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"ETag": etag, "PartNumber": part_number}
+                    for part_number, etag in enumerate(etags, start=1)
+                ]
+            },
+        )
+
+    def abort_multipart_upload(self, s3_path: str, upload_id: str) -> None:
+        """
+        discards the parts uploaded so far; s3 keeps (and bills) them until then
+        """
+        self._client.abort_multipart_upload(Bucket=self.bucket_name, Key=s3_path, UploadId=upload_id)
+
+    def delete_file(self, s3_path: str) -> None:
+        self._client.delete_object(Bucket=self.bucket_name, Key=s3_path)
 
     def download_to_buffer(self, s3_path: str) -> io.BytesIO:
         """
         downloads file from s3_path into a file buffer
         """
         buffer: io.BytesIO = io.BytesIO()
-        self._client.download_fileobj(self.bucket_name, s3_path, buffer)
+        with METRICS.timer("s3_download"):
+            self._client.download_fileobj(self.bucket_name, s3_path, buffer)
+        METRICS.increment("bytes", buffer.getbuffer().nbytes, direction="download")
         buffer.seek(0)
         return buffer
 
+    def iter_object(self, s3_path: str, chunk_size: int = 1024 * 1024) -> Generator[bytes, None, None]:
+        """
+        streams the object at s3_path, chunk_size bytes at a time; unlike download_to_buffer, it is never held in memory
+        """
+        # time the request, not the consumer of the generator
+        with METRICS.timer("s3_download"):
+            body = self._client.get_object(Bucket=self.bucket_name, Key=s3_path)["Body"]
+        try:
+            for chunk in body.iter_chunks(chunk_size):
+                METRICS.increment("bytes", len(chunk), direction="download")
+                yield chunk
+        finally:
+            body.close()
+
+    def read_tail(self, s3_path: str, size: int) -> bytes:
+        """
+        the last size bytes of the object at s3_path, with a ranged request; the whole object, if it is smaller
+        """
+        with METRICS.timer("s3_download"):
+            tail: bytes = self._client.get_object(
+                Bucket=self.bucket_name, Key=s3_path, Range=f"bytes=-{size}"
+            )["Body"].read()
+        METRICS.increment("bytes", len(tail), direction="download")
+        return tail
+
     def list_files(
         self, s3_path_prefix: str, last_modified_date: datetime
     ) -> Generator[FileInfo, None, None]:
@@ -51,7 +128,13 @@ class S3Explorer:
         paginator: ListObjectsV2Paginator = self._client.get_paginator(
             "list_objects_v2"
         )
-        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=s3_path_prefix):
+        pages = iter(paginator.paginate(Bucket=self.bucket_name, Prefix=s3_path_prefix))
+        while True:
+            # each page is a separate ListObjectsV2 request; time the request, not the consumer of the generator
+            with METRICS.timer("s3_list_page"):
+                page = next(pages, None)
+            if page is None:
+                break
             if "Contents" in page:
                 for obj in page["Contents"]:
                     # convert s3's timezone-aware modified date to utc first, then remove the timezone
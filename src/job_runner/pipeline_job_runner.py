@@ -0,0 +1,194 @@
+import asyncio
+import datetime
+import logging
+import threading
+import uuid
+from concurrent.futures import Future
+from enum import Enum
+from typing import Any, Callable, Coroutine
+
+from pydantic import BaseModel, ConfigDict
+
+from src.utils.background_event_loop import BackgroundEventLoop
+from src.utils.logging_utils import setup_logging
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+# called by a pipeline after every batch with (current_block_number, number_of_blocks_in_batch)
+ProgressCallback = Callable[[int, int], None]
+JobFactory = Callable[[ProgressCallback], Coroutine[Any, Any, None]]
+
+
+class PipelineAlreadyRunningError(Exception):
+    pass
+
+
+class JobStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+
+class PipelineJob(BaseModel):
+    """
+    Snapshot of a single pipeline run submitted to the PipelineJobRunner
+    """
+
+    job_id: uuid.UUID
+    pipeline_name: str
+    status: JobStatus = JobStatus.PENDING
+    created_at: datetime.datetime
+    started_at: datetime.datetime | None = None
+    finished_at: datetime.datetime | None = None
+    current_block: int | None = None
+    blocks_processed: int = 0
+    error: str | None = None
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (JobStatus.PENDING, JobStatus.RUNNING)
+
+    @property
+    def blocks_per_second(self) -> float:
+        if self.started_at is None or self.blocks_processed == 0:
+            return 0.0
+        end: datetime.datetime = self.finished_at or datetime.datetime.utcnow()
+        elapsed_seconds: float = (end - self.started_at).total_seconds()
+        return self.blocks_processed / elapsed_seconds if elapsed_seconds > 0 else 0.0
+
+
+class PipelineJobRunner:
+    """
+    Runs pipelines in the background, on a dedicated event loop thread
+
+    Responsible for
+    - assigning every submitted run a job id
+    - single-flight: at most one active job per pipeline_name, so concurrent clicks don't start overlapping runs
+    - collecting progress (current block, blocks processed) reported by the pipeline
+    - cancelling a running job; the pipeline's current batch transaction is rolled back
+
+    Callers (e.g the streamlit script thread) never block on a run; they poll get_job / list_jobs
+    """
+
+    def __init__(self, event_loop: BackgroundEventLoop | None = None) -> None:
+        self._event_loop: BackgroundEventLoop = event_loop or BackgroundEventLoop(
+            name="pipeline-job-runner"
+        )
+        self._jobs: dict[uuid.UUID, PipelineJob] = {}
+        self._futures: dict[uuid.UUID, Future[None]] = {}
+        self._tasks: dict[uuid.UUID, asyncio.Task] = {}
+        # guards _jobs, _futures and _tasks; they are written by both the caller thread and the event loop thread
+        self._lock: threading.Lock = threading.Lock()
+
+    def submit(self, pipeline_name: str, job_factory: JobFactory) -> PipelineJob:
+        """
+        submits a pipeline run and returns immediately
+
+        job_factory receives a progress callback and returns the coroutine to run, e.g
+        lambda report_progress: pipeline.run(progress_callback=report_progress)
+
+        raises PipelineAlreadyRunningError if the pipeline already has an active job
+        """
+        with self._lock:
+            for existing_job in self._jobs.values():
+                if existing_job.pipeline_name == pipeline_name and existing_job.is_active:
+                    raise PipelineAlreadyRunningError(
+                        f"Pipeline {pipeline_name} is already running as job {existing_job.job_id}"
+                    )
+            job: PipelineJob = PipelineJob(
+                job_id=uuid.uuid4(),
+                pipeline_name=pipeline_name,
+                created_at=datetime.datetime.utcnow(),
+            )
+            self._jobs[job.job_id] = job
+            self._futures[job.job_id] = self._event_loop.submit(
+                self._run_job(job.job_id, job_factory)
+            )
+        return job.model_copy()
+
+    async def _run_job(self, job_id: uuid.UUID, job_factory: JobFactory) -> None:
+        def report_progress(current_block: int, blocks_in_batch: int) -> None:
+            with self._lock:
+                job: PipelineJob = self._jobs[job_id]
+                job.current_block = current_block
+                job.blocks_processed += blocks_in_batch
+
+        with self._lock:
+            if self._jobs[job_id].status == JobStatus.CANCELLED:
+                # cancelled before the event loop got to it
+                return
+            self._tasks[job_id] = asyncio.current_task()  # type: ignore[assignment]
+        self._update(job_id, status=JobStatus.RUNNING, started_at=datetime.datetime.utcnow())
+        try:
+            await job_factory(report_progress)
+        except asyncio.CancelledError:
+            logger.info(f"Job {job_id} cancelled")
+            self._update(job_id, status=JobStatus.CANCELLED, finished_at=datetime.datetime.utcnow())
+            raise
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed")
+            self._update(
+                job_id,
+                status=JobStatus.FAILED,
+                error=repr(e),
+                finished_at=datetime.datetime.utcnow(),
+            )
+            return
+        finally:
+            with self._lock:
+                self._tasks.pop(job_id, None)
+        self._update(job_id, status=JobStatus.SUCCEEDED, finished_at=datetime.datetime.utcnow())
+
+    def _update(self, job_id: uuid.UUID, **fields: Any) -> None:
+        with self._lock:
+            job: PipelineJob = self._jobs[job_id]
+            for field_name, value in fields.items():
+                setattr(job, field_name, value)
+
+    def cancel(self, job_id: uuid.UUID) -> bool:
+        """
+        requests cancellation of an active job; returns False if the job is unknown or already finished
+        """
+        with self._lock:
+            job: PipelineJob | None = self._jobs.get(job_id)
+            if job is None or not job.is_active:
+                return False
+            task: asyncio.Task | None = self._tasks.get(job_id)
+            if task is None:
+                # not started yet; _run_job sees the status and exits without running the pipeline
+                job.status = JobStatus.CANCELLED
+                job.finished_at = datetime.datetime.utcnow()
+                return True
+        # the CancelledError is raised inside the pipeline at its next await, rolling back the open transaction
+        self._event_loop.loop.call_soon_threadsafe(task.cancel)
+        return True
+
+    def get_job(self, job_id: uuid.UUID) -> PipelineJob | None:
+        with self._lock:
+            job: PipelineJob | None = self._jobs.get(job_id)
+            return job.model_copy() if job else None
+
+    def list_jobs(self) -> list[PipelineJob]:
+        """
+        returns a snapshot of every job, most recently created first
+        """
+        with self._lock:
+            jobs: list[PipelineJob] = [job.model_copy() for job in self._jobs.values()]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def wait(self, job_id: uuid.UUID, timeout: float | None = None) -> PipelineJob | None:
+        """
+        blocks until the job finishes; used by scripts and tests, never by the dashboard
+        """
+        future: Future[None] | None = self._futures.get(job_id)
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except BaseException:
+                # the outcome is recorded on the job itself
+                pass
+        return self.get_job(job_id)
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
@@ -65,6 +67,18 @@ class Klines(BaseModel):
         return Klines(klines=parsed_klines)
 
 
+class KlinesRequest(BaseModel):
+    """
+    a single /api/v3/klines query; the key BinanceKlinesExtractor extracts by
+    """
+
+    symbol: str
+    interval: str
+    limit: int = 500
+    start_time: datetime | None = None
+    end_time: datetime | None = None
+
+
 if __name__ == "__main__":
     raw_data = [
         [
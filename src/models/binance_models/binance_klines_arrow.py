@@ -0,0 +1,150 @@
+from datetime import datetime, timezone
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+"""
+Columnar (Arrow) representation of binance klines, used on the ingestion hot path
+
+Klines.from_json + BinanceKlinePriceDTO.from_service_klines build 2 pydantic models, 8 Decimals and 2 datetimes per candle
+Here every column is converted once, as a whole array, in C:
+- millisecond epochs -> timestamp[ms]
+- price / volume strings -> decimal128(38, 18), the same fixed-point scale as binance_klines_prices
+
+The pydantic models remain the validation path for tests and single-row reads
+"""
+
+KLINE_DECIMAL_TYPE: pa.Decimal128Type = pa.decimal128(38, 18)
+
+# columns of binance_klines_prices, in table order
+KLINE_ARROW_SCHEMA: pa.Schema = pa.schema(
+    [
+        pa.field("symbol", pa.string(), nullable=False),
+        pa.field("kline_open_time", pa.timestamp("ms"), nullable=False),
+        pa.field("kline_close_time", pa.timestamp("ms"), nullable=False),
+        pa.field("open_price", KLINE_DECIMAL_TYPE, nullable=False),
+        pa.field("high_price", KLINE_DECIMAL_TYPE, nullable=False),
+        pa.field("low_price", KLINE_DECIMAL_TYPE, nullable=False),
+        pa.field("close_price", KLINE_DECIMAL_TYPE, nullable=False),
+        pa.field("volume", KLINE_DECIMAL_TYPE, nullable=False),
+        pa.field("quote_asset_volume", KLINE_DECIMAL_TYPE, nullable=False),
+        pa.field("number_of_trades", pa.int32(), nullable=False),
+        pa.field("taker_buy_base_asset_vol", KLINE_DECIMAL_TYPE, nullable=False),
+        pa.field("taker_buy_quote_asset_vol", KLINE_DECIMAL_TYPE, nullable=False),
+        pa.field("created_at", pa.timestamp("us"), nullable=False),
+    ]
+)
+
+# position of each column in a raw binance kline, e.g [1499040000000, "0.01634790", ..., "0"]
+RAW_KLINE_COLUMN_INDEXES: dict[str, int] = {
+    "kline_open_time": 0,
+    "open_price": 1,
+    "high_price": 2,
+    "low_price": 3,
+    "close_price": 4,
+    "volume": 5,
+    "kline_close_time": 6,
+    "quote_asset_volume": 7,
+    "number_of_trades": 8,
+    "taker_buy_base_asset_vol": 9,
+    "taker_buy_quote_asset_vol": 10,
+}
+
+# Kline model field -> binance_klines_prices column, for klines stored in S3 as Klines.model_dump_json
+KLINE_MODEL_COLUMN_NAMES: dict[str, str] = {
+    "open_time": "kline_open_time",
+    "open_price": "open_price",
+    "high_price": "high_price",
+    "low_price": "low_price",
+    "close_price": "close_price",
+    "volume": "volume",
+    "close_time": "kline_close_time",
+    "quote_asset_volume": "quote_asset_volume",
+    "number_of_trades": "number_of_trades",
+    "taker_buy_base_asset_volume": "taker_buy_base_asset_vol",
+    "taker_buy_quote_asset_volume": "taker_buy_quote_asset_vol",
+}
+
+
+def _cast_column(column_name: str, column: pa.Array | pa.ChunkedArray) -> pa.Array | pa.ChunkedArray:
+    """
+    casts a raw column (int64 epochs, decimal strings, ints) into its KLINE_ARROW_SCHEMA type
+
+    raises pa.ArrowInvalid on malformed values, e.g a non-numeric price
+    """
+    target_type: pa.DataType = KLINE_ARROW_SCHEMA.field(column_name).type
+    if pa.types.is_timestamp(target_type):
+        return pc.cast(pc.cast(column, pa.int64()), target_type)
+    return pc.cast(column, target_type)
+
+
+def _build_table(
+    symbol: str | pa.Array | pa.ChunkedArray,
+    columns: dict[str, pa.Array | pa.ChunkedArray],
+    num_rows: int,
+    created_at: datetime | None,
+) -> pa.Table:
+    created_at = created_at or datetime.now(timezone.utc).replace(tzinfo=None)
+    arrays: dict[str, pa.Array | pa.ChunkedArray] = {
+        "symbol": pa.array([symbol] * num_rows, pa.string()) if isinstance(symbol, str) else symbol,
+        **{column_name: _cast_column(column_name, column) for column_name, column in columns.items()},
+        "created_at": pa.array([created_at] * num_rows, pa.timestamp("us")),
+    }
+    return pa.table(
+        [arrays[field.name] for field in KLINE_ARROW_SCHEMA], schema=KLINE_ARROW_SCHEMA
+    )
+
+
+def raw_klines_to_arrow_table(
+    symbol: str, raw_data: list[list[str | int]], created_at: datetime | None = None
+) -> pa.Table:
+    """
+    Converts the raw binance /api/v3/klines response (a list of lists) into a KLINE_ARROW_SCHEMA table
+
+    The rows are transposed once; each column is then parsed as a whole array
+    """
+    if not raw_data:
+        return KLINE_ARROW_SCHEMA.empty_table()
+    raw_columns: list[tuple[Any, ...]] = list(zip(*raw_data))
+    columns: dict[str, pa.Array] = {
+        column_name: pa.array(raw_columns[column_index])
+        for column_name, column_index in RAW_KLINE_COLUMN_INDEXES.items()
+    }
+    return _build_table(symbol, columns, len(raw_data), created_at)
+
+
+def kline_records_to_arrow_table(
+    records: list[dict[str, Any]], created_at: datetime | None = None
+) -> pa.Table:
+    """
+    Converts serialised Kline models (e.g the "klines" of a Klines JSON file in S3) into a KLINE_ARROW_SCHEMA table
+    """
+    if not records:
+        return KLINE_ARROW_SCHEMA.empty_table()
+    records_table: pa.Table = pa.Table.from_pylist(records)
+    columns: dict[str, pa.ChunkedArray] = {
+        column_name: records_table.column(field_name)
+        for field_name, column_name in KLINE_MODEL_COLUMN_NAMES.items()
+    }
+    return _build_table(records_table.column("symbol"), columns, records_table.num_rows, created_at)
+
+
+if __name__ == "__main__":
+    sample_data: list[list[str | int]] = [
+        [
+            1499040000000,
+            "0.01634790",
+            "0.80000000",
+            "0.01575800",
+            "0.01577100",
+            "148976.11427815",
+            1499644799999,
+            "2434.19055334",
+            308,
+            "1756.87402397",
+            "28.46694368",
+            "0",
+        ]
+    ]
+    print(raw_klines_to_arrow_table("ETHBTC", sample_data))
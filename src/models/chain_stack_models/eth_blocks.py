@@ -38,6 +38,10 @@ class ChainStackEthBlockInformationResult(
     timestamp: str
     totalDifficulty: str | None = None
     transactions: list[ChainStackEthTransaction]  # create a transaction table
+    # hashes of every transaction; the only transaction data of a header-only block (eth_getBlockByNumber full=False)
+    transactionHashes: list[str] = []
+    # False for a header-only block with transactions, whose bodies still have to be hydrated
+    transactionsHydrated: bool = True
     transactionsRoot: str
     uncles: list[str]
     withdrawals: list[ChainStackEthWithdrawal]
@@ -46,13 +50,28 @@ class ChainStackEthBlockInformationResult(
 
     @staticmethod
     def from_json(input: dict[str, Any]) -> "ChainStackEthBlockInformationResult":
+        """
+        input["transactions"] holds transaction objects (full=True), or only their hashes (full=False)
+        """
+        full_transactions: list[dict[str, Any]] = [
+            single_transaction
+            for single_transaction in input["transactions"]
+            if isinstance(single_transaction, dict)
+        ]
         return ChainStackEthBlockInformationResult.model_validate(
             {
                 **input,
                 "transactions": [
                     ChainStackEthTransaction.from_json(single_transaction)
+                    for single_transaction in full_transactions
+                ],
+                "transactionHashes": [
+                    single_transaction["hash"]
+                    if isinstance(single_transaction, dict)
+                    else single_transaction
                     for single_transaction in input["transactions"]
                 ],
+                "transactionsHydrated": len(full_transactions) == len(input["transactions"]),
                 "withdrawals": (
                     [
                         ChainStackEthWithdrawal.model_validate(single_withdrawal)
@@ -0,0 +1,38 @@
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ChainStackEthFeeHistory(BaseModel):
+    """
+    Data class for the result of eth_feeHistory over blocks oldestBlock to oldestBlock + len(gasUsedRatio) - 1
+
+    baseFeePerGas and baseFeePerBlobGas hold one more entry than there are blocks: the fees of the block after
+    the range
+    baseFeePerBlobGas and blobGasUsedRatio are only served by post-Dencun (EIP-4844) nodes
+    """
+
+    oldestBlock: str
+    baseFeePerGas: list[str]
+    gasUsedRatio: list[float]
+    baseFeePerBlobGas: list[str] = []
+    blobGasUsedRatio: list[float] = []
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+class ChainStackEthFeeHistoryResponse(BaseModel):
+    """
+    Top level data-class of eth_feeHistory
+    """
+
+    id: int
+    jsonrpc: str
+    result: ChainStackEthFeeHistory
+
+    @staticmethod
+    def from_json(input: dict[str, Any]) -> "ChainStackEthFeeHistoryResponse":
+        return ChainStackEthFeeHistoryResponse.model_validate(input)
+
+    def block_numbers(self) -> range:
+        oldest_block_number: int = int(self.result.oldestBlock, 16)
+        return range(oldest_block_number, oldest_block_number + len(self.result.gasUsedRatio))
@@ -0,0 +1,87 @@
+from typing import Any
+
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
+
+
+class ChainStackEthLog(BaseModel):
+    """
+    Event log of a transaction receipt; topics[0] is the event signature hash, if any
+    """
+
+    address: str
+    blockHash: str | None = None  # can be null for unsealed block
+    blockNumber: str
+    data: str
+    logIndex: str
+    removed: bool = False
+    topics: list[str]
+    transactionHash: str
+    transactionIndex: str
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+class ChainStackEthReceipt(BaseModel):
+    """
+    Data class for a single receipt of eth_getBlockReceipts
+
+    status is missing on pre-byzantium receipts, which carry the post-transaction state root instead
+    """
+
+    blobGasPrice: str | None = None
+    blobGasUsed: str | None = None
+    blockHash: str | None = None  # can be null for unsealed block
+    blockNumber: str
+    contractAddress: str | None = None  # only set for contract creations
+    cumulativeGasUsed: str
+    effectiveGasPrice: str | None = None
+    from_: str = Field(
+        ..., validation_alias=AliasChoices("from_", "from"), serialization_alias="from_"
+    )
+    gasUsed: str
+    logs: list[ChainStackEthLog]  # create a logs table
+    logsBloom: str
+    root: str | None = None
+    status: str | None = None
+    to: str | None = None  # null for contract creations
+    transactionHash: str
+    transactionIndex: str
+    type: str | None = None
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @staticmethod
+    def from_json(input: dict[str, Any]) -> "ChainStackEthReceipt":
+        return ChainStackEthReceipt.model_validate(
+            {
+                **input,
+                "logs": [
+                    ChainStackEthLog.model_validate(single_log)
+                    for single_log in input.get("logs", [])
+                ],
+            }
+        )
+
+
+class ChainStackEthBlockReceiptsResponse(BaseModel):
+    """
+    Top level data-class of eth_getBlockReceipts; every receipt of a single block, in transaction order
+    """
+
+    block_number: str
+    id: int
+    jsonrpc: str
+    result: list[ChainStackEthReceipt]
+
+    @staticmethod
+    def from_json(
+        block_number: str, input: dict[str, Any]
+    ) -> "ChainStackEthBlockReceiptsResponse":
+        return ChainStackEthBlockReceiptsResponse.model_validate(
+            {
+                "block_number": block_number,
+                **input,
+                "result": [
+                    ChainStackEthReceipt.from_json(single_receipt)
+                    for single_receipt in input["result"]
+                ],
+            }
+        )
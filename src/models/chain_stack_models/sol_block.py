@@ -0,0 +1,89 @@
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+# JSON-RPC errors of getBlock for a slot without a block; not worth retrying
+# -32007: slot was skipped, or missing due to a ledger jump to a recent snapshot
+# -32009: slot was skipped, or missing in long-term storage
+SKIPPED_SLOT_ERROR_CODES: frozenset[int] = frozenset({-32007, -32009})
+
+
+class ChainStackSolTransactionMeta(BaseModel):
+    """
+    Data class for the status metadata of a transaction; err is null if the transaction succeeded
+    """
+
+    fee: int  # lamports
+    err: Any | None = None
+    computeUnitsConsumed: int | None = None
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+class ChainStackSolTransactionSignatures(BaseModel):
+    """
+    Only the signatures of a transaction; its message (accounts, instructions) is not kept
+    """
+
+    signatures: list[str]
+
+
+class ChainStackSolTransaction(BaseModel):
+    """
+    Data class for a transaction of getBlock(transactionDetails=full)
+
+    version is "legacy", or a number for versioned transactions
+    """
+
+    transaction: ChainStackSolTransactionSignatures
+    meta: ChainStackSolTransactionMeta | None = None
+    version: int | str | None = None
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+class ChainStackSolBlock(BaseModel):
+    """
+    Data class for the result of getBlock
+
+    Depending on transactionDetails
+    - full: transactions holds every transaction
+    - signatures: signatures holds the (first) signature of every transaction
+    - none: neither
+    """
+
+    blockhash: str
+    previousBlockhash: str
+    parentSlot: int
+    blockHeight: int | None = None
+    blockTime: int | None = None  # unix timestamp
+    transactions: list[ChainStackSolTransaction] | None = None
+    signatures: list[str] | None = None
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+class ChainStackSolBlockResponse(BaseModel):
+    """
+    Top level data-class of getBlock
+
+    result is None if the slot was skipped; no block was produced in it
+    """
+
+    id: int
+    jsonrpc: str
+    slot: int
+    result: ChainStackSolBlock | None = None
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @staticmethod
+    def from_json(slot: int, input: dict[str, Any]) -> "ChainStackSolBlockResponse":
+        return ChainStackSolBlockResponse.model_validate(
+            {
+                "id": input["id"],
+                "jsonrpc": input["jsonrpc"],
+                "slot": slot,
+                "result": input.get("result"),
+            }
+        )
+
+    @property
+    def skipped(self) -> bool:
+        return self.result is None
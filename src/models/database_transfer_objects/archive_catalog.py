@@ -0,0 +1,12 @@
+import datetime
+from pydantic import BaseModel, ConfigDict
+
+
+class ArchiveCatalogEntryDTO(BaseModel):
+    table_name: str
+    partition_key: str
+    s3_path: str
+    row_count: int
+    sha256: str
+    archived_at: datetime.datetime
+    model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -0,0 +1,56 @@
+import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from src.models.chain_stack_models.eth_blocks import (
+    ChainStackEthBlockInformationResponse,
+)
+from src.models.quick_node_models.eth_blocks import QuickNodeEthBlockInformationResponse
+
+# EIP-4844: every blob consumes 2 ** 17 blob gas
+GAS_PER_BLOB: int = 131_072
+
+
+def hex_to_int(value: str | None) -> int | None:
+    return int(value, 16) if value is not None else None
+
+
+class EthBlobMetricsDTO(BaseModel):
+    """
+    DTO for eth_blob_metrics
+
+    Numeric, unlike the hex strings of eth_blocks, so fees can be aggregated in SQL;
+    blob fields are null before Dencun
+    """
+
+    block_number: int  # identifier
+    blob_gas_used: int | None = None
+    excess_blob_gas: int | None = None
+    blob_count: int | None = None
+    base_fee_per_gas: int | None = None  # wei
+    blob_base_fee: int | None = None  # wei per blob gas
+    blob_gas_used_ratio: float | None = None
+    created_at: datetime.datetime
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @staticmethod
+    def from_block(
+        input: QuickNodeEthBlockInformationResponse | ChainStackEthBlockInformationResponse,
+        base_fee_per_gas: str | None = None,
+        blob_base_fee: str | None = None,
+        blob_gas_used_ratio: float | None = None,
+    ) -> "EthBlobMetricsDTO":
+        """
+        the block's blob gas, with its fees from eth_feeHistory, if any
+        """
+        blob_gas_used: int | None = hex_to_int(input.result.blobGasUsed)
+        return EthBlobMetricsDTO(
+            block_number=int(input.block_number, 16),
+            blob_gas_used=blob_gas_used,
+            excess_blob_gas=hex_to_int(input.result.excessBlobGas),
+            blob_count=blob_gas_used // GAS_PER_BLOB if blob_gas_used is not None else None,
+            base_fee_per_gas=hex_to_int(base_fee_per_gas or input.result.baseFeePerGas),
+            blob_base_fee=hex_to_int(blob_base_fee),
+            blob_gas_used_ratio=blob_gas_used_ratio,
+            created_at=datetime.datetime.utcnow(),
+        )
@@ -56,6 +56,9 @@ class EthBlockDTO(BaseModel):
     created_at: datetime.datetime = Field(
         default_factory=datetime.datetime.utcnow, serialization_alias="created_at"
     )
+    # False for a header-only block, until its transactions are hydrated
+    transactionsHydrated: bool = Field(True, serialization_alias="transactions_hydrated")
+    transactionCount: int | None = Field(None, serialization_alias="transaction_count")
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     @staticmethod
@@ -67,6 +70,12 @@ class EthBlockDTO(BaseModel):
         """
         Smart constructor to create a DTO from QuickNode service class
         """
+        # only chainstack blocks can be header-only
+        transactions_hydrated: bool = True
+        transaction_count: int = len(input.result.transactions)
+        if isinstance(input, ChainStackEthBlockInformationResponse):
+            transactions_hydrated = input.result.transactionsHydrated
+            transaction_count = len(input.result.transactionHashes)
         return EthBlockDTO(
             block_number=input.block_number,
             id=input.id,
@@ -95,4 +104,6 @@ class EthBlockDTO(BaseModel):
             transactionsRoot=input.result.transactionsRoot,
             withdrawalsRoot=input.result.withdrawalsRoot,
             created_at=datetime.datetime.utcnow(),  # set created_at to UTC timezone
+            transactionsHydrated=transactions_hydrated,
+            transactionCount=transaction_count,
         )
@@ -0,0 +1,46 @@
+import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from src.models.chain_stack_models.eth_receipt import ChainStackEthLog
+
+
+class EthLogDTO(BaseModel):
+    """
+    DTO for eth_logs
+
+    topics are flattened into topic0 to topic3; an event has at most 4 topics, and topic0 (the event signature)
+    is what logs are filtered by
+    """
+
+    block_number: str  # eth_blocks.block_number
+    logIndex: str  # unique within a block
+    transaction_hash: str
+    transactionIndex: str
+    address: str
+    topic0: str | None = None
+    topic1: str | None = None
+    topic2: str | None = None
+    topic3: str | None = None
+    data: str
+    removed: bool
+    created_at: datetime.datetime
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @staticmethod
+    def from_eth_log(block_number: str, input: ChainStackEthLog) -> "EthLogDTO":
+        topics: list[str | None] = [*input.topics, None, None, None, None][:4]
+        return EthLogDTO(
+            block_number=block_number,
+            logIndex=input.logIndex,
+            transaction_hash=input.transactionHash,
+            transactionIndex=input.transactionIndex,
+            address=input.address,
+            topic0=topics[0],
+            topic1=topics[1],
+            topic2=topics[2],
+            topic3=topics[3],
+            data=input.data,
+            removed=input.removed,
+            created_at=datetime.datetime.utcnow(),
+        )
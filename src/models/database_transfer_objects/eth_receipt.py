@@ -0,0 +1,54 @@
+import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from src.models.chain_stack_models.eth_receipt import ChainStackEthReceipt
+
+
+class EthReceiptDTO(BaseModel):
+    """
+    DTO for eth_receipts
+
+    Converted from ChainStackEthReceipt, omitting the nested logs; those go to eth_logs
+    """
+
+    transaction_hash: str  # identifier
+    block_number: str  # eth_blocks.block_number
+    blockHash: str | None = None
+    transactionIndex: str
+    from_address: str
+    to_address: str | None = None
+    contractAddress: str | None = None
+    cumulativeGasUsed: str
+    gasUsed: str
+    effectiveGasPrice: str | None = None
+    blobGasUsed: str | None = None
+    blobGasPrice: str | None = None
+    logsBloom: str
+    status: str | None = None
+    root: str | None = None
+    type: str | None = None
+    created_at: datetime.datetime
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @staticmethod
+    def from_eth_receipt(block_number: str, input: ChainStackEthReceipt) -> "EthReceiptDTO":
+        return EthReceiptDTO(
+            transaction_hash=input.transactionHash,
+            block_number=block_number,
+            blockHash=input.blockHash,
+            transactionIndex=input.transactionIndex,
+            from_address=input.from_,
+            to_address=input.to,
+            contractAddress=input.contractAddress,
+            cumulativeGasUsed=input.cumulativeGasUsed,
+            gasUsed=input.gasUsed,
+            effectiveGasPrice=input.effectiveGasPrice,
+            blobGasUsed=input.blobGasUsed,
+            blobGasPrice=input.blobGasPrice,
+            logsBloom=input.logsBloom,
+            status=input.status,
+            root=input.root,
+            type=input.type,
+            created_at=datetime.datetime.utcnow(),
+        )
@@ -35,7 +35,7 @@ class EthTransactionDTO(BaseModel):
 
     @staticmethod
     def from_eth_transaction(
-        block_id: int, input: QuickNodeEthTransaction | ChainStackEthTransaction
+        block_id: int | None, input: QuickNodeEthTransaction | ChainStackEthTransaction
     ) -> "EthTransactionDTO":
         return EthTransactionDTO(
             hash=input.hash,
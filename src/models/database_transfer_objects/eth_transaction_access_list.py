@@ -1,20 +1,23 @@
 from pydantic import BaseModel, ConfigDict
-import uuid
 import datetime
 
 from src.models.chain_stack_models.eth_access_list_item import (
     ChainStackEthAccessListItem,
 )
+from src.models.database_transfer_objects.natural_keys import natural_key
 from src.models.quick_node_models.eth_access_list_item import QuickNodeEthAccessListItem
 
 
 class EthTransactionAccessListDTO(BaseModel):
     """
     DTO for table quick_node.eth_transaction_access_list
+
+    id is derived from (transaction_hash, position), so a re-ingested access list item keeps its id
     """
 
     id: str
     transaction_hash: str
+    position: int  # index of the item in the transaction's access list
     address: str
     storageKeys: list[str]
     created_at: datetime.datetime
@@ -23,11 +26,13 @@ class EthTransactionAccessListDTO(BaseModel):
     @staticmethod
     def from_eth_access_list_item(
         transaction_hash: str,
+        position: int,
         input: QuickNodeEthAccessListItem | ChainStackEthAccessListItem,
     ) -> "EthTransactionAccessListDTO":
         return EthTransactionAccessListDTO(
-            id=str(uuid.uuid4()),
+            id=str(natural_key(transaction_hash, position)),
             transaction_hash=transaction_hash,
+            position=position,
             address=input.address,
             storageKeys=input.storageKeys,
             created_at=datetime.datetime.utcnow(),
@@ -3,12 +3,15 @@ import uuid
 import datetime
 
 from src.models.chain_stack_models.eth_withdrawal import ChainStackEthWithdrawal
+from src.models.database_transfer_objects.natural_keys import natural_key
 from src.models.quick_node_models.eth_blocks import QuickNodeEthWithdrawal
 
 
 class EthWithdrawalDTO(BaseModel):
     """
     DTO for quick_node.eth_withdrawals_table
+
+    id is derived from (block_number, index), so a re-ingested withdrawal keeps its id
     """
 
     id: uuid.UUID
@@ -25,7 +28,7 @@ class EthWithdrawalDTO(BaseModel):
         block_number: str, input: QuickNodeEthWithdrawal | ChainStackEthWithdrawal
     ) -> "EthWithdrawalDTO":
         return EthWithdrawalDTO(
-            id=uuid.uuid4(),
+            id=natural_key(block_number, input.index),
             block_number=block_number,
             address=input.address,
             amount=input.amount,
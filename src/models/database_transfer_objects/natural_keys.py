@@ -0,0 +1,14 @@
+import uuid
+
+# namespace of every natural key; never change it, or re-ingested rows stop conflicting with existing ones
+# the migrations compute the same keys in SQL, with uuid_generate_v5
+NATURAL_KEY_NAMESPACE: uuid.UUID = uuid.UUID("157c990e-3e3a-55a7-8c49-1217e1b673bb")
+
+
+def natural_key(*parts: str | int) -> uuid.UUID:
+    """
+    a deterministic id (UUIDv5) for a row without one, from the columns that identify it
+
+    the same row always gets the same id, so a re-ingested row conflicts with itself, and ON CONFLICT DO NOTHING skips it
+    """
+    return uuid.uuid5(NATURAL_KEY_NAMESPACE, ":".join(str(part) for part in parts))
@@ -0,0 +1,10 @@
+import datetime
+from pydantic import BaseModel, ConfigDict
+
+
+class PipelineCheckpointDTO(BaseModel):
+    pipeline_name: str
+    shard: int
+    position: int
+    updated_at: datetime.datetime
+    model_config = ConfigDict(arbitrary_types_allowed=True)
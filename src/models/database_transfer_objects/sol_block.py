@@ -0,0 +1,111 @@
+import datetime
+import json
+
+from pydantic import BaseModel, ConfigDict
+
+from src.models.chain_stack_models.sol_block import (
+    ChainStackSolBlockResponse,
+    ChainStackSolTransaction,
+)
+
+
+class SolBlockDTO(BaseModel):
+    """
+    DTO for sol_block
+    """
+
+    slot: int  # identifier
+    block_height: int | None = None
+    block_time: datetime.datetime | None = None
+    blockhash: str
+    parent_slot: int
+    previous_blockhash: str
+    transaction_count: int | None = None  # None if fetched with transactionDetails=none
+    created_at: datetime.datetime
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @staticmethod
+    def from_block_response(input: ChainStackSolBlockResponse) -> "SolBlockDTO":
+        if input.result is None:
+            raise ValueError(f"slot {input.slot} was skipped; it has no block")
+        transaction_count: int | None = None
+        if input.result.transactions is not None:
+            transaction_count = len(input.result.transactions)
+        elif input.result.signatures is not None:
+            transaction_count = len(input.result.signatures)
+        return SolBlockDTO(
+            slot=input.slot,
+            block_height=input.result.blockHeight,
+            block_time=(
+                datetime.datetime.utcfromtimestamp(input.result.blockTime)
+                if input.result.blockTime is not None
+                else None
+            ),
+            blockhash=input.result.blockhash,
+            parent_slot=input.result.parentSlot,
+            previous_blockhash=input.result.previousBlockhash,
+            transaction_count=transaction_count,
+            created_at=datetime.datetime.utcnow(),
+        )
+
+
+class SolTransactionDTO(BaseModel):
+    """
+    DTO for sol_transaction
+
+    fee, compute_units_consumed, err and version are None if fetched with transactionDetails=signatures
+    """
+
+    signature: str  # identifier
+    slot: int  # sol_block.slot
+    transaction_index: int
+    fee: int | None = None
+    compute_units_consumed: int | None = None
+    err: str | None = None  # JSON
+    version: str | None = None
+    created_at: datetime.datetime
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @staticmethod
+    def from_transaction(
+        slot: int, transaction_index: int, input: ChainStackSolTransaction
+    ) -> "SolTransactionDTO":
+        return SolTransactionDTO(
+            signature=input.transaction.signatures[0],
+            slot=slot,
+            transaction_index=transaction_index,
+            fee=input.meta.fee if input.meta is not None else None,
+            compute_units_consumed=(
+                input.meta.computeUnitsConsumed if input.meta is not None else None
+            ),
+            err=(
+                json.dumps(input.meta.err)
+                if input.meta is not None and input.meta.err is not None
+                else None
+            ),
+            version=str(input.version) if input.version is not None else None,
+            created_at=datetime.datetime.utcnow(),
+        )
+
+    @staticmethod
+    def from_block_response(input: ChainStackSolBlockResponse) -> list["SolTransactionDTO"]:
+        """
+        every transaction of the block, from its transactions or, failing that, its signatures
+        """
+        if input.result is None:
+            return []
+        if input.result.transactions is not None:
+            return [
+                SolTransactionDTO.from_transaction(input.slot, transaction_index, transaction)
+                for transaction_index, transaction in enumerate(input.result.transactions)
+            ]
+        created_at: datetime.datetime = datetime.datetime.utcnow()
+        return [
+            SolTransactionDTO(
+                signature=signature,
+                slot=input.slot,
+                transaction_index=transaction_index,
+                created_at=created_at,
+            )
+            for transaction_index, signature in enumerate(input.result.signatures or [])
+        ]
@@ -22,7 +22,7 @@ class QuickNodeEthTransaction(BaseModel):
     nonce: str
     r: str
     s: str
-    to: str
+    to: str | None  # null for contract creation transactions
     transactionIndex: str
     type: str
     v: str
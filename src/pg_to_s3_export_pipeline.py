@@ -0,0 +1,261 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Sequence
+
+from dotenv import load_dotenv
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from database_management.chainstack.tables import eth_block_table
+from src.dao.s3_export_watermark_dao import S3ExportWatermarkDAO
+from src.file_explorer.multipart_gzip_writer import MultipartGzipWriter
+from src.file_explorer.s3_file_explorer import S3Explorer
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+load_dotenv()
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+# a key range: (inclusive lower bound, exclusive upper bound); None is unbounded
+KeyRange = tuple[Any | None, Any | None]
+
+
+def key_ranges(boundaries: Sequence[Any | None]) -> list[KeyRange]:
+    """
+    disjoint key ranges covering every key, split at boundaries
+    """
+    distinct_boundaries: list[Any] = sorted(
+        {boundary for boundary in boundaries if boundary is not None}
+    )
+    bounds: list[Any | None] = [None, *distinct_boundaries, None]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def export_query(
+    table: Table,
+    key_column: str,
+    key_range: KeyRange,
+    exported_after: datetime | None,
+    exported_until: datetime,
+) -> tuple[str, list[Any]]:
+    """
+    the query (with asyncpg's positional parameters) and arguments exporting the rows of a key range created after
+    exported_after, up to exported_until (inclusive)
+    """
+    lower, upper = key_range
+    conditions: list[str] = []
+    args: list[Any] = []
+    for condition, value in (
+        (f"{key_column} >= ${{}}", lower),
+        (f"{key_column} < ${{}}", upper),
+        ("created_at > ${}", exported_after),
+    ):
+        if value is not None:
+            args.append(value)
+            conditions.append(condition.format(len(args)))
+    args.append(exported_until)
+    conditions.append(f"created_at <= ${len(args)}")
+    column_list: str = ", ".join(column.name for column in table.columns)
+    return f"SELECT {column_list} FROM {table.name} WHERE {' AND '.join(conditions)}", args
+
+
+class PgToS3ExportPipeline:
+    """
+    Exports a table to gzip compressed CSVs in s3, the format S3ETLPipeline loads back; the reverse of S3ETLPipeline
+
+    Steps
+    1. Export a snapshot (pg_export_snapshot), and split the table into parallelism key ranges, from a sample
+    2. Stream every key range with COPY ... TO STDOUT on its own connection, all in the same snapshot, straight into
+       its own s3 multipart upload (MultipartGzipWriter); one CSV per key range
+    3. Once every key range is streamed, complete the uploads, then move the watermark
+
+    Incremental: only rows created after the watermark are exported, up to lag ago; rows of batches still committing
+    are left for the next run. Nothing is visible in s3 unless the whole export succeeds
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        s3_explorer: S3Explorer,
+        watermark_dao: S3ExportWatermarkDAO,
+        table: Table,
+        s3_prefix_path: str,
+        parallelism: int = 4,
+        part_size: int = 16 * 1024 * 1024,
+        lag: timedelta = timedelta(minutes=10),
+        sample_percent: float = 1.0,
+    ) -> None:
+        self._engine: AsyncEngine = create_async_engine(
+            connection_string, pool_size=parallelism + 1
+        )
+        self._s3_explorer: S3Explorer = s3_explorer
+        self._watermark_dao: S3ExportWatermarkDAO = watermark_dao
+        self._table: Table = table
+        # the first primary key column; e.g symbol of binance_klines_prices
+        self._key_column: str = next(iter(table.primary_key.columns)).name
+        self._s3_prefix_path: str = s3_prefix_path
+        self._parallelism: int = parallelism
+        self._part_size: int = part_size
+        self._lag: timedelta = lag
+        self._sample_percent: float = sample_percent
+
+    async def run(self) -> None:
+        exported_after: datetime | None = await self._watermark_dao.read_watermark(self._table.name)
+        exported_until: datetime = datetime.utcnow() - self._lag
+        if exported_after is not None and exported_until <= exported_after:
+            logger.info(f"{self._table.name} is exported until {exported_after} already")
+            return
+
+        with METRICS.run(f"{self._table.name}_export"):
+            async with self._engine.connect() as coordinator:
+                await coordinator.execution_options(isolation_level="REPEATABLE READ")
+                async with coordinator.begin():
+                    # every worker imports this snapshot; it stays importable while this transaction is open
+                    snapshot_id: str = (
+                        await coordinator.execute(text("SELECT pg_export_snapshot()"))
+                    ).scalar_one()
+                    ranges: list[KeyRange] = key_ranges(await self._sample_boundaries(coordinator))
+                    writers: list[MultipartGzipWriter] = [
+                        MultipartGzipWriter(
+                            self._s3_explorer,
+                            f"{self._s3_prefix_path}/{exported_until:%Y/%m/%d}/"
+                            f"{self._table.name}_{exported_until:%Y%m%d%H%M%S}_{index:04d}.csv.gz",
+                            part_size=self._part_size,
+                        )
+                        for index in range(len(ranges))
+                    ]
+                    results: list[int | BaseException] = await asyncio.gather(
+                        *[
+                            self._export_range(
+                                snapshot_id, key_range, exported_after, exported_until, writer
+                            )
+                            for key_range, writer in zip(ranges, writers)
+                        ],
+                        return_exceptions=True,
+                    )
+            await self._publish(writers, results)
+        await self._watermark_dao.update_watermark(self._table.name, exported_until)
+
+    async def _sample_boundaries(self, coordinator: AsyncConnection) -> list[Any | None]:
+        """
+        the keys splitting a sample of the table into parallelism equal parts; no boundaries for an empty sample
+        """
+        fractions: list[float] = [index / self._parallelism for index in range(1, self._parallelism)]
+        if not fractions:
+            return []
+        boundaries: list[Any | None] | None = (
+            await coordinator.execute(
+                text(
+                    f"SELECT percentile_disc(CAST(:fractions AS double precision[])) "
+                    f"WITHIN GROUP (ORDER BY {self._key_column}) "
+                    f"FROM {self._table.name} TABLESAMPLE SYSTEM (:sample_percent)"
+                ),
+                {"fractions": fractions, "sample_percent": self._sample_percent},
+            )
+        ).scalar_one()
+        return boundaries or []
+
+    async def _export_range(
+        self,
+        snapshot_id: str,
+        key_range: KeyRange,
+        exported_after: datetime | None,
+        exported_until: datetime,
+        writer: MultipartGzipWriter,
+    ) -> int:
+        """
+        streams a key range into writer, and returns its number of rows; writer is left open
+        """
+        query, args = export_query(
+            self._table, self._key_column, key_range, exported_after, exported_until
+        )
+        async with self._engine.connect() as async_connection:
+            await async_connection.execution_options(isolation_level="REPEATABLE READ")
+            async with async_connection.begin():
+                # must be the first statement of the transaction; the snapshot id can't be a parameter
+                await async_connection.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'"))
+                dbapi_pooled_conn = await async_connection.get_raw_connection()
+                dbapi_conn = dbapi_pooled_conn.driver_connection
+                with METRICS.timer("copy_to_stdout"):
+                    # e.g COPY 1234
+                    status: str = await dbapi_conn.copy_from_query(  # type: ignore[union-attr]
+                        query, *args, output=writer.write, format="csv", header=True
+                    )
+        row_count: int = int(status.split()[-1])
+        METRICS.increment("rows", row_count, table=self._table.name, direction="export")
+        return row_count
+
+    @staticmethod
+    async def _publish(
+        writers: list[MultipartGzipWriter], results: list[int | BaseException]
+    ) -> None:
+        """
+        completes every upload with rows, or, if any key range failed, aborts them all
+
+        if completing an upload fails, the remaining uploads are aborted and the objects already completed are deleted,
+        so the export is never partially visible
+        """
+        failures: list[BaseException] = [
+            result for result in results if isinstance(result, BaseException)
+        ]
+        if failures:
+            for writer in writers:
+                await writer.abort()
+            raise failures[0]
+
+        completed: list[MultipartGzipWriter] = []
+        try:
+            for writer, result in zip(writers, results):
+                if result == 0:
+                    await writer.abort()
+                else:
+                    await writer.close()
+                    completed.append(writer)
+        except BaseException:
+            for writer in writers:
+                await writer.abort()
+            for writer in completed:
+                await writer.delete()
+            raise
+        for writer, result in zip(writers, results):
+            if result != 0:
+                logger.info(f"Exported {result} rows to {writer.s3_path}")
+
+
+def create_export_pipeline(
+    table: Table, connection_string: str, s3_prefix_path: str
+) -> PgToS3ExportPipeline:
+    return PgToS3ExportPipeline(
+        connection_string=connection_string,
+        s3_explorer=S3Explorer(
+            bucket_name=os.getenv("AWS_S3_BUCKET", ""),
+            endpoint_url=os.getenv("AWS_S3_ENDPOINT", ""),
+            access_key_id=os.getenv("AWS_ACCESS_KEY_ID", ""),
+            secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", ""),
+        ),
+        watermark_dao=S3ExportWatermarkDAO(connection_string),
+        table=table,
+        s3_prefix_path=s3_prefix_path,
+        parallelism=int(os.getenv("EXPORT_PARALLELISM", "4")),
+    )
+
+
+def trigger_eth_blocks_export() -> None:
+    """
+    into chainstack/eth_blocks, where S3ETLPipeline loads eth_blocks from
+    """
+    asyncio.run(
+        create_export_pipeline(
+            table=eth_block_table,
+            connection_string=os.getenv("CHAIN_STACK_PG_CONNECTION_STRING", ""),
+            s3_prefix_path="chainstack/eth_blocks",
+        ).run()
+    )
+
+
+if __name__ == "__main__":
+    trigger_eth_blocks_export()
@@ -6,48 +6,68 @@ from dotenv import load_dotenv
 import json
 import os
 
-from retry import retry
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+)
 
 from src.models.quick_node_models.eth_blocks import (
     QuickNodeEthBlockInformationResponse,
 )
 from src.quick_node.exceptions.quick_node_client_error import QuickNodeClientError
+from src.utils.http_client import SharedClientSession, client_session, read_json
+from src.utils.metrics import METRICS
 
 load_dotenv()
 
 
+# tenacity, unlike retry.retry, awaits the coroutine; so failed requests are actually retried
 @retry(
-    exceptions=(aiohttp.ClientError, QuickNodeClientError),
-    tries=5,
-    delay=0.1,
-    max_delay=0.3375,
-    backoff=1.5,
-    jitter=(-0.01, 0.01),
+    retry=retry_if_exception_type((aiohttp.ClientError, QuickNodeClientError)),
+    wait=wait_exponential(multiplier=0.1, exp_base=1.5, max=0.3375) + wait_random(-0.01, 0.01),
+    stop=stop_after_attempt(5),
+    reraise=True,
+    before_sleep=METRICS.record_retry,
 )
-async def get_block_information(
-    block_number: str,
-) -> QuickNodeEthBlockInformationResponse:
+async def get_raw_block_information(
+    block_number: str, full_transactions: bool = True, session: SharedClientSession | None = None
+) -> dict[str, Any]:
+    """
+    returns the eth_getBlockByNumber JSON-RPC response as is, so it can be cached before parsing
+
+    with full_transactions=False, transactions are only returned as hashes; a 50-100x smaller header-only payload
+    """
     url: str = os.getenv("QUICK_NODE_URL", "")
     payload: str = json.dumps(
         {
             "method": "eth_getBlockByNumber",
-            "params": [block_number, True],  # set to True
+            "params": [block_number, full_transactions],
             "id": 1,
             "jsonrpc": "2.0",
         }
     )
     headers: dict[str, str] = {"Content-Type": "application/json"}
 
-    async with aiohttp.ClientSession() as client:
+    async with client_session(session) as client:
         async with client.post(url, headers=headers, data=payload) as response:
             if response.status == 200:
-                response_dict: dict[str, Any] = await response.json()
+                response_dict: dict[str, Any] = await read_json(response, provider="quicknode")
             else:
                 # can happen when quicknode server is down
                 raise QuickNodeClientError(
                     f"Received non-status code 200: {response.status}"
                 )
 
+    return response_dict
+
+
+async def get_block_information(
+    block_number: str,
+) -> QuickNodeEthBlockInformationResponse:
+    response_dict: dict[str, Any] = await get_raw_block_information(block_number)
     response_model: QuickNodeEthBlockInformationResponse = (
         QuickNodeEthBlockInformationResponse.from_json(block_number, response_dict)
     )
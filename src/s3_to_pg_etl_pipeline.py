@@ -1,14 +1,22 @@
+import gzip
 import io
 import os
 from asyncio import AbstractEventLoop, new_event_loop
 from datetime import datetime
+from functools import partial
 from typing import Generator
 
 from dotenv import load_dotenv
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 
+from database_management.binance.binance_table import (
+    binance_kline_rollup_tables,
+    binance_klines_prices_table,
+)
+from src.dao.bulk_load import BulkLoadMode
 from src.dao.eth_block_dao import EthBlockDAO
 from src.dao.kline_binance_dao import KlineBinanceDAO
+from src.dao.kline_rollup_dao import KlineRollupDAO
 from src.dao.s3_import_status_dao import S3ImportStatusDAO
 from src.file_explorer.s3_file_explorer import S3Explorer
 from src.models.database_transfer_objects.s3_import_status import S3ImportStatusDTO
@@ -21,6 +29,8 @@ class S3ETLPipeline:
 
     TODO: Create and abstract base class for DAO, then use the abstract base class here
     This will allow the support for all DAOs
+
+    with a bulk_load_mode, the backfill is loaded with its tables in bulk load mode (see BulkLoadMode)
     """
 
     def __init__(
@@ -31,6 +41,7 @@ class S3ETLPipeline:
         s3_prefix_path: str,
         connection_string: str,
         dao: EthBlockDAO | KlineBinanceDAO,
+        bulk_load_mode: BulkLoadMode | None = None,
     ) -> None:
         self._s3_import_status_dao: S3ImportStatusDAO = s3_import_status_dao
         self._data_source: str = data_source
@@ -38,8 +49,16 @@ class S3ETLPipeline:
         self._s3_prefix_path: str = s3_prefix_path
         self._engine: AsyncEngine = create_async_engine(connection_string)
         self._dao: EthBlockDAO | KlineBinanceDAO = dao
+        self._bulk_load_mode: BulkLoadMode | None = bulk_load_mode
 
     async def run(self) -> None:
+        if self._bulk_load_mode is None:
+            await self.load_new_files()
+            return
+        async with self._bulk_load_mode.bulk_load():
+            await self.load_new_files()
+
+    async def load_new_files(self) -> None:
         """
         Step 1: Get latest file modified date from s3_import_status table
         Step 2: Get all files whole modified date is after the s3_import_status modified date
@@ -71,6 +90,9 @@ class S3ETLPipeline:
                 csv_bytes: io.BytesIO = self._s3_explorer.download_to_buffer(
                     file_info.file_path
                 )
+                # e.g exported by PgToS3ExportPipeline
+                if file_info.file_path.endswith(".gz"):
+                    csv_bytes = io.BytesIO(gzip.decompress(csv_bytes.getbuffer()))
                 await self._dao.insert_csv_to_main_table(csv_bytes)
                 current_batch_latest_modified_date = max(
                     current_batch_latest_modified_date, file_info.modified_date
@@ -107,7 +129,18 @@ def run():
     #     os.getenv("CHAIN_STACK_PG_CONNECTION_STRING", "")
     # )
     kline_binance_dao: KlineBinanceDAO = KlineBinanceDAO(
-        os.getenv("BINANCE_PG_CONNECTION_STRING", "")
+        os.getenv("BINANCE_PG_CONNECTION_STRING", ""),
+        rollup_dao=KlineRollupDAO(os.getenv("BINANCE_PG_CONNECTION_STRING", "")),
+    )
+    # BULK_LOAD_MODE=true, for initial backfills only
+    bulk_load_mode: BulkLoadMode | None = (
+        BulkLoadMode(
+            connection_string=os.getenv("BINANCE_PG_CONNECTION_STRING", ""),
+            tables=[binance_klines_prices_table, *binance_kline_rollup_tables.values()],
+            checkpoint_resets=[partial(s3_import_status_dao.reset, data_source="binance_klines")],
+        )
+        if os.getenv("BULK_LOAD_MODE", "false").lower() == "true"
+        else None
     )
     s3_etl_pipeline: S3ETLPipeline = S3ETLPipeline(
         s3_import_status_dao=s3_import_status_dao,
@@ -116,6 +149,7 @@ def run():
         s3_prefix_path="binance/klines",
         connection_string=os.getenv("CHAIN_STACK_PG_CONNECTION_STRING", ""),
         dao=kline_binance_dao,
+        bulk_load_mode=bulk_load_mode,
     )
     event_loop: AbstractEventLoop = new_event_loop()
     event_loop.run_until_complete(s3_etl_pipeline.run())
@@ -0,0 +1,124 @@
+import logging
+
+from pydantic import BaseModel
+
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+
+class BatchResult(BaseModel):
+    """
+    what a committed batch weighed, and how long its commit took
+    """
+
+    blocks: int
+    transactions: int
+    size_bytes: int
+    commit_seconds: float
+
+
+class AdaptiveBatchController:
+    """
+    Sizes the next batch of blocks from the weight and commit latency of the previous ones (AIMD)
+
+    Responsible for
+    - additive increase: the batch grows by additive_increase blocks after every commit within target_commit_seconds
+    - multiplicative decrease: the batch shrinks by multiplicative_decrease after a slower commit
+    - a weight cap: never more blocks than target_transactions / target_bytes allow, at the (smoothed) transactions
+      and bytes per block seen so far; early-chain blocks batch by the thousand, modern blocks by the dozen
+    - exposing every decision in metrics: the batch_size gauge, and batch_size_decisions counted by reason
+
+    min_batch_size == max_batch_size gives a fixed batch size
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_batch_size: int = 100,
+        min_batch_size: int = 1,
+        max_batch_size: int = 2_000,
+        target_transactions: int = 20_000,
+        target_bytes: int = 64 * 1024 * 1024,
+        target_commit_seconds: float = 10.0,
+        additive_increase: int = 10,
+        multiplicative_decrease: float = 0.5,
+        smoothing: float = 0.3,
+    ) -> None:
+        if not 1 <= min_batch_size <= max_batch_size:
+            raise ValueError("requires 1 <= min_batch_size <= max_batch_size")
+        self._name: str = name
+        self._min_batch_size: int = min_batch_size
+        self._max_batch_size: int = max_batch_size
+        self._target_transactions: int = target_transactions
+        self._target_bytes: int = target_bytes
+        self._target_commit_seconds: float = target_commit_seconds
+        self._additive_increase: int = additive_increase
+        self._multiplicative_decrease: float = multiplicative_decrease
+        self._smoothing: float = smoothing
+        self._transactions_per_block: float | None = None
+        self._bytes_per_block: float | None = None
+        self._batch_size: int = self._clamp(initial_batch_size)
+        METRICS.set_gauge("batch_size", self._batch_size, pipeline=self._name)
+
+    @staticmethod
+    def fixed(name: str, batch_size: int) -> "AdaptiveBatchController":
+        return AdaptiveBatchController(
+            name=name,
+            initial_batch_size=batch_size,
+            min_batch_size=batch_size,
+            max_batch_size=batch_size,
+        )
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    def _clamp(self, batch_size: float) -> int:
+        return max(self._min_batch_size, min(self._max_batch_size, int(batch_size)))
+
+    def _smooth(self, average: float | None, sample: float) -> float:
+        return sample if average is None else (1 - self._smoothing) * average + self._smoothing * sample
+
+    def record_batch(self, result: BatchResult) -> int:
+        """
+        records a committed batch, and returns the size of the next one
+        """
+        if result.blocks > 0:
+            self._transactions_per_block = self._smooth(
+                self._transactions_per_block, result.transactions / result.blocks
+            )
+            self._bytes_per_block = self._smooth(
+                self._bytes_per_block, result.size_bytes / result.blocks
+            )
+
+        reason: str
+        next_batch_size: float
+        if result.commit_seconds > self._target_commit_seconds:
+            reason = "decrease"
+            next_batch_size = self._batch_size * self._multiplicative_decrease
+        else:
+            reason = "increase"
+            next_batch_size = self._batch_size + self._additive_increase
+
+        weight_cap: float = min(
+            self._target_transactions / max(self._transactions_per_block or 0, 1),
+            self._target_bytes / max(self._bytes_per_block or 0, 1),
+        )
+        if next_batch_size > weight_cap:
+            reason = "weight_cap"
+            next_batch_size = weight_cap
+
+        clamped_batch_size: int = self._clamp(next_batch_size)
+        if clamped_batch_size == self._batch_size:
+            reason = "hold"
+        self._batch_size = clamped_batch_size
+        METRICS.set_gauge("batch_size", self._batch_size, pipeline=self._name)
+        METRICS.increment("batch_size_decisions", pipeline=self._name, reason=reason)
+        logger.debug(
+            f"{self._name}: next batch of {self._batch_size} blocks ({reason}), "
+            f"after {result.blocks} blocks / {result.transactions} transactions in {result.commit_seconds:.2f}s"
+        )
+        return self._batch_size
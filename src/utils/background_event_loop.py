@@ -0,0 +1,50 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, TypeVar
+
+RESULT = TypeVar("RESULT")
+
+
+class BackgroundEventLoop:
+    """
+    Runs a single asyncio event loop on a daemon thread
+
+    Synchronous callers (e.g streamlit scripts) use this to run coroutines without asyncio.run()
+    asyncio.run() creates a new event loop per call, and pooled asyncpg connections are bound to the loop that created them
+    Keeping one long-lived loop lets an AsyncEngine reuse its connection pool across calls
+    """
+
+    def __init__(self, name: str = "background-event-loop") -> None:
+        self._loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._thread: threading.Thread = threading.Thread(
+            target=self._run_forever, name=name, daemon=True
+        )
+        self._thread.start()
+
+    def _run_forever(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def submit(self, coroutine: Coroutine[Any, Any, RESULT]) -> Future[RESULT]:
+        """
+        schedules the coroutine on the background loop and returns immediately
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def run(
+        self, coroutine: Coroutine[Any, Any, RESULT], timeout: float | None = None
+    ) -> RESULT:
+        """
+        schedules the coroutine on the background loop and blocks until it completes
+        """
+        return self.submit(coroutine).result(timeout=timeout)
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
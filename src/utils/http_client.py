@@ -0,0 +1,252 @@
+import asyncio
+import json
+import logging
+import zlib
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Protocol
+
+import aiohttp
+
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+# optional codecs; only advertised in Accept-Encoding when they can be decoded
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:
+    brotli = None
+try:
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:
+    zstandard = None
+
+
+def supported_encodings() -> list[str]:
+    """
+    content encodings which StreamDecompressor can decode, best compression ratio first
+    """
+    encodings: list[str] = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    return [*encodings, "gzip", "deflate"]
+
+
+ACCEPT_ENCODING: str = ", ".join(supported_encodings())
+# errors raised by the codecs on a corrupt or truncated body
+DECODE_ERRORS: tuple[type[Exception], ...] = (
+    zlib.error,
+    *((brotli.error,) if brotli is not None else ()),
+    *((zstandard.ZstdError,) if zstandard is not None else ()),
+)
+
+
+class _Decompressor(Protocol):
+    def decompress(self, chunk: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _ZlibDecompressor:
+    def __init__(self, encoding: str) -> None:
+        # gzip: header + trailer; deflate: servers send either zlib wrapped or raw deflate streams
+        self._decompressobj = zlib.decompressobj(
+            zlib.MAX_WBITS | 16 if encoding == "gzip" else zlib.MAX_WBITS | 32
+        )
+        self._raw_deflate: bool = False
+        self._encoding: str = encoding
+
+    def decompress(self, chunk: bytes) -> bytes:
+        try:
+            return self._decompressobj.decompress(chunk)
+        except zlib.error:
+            if self._encoding != "deflate" or self._raw_deflate:
+                raise
+            self._raw_deflate = True
+            self._decompressobj = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._decompressobj.decompress(chunk)
+
+    def flush(self) -> bytes:
+        return self._decompressobj.flush()
+
+
+class _BrotliDecompressor:
+    def __init__(self) -> None:
+        self._decompressor = brotli.Decompressor()
+
+    def decompress(self, chunk: bytes) -> bytes:
+        return self._decompressor.process(chunk)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _ZstdDecompressor:
+    def __init__(self) -> None:
+        self._decompressobj = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, chunk: bytes) -> bytes:
+        return self._decompressobj.decompress(chunk)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _IdentityDecompressor:
+    def decompress(self, chunk: bytes) -> bytes:
+        return chunk
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class StreamDecompressor:
+    """
+    Incrementally decodes a response body by its Content-Encoding, counting bytes on the wire and decoded bytes
+
+    Responsible for
+    - decoding gzip and deflate (zlib), br (if brotli is installed) and zstd (if zstandard is installed)
+    - reporting http_wire_bytes (as received) and http_decoded_bytes (after decompression) per provider
+    - raising a corrupt body as aiohttp.ClientPayloadError, so it is retried like any other aiohttp.ClientError
+    """
+
+    def __init__(self, content_encoding: str | None, provider: str) -> None:
+        encoding: str = (content_encoding or "identity").strip().lower()
+        self._decompressor: _Decompressor
+        if encoding in ("gzip", "x-gzip", "deflate"):
+            self._decompressor = _ZlibDecompressor("deflate" if encoding == "deflate" else "gzip")
+        elif encoding == "br" and brotli is not None:
+            self._decompressor = _BrotliDecompressor()
+        elif encoding == "zstd" and zstandard is not None:
+            self._decompressor = _ZstdDecompressor()
+        elif encoding == "identity":
+            self._decompressor = _IdentityDecompressor()
+        else:
+            raise aiohttp.ClientPayloadError(f"Unsupported Content-Encoding {encoding} from {provider}")
+        self._encoding: str = encoding
+        self._provider: str = provider
+        self.wire_bytes: int = 0
+        self.decoded_bytes: int = 0
+
+    def decompress(self, chunk: bytes) -> bytes:
+        try:
+            decoded: bytes = self._decompressor.decompress(chunk)
+        except DECODE_ERRORS as e:
+            raise aiohttp.ClientPayloadError(f"Invalid {self._encoding} body from {self._provider}: {e}") from e
+        self.wire_bytes += len(chunk)
+        self.decoded_bytes += len(decoded)
+        return decoded
+
+    def flush(self) -> bytes:
+        """
+        returns the remaining decoded bytes, and reports the byte counts of the whole body
+        """
+        try:
+            decoded: bytes = self._decompressor.flush()
+        except DECODE_ERRORS as e:
+            raise aiohttp.ClientPayloadError(f"Invalid {self._encoding} body from {self._provider}: {e}") from e
+        self.decoded_bytes += len(decoded)
+        METRICS.increment("http_wire_bytes", self.wire_bytes, provider=self._provider)
+        METRICS.increment("http_decoded_bytes", self.decoded_bytes, provider=self._provider)
+        return decoded
+
+
+def create_client_session(**kwargs: Any) -> aiohttp.ClientSession:
+    """
+    aiohttp.ClientSession which negotiates compressed responses
+
+    bodies are left compressed by aiohttp (auto_decompress=False), so the bytes on the wire can be counted;
+    read them with read_body / read_json / iter_body
+    """
+    headers: dict[str, str] = {"Accept-Encoding": ACCEPT_ENCODING, **kwargs.pop("headers", {})}
+    return aiohttp.ClientSession(headers=headers, auto_decompress=False, **kwargs)
+
+
+class SharedClientSession:
+    """
+    A create_client_session session shared by every request of an extractor, so connections are pooled and kept alive,
+    instead of a TCP (and TLS) handshake per request
+
+    the session is created on first use, and recreated if it was closed, or is used from another event loop
+    (e.g the extractor is run with one asyncio.run per batch); the owner closes it with close()
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        self._kwargs: dict[str, Any] = kwargs
+        self._session: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self) -> aiohttp.ClientSession:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # a session of a finished event loop can't be closed anymore; its connections were closed with the loop
+            self._session = create_client_session(**self._kwargs)
+            self._loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed and self._loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+@asynccontextmanager
+async def client_session(
+    shared_session: SharedClientSession | None = None,
+) -> AsyncGenerator[aiohttp.ClientSession, None]:
+    """
+    the shared session, left open for the next request; or, without one, a session for this request only
+    """
+    if shared_session is not None:
+        yield shared_session.get()
+        return
+    async with create_client_session() as session:
+        yield session
+
+
+async def iter_body(
+    response: aiohttp.ClientResponse, provider: str, chunk_size: int = 64 * 1024
+) -> AsyncGenerator[bytes, None]:
+    """
+    yields the decoded body of a response from create_client_session, as it is received
+    """
+    decompressor: StreamDecompressor = StreamDecompressor(
+        response.headers.get("Content-Encoding"), provider
+    )
+    async for chunk in response.content.iter_chunked(chunk_size):
+        decoded: bytes = decompressor.decompress(chunk)
+        if decoded:
+            yield decoded
+    remaining: bytes = decompressor.flush()
+    if remaining:
+        yield remaining
+
+
+async def read_body(response: aiohttp.ClientResponse, provider: str) -> bytes:
+    """
+    the whole decoded body of a response from create_client_session
+    """
+    decompressor: StreamDecompressor = StreamDecompressor(
+        response.headers.get("Content-Encoding"), provider
+    )
+    body: bytes = decompressor.decompress(await response.read())
+    return body + decompressor.flush()
+
+
+async def read_json(response: aiohttp.ClientResponse, provider: str) -> Any:
+    """
+    replaces response.json(), for a response from create_client_session
+    """
+    body: bytes = await read_body(response, provider)
+    try:
+        return json.loads(body)
+    except ValueError as e:
+        # surfaced like aiohttp's own json errors, so existing aiohttp.ClientError handling still applies
+        raise aiohttp.ContentTypeError(
+            response.request_info, response.history, message=f"Invalid JSON from {provider}: {e}"
+        )
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+from decimal import MAX_PREC, localcontext
+
+import pandas as pd
+
+from database_management.binance.binance_table import KLINE_ROLLUP_INTERVALS
+
+BASE_KLINE_INTERVAL: timedelta = timedelta(minutes=1)
+UNIX_EPOCH: datetime = datetime(1970, 1, 1)
+
+# numeric columns of binance_klines_prices, and how each is aggregated into a coarser bucket
+KLINE_AGGREGATIONS: dict[str, str] = {
+    "open_price": "first",
+    "high_price": "max",
+    "low_price": "min",
+    "close_price": "last",
+    "volume": "sum",
+    "quote_asset_volume": "sum",
+    "number_of_trades": "sum",
+    "taker_buy_base_asset_vol": "sum",
+    "taker_buy_quote_asset_vol": "sum",
+}
+
+
+def select_rollup_interval(requested_interval: timedelta) -> str | None:
+    """
+    Picks the coarsest rollup interval which evenly divides the requested interval
+
+    e.g
+    - 1h -> "1h" (served as-is)
+    - 2h -> "1h" (2 x 1h buckets per row)
+    - 45m -> "15m"
+    - 3m -> None (only the 1m base table can serve it)
+    """
+    if requested_interval < BASE_KLINE_INTERVAL or requested_interval % BASE_KLINE_INTERVAL:
+        raise ValueError(
+            f"Requested interval must be a whole number of minutes: {requested_interval}"
+        )
+    selected_interval: str | None = None
+    for interval, interval_duration in KLINE_ROLLUP_INTERVALS.items():
+        if interval_duration <= requested_interval and not requested_interval % interval_duration:
+            selected_interval = interval
+    return selected_interval
+
+
+def resample_klines(klines_df: pd.DataFrame, interval: timedelta) -> pd.DataFrame:
+    """
+    Vectorised OHLCV resampling of 1m (or finer rollup) klines into interval buckets, used by backfills
+
+    klines_df has one row per candle with a symbol and kline_open_time column, plus the KLINE_AGGREGATIONS columns
+    Buckets are floored relative to the unix epoch, the same alignment binance (and date_bin) uses
+
+    Returns one row per (symbol, bucket) with kline_close_time = bucket end - 1ms,
+    and candle_count = number of input candles in the bucket
+
+    Decimal columns are aggregated exactly; sums of NUMERIC(38, 18) values need more than Decimal's default 28 digits
+    """
+    if klines_df.empty:
+        return pd.DataFrame(
+            columns=[
+                "symbol",
+                "kline_open_time",
+                "kline_close_time",
+                *KLINE_AGGREGATIONS.keys(),
+                "candle_count",
+            ]
+        )
+    sorted_df: pd.DataFrame = klines_df.sort_values(["symbol", "kline_open_time"])
+    bucket_open_time: pd.Series = sorted_df["kline_open_time"].dt.floor(
+        pd.Timedelta(interval)
+    )
+    grouped = sorted_df.groupby([sorted_df["symbol"], bucket_open_time.rename("bucket")], sort=True)
+    with localcontext(prec=MAX_PREC):
+        rollup_df: pd.DataFrame = grouped.agg(
+            **{column: (column, aggregation) for column, aggregation in KLINE_AGGREGATIONS.items()},
+            candle_count=("kline_open_time", "size"),
+        ).reset_index()
+    rollup_df = rollup_df.rename(columns={"bucket": "kline_open_time"})
+    rollup_df.insert(
+        2,
+        "kline_close_time",
+        rollup_df["kline_open_time"] + pd.Timedelta(interval) - pd.Timedelta(milliseconds=1),
+    )
+    return rollup_df
+
+
+def floor_to_interval(input: datetime, interval: timedelta) -> datetime:
+    """
+    floors a naive UTC datetime to the start of its interval bucket, aligned to the unix epoch
+    """
+    return UNIX_EPOCH + ((input - UNIX_EPOCH) // interval) * interval
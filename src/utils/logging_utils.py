@@ -1,5 +1,8 @@
 import logging
 
+# a single handler shared by every logger; one open file, no matter how many modules call setup_logging
+_file_handler: logging.FileHandler | None = None
+
 
 def setup_logging(logger: logging.Logger):
     """
@@ -11,19 +14,24 @@ def setup_logging(logger: logging.Logger):
         - func name responsible - funcName
         - levelname - DEBUG / INFO / WARNING / ERROR / CRITICAL
         - message - actual logs
+
+    safe to call more than once for the same logger; the file handler is only attached once
     """
+    global _file_handler
     # set logging level
     logger.setLevel(logging.INFO)
 
-    # format logs
-    logging_formatter = logging.Formatter(
-        "(%(asctime)s %(funcName)s %(levelname)s) %(message)s"
-    )
+    if _file_handler is None:
+        # format logs
+        logging_formatter = logging.Formatter(
+            "(%(asctime)s %(funcName)s %(levelname)s) %(message)s"
+        )
 
-    file_handler = logging.FileHandler("logs.txt")
-    file_handler.setFormatter(logging_formatter)
+        _file_handler = logging.FileHandler("logs.txt")
+        _file_handler.setFormatter(logging_formatter)
 
-    logger.addHandler(file_handler)
+    if _file_handler not in logger.handlers:
+        logger.addHandler(_file_handler)
 
 
 if __name__ == "__main__":
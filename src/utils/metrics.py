@@ -0,0 +1,390 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Generator, TypeVar
+
+from src.utils.logging_utils import setup_logging
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+FUNCTION = TypeVar("FUNCTION", bound=Callable[..., Any])
+
+# upper bounds (seconds) of the prometheus histogram buckets for stage durations
+DEFAULT_DURATION_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# counters reported as a per second rate in run summaries
+RATE_COUNTERS: tuple[str, ...] = ("blocks", "rows", "bytes")
+
+
+class StageStats:
+    """
+    Durations of a single stage, e.g "extract" or "insert_blocks"
+
+    Keeps exact count / sum / histogram buckets, and the most recent max_samples durations for percentiles
+    """
+
+    def __init__(self, buckets: tuple[float, ...], max_samples: int) -> None:
+        self.count: int = 0
+        self.total_seconds: float = 0.0
+        self.bucket_counts: list[int] = [0] * len(buckets)
+        self.samples: deque[float] = deque(maxlen=max_samples)
+        self._buckets: tuple[float, ...] = buckets
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.samples.append(seconds)
+        for index, upper_bound in enumerate(self._buckets):
+            if seconds <= upper_bound:
+                self.bucket_counts[index] += 1
+
+    def percentile(self, percentile: float) -> float:
+        """
+        nearest-rank percentile of the retained samples, e.g percentile(99) for p99
+        """
+        if not self.samples:
+            return 0.0
+        sorted_samples: list[float] = sorted(self.samples)
+        rank: int = max(int(-(-percentile * len(sorted_samples) // 100)), 1)
+        return sorted_samples[rank - 1]
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total_seconds, 6),
+            "mean_seconds": round(self.total_seconds / self.count, 6) if self.count else 0.0,
+            "p50_seconds": round(self.percentile(50), 6),
+            "p99_seconds": round(self.percentile(99), 6),
+        }
+
+
+class RunStats:
+    """
+    Stage durations and counters of a single pipeline run, written out as the run summary
+    """
+
+    def __init__(self, pipeline_name: str, buckets: tuple[float, ...], max_samples: int) -> None:
+        self.pipeline_name: str = pipeline_name
+        self.started_at: datetime = datetime.utcnow()
+        self._start_time: float = time.perf_counter()
+        self._buckets: tuple[float, ...] = buckets
+        self._max_samples: int = max_samples
+        self.stages: dict[str, StageStats] = {}
+        self.counters: dict[str, float] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        if stage not in self.stages:
+            self.stages[stage] = StageStats(self._buckets, self._max_samples)
+        self.stages[stage].observe(seconds)
+
+    def increment(self, name: str, value: float) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> dict[str, Any]:
+        elapsed_seconds: float = time.perf_counter() - self._start_time
+        return {
+            "pipeline_name": self.pipeline_name,
+            "started_at": self.started_at.isoformat(),
+            "elapsed_seconds": round(elapsed_seconds, 6),
+            "counters": self.counters,
+            "rates_per_second": {
+                f"{name}_per_second": round(self.counters.get(name, 0) / elapsed_seconds, 3)
+                if elapsed_seconds > 0
+                else 0.0
+                for name in RATE_COUNTERS
+            },
+            "retries": self.counters.get("retries", 0),
+            "stages": {stage: stats.summary() for stage, stats in self.stages.items()},
+        }
+
+
+class MetricsRegistry:
+    """
+    Process wide registry of pipeline timings and counters
+
+    Responsible for
+    - timing stages, with timer (context manager) or timed (decorator, sync or async)
+    - counting blocks / rows / bytes / retries, with increment
+    - recording current values, e.g a batch size, with set_gauge
+    - rendering everything in the prometheus text exposition format, served by MetricsServer
+    - writing a JSON summary per pipeline run, with run
+
+    Stage durations and counters are also attributed to the current run, if any
+    The current run is a ContextVar, so concurrent runs on the same event loop (e.g the dashboard job runner) don't mix
+    """
+
+    def __init__(
+        self,
+        buckets: tuple[float, ...] = DEFAULT_DURATION_BUCKETS,
+        max_samples: int = 10_000,
+    ) -> None:
+        self._buckets: tuple[float, ...] = buckets
+        self._max_samples: int = max_samples
+        self._stages: dict[str, StageStats] = {}
+        self._counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+        self._gauges: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+        self._current_run: ContextVar[RunStats | None] = ContextVar("current_run", default=None)
+        # observations come from both the event loop thread and worker threads
+        self._lock: threading.Lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            if stage not in self._stages:
+                self._stages[stage] = StageStats(self._buckets, self._max_samples)
+            self._stages[stage].observe(seconds)
+            current_run: RunStats | None = self._current_run.get()
+            if current_run is not None:
+                current_run.observe(stage, seconds)
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """
+        e.g increment("rows", 250, table="eth_transactions")
+        """
+        key: tuple[str, tuple[tuple[str, str], ...]] = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            current_run: RunStats | None = self._current_run.get()
+            if current_run is not None:
+                current_run.increment(name, value)
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """
+        e.g set_gauge("batch_size", 250, pipeline="chainstack_eth_blocks"); only the latest value is kept
+        """
+        key: tuple[str, tuple[tuple[str, str], ...]] = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    @contextmanager
+    def timer(self, stage: str) -> Generator[None, None, None]:
+        """
+        with METRICS.timer("extract"):
+            ...
+
+        the duration is recorded even if the block raises
+        """
+        start_time: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start_time)
+
+    def timed(self, stage: str) -> Callable[[FUNCTION], FUNCTION]:
+        """
+        decorator form of timer, for both sync and async functions
+        """
+
+        def decorator(function: FUNCTION) -> FUNCTION:
+            if inspect.iscoroutinefunction(function):
+
+                @functools.wraps(function)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    with self.timer(stage):
+                        return await function(*args, **kwargs)
+
+                return async_wrapper  # type: ignore[return-value]
+
+            @functools.wraps(function)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.timer(stage):
+                    return function(*args, **kwargs)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorator
+
+    def record_retry(self, retry_state: Any) -> None:
+        """
+        tenacity before_sleep hook; counts every retry of the decorated function
+
+        @retry(..., before_sleep=METRICS.record_retry)
+        """
+        function_name: str = getattr(retry_state.fn, "__qualname__", "unknown")
+        self.increment("retries", function=function_name)
+
+    @contextmanager
+    def run(
+        self, pipeline_name: str, summary_dir: str | None = None
+    ) -> Generator[RunStats, None, None]:
+        """
+        attributes every timing and counter inside the block to a single run of pipeline_name,
+        then writes its summary to <summary_dir>/<pipeline_name>_<started_at>.json
+
+        summary_dir defaults to the METRICS_SUMMARY_DIR env var, or ./metrics
+        with the METRICS_PORT env var set, the /metrics endpoint is started first (start_metrics_server), so standalone
+        pipelines can be scraped too
+        """
+        if not summary_dir:
+            summary_dir = os.getenv("METRICS_SUMMARY_DIR", "metrics")
+        if os.getenv("METRICS_PORT"):
+            try:
+                start_metrics_server()
+            except OSError as e:
+                # e.g the port is taken; the run itself doesn't need the endpoint
+                logger.warning(f"Failed to start the metrics server: {e}")
+        run_stats: RunStats = RunStats(pipeline_name, self._buckets, self._max_samples)
+        token = self._current_run.set(run_stats)
+        try:
+            yield run_stats
+        finally:
+            self._current_run.reset(token)
+            self.write_run_summary(run_stats, summary_dir)
+
+    @staticmethod
+    def write_run_summary(run_stats: RunStats, summary_dir: str) -> str:
+        os.makedirs(summary_dir, exist_ok=True)
+        summary_path: str = os.path.join(
+            summary_dir,
+            f"{run_stats.pipeline_name}_{run_stats.started_at.strftime('%Y%m%d%H%M%S%f')}.json",
+        )
+        summary: dict[str, Any] = run_stats.summary()
+        with open(summary_path, "w", encoding="utf-8") as summary_file:
+            json.dump(summary, summary_file, indent=2)
+        logger.info(f"Run summary of {run_stats.pipeline_name}: {json.dumps(summary)}")
+        return summary_path
+
+    @staticmethod
+    def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+        if not labels:
+            return ""
+        escaped_labels: list[str] = [
+            f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+            for name, value in labels
+        ]
+        return "{" + ",".join(escaped_labels) + "}"
+
+    def render_prometheus(self) -> str:
+        """
+        renders every counter and stage histogram in the prometheus text exposition format (version 0.0.4)
+        """
+        lines: list[str] = []
+        with self._lock:
+            counter_names: list[str] = sorted({name for name, _ in self._counters})
+            for name in counter_names:
+                lines.append(f"# TYPE pipeline_{name}_total counter")
+                for (counter_name, labels), value in sorted(self._counters.items()):
+                    if counter_name == name:
+                        lines.append(f"pipeline_{name}_total{self._format_labels(labels)} {value}")
+
+            gauge_names: list[str] = sorted({name for name, _ in self._gauges})
+            for name in gauge_names:
+                lines.append(f"# TYPE pipeline_{name} gauge")
+                for (gauge_name, labels), value in sorted(self._gauges.items()):
+                    if gauge_name == name:
+                        lines.append(f"pipeline_{name}{self._format_labels(labels)} {value}")
+
+            if self._stages:
+                lines.append("# TYPE pipeline_stage_duration_seconds histogram")
+            for stage, stats in sorted(self._stages.items()):
+                stage_label: tuple[tuple[str, str], ...] = (("stage", stage),)
+                for upper_bound, bucket_count in zip(self._buckets, stats.bucket_counts):
+                    bucket_labels: str = self._format_labels(stage_label + (("le", str(upper_bound)),))
+                    lines.append(f"pipeline_stage_duration_seconds_bucket{bucket_labels} {bucket_count}")
+                inf_labels: str = self._format_labels(stage_label + (("le", "+Inf"),))
+                lines.append(f"pipeline_stage_duration_seconds_bucket{inf_labels} {stats.count}")
+                lines.append(
+                    f"pipeline_stage_duration_seconds_sum{self._format_labels(stage_label)} {stats.total_seconds}"
+                )
+                lines.append(
+                    f"pipeline_stage_duration_seconds_count{self._format_labels(stage_label)} {stats.count}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+
+class MetricsServer:
+    """
+    Serves a MetricsRegistry on http://<host>:<port>/metrics for prometheus to scrape, from a daemon thread
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464) -> None:
+        self._registry: MetricsRegistry = registry
+        self._host: str = host
+        self._port: int = port
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1] if self._server else self._port
+
+    def start(self) -> None:
+        if self._server is not None:
+            return
+        registry: MetricsRegistry = self._registry
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body: bytes = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                # scrapes every few seconds would otherwise flood stderr
+                return
+
+        self._server = ThreadingHTTPServer((self._host, self._port), MetricsHandler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Serving metrics on http://{self._host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+
+
+# shared by every pipeline in the process
+METRICS: MetricsRegistry = MetricsRegistry()
+_metrics_server: MetricsServer | None = None
+
+
+def start_metrics_server(port: int | None = None) -> MetricsServer:
+    """
+    starts (once per process) the /metrics endpoint of METRICS, on port or the METRICS_PORT env var (default 9464)
+    """
+    global _metrics_server
+    if _metrics_server is None:
+        metrics_server: MetricsServer = MetricsServer(
+            METRICS, port=port if port is not None else int(os.getenv("METRICS_PORT", "9464"))
+        )
+        # only kept once listening, so a failed start can be retried
+        metrics_server.start()
+        _metrics_server = metrics_server
+    return _metrics_server
+
+
+if __name__ == "__main__":
+    with METRICS.run("demo", summary_dir="metrics"):
+        with METRICS.timer("extract"):
+            time.sleep(0.05)
+        METRICS.increment("blocks", 100)
+    print(METRICS.render_prometheus())
@@ -0,0 +1,116 @@
+import hashlib
+import uuid
+from typing import Any, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import (
+    ARRAY,
+    BigInteger,
+    Boolean,
+    DateTime,
+    Float,
+    Integer,
+    Numeric,
+    SmallInteger,
+    String,
+    Table,
+    Uuid,
+)
+from sqlalchemy.types import TypeEngine
+
+"""
+Parquet layout of the rows archived from postgres (ColdStorageArchiver)
+
+Every archived range of a table is a single parquet file, in a hive style partition of the table, e.g
+archive/eth_transactions/block_range=19000000-19099999/eth_transactions.parquet
+so the archive can be queried as one dataset per table
+"""
+
+ARCHIVE_S3_PREFIX: str = "archive"
+# a parquet file starts and ends with it
+PARQUET_MAGIC: bytes = b"PAR1"
+# bytes read from the end of an archived file to reach its footer; enough for most footers in a single read
+PARQUET_FOOTER_READ_SIZE: int = 64 * 1024
+
+
+def arrow_type_of(column_type: TypeEngine[Any]) -> pa.DataType:
+    """
+    the arrow type of a postgres column; uuids are archived as strings, parquet has no uuid type in pyarrow
+    """
+    if isinstance(column_type, ARRAY):
+        return pa.list_(arrow_type_of(column_type.item_type))
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, Numeric):
+        return pa.decimal128(column_type.precision or 38, column_type.scale or 0)
+    if isinstance(column_type, BigInteger):
+        return pa.int64()
+    if isinstance(column_type, SmallInteger):
+        return pa.int16()
+    if isinstance(column_type, Integer):
+        return pa.int32()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, (String, Uuid)):
+        return pa.string()
+    raise ValueError(f"No arrow type for {column_type!r}")
+
+
+def arrow_schema_of(table: Table) -> pa.Schema:
+    """
+    the columns of table, in table order
+    """
+    return pa.schema(
+        [
+            pa.field(column.name, arrow_type_of(column.type), nullable=bool(column.nullable))
+            for column in table.columns
+        ]
+    )
+
+
+def rows_to_record_batch(schema: pa.Schema, rows: Sequence[Sequence[Any]]) -> pa.RecordBatch:
+    """
+    rows are tuples in schema order; transposed once, then every column is converted as a whole
+    """
+    columns: list[tuple[Any, ...]] = list(zip(*rows)) if rows else [() for _ in schema]
+    arrays: list[pa.Array] = []
+    for field, column_values in zip(schema, columns):
+        if pa.types.is_string(field.type):
+            column_values = tuple(
+                str(value) if isinstance(value, uuid.UUID) else value for value in column_values
+            )
+        arrays.append(pa.array(column_values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def archive_s3_path(table_name: str, partition_key: str) -> str:
+    return f"{ARCHIVE_S3_PREFIX}/{table_name}/{partition_key}/{table_name}.parquet"
+
+
+def sha256_of_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parquet_footer_size(tail: bytes) -> int:
+    """
+    the size of the footer (metadata, its 4 byte length, and the magic) of the parquet file which tail ends
+    """
+    if len(tail) < 8 or tail[-4:] != PARQUET_MAGIC:
+        raise ValueError("Not the end of a parquet file")
+    return int.from_bytes(tail[-8:-4], "little") + 8
+
+
+def parquet_metadata_of_footer(tail: bytes) -> pq.FileMetaData:
+    """
+    the metadata of the parquet file which tail ends; tail holds at least its footer (parquet_footer_size)
+    """
+    footer: bytes = tail[-parquet_footer_size(tail) :]
+    # the leading magic stands in for the rest of the file; only the footer is read
+    return pq.read_metadata(pa.BufferReader(PARQUET_MAGIC + footer))
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Generator, Iterable
+
+from src.utils.logging_utils import setup_logging
+from src.utils.metrics import METRICS
+
+logger: logging.Logger = logging.getLogger(__name__)
+setup_logging(logger)
+
+
+class RawBlockCacheMissError(KeyError):
+    """
+    raised in replay mode, when a block was never fetched into the cache
+    """
+
+    pass
+
+
+class RawBlockCache:
+    """
+    Size bounded, on-disk cache of raw JSON-RPC block responses, e.g eth_getBlockByNumber
+
+    Responsible for
+    - storing each response zlib-compressed, keyed by (chain, provider, block_number)
+    - content addressing: payloads are stored once per sha256 digest, so the same block from 2 providers is stored once,
+      and every read is verified against its digest
+    - evicting least recently used blocks once the compressed payloads exceed max_bytes
+    - replaying cached blocks at disk speed, so DTO / schema changes don't require refetching paid provider calls
+
+    Backed by a single SQLite file; safe to share between threads
+    """
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024 * 1024) -> None:
+        self._path: str = path
+        self._max_bytes: int = max_bytes
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS payloads (
+                digest TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                size_bytes INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS blocks (
+                chain TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                block_number INTEGER NOT NULL,
+                digest TEXT NOT NULL REFERENCES payloads (digest),
+                last_accessed_at REAL NOT NULL,
+                PRIMARY KEY (chain, provider, block_number)
+            );
+            CREATE INDEX IF NOT EXISTS blocks_last_accessed_at_idx ON blocks (last_accessed_at);
+            CREATE INDEX IF NOT EXISTS blocks_digest_idx ON blocks (digest);
+            """
+        )
+        self._connection.commit()
+        # kept in memory, so eviction doesn't SUM over every payload after each put
+        self._total_bytes: int = int(
+            self._connection.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM payloads").fetchone()[0]
+        )
+
+    @staticmethod
+    def _encode(raw_block: dict[str, Any]) -> tuple[str, bytes]:
+        canonical_bytes: bytes = json.dumps(raw_block, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(canonical_bytes).hexdigest(), zlib.compress(canonical_bytes, 6)
+
+    @staticmethod
+    def _decode(digest: str, payload: bytes) -> dict[str, Any]:
+        canonical_bytes: bytes = zlib.decompress(payload)
+        if hashlib.sha256(canonical_bytes).hexdigest() != digest:
+            raise ValueError(f"Raw block payload does not match its digest {digest}")
+        return json.loads(canonical_bytes)
+
+    def get_many(
+        self, chain: str, provider: str, block_numbers: Iterable[int]
+    ) -> dict[int, dict[str, Any]]:
+        """
+        returns the cached raw responses among block_numbers, by block number; misses are left out
+        """
+        block_number_list: list[int] = list(block_numbers)
+        if not block_number_list:
+            return {}
+        placeholders: str = ", ".join("?" for _ in block_number_list)
+        with self._lock:
+            rows: list[tuple[int, str, bytes]] = self._connection.execute(
+                "SELECT blocks.block_number, blocks.digest, payloads.payload FROM blocks "
+                "JOIN payloads ON payloads.digest = blocks.digest "
+                f"WHERE blocks.chain = ? AND blocks.provider = ? AND blocks.block_number IN ({placeholders})",
+                (chain, provider, *block_number_list),
+            ).fetchall()
+            self._connection.execute(
+                "UPDATE blocks SET last_accessed_at = ? "
+                f"WHERE chain = ? AND provider = ? AND block_number IN ({placeholders})",
+                (time.time(), chain, provider, *block_number_list),
+            )
+            self._connection.commit()
+        METRICS.increment("raw_block_cache_hits", len(rows), provider=provider)
+        METRICS.increment("raw_block_cache_misses", len(block_number_list) - len(rows), provider=provider)
+        return {block_number: self._decode(digest, payload) for block_number, digest, payload in rows}
+
+    def get(self, chain: str, provider: str, block_number: int) -> dict[str, Any] | None:
+        return self.get_many(chain, provider, [block_number]).get(block_number)
+
+    def put_many(
+        self, chain: str, provider: str, raw_blocks: Iterable[tuple[int, dict[str, Any]]]
+    ) -> None:
+        """
+        stores raw responses, then evicts least recently used blocks if the cache is over max_bytes
+        """
+        accessed_at: float = time.time()
+        encoded_blocks: list[tuple[int, str, bytes]] = [
+            (block_number, *self._encode(raw_block)) for block_number, raw_block in raw_blocks
+        ]
+        if not encoded_blocks:
+            return
+        placeholders: str = ", ".join("?" for _ in encoded_blocks)
+        with self._lock:
+            # payloads of overwritten blocks may no longer be referenced afterwards
+            replaced_digests: set[str] = {
+                row[0]
+                for row in self._connection.execute(
+                    "SELECT digest FROM blocks "
+                    f"WHERE chain = ? AND provider = ? AND block_number IN ({placeholders})",
+                    (chain, provider, *[block_number for block_number, _, _ in encoded_blocks]),
+                )
+            }
+            for _, digest, payload in encoded_blocks:
+                cursor: sqlite3.Cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO payloads (digest, payload, size_bytes) VALUES (?, ?, ?)",
+                    (digest, payload, len(payload)),
+                )
+                self._total_bytes += len(payload) * cursor.rowcount
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO blocks (chain, provider, block_number, digest, last_accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (chain, provider, block_number, digest, accessed_at)
+                    for block_number, digest, _ in encoded_blocks
+                ],
+            )
+            self._delete_unreferenced_payloads(replaced_digests)
+            self._evict()
+            self._connection.commit()
+
+    def put(self, chain: str, provider: str, block_number: int, raw_block: dict[str, Any]) -> None:
+        self.put_many(chain, provider, [(block_number, raw_block)])
+
+    def _delete_unreferenced_payloads(self, digests: Iterable[str]) -> None:
+        """
+        deletes the payloads among digests which no block refers to anymore
+        must be called with the lock held
+        """
+        for digest in digests:
+            row: tuple[int] | None = self._connection.execute(
+                "SELECT size_bytes FROM payloads "
+                "WHERE digest = ? AND NOT EXISTS (SELECT 1 FROM blocks WHERE blocks.digest = ?)",
+                (digest, digest),
+            ).fetchone()
+            if row is not None:
+                self._connection.execute("DELETE FROM payloads WHERE digest = ?", (digest,))
+                self._total_bytes -= row[0]
+
+    def _evict(self) -> None:
+        """
+        deletes the least recently used blocks, one at a time, until the payloads fit in max_bytes
+        must be called with the lock held
+        """
+        evicted_blocks: int = 0
+        while self._total_bytes > self._max_bytes:
+            least_recently_used: list[tuple[int, str]] = self._connection.execute(
+                "SELECT rowid, digest FROM blocks ORDER BY last_accessed_at, rowid LIMIT 100"
+            ).fetchall()
+            if not least_recently_used:
+                break
+            for rowid, digest in least_recently_used:
+                if self._total_bytes <= self._max_bytes:
+                    break
+                self._connection.execute("DELETE FROM blocks WHERE rowid = ?", (rowid,))
+                self._delete_unreferenced_payloads([digest])
+                evicted_blocks += 1
+        if evicted_blocks:
+            METRICS.increment("raw_block_cache_evictions", evicted_blocks)
+            logger.info(f"Evicted {evicted_blocks} raw blocks from {self._path}")
+
+    def total_bytes(self) -> int:
+        """
+        compressed size of every cached payload
+        """
+        with self._lock:
+            return self._total_bytes
+
+    def iter_blocks(
+        self, chain: str, provider: str, start_block_number: int, end_block_number: int
+    ) -> Generator[tuple[int, dict[str, Any]], None, None]:
+        """
+        yields every cached (block_number, raw response) between start_block_number and end_block_number (inclusive),
+        in block order, without touching the LRU order
+        """
+        with self._lock:
+            rows: list[tuple[int, str, bytes]] = self._connection.execute(
+                "SELECT blocks.block_number, blocks.digest, payloads.payload FROM blocks "
+                "JOIN payloads ON payloads.digest = blocks.digest "
+                "WHERE blocks.chain = ? AND blocks.provider = ? AND blocks.block_number BETWEEN ? AND ? "
+                "ORDER BY blocks.block_number",
+                (chain, provider, start_block_number, end_block_number),
+            ).fetchall()
+        for block_number, digest, payload in rows:
+            yield block_number, self._decode(digest, payload)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def create_raw_block_cache() -> RawBlockCache:
+    """
+    RawBlockCache at RAW_BLOCK_CACHE_PATH (default raw_block_cache.sqlite3), bounded by RAW_BLOCK_CACHE_MAX_BYTES
+    """
+    return RawBlockCache(
+        path=os.getenv("RAW_BLOCK_CACHE_PATH", "raw_block_cache.sqlite3"),
+        max_bytes=int(os.getenv("RAW_BLOCK_CACHE_MAX_BYTES", str(10 * 1024 * 1024 * 1024))),
+    )
@@ -0,0 +1,116 @@
+import json
+import re
+from typing import Any
+
+# a complete JSON string, a lone quote (string cut off at the end of the chunk), or a structural character;
+# numbers, literals and whitespace are never structural, so they are skipped over
+_TOKEN: re.Pattern[bytes] = re.compile(rb'"(?:[^"\\]|\\.)*"|"|[{}\[\],:]')
+
+
+class _Frame:
+    __slots__ = ("is_object", "expect_key", "key")
+
+    def __init__(self, is_object: bool) -> None:
+        self.is_object: bool = is_object
+        self.expect_key: bool = is_object
+        self.key: str | None = None
+
+
+class StreamingJsonArraySplitter:
+    """
+    Incrementally splits a JSON document into the elements of one nested array, and everything else
+
+    e.g with array_path=("result", "transactions"), an eth_getBlockByNumber response is fed chunk by chunk;
+    every transaction is returned by feed as soon as it is complete, and close returns the response with
+    result.transactions = []
+
+    Only the current (incomplete) element is buffered, so memory is bounded by the largest element,
+    instead of the whole document and its parsed tree
+    """
+
+    def __init__(self, array_path: tuple[str, ...]) -> None:
+        self._array_path: tuple[str, ...] = array_path
+        self._buffer: bytearray = bytearray()
+        self._position: int = 0
+        self._stack: list[_Frame] = []
+        self._target: _Frame | None = None
+        self._element_start: int = 0
+        self._header_start: int = 0
+        self._header_parts: list[bytes] = []
+
+    def _is_array_path(self) -> bool:
+        return len(self._stack) == len(self._array_path) and all(
+            frame.is_object and frame.key == key
+            for frame, key in zip(self._stack, self._array_path)
+        )
+
+    def _take_element(self, end: int) -> list[Any]:
+        element: bytes = bytes(self._buffer[self._element_start : end]).strip()
+        return [json.loads(element)] if element else []
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """
+        returns the array elements completed by chunk, parsed, in order
+        """
+        self._buffer.extend(chunk)
+        elements: list[Any] = []
+        while True:
+            match: re.Match[bytes] | None = _TOKEN.search(self._buffer, self._position)
+            if match is None:
+                self._position = len(self._buffer)
+                break
+            token: bytes = match.group()
+            if token == b'"':
+                # incomplete string; wait for the next chunk
+                self._position = match.start()
+                break
+            self._position = match.end()
+            top: _Frame | None = self._stack[-1] if self._stack else None
+
+            if token[0:1] == b'"':
+                if top is not None and top.is_object and top.expect_key:
+                    top.key = json.loads(token)
+            elif token == b":":
+                if top is not None:
+                    top.expect_key = False
+            elif token == b",":
+                if top is self._target:
+                    elements.extend(self._take_element(match.start()))
+                    self._element_start = match.end()
+                elif top is not None and top.is_object:
+                    top.expect_key = True
+            elif token in (b"{", b"["):
+                is_target: bool = token == b"[" and self._target is None and self._is_array_path()
+                self._stack.append(_Frame(is_object=token == b"{"))
+                if is_target:
+                    self._target = self._stack[-1]
+                    self._header_parts.append(bytes(self._buffer[self._header_start : match.end()]))
+                    self._element_start = match.end()
+            else:  # } or ]
+                if top is self._target and top is not None:
+                    elements.extend(self._take_element(match.start()))
+                    self._target = None
+                    self._header_start = match.start()
+                self._stack.pop()
+
+        # drop everything which is no longer needed: header bytes are moved out, finished elements discarded
+        if self._target is not None:
+            cut: int = self._element_start
+        else:
+            self._header_parts.append(bytes(self._buffer[self._header_start : self._position]))
+            cut = self._position
+        del self._buffer[:cut]
+        self._position -= cut
+        self._element_start -= cut
+        self._header_start = 0 if self._target is None else self._header_start - cut
+        return elements
+
+    def close(self) -> Any:
+        """
+        returns the parsed document, with the split array left empty
+
+        raises ValueError if the document is incomplete
+        """
+        if self._stack:
+            raise ValueError("Incomplete JSON document")
+        return json.loads(b"".join([*self._header_parts, bytes(self._buffer)]))
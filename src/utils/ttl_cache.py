@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+VALUE = TypeVar("VALUE")
+
+
+def make_query_cache_key(
+    query: str, params: dict[str, Any] | None = None
+) -> tuple[str, tuple[tuple[str, str], ...]]:
+    """
+    Builds a hashable cache key from a SQL query and its bind params
+
+    - whitespace in the query is collapsed, so re-indented queries share an entry
+    - params are sorted by name and repr-ed, so unhashable values (e.g lists) can be used
+    """
+    normalised_query: str = " ".join(query.split())
+    normalised_params: tuple[tuple[str, str], ...] = tuple(
+        sorted((name, repr(value)) for name, value in (params or {}).items())
+    )
+    return normalised_query, normalised_params
+
+
+class TTLCache(Generic[VALUE]):
+    """
+    Thread-safe LRU cache where every entry expires after ttl_seconds
+
+    Responsible for
+    - returning a cached value if it has not expired
+    - evicting the least recently used entries once max_entries or max_bytes is exceeded
+
+    max_bytes is only enforced when a sizer is given; the sizer returns the size of a single value in bytes
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        max_bytes: int | None = None,
+        sizer: Callable[[VALUE], int] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive: {max_entries}")
+        if ttl_seconds <= 0:
+            raise ValueError(f"ttl_seconds must be positive: {ttl_seconds}")
+        self._max_entries: int = max_entries
+        self._ttl_seconds: float = ttl_seconds
+        self._max_bytes: int | None = max_bytes
+        self._sizer: Callable[[VALUE], int] | None = sizer
+        self._clock: Callable[[], float] = clock
+        # key -> (expires_at, size_in_bytes, value); ordered from least to most recently used
+        self._entries: OrderedDict[Hashable, tuple[float, int, VALUE]] = OrderedDict()
+        self._total_bytes: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: Hashable) -> VALUE | None:
+        with self._lock:
+            entry: tuple[float, int, VALUE] | None = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, value = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: VALUE) -> None:
+        size: int = self._sizer(value) if self._sizer else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self._max_bytes is not None and size > self._max_bytes:
+                # a single value larger than the whole cache is never cached
+                return
+            self._entries[key] = (self._clock() + self._ttl_seconds, size, value)
+            self._total_bytes += size
+            self._evict()
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """
+        invalidates a single key, or the whole cache if no key is given
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._total_bytes = 0
+            elif key in self._entries:
+                self._remove(key)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def _evict(self) -> None:
+        # expired entries go first, then least recently used entries until both bounds hold
+        now: float = self._clock()
+        for expired_key in [
+            key for key, (expires_at, _, _) in self._entries.items() if expires_at <= now
+        ]:
+            self._remove(expired_key)
+        while len(self._entries) > self._max_entries or (
+            self._max_bytes is not None and self._total_bytes > self._max_bytes
+        ):
+            oldest_key: Hashable = next(iter(self._entries))
+            self._remove(oldest_key)
@@ -0,0 +1,90 @@
+import json
+from datetime import datetime
+
+import pyarrow as pa
+import pytest
+
+from src.models.binance_models.binance_klines import Klines
+from src.models.binance_models.binance_klines_arrow import (
+    KLINE_ARROW_SCHEMA,
+    kline_records_to_arrow_table,
+    raw_klines_to_arrow_table,
+)
+from src.models.database_transfer_objects.binance.binance_klines import BinanceKlinePriceDTO
+
+
+@pytest.fixture()
+def raw_klines() -> list[list[str | int]]:
+    return [
+        [
+            1499040000000,
+            "0.01634790",
+            "0.80000000",
+            "0.01575800",
+            "0.01577100",
+            "148976.11427815",
+            1499040059999,
+            "2434.19055334",
+            308,
+            "1756.87402397",
+            "28.46694368",
+            "0",
+        ],
+        [
+            1499040060000,
+            "0.01577100",
+            "0.01600000",
+            "0.00000001",
+            "0.01590000",
+            "0",
+            1499040119999,
+            "0",
+            0,
+            "0",
+            "0",
+            "0",
+        ],
+    ]
+
+
+def test_raw_klines_match_the_pydantic_path(raw_klines: list[list[str | int]]) -> None:
+    """
+    GIVEN: raw binance klines
+    WHEN: converted by the columnar path and by Klines -> BinanceKlinePriceDTO
+    THEN: every column holds exactly the same values (fixed-point decimals, millisecond timestamps)
+    """
+    created_at: datetime = datetime(2026, 3, 29)
+    klines_table: pa.Table = raw_klines_to_arrow_table("ETHBTC", raw_klines, created_at=created_at)
+    dtos: list[BinanceKlinePriceDTO] = BinanceKlinePriceDTO.from_service_klines(
+        "ETHBTC", Klines.from_json("ETHBTC", raw_klines)
+    )
+
+    assert klines_table.schema == KLINE_ARROW_SCHEMA
+    assert klines_table.to_pylist() == [
+        dto.model_copy(update={"created_at": created_at}).model_dump() for dto in dtos
+    ]
+
+
+def test_serialised_klines_match_raw_klines(raw_klines: list[list[str | int]]) -> None:
+    """
+    GIVEN: klines serialised as a Klines JSON file, the format stored in S3
+    WHEN: converted by kline_records_to_arrow_table
+    THEN: the table equals the one built from the raw klines
+    """
+    created_at: datetime = datetime(2026, 3, 29)
+    records: list[dict] = json.loads(Klines.from_json("ETHBTC", raw_klines).model_dump_json())["klines"]
+
+    assert kline_records_to_arrow_table(records, created_at=created_at).equals(
+        raw_klines_to_arrow_table("ETHBTC", raw_klines, created_at=created_at)
+    )
+
+
+def test_empty_klines() -> None:
+    assert raw_klines_to_arrow_table("ETHBTC", []).num_rows == 0
+    assert kline_records_to_arrow_table([]).schema == KLINE_ARROW_SCHEMA
+
+
+def test_malformed_price_is_rejected(raw_klines: list[list[str | int]]) -> None:
+    raw_klines[0][1] = "not a price"
+    with pytest.raises(pa.ArrowInvalid):
+        raw_klines_to_arrow_table("ETHBTC", raw_klines)
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from src.binance_kline_gap_refill import KlineGap, exclude_ranges, refill_windows
+from src.cold_storage_archiver import archived_kline_month
+
+
+def test_a_gap_is_split_into_windows_of_at_most_limit_candles() -> None:
+    gap: KlineGap = KlineGap(
+        symbol="BTCUSDC", start_time=datetime(2026, 3, 29, 0, 0), end_time=datetime(2026, 3, 29, 0, 25)
+    )
+
+    assert refill_windows(gap, limit=10) == [
+        (datetime(2026, 3, 29, 0, 0), datetime(2026, 3, 29, 0, 10)),
+        (datetime(2026, 3, 29, 0, 10), datetime(2026, 3, 29, 0, 20)),
+        (datetime(2026, 3, 29, 0, 20), datetime(2026, 3, 29, 0, 25)),
+    ]
+
+
+def test_a_single_missing_candle_is_a_single_window() -> None:
+    gap: KlineGap = KlineGap(
+        symbol="BTCUSDC", start_time=datetime(2026, 3, 29, 0, 7), end_time=datetime(2026, 3, 29, 0, 8)
+    )
+
+    assert refill_windows(gap) == [(datetime(2026, 3, 29, 0, 7), datetime(2026, 3, 29, 0, 8))]
+
+
+def test_archived_months_are_not_gaps() -> None:
+    gaps: list[KlineGap] = [
+        KlineGap(symbol="BTCUSDC", start_time=datetime(2026, 1, 20), end_time=datetime(2026, 3, 2)),
+        KlineGap(symbol="ETHBTC", start_time=datetime(2026, 2, 3), end_time=datetime(2026, 2, 4)),
+    ]
+
+    assert exclude_ranges(gaps, [archived_kline_month("month=2026-02")]) == [
+        KlineGap(symbol="BTCUSDC", start_time=datetime(2026, 1, 20), end_time=datetime(2026, 2, 1)),
+        KlineGap(symbol="BTCUSDC", start_time=datetime(2026, 3, 1), end_time=datetime(2026, 3, 2)),
+    ]
+
+
+def test_december_ends_at_the_next_year() -> None:
+    assert archived_kline_month("month=2025-12") == (datetime(2025, 12, 1), datetime(2026, 1, 1))
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from src.utils.kline_rollups import floor_to_interval, resample_klines, select_rollup_interval
+
+
+@pytest.fixture()
+def one_minute_klines() -> pd.DataFrame:
+    """
+    10 consecutive 1m klines from 00:00 to 00:09, with open price = minute index
+    """
+    open_times: list[datetime] = [datetime(2026, 3, 29, 0, minute) for minute in range(10)]
+    return pd.DataFrame(
+        {
+            "symbol": ["BTCUSDC"] * 10,
+            "kline_open_time": pd.to_datetime(open_times),
+            "open_price": [float(minute) for minute in range(10)],
+            "high_price": [float(minute) + 0.5 for minute in range(10)],
+            "low_price": [float(minute) - 0.5 for minute in range(10)],
+            "close_price": [float(minute) + 0.25 for minute in range(10)],
+            "volume": [1.0] * 10,
+            "quote_asset_volume": [2.0] * 10,
+            "number_of_trades": [3] * 10,
+            "taker_buy_base_asset_vol": [0.5] * 10,
+            "taker_buy_quote_asset_vol": [1.5] * 10,
+        }
+    )
+
+
+class TestResampleKlines:
+    def test_resample_into_5m(self, one_minute_klines: pd.DataFrame) -> None:
+        """
+        GIVEN: 10 1m klines
+        WHEN: resampled into 5m buckets
+        THEN: 2 buckets, with first open, max high, min low, last close and summed volumes
+        """
+        rollup_df: pd.DataFrame = resample_klines(one_minute_klines, timedelta(minutes=5))
+
+        assert len(rollup_df) == 2
+        first_bucket = rollup_df.iloc[0]
+        assert first_bucket["kline_open_time"] == pd.Timestamp(2026, 3, 29, 0, 0)
+        assert first_bucket["kline_close_time"] == pd.Timestamp(2026, 3, 29, 0, 4, 59, 999000)
+        assert first_bucket["open_price"] == 0.0
+        assert first_bucket["high_price"] == 4.5
+        assert first_bucket["low_price"] == -0.5
+        assert first_bucket["close_price"] == 4.25
+        assert first_bucket["volume"] == 5.0
+        assert first_bucket["number_of_trades"] == 15
+        assert first_bucket["candle_count"] == 5
+        assert rollup_df.iloc[1]["open_price"] == 5.0
+
+    def test_decimal_columns_are_aggregated_exactly(self, one_minute_klines: pd.DataFrame) -> None:
+        """
+        GIVEN: NUMERIC(38, 18) volumes with 32 significant digits, more than Decimal's default precision of 28
+        WHEN: resampled into 5m buckets
+        THEN: the volumes sum without rounding, the same as postgres' sum
+        """
+        one_minute_klines["quote_asset_volume"] = [Decimal("12345678901234.123456789012345678")] * 10
+
+        rollup_df: pd.DataFrame = resample_klines(one_minute_klines, timedelta(minutes=5))
+
+        assert rollup_df.iloc[0]["quote_asset_volume"] == Decimal("61728394506170.617283945061728390")
+
+    def test_resample_is_order_independent(self, one_minute_klines: pd.DataFrame) -> None:
+        shuffled_df: pd.DataFrame = one_minute_klines.sample(frac=1, random_state=7)
+        pd.testing.assert_frame_equal(
+            resample_klines(shuffled_df, timedelta(minutes=5)),
+            resample_klines(one_minute_klines, timedelta(minutes=5)),
+        )
+
+    def test_resample_empty(self) -> None:
+        rollup_df: pd.DataFrame = resample_klines(
+            pd.DataFrame(columns=["symbol", "kline_open_time"]), timedelta(hours=1)
+        )
+        assert rollup_df.empty
+        assert "candle_count" in rollup_df.columns
+
+
+@pytest.mark.parametrize(
+    "requested_interval, expected",
+    [
+        (timedelta(minutes=1), None),
+        (timedelta(minutes=3), None),
+        (timedelta(minutes=5), "5m"),
+        (timedelta(minutes=45), "15m"),
+        (timedelta(hours=2), "1h"),
+        (timedelta(hours=8), "4h"),
+        (timedelta(days=7), "1d"),
+    ],
+)
+def test_select_rollup_interval(requested_interval: timedelta, expected: str | None) -> None:
+    assert select_rollup_interval(requested_interval) == expected
+
+
+def test_select_rollup_interval_rejects_partial_minutes() -> None:
+    with pytest.raises(ValueError):
+        select_rollup_interval(timedelta(seconds=90))
+
+
+def test_floor_to_interval() -> None:
+    assert floor_to_interval(datetime(2026, 3, 29, 13, 47, 12), timedelta(hours=4)) == datetime(2026, 3, 29, 12)
+    assert floor_to_interval(datetime(2026, 3, 29, 13, 47), timedelta(minutes=15)) == datetime(2026, 3, 29, 13, 45)
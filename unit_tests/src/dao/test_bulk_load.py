@@ -0,0 +1,57 @@
+from sqlalchemy import ForeignKeyConstraint, Index
+
+from database_management.chainstack.tables import eth_block_table
+from src.dao.bulk_load import (
+    add_foreign_key_sql,
+    create_index_sql,
+    foreign_keys_of,
+    indexes_of,
+)
+from src.eth_block_etl_pipeline import ETH_BLOCK_TABLES
+
+
+def test_bulk_load_mode_defers_every_foreign_key_and_secondary_index_of_the_eth_tables() -> None:
+    foreign_keys: list[ForeignKeyConstraint] = foreign_keys_of(ETH_BLOCK_TABLES)
+    indexes: list[Index] = indexes_of(ETH_BLOCK_TABLES)
+
+    assert [foreign_key.name for foreign_key in foreign_keys] == [
+        "logs_to_blocks_fk",
+        "receipts_to_blocks_fk",
+        "transaction_access_list_to_transactions_fk",
+        "transactions_to_blocks_fk",
+        "withdrawals_to_blocks_fk",
+    ]
+    assert [index.name for index in indexes] == [
+        "eth_blocks_unhydrated_index",
+        "eth_logs_address_index",
+        "eth_logs_topic0_index",
+        "eth_receipts_block_number_index",
+        "eth_transactions_block_number_index",
+    ]
+
+
+def test_foreign_keys_referencing_a_table_are_deferred_with_it() -> None:
+    # eth_blocks can only be SET UNLOGGED once no logged table references it
+    assert "transactions_to_blocks_fk" in {
+        foreign_key.name for foreign_key in foreign_keys_of([eth_block_table])
+    }
+
+
+def test_rebuild_statements() -> None:
+    foreign_key: ForeignKeyConstraint = next(
+        foreign_key
+        for foreign_key in foreign_keys_of(ETH_BLOCK_TABLES)
+        if foreign_key.name == "transaction_access_list_to_transactions_fk"
+    )
+    index: Index = next(
+        index for index in indexes_of(ETH_BLOCK_TABLES) if index.name == "eth_blocks_unhydrated_index"
+    )
+
+    assert add_foreign_key_sql(foreign_key) == (
+        "ALTER TABLE eth_transaction_access_list ADD CONSTRAINT transaction_access_list_to_transactions_fk "
+        "FOREIGN KEY (transaction_hash) REFERENCES eth_transactions (hash) NOT VALID"
+    )
+    assert create_index_sql(index) == (
+        "CREATE INDEX IF NOT EXISTS eth_blocks_unhydrated_index ON eth_blocks (block_number) "
+        "WHERE NOT transactions_hydrated"
+    )
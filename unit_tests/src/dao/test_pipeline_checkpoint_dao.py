@@ -0,0 +1,37 @@
+import pytest
+
+from src.dao.pipeline_checkpoint_dao import CheckpointConflictError, next_checkpoint_position
+
+
+def test_exclusive_batch_continuing_the_checkpoint_advances_it() -> None:
+    assert next_checkpoint_position(0, 1, 100, exclusive=True) == 100
+    assert next_checkpoint_position(100, 101, 150, exclusive=True) == 150
+
+
+def test_first_exclusive_batch_may_start_anywhere() -> None:
+    assert next_checkpoint_position(None, 1, 100, exclusive=True) == 100
+    assert next_checkpoint_position(None, 9_001, 9_100, exclusive=True) == 9_100
+    # a range batch still has to start from the beginning
+    assert next_checkpoint_position(None, 9_001, 9_100, exclusive=False) is None
+
+
+@pytest.mark.parametrize("start_position", [90, 100, 102])
+def test_exclusive_batch_not_continuing_the_checkpoint_conflicts(start_position: int) -> None:
+    # e.g another replica already ingested the batch
+    with pytest.raises(CheckpointConflictError):
+        next_checkpoint_position(100, start_position, start_position + 49, exclusive=True)
+
+
+@pytest.mark.parametrize(
+    "start_position, end_position, expected",
+    [
+        (1, 150, 150),  # overlaps and extends the checkpoint
+        (101, 150, 150),  # continues it
+        (1, 50, None),  # replay behind the checkpoint
+        (200, 250, None),  # backfill ahead of it; blocks 101 to 199 are still missing
+    ],
+)
+def test_range_batch_only_extends_the_checkpoint(
+    start_position: int, end_position: int, expected: int | None
+) -> None:
+    assert next_checkpoint_position(100, start_position, end_position, exclusive=False) == expected
@@ -0,0 +1,191 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Sequence
+
+import pytest
+
+from src.dao.eth_block_dao import BLOCK_COLUMNS, EthBlockDAO
+from src.dao.eth_transaction_access_list_dao import (
+    ACCESS_LIST_COLUMNS,
+    EthTransactionAccessListDAO,
+)
+from src.dao.eth_transactions_dao import TRANSACTION_COLUMNS, EthTransactionDAO
+from src.dao.eth_withdrawals_dao import WITHDRAWAL_COLUMNS, EthWithdrawalDAO
+from src.dao.staged_batch_loader import StagedBatchLoader, StagedRows
+from src.eth_block_etl_pipeline import ETH_BLOCK_TABLES, EthBlockDTOMapper
+from src.models.chain_stack_models.eth_blocks import ChainStackEthBlockInformationResponse
+
+# postgres silently truncates longer identifiers
+MAX_IDENTIFIER_LENGTH: int = 63
+
+
+def make_block() -> ChainStackEthBlockInformationResponse:
+    raw_block: dict[str, Any] = {
+        "id": 1,
+        "jsonrpc": "2.0",
+        "result": {
+            "difficulty": "0x0",
+            "extraData": "0x",
+            "gasLimit": "0x1c9c380",
+            "gasUsed": "0x5208",
+            "hash": "0xb1",
+            "logsBloom": "0x0",
+            "miner": "0xm1",
+            "mixHash": "0x0",
+            "nonce": "0x0",
+            "number": "0x1",
+            "parentHash": "0xb0",
+            "receiptsRoot": "0x0",
+            "sha3Uncles": "0x0",
+            "size": "0x220",
+            "stateRoot": "0x0",
+            "timestamp": "0x5f5e100",
+            "transactions": [
+                {
+                    "accessList": [{"address": "0xa1", "storageKeys": ["0x01"]}],
+                    "blockHash": "0xb1",
+                    "blockNumber": "0x1",
+                    "chainId": "0x1",
+                    "from": "0xf1",
+                    "gas": "0x5208",
+                    "gasPrice": "0x1",
+                    "hash": "0xt1",
+                    "input": "0x",
+                    "nonce": "0x0",
+                    "r": "0x1",
+                    "s": "0x1",
+                    "to": "0xt1",
+                    "transactionIndex": "0x0",
+                    "type": "0x1",
+                    "v": "0x1",
+                    "value": "0x0",
+                }
+            ],
+            "transactionsRoot": "0x0",
+            "uncles": [],
+            "withdrawals": [
+                {"address": "0xa1", "amount": "0x10", "index": "0x4c1b", "validatorIndex": "0x7"}
+            ],
+        },
+    }
+    return ChainStackEthBlockInformationResponse.from_json("0x1", raw_block)
+
+
+def test_every_record_matches_its_columns() -> None:
+    block_dtos, transaction_dtos, withdrawal_dtos, access_list_dtos = EthBlockDTOMapper.blocks_to_dto(
+        [make_block()]
+    )
+    records_and_columns: list[tuple[list[tuple[Any, ...]], Sequence[str]]] = [
+        (EthBlockDAO.to_records(block_dtos), BLOCK_COLUMNS),
+        (EthTransactionDAO.to_records(transaction_dtos), TRANSACTION_COLUMNS),
+        (EthWithdrawalDAO.to_records(withdrawal_dtos), WITHDRAWAL_COLUMNS),
+        (EthTransactionAccessListDAO.to_records(access_list_dtos), ACCESS_LIST_COLUMNS),
+    ]
+
+    for records, columns in records_and_columns:
+        assert len(records) == 1
+        assert len(records[0]) == len(columns)
+    assert EthTransactionAccessListDAO.to_records(access_list_dtos)[0][2] == 0  # position
+
+
+@pytest.mark.parametrize("table_name", [table.name for table in ETH_BLOCK_TABLES])
+def test_staging_tables_are_unique_and_never_truncated(table_name: str) -> None:
+    first: StagedRows = StagedRows(table_name, [], [])
+    second: StagedRows = StagedRows(table_name, [], [])
+
+    assert first.staging_table_name != second.staging_table_name
+    assert len(first.staging_table_name) <= MAX_IDENTIFIER_LENGTH
+
+
+class FakeDriverConnection:
+    def __init__(self, copies: dict[str, list[tuple[Any, ...]]]) -> None:
+        self._copies: dict[str, list[tuple[Any, ...]]] = copies
+
+    async def copy_records_to_table(
+        self, table_name: str, records: Sequence[tuple[Any, ...]], columns: list[str]
+    ) -> None:
+        self._copies[table_name] = list(records)
+
+
+class FakePooledConnection:
+    def __init__(self, driver_connection: FakeDriverConnection) -> None:
+        self.driver_connection: FakeDriverConnection = driver_connection
+
+
+class FakeConnection:
+    """
+    records every statement, grouped by the transaction (engine.begin) which ran it
+    """
+
+    def __init__(self, engine: "FakeEngine") -> None:
+        self._engine: FakeEngine = engine
+        self.statements: list[str] = []
+
+    async def execute(self, statement: Any, *args: Any) -> None:
+        self.statements.append(str(statement))
+
+    async def get_raw_connection(self) -> FakePooledConnection:
+        return FakePooledConnection(FakeDriverConnection(self._engine.copies))
+
+
+class FakeEngine:
+    def __init__(self) -> None:
+        self.transactions: list[FakeConnection] = []
+        self.copies: dict[str, list[tuple[Any, ...]]] = {}
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[FakeConnection]:
+        connection: FakeConnection = FakeConnection(self)
+        self.transactions.append(connection)
+        yield connection
+
+
+def test_load_stages_every_table_then_publishes_in_one_transaction() -> None:
+    engine: FakeEngine = FakeEngine()
+    blocks: StagedRows = StagedRows("eth_blocks", ["block_number"], [("0x1",), ("0x2",)])
+    transactions: StagedRows = StagedRows("eth_transactions", ["hash"], [("0xt1",)])
+    empty: StagedRows = StagedRows("eth_withdrawals", ["id"], [])
+    published: list[FakeConnection] = []
+
+    async def publish(async_connection: Any) -> None:
+        published.append(async_connection)
+
+    asyncio.run(
+        StagedBatchLoader(engine).load([blocks, transactions, empty], publish)  # type: ignore[arg-type]
+    )
+
+    assert engine.copies == {
+        blocks.staging_table_name: [("0x1",), ("0x2",)],
+        transactions.staging_table_name: [("0xt1",)],
+    }
+    staging, publishing, dropping = engine.transactions[:2], engine.transactions[2], engine.transactions[3]
+    assert all(len(connection.statements) == 2 for connection in staging)
+    # referenced tables first, then the import status, on the same transaction
+    assert publishing.statements == [
+        (
+            f"INSERT INTO eth_blocks (block_number) SELECT block_number FROM {blocks.staging_table_name} "
+            f"ON CONFLICT DO NOTHING"
+        ),
+        (
+            f"INSERT INTO eth_transactions (hash) SELECT hash FROM {transactions.staging_table_name} "
+            f"ON CONFLICT DO NOTHING"
+        ),
+    ]
+    assert published == [publishing]
+    assert dropping.statements == [
+        f"DROP TABLE IF EXISTS {blocks.staging_table_name}",
+        f"DROP TABLE IF EXISTS {transactions.staging_table_name}",
+    ]
+
+
+def test_staging_tables_are_dropped_when_publishing_fails() -> None:
+    engine: FakeEngine = FakeEngine()
+    blocks: StagedRows = StagedRows("eth_blocks", ["block_number"], [("0x1",)])
+
+    async def publish(async_connection: Any) -> None:
+        raise RuntimeError("checkpoint conflict")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(StagedBatchLoader(engine).load([blocks], publish))  # type: ignore[arg-type]
+
+    assert engine.transactions[-1].statements == [f"DROP TABLE IF EXISTS {blocks.staging_table_name}"]
@@ -0,0 +1,97 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+from pydantic import BaseModel
+
+from src.extractors.abstract_extractor import BaseExtractor
+
+
+class Block(BaseModel):
+    number: int
+
+
+class SlowBlockExtractor(BaseExtractor[int, Block]):
+    """
+    block n takes delays[n] seconds; records how many requests were in flight at once, and which were cancelled
+    """
+
+    def __init__(self, delays: dict[int, float], max_concurrency: int, failing: int | None = None) -> None:
+        super().__init__(max_concurrency=max_concurrency)
+        self.delays: dict[int, float] = delays
+        self.failing: int | None = failing
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self.started: list[int] = []
+        self.cancelled: list[int] = []
+
+    async def extract_one(self, key: int) -> Block:
+        self.started.append(key)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(key, 0))
+            if key == self.failing:
+                raise ValueError(f"block {key} failed")
+            return Block(number=key)
+        except asyncio.CancelledError:
+            self.cancelled.append(key)
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+async def collect(extractor: SlowBlockExtractor, ordered: bool) -> list[int]:
+    return [key async for key, _ in extractor.stream(range(5), ordered=ordered)]
+
+
+def test_stream_in_block_order_and_in_completion_order() -> None:
+    delays: dict[int, float] = {0: 0.05, 1: 0.0, 2: 0.02, 3: 0.0, 4: 0.0}
+
+    ordered_extractor: SlowBlockExtractor = SlowBlockExtractor(delays, max_concurrency=5)
+    assert asyncio.run(collect(ordered_extractor, ordered=True)) == [0, 1, 2, 3, 4]
+
+    unordered_extractor: SlowBlockExtractor = SlowBlockExtractor(delays, max_concurrency=5)
+    assert asyncio.run(collect(unordered_extractor, ordered=False)) == [1, 3, 4, 2, 0]
+
+    assert [block.number for block in asyncio.run(ordered_extractor.extract_many([3, 1]))] == [3, 1]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_stream_bounds_concurrency(ordered: bool) -> None:
+    extractor: SlowBlockExtractor = SlowBlockExtractor({n: 0.001 for n in range(20)}, max_concurrency=3)
+
+    async def run() -> list[int]:
+        return [key async for key, _ in extractor.stream(range(20), ordered=ordered)]
+
+    assert sorted(asyncio.run(run())) == list(range(20))
+    assert extractor.max_in_flight == 3
+
+
+def test_slow_consumer_applies_backpressure() -> None:
+    """
+    GIVEN: a consumer which stops after the first block
+    WHEN: the stream is closed
+    THEN: no more than max_concurrency blocks were ever requested, and the ones in flight are cancelled
+    """
+    extractor: SlowBlockExtractor = SlowBlockExtractor({0: 0.0, 1: 10.0, 2: 10.0}, max_concurrency=3)
+
+    async def run() -> None:
+        async with aclosing(extractor.stream(range(100))) as blocks:
+            async for _ in blocks:
+                await asyncio.sleep(0.01)
+                break
+
+    asyncio.run(run())
+    assert extractor.started == [0, 1, 2]
+    assert sorted(extractor.cancelled) == [1, 2]
+
+
+def test_failure_cancels_requests_in_flight() -> None:
+    extractor: SlowBlockExtractor = SlowBlockExtractor(
+        {0: 0.0, 1: 0.01, 2: 10.0}, max_concurrency=3, failing=1
+    )
+
+    with pytest.raises(ValueError):
+        asyncio.run(collect(extractor, ordered=False))
+    assert extractor.cancelled == [2]
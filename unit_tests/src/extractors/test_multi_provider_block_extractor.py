@@ -0,0 +1,129 @@
+import asyncio
+from typing import Any, Callable, Coroutine
+
+import pytest
+
+from src.extractors.multi_provider_block_extractor import (
+    BlockProvider,
+    MultiProviderBlockExtractor,
+    ProviderHealth,
+)
+from src.utils.raw_block_cache import RawBlockCache
+
+
+def make_raw_block(block_number: str) -> dict[str, Any]:
+    return {"id": 1, "jsonrpc": "2.0", "result": {"number": block_number}}
+
+
+def make_provider(
+    name: str, delay_seconds: float, calls: list[str], fail: bool = False
+) -> BlockProvider:
+    async def fetch_raw_block(block_number: str) -> dict[str, Any]:
+        calls.append(name)
+        await asyncio.sleep(delay_seconds)
+        if fail:
+            raise ConnectionError(f"{name} is down")
+        return make_raw_block(block_number)
+
+    return BlockProvider(name=name, fetch_raw_block=fetch_raw_block)
+
+
+def make_extractor(
+    providers: list[BlockProvider], **kwargs: Any
+) -> MultiProviderBlockExtractor:
+    return MultiProviderBlockExtractor(
+        providers=providers,
+        parse_raw_block=lambda block_number, raw_block: raw_block["result"]["number"],
+        min_hedge_delay_seconds=0.01,
+        max_hedge_delay_seconds=0.05,
+        **kwargs,
+    )
+
+
+def run(coroutine_function: Callable[[], Coroutine[Any, Any, Any]]) -> Any:
+    return asyncio.run(coroutine_function())
+
+
+class TestProviderHealth:
+    def test_errors_make_a_provider_less_healthy(self) -> None:
+        fast_but_failing: ProviderHealth = ProviderHealth()
+        slow: ProviderHealth = ProviderHealth()
+        for _ in range(9):
+            fast_but_failing.record_success(0.1)
+            slow.record_success(0.15)
+        fast_but_failing.record_failure()
+
+        assert fast_but_failing.latency_percentile(95) == 0.1
+        assert fast_but_failing.error_rate == 0.1
+        assert fast_but_failing.score > slow.score
+
+
+class TestMultiProviderBlockExtractor:
+    def test_slow_provider_is_hedged_by_the_fast_one(self) -> None:
+        """
+        GIVEN: a primary provider which takes 1s, and a second provider which takes 10ms
+        WHEN: a block is fetched
+        THEN: the second provider is asked after the hedge delay, and its answer wins
+        """
+        calls: list[str] = []
+        extractor: MultiProviderBlockExtractor = make_extractor(
+            [make_provider("slow", 1.0, calls), make_provider("fast", 0.01, calls)]
+        )
+
+        async def fetch() -> tuple[str, dict[str, Any]]:
+            return await asyncio.wait_for(extractor.fetch_raw_block("0x1"), timeout=0.5)
+
+        provider_name, raw_block = run(fetch)
+
+        assert provider_name == "fast"
+        assert raw_block == make_raw_block("0x1")
+        assert calls == ["slow", "fast"]
+        # the abandoned request still counts as (at least) hedge delay slow
+        assert extractor.provider_health("slow").latency_percentile(95) >= 0.01
+
+    def test_failing_provider_fails_over(self) -> None:
+        calls: list[str] = []
+        extractor: MultiProviderBlockExtractor = make_extractor(
+            [make_provider("down", 0.0, calls, fail=True), make_provider("up", 0.0, calls)]
+        )
+
+        async def extract() -> list[str]:
+            return await extractor.extract(1, 3)
+
+        assert run(extract) == ["0x1", "0x2", "0x3"]
+        assert extractor.provider_health("down").error_rate == 1.0
+        # new work is routed to the healthy provider first
+        assert [provider.name for provider in extractor.rank_providers()] == ["up", "down"]
+
+    def test_raises_when_every_provider_fails(self) -> None:
+        calls: list[str] = []
+        extractor: MultiProviderBlockExtractor = make_extractor(
+            [
+                make_provider("first", 0.0, calls, fail=True),
+                make_provider("second", 0.0, calls, fail=True),
+            ]
+        )
+
+        with pytest.raises(ConnectionError):
+            run(lambda: extractor.fetch_raw_block("0x1"))
+
+    def test_blocks_are_cached_under_the_provider_which_served_them(self, tmp_path) -> None:
+        raw_block_cache: RawBlockCache = RawBlockCache(str(tmp_path / "raw_blocks.sqlite3"))
+        calls: list[str] = []
+        extractor: MultiProviderBlockExtractor = make_extractor(
+            [make_provider("down", 0.0, calls, fail=True), make_provider("up", 0.0, calls)],
+            raw_block_cache=raw_block_cache,
+        )
+        run(lambda: extractor.extract(1, 2))
+
+        replay_extractor: MultiProviderBlockExtractor = make_extractor(
+            [make_provider("down", 0.0, calls, fail=True), make_provider("up", 0.0, calls)],
+            raw_block_cache=raw_block_cache,
+            replay=True,
+        )
+        calls.clear()
+
+        assert run(lambda: replay_extractor.extract(1, 2)) == ["0x1", "0x2"]
+        assert calls == []
+        assert raw_block_cache.get("ethereum", "up", 1) == make_raw_block("0x1")
+        raw_block_cache.close()
@@ -0,0 +1,154 @@
+import asyncio
+import os
+from typing import Any, Generator
+
+import pytest
+from pydantic import BaseModel
+
+from src.extractors.raw_block_cache_extractor import RawBlockCacheExtractor
+from src.utils.raw_block_cache import RawBlockCache, RawBlockCacheMissError
+
+
+class Block(BaseModel):
+    number: str
+    extra_data: str
+
+
+def make_raw_block(block_number: int) -> dict[str, Any]:
+    return {
+        "id": 1,
+        "jsonrpc": "2.0",
+        "result": {"number": hex(block_number), "extraData": os.urandom(16).hex()},
+    }
+
+
+class FakeBlockExtractor(RawBlockCacheExtractor[Block]):
+    """
+    records every fetched block number; blocks in empty_blocks have no result, e.g blocks past the chain head
+    the chain head is chain_head
+    """
+
+    def __init__(
+        self,
+        raw_block_cache: RawBlockCache,
+        replay: bool = False,
+        empty_blocks: tuple[int, ...] = (),
+        chain_head: int = 1_000,
+    ) -> None:
+        super().__init__(
+            raw_block_cache=raw_block_cache,
+            replay=replay,
+            fetch_chain_head=self.fetch_chain_head,
+            confirmations=64,
+        )
+        self.empty_blocks: tuple[int, ...] = empty_blocks
+        self.chain_head: int = chain_head
+        self.fetched_block_numbers: list[str] = []
+        self.chain_head_fetches: int = 0
+
+    async def fetch_chain_head(self) -> str:
+        self.chain_head_fetches += 1
+        return hex(self.chain_head)
+
+    def cache_providers(self) -> list[str]:
+        return ["chainstack"]
+
+    async def fetch_raw_block(self, block_number: str) -> tuple[str, dict[str, Any]]:
+        self.fetched_block_numbers.append(block_number)
+        if int(block_number, 16) in self.empty_blocks:
+            return "chainstack", {"id": 1, "jsonrpc": "2.0", "result": None}
+        return "chainstack", make_raw_block(int(block_number, 16))
+
+    def parse_raw_block(self, block_number: str, raw_block: dict[str, Any]) -> Block:
+        if raw_block["result"] is None:
+            return Block(number=block_number, extra_data="")
+        return Block(number=raw_block["result"]["number"], extra_data=raw_block["result"]["extraData"])
+
+
+class CallCountingRawBlockCache(RawBlockCache):
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self.get_many_calls: int = 0
+        self.put_many_calls: int = 0
+
+    def get_many(self, *args: Any, **kwargs: Any) -> dict[int, dict[str, Any]]:
+        self.get_many_calls += 1
+        return super().get_many(*args, **kwargs)
+
+    def put_many(self, *args: Any, **kwargs: Any) -> None:
+        self.put_many_calls += 1
+        super().put_many(*args, **kwargs)
+
+
+@pytest.fixture
+def raw_block_cache(tmp_path) -> Generator[CallCountingRawBlockCache, None, None]:
+    cache: CallCountingRawBlockCache = CallCountingRawBlockCache(str(tmp_path / "raw_blocks.sqlite3"))
+    yield cache
+    cache.close()
+
+
+class TestRawBlockCacheExtractor:
+    def test_cached_blocks_are_not_refetched(self, raw_block_cache: CallCountingRawBlockCache) -> None:
+        extractor: FakeBlockExtractor = FakeBlockExtractor(raw_block_cache)
+
+        first_read: list[Block] = asyncio.run(extractor.extract_many([1, 2, 3]))
+        second_read: list[Block] = asyncio.run(extractor.extract_many([2, 3, 4]))
+
+        assert extractor.fetched_block_numbers == ["0x1", "0x2", "0x3", "0x4"]
+        assert second_read[:2] == first_read[1:]
+
+    def test_the_cache_is_read_and_written_once_per_batch(
+        self, raw_block_cache: CallCountingRawBlockCache
+    ) -> None:
+        """
+        GIVEN: blocks 1 to 50 of a 100 block batch are cached
+        WHEN: the batch is extracted
+        THEN: the cached blocks are read with a single get_many, and the 50 fetched blocks stored with a single put_many
+        """
+        raw_block_cache.put_many(
+            "ethereum", "chainstack", [(block_number, make_raw_block(block_number)) for block_number in range(1, 51)]
+        )
+        raw_block_cache.put_many_calls = 0
+        extractor: FakeBlockExtractor = FakeBlockExtractor(raw_block_cache)
+
+        blocks: list[Block] = asyncio.run(extractor.extract_many(range(1, 101)))
+
+        assert [block.number for block in blocks] == [hex(block_number) for block_number in range(1, 101)]
+        assert len(extractor.fetched_block_numbers) == 50
+        assert raw_block_cache.get_many_calls == 1
+        assert raw_block_cache.put_many_calls == 1
+
+    def test_replay_never_fetches(self, raw_block_cache: CallCountingRawBlockCache) -> None:
+        raw_block_cache.put("ethereum", "chainstack", 1, make_raw_block(1))
+        extractor: FakeBlockExtractor = FakeBlockExtractor(raw_block_cache, replay=True)
+
+        assert asyncio.run(extractor.extract_one(1)).number == "0x1"
+        with pytest.raises(RawBlockCacheMissError):
+            asyncio.run(extractor.extract_many([1, 2]))
+        assert extractor.fetched_block_numbers == []
+
+    def test_empty_results_are_not_cached(self, raw_block_cache: CallCountingRawBlockCache) -> None:
+        extractor: FakeBlockExtractor = FakeBlockExtractor(raw_block_cache, empty_blocks=(1,))
+
+        asyncio.run(extractor.extract_one(1))
+
+        assert raw_block_cache.get("ethereum", "chainstack", 1) is None
+
+    def test_blocks_near_the_chain_head_are_not_cached(
+        self, raw_block_cache: CallCountingRawBlockCache
+    ) -> None:
+        """
+        GIVEN: the chain head is block 1000, and blocks need 64 confirmations
+        WHEN: blocks 930 to 940 are extracted, then blocks 900 to 910
+        THEN: only blocks up to 936 are cached, a reorg can still replace 937 to 940
+              and the chain head is not refetched for blocks behind the last known one
+        """
+        extractor: FakeBlockExtractor = FakeBlockExtractor(raw_block_cache)
+
+        asyncio.run(extractor.extract_many(range(930, 941)))
+        asyncio.run(extractor.extract_many(range(900, 911)))
+
+        assert [
+            block_number for block_number, _ in raw_block_cache.iter_blocks("ethereum", "chainstack", 900, 1_000)
+        ] == [*range(900, 911), *range(930, 937)]
+        assert extractor.chain_head_fetches == 1
@@ -0,0 +1,69 @@
+import asyncio
+import gzip
+import os
+
+from src.file_explorer.multipart_gzip_writer import MIN_PART_SIZE, MultipartGzipWriter
+
+
+class InMemoryMultipartStore:
+    """
+    the multipart upload calls of S3Explorer, into memory
+    """
+
+    def __init__(self) -> None:
+        self.parts: dict[str, list[bytes]] = {}
+        self.objects: dict[str, bytes] = {}
+
+    def start_multipart_upload(self, s3_path: str) -> str:
+        self.parts[s3_path] = []
+        return f"upload-{s3_path}"
+
+    def upload_part(self, s3_path: str, upload_id: str, part_number: int, body: bytes) -> str:
+        assert part_number == len(self.parts[s3_path]) + 1
+        self.parts[s3_path].append(body)
+        return f"etag-{part_number}"
+
+    def complete_multipart_upload(self, s3_path: str, upload_id: str, etags: list[str]) -> None:
+        assert etags == [f"etag-{part_number}" for part_number in range(1, len(etags) + 1)]
+        self.objects[s3_path] = b"".join(self.parts.pop(s3_path))
+
+    def abort_multipart_upload(self, s3_path: str, upload_id: str) -> None:
+        del self.parts[s3_path]
+
+
+def test_streamed_chunks_are_a_single_gzip_object() -> None:
+    store: InMemoryMultipartStore = InMemoryMultipartStore()
+    writer: MultipartGzipWriter = MultipartGzipWriter(
+        store, "chainstack/eth_blocks/eth_blocks_0000.csv.gz", part_size=MIN_PART_SIZE  # type: ignore[arg-type]
+    )
+    # random bytes don't compress; enough for several parts
+    chunks: list[bytes] = [os.urandom(1024 * 1024) for _ in range(12)]
+
+    async def write_all() -> list[int]:
+        for chunk in chunks:
+            await writer.write(chunk)
+        part_sizes: list[int] = [len(part) for part in store.parts[writer.s3_path]]
+        await writer.close()
+        return part_sizes
+
+    part_sizes: list[int] = asyncio.run(write_all())
+
+    assert len(part_sizes) == 2
+    assert all(part_size >= MIN_PART_SIZE for part_size in part_sizes)
+    assert gzip.decompress(store.objects[writer.s3_path]) == b"".join(chunks)
+    assert writer.uncompressed_bytes == 12 * 1024 * 1024
+
+
+def test_aborted_upload_leaves_nothing_behind() -> None:
+    store: InMemoryMultipartStore = InMemoryMultipartStore()
+    writer: MultipartGzipWriter = MultipartGzipWriter(
+        store, "chainstack/eth_blocks/eth_blocks_0001.csv.gz", part_size=MIN_PART_SIZE  # type: ignore[arg-type]
+    )
+
+    async def write_and_abort() -> None:
+        await writer.write(os.urandom(6 * 1024 * 1024))
+        await writer.abort()
+
+    asyncio.run(write_and_abort())
+
+    assert store.parts == {} and store.objects == {}
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+from typing import Generator
+
+import pytest
+
+from src.job_runner.pipeline_job_runner import (
+    JobStatus,
+    PipelineAlreadyRunningError,
+    PipelineJob,
+    PipelineJobRunner,
+    ProgressCallback,
+)
+from src.utils.background_event_loop import BackgroundEventLoop
+
+
+@pytest.fixture
+def job_runner() -> Generator[PipelineJobRunner, None, None]:
+    event_loop: BackgroundEventLoop = BackgroundEventLoop()
+    yield PipelineJobRunner(event_loop=event_loop)
+    event_loop.stop()
+
+
+class TestPipelineJobRunner:
+    def test_successful_job_reports_progress(self, job_runner: PipelineJobRunner) -> None:
+        """
+        GIVEN: a pipeline which processes 2 batches of 100 blocks
+        WHEN: it is submitted and awaited
+        THEN: the job succeeds, with the last block and total blocks recorded
+        """
+
+        async def fake_pipeline(report_progress: ProgressCallback) -> None:
+            report_progress(100, 100)
+            report_progress(200, 100)
+
+        job: PipelineJob = job_runner.submit("eth", fake_pipeline)
+        finished_job: PipelineJob | None = job_runner.wait(job.job_id, timeout=5)
+
+        assert finished_job is not None
+        assert finished_job.status == JobStatus.SUCCEEDED
+        assert finished_job.current_block == 200
+        assert finished_job.blocks_processed == 200
+        assert finished_job.blocks_per_second > 0
+
+    def test_second_submit_of_a_running_pipeline_is_rejected(
+        self, job_runner: PipelineJobRunner
+    ) -> None:
+        """
+        GIVEN: a pipeline which is still running
+        WHEN: the same pipeline is submitted again
+        THEN: PipelineAlreadyRunningError is raised, while other pipelines can still be submitted
+        """
+        release: threading.Event = threading.Event()
+
+        async def blocking_pipeline(report_progress: ProgressCallback) -> None:
+            while not release.is_set():
+                await asyncio.sleep(0.01)
+
+        async def other_pipeline(report_progress: ProgressCallback) -> None:
+            return None
+
+        job: PipelineJob = job_runner.submit("eth", blocking_pipeline)
+        with pytest.raises(PipelineAlreadyRunningError):
+            job_runner.submit("eth", blocking_pipeline)
+        other_job: PipelineJob = job_runner.submit("binance", other_pipeline)
+
+        release.set()
+        assert job_runner.wait(job.job_id, timeout=5).status == JobStatus.SUCCEEDED  # type: ignore[union-attr]
+        assert job_runner.wait(other_job.job_id, timeout=5).status == JobStatus.SUCCEEDED  # type: ignore[union-attr]
+        # once finished, the pipeline can be submitted again
+        job_runner.wait(job_runner.submit("eth", other_pipeline).job_id, timeout=5)
+
+    def test_cancel_stops_a_running_job(self, job_runner: PipelineJobRunner) -> None:
+        """
+        GIVEN: a pipeline which never finishes on its own
+        WHEN: the job is cancelled
+        THEN: the job ends with status CANCELLED
+        """
+        started: threading.Event = threading.Event()
+
+        async def endless_pipeline(report_progress: ProgressCallback) -> None:
+            started.set()
+            while True:
+                await asyncio.sleep(0.01)
+
+        job: PipelineJob = job_runner.submit("eth", endless_pipeline)
+        assert started.wait(timeout=5)
+        assert job_runner.cancel(job.job_id)
+
+        cancelled_job: PipelineJob | None = job_runner.wait(job.job_id, timeout=5)
+        assert cancelled_job is not None
+        assert cancelled_job.status == JobStatus.CANCELLED
+        assert not job_runner.cancel(job.job_id)
+
+    def test_failed_job_records_the_error(self, job_runner: PipelineJobRunner) -> None:
+        async def failing_pipeline(report_progress: ProgressCallback) -> None:
+            raise ValueError("boom")
+
+        job: PipelineJob = job_runner.submit("eth", failing_pipeline)
+        failed_job: PipelineJob | None = job_runner.wait(job.job_id, timeout=5)
+
+        assert failed_job is not None
+        assert failed_job.status == JobStatus.FAILED
+        assert "boom" in (failed_job.error or "")
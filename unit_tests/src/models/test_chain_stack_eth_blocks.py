@@ -0,0 +1,100 @@
+from typing import Any
+
+from src.eth_block_etl_pipeline import EthBlockDTOMapper
+from src.models.chain_stack_models.eth_blocks import (
+    ChainStackEthBlockInformationResponse,
+)
+from src.models.database_transfer_objects.eth_blocks import EthBlockDTO
+
+
+def make_transaction(transaction_hash: str) -> dict[str, Any]:
+    return {
+        "blockHash": "0xb1",
+        "blockNumber": "0x1",
+        "from": "0xf1",
+        "gas": "0x5208",
+        "gasPrice": "0x1",
+        "hash": transaction_hash,
+        "input": "0x",
+        "nonce": "0x0",
+        "r": "0x1",
+        "s": "0x1",
+        "to": "0xt1",
+        "transactionIndex": "0x0",
+        "type": "0x0",
+        "v": "0x1b",
+        "value": "0x0",
+    }
+
+
+def make_raw_block(transactions: list[Any]) -> dict[str, Any]:
+    return {
+        "id": 1,
+        "jsonrpc": "2.0",
+        "result": {
+            "difficulty": "0x0",
+            "extraData": "0x",
+            "gasLimit": "0x1c9c380",
+            "gasUsed": "0x5208",
+            "hash": "0xb1",
+            "logsBloom": "0x0",
+            "miner": "0xm1",
+            "mixHash": "0x0",
+            "nonce": "0x0",
+            "number": "0x1",
+            "parentHash": "0xb0",
+            "receiptsRoot": "0x0",
+            "sha3Uncles": "0x0",
+            "size": "0x220",
+            "stateRoot": "0x0",
+            "timestamp": "0x5f5e100",
+            "transactions": transactions,
+            "transactionsRoot": "0x0",
+            "uncles": [],
+        },
+    }
+
+
+class TestHeaderOnlyBlocks:
+    def test_header_only_block_is_not_hydrated(self) -> None:
+        """
+        GIVEN: an eth_getBlockByNumber(full=False) response, where transactions are hashes
+        WHEN: it is parsed and converted to DTOs
+        THEN: the block keeps the hashes, is flagged as not hydrated, and yields no transaction DTOs
+        """
+        block: ChainStackEthBlockInformationResponse = (
+            ChainStackEthBlockInformationResponse.from_json(
+                "0x1", make_raw_block(["0xt1", "0xt2"])
+            )
+        )
+
+        block_dtos, transaction_dtos, _, _ = EthBlockDTOMapper.blocks_to_dto(
+            [block]
+        )
+
+        assert block.result.transactions == []
+        assert block.result.transactionHashes == ["0xt1", "0xt2"]
+        assert block_dtos[0].transactionsHydrated is False
+        assert block_dtos[0].transactionCount == 2
+        assert transaction_dtos == []
+
+    def test_full_block_is_hydrated(self) -> None:
+        block: ChainStackEthBlockInformationResponse = (
+            ChainStackEthBlockInformationResponse.from_json(
+                "0x1", make_raw_block([make_transaction("0xt1")])
+            )
+        )
+
+        block_dto: EthBlockDTO = EthBlockDTO.from_block_information_response(block)
+        _, transaction_dtos, _, _ = EthBlockDTOMapper.blocks_to_dto([block])
+
+        assert block.result.transactionHashes == ["0xt1"]
+        assert block_dto.transactionsHydrated is True
+        assert [transaction_dto.hash for transaction_dto in transaction_dtos] == ["0xt1"]
+
+    def test_empty_header_only_block_needs_no_hydration(self) -> None:
+        block: ChainStackEthBlockInformationResponse = (
+            ChainStackEthBlockInformationResponse.from_json("0x1", make_raw_block([]))
+        )
+
+        assert block.result.transactionsHydrated is True
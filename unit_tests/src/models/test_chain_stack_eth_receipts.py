@@ -0,0 +1,71 @@
+from typing import Any
+
+from src.eth_block_etl_pipeline import EthBlockDTOMapper
+from src.models.chain_stack_models.eth_receipt import ChainStackEthBlockReceiptsResponse
+from src.models.database_transfer_objects.eth_log import EthLogDTO
+from src.models.database_transfer_objects.eth_receipt import EthReceiptDTO
+
+
+def make_log(log_index: str, topics: list[str]) -> dict[str, Any]:
+    return {
+        "address": "0xc0ffee",
+        "blockHash": "0xb1",
+        "blockNumber": "0x1",
+        "data": "0x",
+        "logIndex": log_index,
+        "removed": False,
+        "topics": topics,
+        "transactionHash": "0xt1",
+        "transactionIndex": "0x0",
+    }
+
+
+def make_raw_block_receipts() -> dict[str, Any]:
+    return {
+        "id": 1,
+        "jsonrpc": "2.0",
+        "result": [
+            {
+                "blockHash": "0xb1",
+                "blockNumber": "0x1",
+                "contractAddress": None,
+                "cumulativeGasUsed": "0xa410",
+                "effectiveGasPrice": "0x1",
+                "from": "0xf1",
+                "gasUsed": "0xa410",
+                "logs": [
+                    make_log("0x0", ["0xddf252ad", "0xa", "0xb"]),
+                    make_log("0x1", []),
+                ],
+                "logsBloom": "0x0",
+                "status": "0x1",
+                "to": "0xc0ffee",
+                "transactionHash": "0xt1",
+                "transactionIndex": "0x0",
+                "type": "0x2",
+            }
+        ],
+    }
+
+
+def test_receipts_to_dto_flattens_logs_and_topics() -> None:
+    """
+    GIVEN: an eth_getBlockReceipts response of 1 receipt with 2 logs
+    WHEN: it is converted to DTOs
+    THEN: there is 1 receipt DTO and 2 log DTOs, with topics flattened into topic0 to topic3
+    """
+    block_receipts: ChainStackEthBlockReceiptsResponse = (
+        ChainStackEthBlockReceiptsResponse.from_json("0x1", make_raw_block_receipts())
+    )
+
+    receipt_dtos: list[EthReceiptDTO]
+    log_dtos: list[EthLogDTO]
+    receipt_dtos, log_dtos = EthBlockDTOMapper.receipts_to_dto([block_receipts])
+
+    assert [receipt_dto.transaction_hash for receipt_dto in receipt_dtos] == ["0xt1"]
+    assert receipt_dtos[0].from_address == "0xf1"
+    assert receipt_dtos[0].status == "0x1"
+    assert [log_dto.logIndex for log_dto in log_dtos] == ["0x0", "0x1"]
+    assert (log_dtos[0].topic0, log_dtos[0].topic2, log_dtos[0].topic3) == ("0xddf252ad", "0xb", None)
+    assert log_dtos[1].topic0 is None
+    assert all(log_dto.block_number == "0x1" for log_dto in log_dtos)
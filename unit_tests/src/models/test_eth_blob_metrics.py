@@ -0,0 +1,93 @@
+from typing import Any
+
+from src.eth_block_etl_pipeline import EthBlockDTOMapper
+from src.models.chain_stack_models.eth_blocks import (
+    ChainStackEthBlockInformationResponse,
+)
+from src.models.chain_stack_models.eth_fee_history import ChainStackEthFeeHistoryResponse
+from src.models.database_transfer_objects.eth_blob_metrics import EthBlobMetricsDTO
+
+
+def make_block(block_number: int, blob_fields: dict[str, str]) -> ChainStackEthBlockInformationResponse:
+    raw_block: dict[str, Any] = {
+        "id": 1,
+        "jsonrpc": "2.0",
+        "result": {
+            "baseFeePerGas": "0x7",
+            "difficulty": "0x0",
+            "extraData": "0x",
+            "gasLimit": "0x1c9c380",
+            "gasUsed": "0x0",
+            "hash": "0xb1",
+            "logsBloom": "0x0",
+            "miner": "0xm1",
+            "mixHash": "0x0",
+            "nonce": "0x0",
+            "number": hex(block_number),
+            "parentHash": "0xb0",
+            "receiptsRoot": "0x0",
+            "sha3Uncles": "0x0",
+            "size": "0x220",
+            "stateRoot": "0x0",
+            "timestamp": "0x5f5e100",
+            "transactions": [],
+            "transactionsRoot": "0x0",
+            "uncles": [],
+            **blob_fields,
+        },
+    }
+    return ChainStackEthBlockInformationResponse.from_json(hex(block_number), raw_block)
+
+
+def test_blob_metrics_combine_block_headers_and_fee_history() -> None:
+    """
+    GIVEN: a post-Dencun block with 3 blobs, a pre-Dencun block, and the eth_feeHistory of both
+    WHEN: they are converted to blob metrics
+    THEN: blob gas is decoded from the headers, and fees are taken from the fee history of the same block
+    """
+    blocks: list[ChainStackEthBlockInformationResponse] = [
+        make_block(100, {"blobGasUsed": hex(3 * 131_072), "excessBlobGas": "0x40000"}),
+        make_block(101, {}),
+    ]
+    fee_history: ChainStackEthFeeHistoryResponse = ChainStackEthFeeHistoryResponse.from_json(
+        {
+            "id": 1,
+            "jsonrpc": "2.0",
+            "result": {
+                "oldestBlock": hex(100),
+                # one more entry than blocks; the fees of block 102
+                "baseFeePerGas": ["0x3b9aca00", "0x3b9aca01", "0x3b9aca02"],
+                "gasUsedRatio": [0.5, 0.25],
+                "baseFeePerBlobGas": ["0x1", "0x2", "0x3"],
+                "blobGasUsedRatio": [0.5, 0.0],
+            },
+        }
+    )
+
+    blob_metrics: list[EthBlobMetricsDTO] = EthBlockDTOMapper.blob_metrics_to_dto(
+        input=blocks, fee_histories=[fee_history]
+    )
+
+    assert list(fee_history.block_numbers()) == [100, 101]
+    assert blob_metrics[0].model_dump(exclude={"created_at"}) == {
+        "block_number": 100,
+        "blob_gas_used": 393_216,
+        "excess_blob_gas": 262_144,
+        "blob_count": 3,
+        "base_fee_per_gas": 1_000_000_000,
+        "blob_base_fee": 1,
+        "blob_gas_used_ratio": 0.5,
+    }
+    assert blob_metrics[1].blob_gas_used is None
+    assert blob_metrics[1].blob_count is None
+    assert blob_metrics[1].base_fee_per_gas == 1_000_000_001
+
+
+def test_blocks_without_fee_history_keep_their_header_base_fee() -> None:
+    blob_metrics: list[EthBlobMetricsDTO] = EthBlockDTOMapper.blob_metrics_to_dto(
+        input=[make_block(100, {"blobGasUsed": "0x0", "excessBlobGas": "0x0"})], fee_histories=[]
+    )
+
+    assert blob_metrics[0].blob_count == 0
+    assert blob_metrics[0].base_fee_per_gas == 7
+    assert blob_metrics[0].blob_base_fee is None
@@ -0,0 +1,45 @@
+import uuid
+
+from src.models.chain_stack_models.eth_access_list_item import ChainStackEthAccessListItem
+from src.models.chain_stack_models.eth_withdrawal import ChainStackEthWithdrawal
+from src.models.database_transfer_objects.eth_transaction_access_list import (
+    EthTransactionAccessListDTO,
+)
+from src.models.database_transfer_objects.eth_withdrawals import EthWithdrawalDTO
+from src.models.database_transfer_objects.natural_keys import (
+    NATURAL_KEY_NAMESPACE,
+    natural_key,
+)
+
+
+def test_natural_key_matches_postgres_uuid_generate_v5() -> None:
+    # the migration computes uuid_generate_v5(namespace, block_number || ':' || index)
+    assert natural_key("0x13e4f9a", "0x4c1b") == uuid.uuid5(
+        NATURAL_KEY_NAMESPACE, "0x13e4f9a:0x4c1b"
+    )
+
+
+def test_reconverted_rows_keep_their_ids() -> None:
+    """
+    GIVEN: the same withdrawal and access list item, converted twice (e.g a replayed batch)
+    WHEN: their DTOs are compared
+    THEN: both conversions have the same ids, so the replayed rows conflict and are skipped
+    """
+    withdrawal: ChainStackEthWithdrawal = ChainStackEthWithdrawal(
+        address="0xa1", amount="0x10", index="0x4c1b", validatorIndex="0x7"
+    )
+    access_list_item: ChainStackEthAccessListItem = ChainStackEthAccessListItem(
+        address="0xa1", storageKeys=["0x01"]
+    )
+
+    first_withdrawal: EthWithdrawalDTO = EthWithdrawalDTO.from_quick_node_withdrawal("0x1", withdrawal)
+    replayed_withdrawal: EthWithdrawalDTO = EthWithdrawalDTO.from_quick_node_withdrawal("0x1", withdrawal)
+    access_list_items: list[EthTransactionAccessListDTO] = [
+        EthTransactionAccessListDTO.from_eth_access_list_item("0xt1", position, access_list_item)
+        for position in [0, 1, 0]
+    ]
+
+    assert first_withdrawal.id == replayed_withdrawal.id
+    assert access_list_items[0].id == access_list_items[2].id
+    # the same item listed twice in a transaction is still 2 rows
+    assert access_list_items[0].id != access_list_items[1].id
@@ -0,0 +1,112 @@
+import asyncio
+from typing import Any
+
+from src.chain_stack_sol_block_etl_pipeline import SOL_SLOTS_CHECKPOINT, SolBlockETLPipeline
+from src.dao.pipeline_checkpoint_dao import PipelineCheckpointDAO
+from src.dao.sol_block_dao import SolBlockDAO
+from src.extractors.chain_stack_sol_block_extractor import ChainStackSolBlockExtractor
+from src.models.chain_stack_models.sol_block import ChainStackSolBlockResponse
+from src.models.database_transfer_objects.sol_block import SolBlockDTO, SolTransactionDTO
+
+CONNECTION_STRING: str = "postgresql+asyncpg://localhost/sol"
+
+
+def make_raw_block(slot: int, **details: Any) -> dict[str, Any]:
+    return {
+        "id": 1,
+        "jsonrpc": "2.0",
+        "result": {
+            "blockHeight": slot - 10,
+            "blockTime": 1_700_000_000,
+            "blockhash": f"hash{slot}",
+            "parentSlot": slot - 1,
+            "previousBlockhash": f"hash{slot - 1}",
+            **details,
+        },
+    }
+
+
+def make_raw_transaction(signature: str, fee: int, err: Any = None) -> dict[str, Any]:
+    return {
+        "transaction": {"signatures": [signature, "other"], "message": {"instructions": []}},
+        "meta": {"fee": fee, "err": err, "computeUnitsConsumed": 150, "logMessages": []},
+        "version": 0,
+    }
+
+
+def test_full_block_is_converted_to_block_and_transaction_dtos() -> None:
+    block: ChainStackSolBlockResponse = ChainStackSolBlockResponse.from_json(
+        100,
+        make_raw_block(
+            100,
+            transactions=[
+                make_raw_transaction("sig1", 5000),
+                make_raw_transaction("sig2", 10000, err={"InstructionError": [0, "Custom"]}),
+            ],
+        ),
+    )
+
+    block_dto: SolBlockDTO = SolBlockDTO.from_block_response(block)
+    transaction_dtos: list[SolTransactionDTO] = SolTransactionDTO.from_block_response(block)
+
+    assert block_dto.slot == 100
+    assert block_dto.parent_slot == 99
+    assert block_dto.transaction_count == 2
+    assert [dto.signature for dto in transaction_dtos] == ["sig1", "sig2"]
+    assert [dto.transaction_index for dto in transaction_dtos] == [0, 1]
+    assert transaction_dtos[0].err is None
+    assert transaction_dtos[1].err == '{"InstructionError": [0, "Custom"]}'
+    assert transaction_dtos[1].version == "0"
+
+
+def test_signatures_only_block_and_skipped_slot() -> None:
+    block: ChainStackSolBlockResponse = ChainStackSolBlockResponse.from_json(
+        100, make_raw_block(100, signatures=["sig1", "sig2", "sig3"])
+    )
+    skipped: ChainStackSolBlockResponse = ChainStackSolBlockResponse.from_json(
+        101, {"id": 1, "jsonrpc": "2.0", "error": {"code": -32007, "message": "skipped"}}
+    )
+
+    transaction_dtos: list[SolTransactionDTO] = SolTransactionDTO.from_block_response(block)
+
+    assert SolBlockDTO.from_block_response(block).transaction_count == 3
+    assert [dto.fee for dto in transaction_dtos] == [None, None, None]
+    assert skipped.skipped
+    assert SolTransactionDTO.from_block_response(skipped) == []
+
+
+class RecordedSolBlockExtractor(ChainStackSolBlockExtractor):
+    """
+    serves recorded blocks; slot 103 is listed by getBlocks, but has since been cleaned up
+    """
+
+    async def extract_slots(self, start_slot: int, end_slot: int) -> list[int]:
+        return [slot for slot in [100, 102, 103] if start_slot <= slot <= end_slot]
+
+    async def extract_one(self, key: int) -> ChainStackSolBlockResponse:
+        if key == 103:
+            return ChainStackSolBlockResponse.from_json(
+                key, {"id": 1, "jsonrpc": "2.0", "error": {"code": -32009, "message": "skipped"}}
+            )
+        return ChainStackSolBlockResponse.from_json(
+            key, make_raw_block(key, transactions=[make_raw_transaction(f"sig{key}", 5000)])
+        )
+
+
+def test_extract_and_convert_only_converts_slots_with_blocks() -> None:
+    """
+    GIVEN: slots 100 to 104, of which only 100, 102 and 103 are listed, and 103 was cleaned up
+    WHEN: they are extracted and converted
+    THEN: only blocks 100 and 102, and their transactions, are converted
+    """
+    pipeline: SolBlockETLPipeline = SolBlockETLPipeline(
+        connection_string=CONNECTION_STRING,
+        extractor=RecordedSolBlockExtractor(),
+        checkpoint_dao=PipelineCheckpointDAO(connection_string=CONNECTION_STRING, pipeline_name=SOL_SLOTS_CHECKPOINT),
+        block_dao=SolBlockDAO(),
+    )
+
+    block_dtos, transaction_dtos = asyncio.run(pipeline.extract_and_convert(100, 104))
+
+    assert sorted(dto.slot for dto in block_dtos) == [100, 102]
+    assert sorted(dto.signature for dto in transaction_dtos) == ["sig100", "sig102"]
@@ -0,0 +1,116 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from src.eth_block_etl_pipeline import (
+    EthBlockETLPipeline,
+    EthBlockProviderAdapter,
+    create_eth_block_etl_pipeline,
+)
+from src.extractors.chain_stack_block_extractor import ChainStackBlockExtractor
+from src.extractors.quick_node_block_extractor import QuickNodeBlockExtractor
+from src.utils.raw_block_cache import RawBlockCache
+
+RECORDED_BLOCKS_PATH: str = (
+    "integration_tests/src/extractors/test_files/expected_transaction_results.json"
+)
+# never connected to; extract_and_convert makes no database calls
+CONNECTION_STRING: str = "postgresql+asyncpg://localhost/conformance"
+
+
+def load_recorded_raw_blocks() -> dict[int, dict[str, Any]]:
+    """
+    the recorded blocks 20846330 to 20846334, back as the raw JSON-RPC responses both providers serve
+    """
+    with open(RECORDED_BLOCKS_PATH, "r") as file:
+        recorded_blocks: list[dict[str, Any]] = json.loads(file.read())
+    raw_blocks: dict[int, dict[str, Any]] = {}
+    for recorded_block in recorded_blocks:
+        raw_block: dict[str, Any] = {
+            key: value for key, value in recorded_block.items() if key != "block_number"
+        }
+        raw_block["result"] = {
+            **recorded_block["result"],
+            "transactions": [
+                # providers omit the fields a transaction type doesn't have; only "to" is ever null
+                {
+                    ("from" if key == "from_" else key): value
+                    for key, value in transaction.items()
+                    if value is not None or key == "to"
+                }
+                for transaction in recorded_block["result"]["transactions"]
+            ],
+        }
+        raw_blocks[int(recorded_block["block_number"], 16)] = raw_block
+    return raw_blocks
+
+
+@pytest.fixture
+def raw_block_cache(tmp_path: Path) -> RawBlockCache:
+    """
+    the same recorded blocks, cached under both providers
+    """
+    cache: RawBlockCache = RawBlockCache(path=str(tmp_path / "raw_block_cache.sqlite3"))
+    raw_blocks: list[tuple[int, dict[str, Any]]] = list(load_recorded_raw_blocks().items())
+    cache.put_many("ethereum", ChainStackBlockExtractor.PROVIDER, raw_blocks)
+    cache.put_many("ethereum", QuickNodeBlockExtractor.PROVIDER, raw_blocks)
+    return cache
+
+
+def dump(dtos: list[Any]) -> list[dict[str, Any]]:
+    # DTOs arrive in completion order; created_at is the conversion time
+    dumped: list[dict[str, Any]] = [
+        dto.model_dump(exclude={"created_at"})
+        for dto in dtos
+        if isinstance(dto, BaseModel)
+    ]
+    return sorted(dumped, key=lambda dto: json.dumps(dto, default=str, sort_keys=True))
+
+
+def test_both_providers_produce_identical_dtos(raw_block_cache: RawBlockCache) -> None:
+    """
+    GIVEN: the same recorded blocks, replayed from the raw block cache of each provider
+    WHEN: both providers' adapters are run through EthBlockETLPipeline
+    THEN: both produce the same block, transaction, withdrawal and access list DTOs
+    """
+    chain_stack_pipeline: EthBlockETLPipeline = create_eth_block_etl_pipeline(
+        provider=EthBlockProviderAdapter(
+            name="conformance_chainstack",
+            connection_string=CONNECTION_STRING,
+            extractor=ChainStackBlockExtractor(raw_block_cache=raw_block_cache, replay=True),
+        )
+    )
+    quick_node_pipeline: EthBlockETLPipeline = create_eth_block_etl_pipeline(
+        provider=EthBlockProviderAdapter(
+            name="conformance_quicknode",
+            connection_string=CONNECTION_STRING,
+            extractor=QuickNodeBlockExtractor(raw_block_cache=raw_block_cache, replay=True),
+        )
+    )
+
+    chain_stack_blocks, chain_stack_dtos, _, _, _ = asyncio.run(
+        chain_stack_pipeline.extract_and_convert(20846330, 20846334)
+    )
+    quick_node_blocks, quick_node_dtos, _, _, _ = asyncio.run(
+        quick_node_pipeline.extract_and_convert(20846330, 20846334)
+    )
+
+    assert len(chain_stack_blocks) == len(quick_node_blocks) == 5
+    block_dtos, transaction_dtos, withdrawal_dtos, access_list_dtos = chain_stack_dtos
+    assert len(transaction_dtos) == sum(
+        len(raw_block["result"]["transactions"]) for raw_block in load_recorded_raw_blocks().values()
+    )
+    # withdrawal and access list item ids are natural keys, so they match too
+    dto_list_pairs: list[tuple[list[Any], list[Any]]] = [
+        (block_dtos, quick_node_dtos[0]),
+        (transaction_dtos, quick_node_dtos[1]),
+        (withdrawal_dtos, quick_node_dtos[2]),
+        (access_list_dtos, quick_node_dtos[3]),
+    ]
+    for chain_stack_dto_list, quick_node_dto_list in dto_list_pairs:
+        assert dump(chain_stack_dto_list) == dump(quick_node_dto_list)
+    assert block_dtos and withdrawal_dtos and access_list_dtos
@@ -0,0 +1,39 @@
+from src.eth_chain_verifier import RepairRange, merge_repair_ranges, repair_ranges
+
+
+def test_an_empty_chunk_is_missing() -> None:
+    assert repair_ranges(100, 199, None, None, []) == [
+        RepairRange(start_block_number=100, end_block_number=199, reason="missing")
+    ]
+
+
+def test_repair_ranges_of_a_broken_chunk() -> None:
+    # 100 (the block before the chunk) is stored, 102-104 are missing, 106 doesn't link to 105, 197-199 are missing
+    breaks: list[tuple[int, int, bool]] = [(101, 105, False), (105, 106, False)]
+
+    assert repair_ranges(101, 199, 100, 196, breaks) == [
+        RepairRange(start_block_number=102, end_block_number=104, reason="missing"),
+        RepairRange(start_block_number=105, end_block_number=106, reason="hash_mismatch"),
+        RepairRange(start_block_number=197, end_block_number=199, reason="missing"),
+    ]
+
+
+def test_missing_blocks_at_the_start_of_a_chunk() -> None:
+    assert repair_ranges(101, 199, 110, 199, []) == [
+        RepairRange(start_block_number=101, end_block_number=109, reason="missing")
+    ]
+
+
+def test_ranges_across_chunks_are_merged() -> None:
+    ranges: list[RepairRange] = [
+        RepairRange(start_block_number=200, end_block_number=250, reason="missing"),
+        RepairRange(start_block_number=199, end_block_number=200, reason="hash_mismatch"),
+        RepairRange(start_block_number=150, end_block_number=199, reason="missing"),
+        RepairRange(start_block_number=300, end_block_number=310, reason="missing"),
+    ]
+
+    assert merge_repair_ranges(ranges) == [
+        RepairRange(start_block_number=150, end_block_number=250, reason="missing"),
+        RepairRange(start_block_number=199, end_block_number=200, reason="hash_mismatch"),
+        RepairRange(start_block_number=300, end_block_number=310, reason="missing"),
+    ]
@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from database_management.binance.binance_table import binance_klines_prices_table
+from database_management.chainstack.tables import eth_block_table
+from src.file_explorer.multipart_gzip_writer import MIN_PART_SIZE, MultipartGzipWriter
+from src.pg_to_s3_export_pipeline import PgToS3ExportPipeline, export_query, key_ranges
+
+
+def test_key_ranges_cover_every_key_once() -> None:
+    assert key_ranges(["0x30", None, "0x10", "0x30"]) == [
+        (None, "0x10"),
+        ("0x10", "0x30"),
+        ("0x30", None),
+    ]
+    assert key_ranges([]) == [(None, None)]
+
+
+def test_first_export_of_a_key_range() -> None:
+    exported_until: datetime = datetime(2025, 1, 6)
+    query, args = export_query(
+        binance_klines_prices_table, "symbol", ("BTCUSDC", "ETHBTC"), None, exported_until
+    )
+
+    assert query.endswith(
+        "FROM binance_klines_prices WHERE symbol >= $1 AND symbol < $2 AND created_at <= $3"
+    )
+    assert args == ["BTCUSDC", "ETHBTC", exported_until]
+
+
+def test_incremental_export_of_the_last_key_range() -> None:
+    exported_after: datetime = datetime(2025, 1, 5)
+    exported_until: datetime = datetime(2025, 1, 6)
+    query, args = export_query(
+        eth_block_table, "block_number", ("0x30", None), exported_after, exported_until
+    )
+
+    assert query.startswith("SELECT block_number, id, jsonrpc, ")
+    assert query.endswith(
+        "FROM eth_blocks WHERE block_number >= $1 AND created_at > $2 AND created_at <= $3"
+    )
+    assert args == ["0x30", exported_after, exported_until]
+
+
+class FailingMultipartStore:
+    """
+    the multipart upload calls of S3Explorer, into memory; completing fail_path fails
+    """
+
+    def __init__(self, fail_path: str) -> None:
+        self.fail_path: str = fail_path
+        self.uploads: set[str] = set()
+        self.objects: set[str] = set()
+
+    def start_multipart_upload(self, s3_path: str) -> str:
+        self.uploads.add(s3_path)
+        return f"upload-{s3_path}"
+
+    def upload_part(self, s3_path: str, upload_id: str, part_number: int, body: bytes) -> str:
+        return f"etag-{part_number}"
+
+    def complete_multipart_upload(self, s3_path: str, upload_id: str, etags: list[str]) -> None:
+        if s3_path == self.fail_path:
+            raise ConnectionError(f"Failed to complete {s3_path}")
+        self.uploads.remove(s3_path)
+        self.objects.add(s3_path)
+
+    def abort_multipart_upload(self, s3_path: str, upload_id: str) -> None:
+        self.uploads.remove(s3_path)
+
+    def delete_file(self, s3_path: str) -> None:
+        self.objects.remove(s3_path)
+
+
+def test_failed_publish_leaves_nothing_behind() -> None:
+    """
+    GIVEN: 3 streamed key ranges
+    WHEN: completing the upload of the second one fails
+    THEN: the first object is deleted, the remaining uploads are aborted, and the error is raised
+    """
+    store: FailingMultipartStore = FailingMultipartStore(fail_path="eth_blocks_0001.csv.gz")
+    writers: list[MultipartGzipWriter] = [
+        MultipartGzipWriter(store, f"eth_blocks_{index:04d}.csv.gz", part_size=MIN_PART_SIZE)  # type: ignore[arg-type]
+        for index in range(3)
+    ]
+
+    async def stream_and_publish() -> None:
+        for writer in writers:
+            await writer.write(b"block_number\n0x1\n")
+        await PgToS3ExportPipeline._publish(writers, [1, 1, 1])
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(stream_and_publish())
+
+    assert store.uploads == set() and store.objects == set()
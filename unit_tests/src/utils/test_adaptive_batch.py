@@ -0,0 +1,59 @@
+from src.utils.adaptive_batch import AdaptiveBatchController, BatchResult
+from src.utils.metrics import METRICS
+
+
+def make_result(
+    blocks: int, transactions: int = 0, size_bytes: int = 0, commit_seconds: float = 1.0
+) -> BatchResult:
+    return BatchResult(
+        blocks=blocks,
+        transactions=transactions,
+        size_bytes=size_bytes,
+        commit_seconds=commit_seconds,
+    )
+
+
+def test_fast_commits_grow_and_a_slow_commit_halves_the_batch() -> None:
+    controller: AdaptiveBatchController = AdaptiveBatchController(
+        name="test_aimd", initial_batch_size=100, target_commit_seconds=10.0
+    )
+
+    assert controller.record_batch(make_result(blocks=100)) == 110
+    assert controller.record_batch(make_result(blocks=110)) == 120
+    assert controller.record_batch(make_result(blocks=120, commit_seconds=30.0)) == 60
+
+
+def test_heavy_blocks_cap_the_batch_by_weight() -> None:
+    """
+    GIVEN: blocks of ~200 transactions, and a target of 2_000 transactions per batch
+    WHEN: a batch is recorded
+    THEN: the next batch holds at most 10 blocks, however fast the commit was
+    """
+    controller: AdaptiveBatchController = AdaptiveBatchController(
+        name="test_weight_cap", initial_batch_size=100, target_transactions=2_000
+    )
+
+    assert controller.record_batch(make_result(blocks=100, transactions=20_000)) == 10
+    assert controller.record_batch(make_result(blocks=10, transactions=2_000)) == 10
+
+
+def test_fixed_controller_holds_its_size() -> None:
+    controller: AdaptiveBatchController = AdaptiveBatchController.fixed("test_fixed", 50)
+
+    assert controller.record_batch(make_result(blocks=50, commit_seconds=60.0)) == 50
+    assert controller.record_batch(make_result(blocks=50)) == 50
+
+
+def test_decisions_are_exposed_in_metrics() -> None:
+    controller: AdaptiveBatchController = AdaptiveBatchController(
+        name="test_metrics", initial_batch_size=20
+    )
+    controller.record_batch(make_result(blocks=20))
+
+    metrics: str = METRICS.render_prometheus()
+    assert "# TYPE pipeline_batch_size gauge" in metrics
+    assert 'pipeline_batch_size{pipeline="test_metrics"} 30' in metrics
+    assert (
+        'pipeline_batch_size_decisions_total{pipeline="test_metrics",reason="increase"} 1'
+        in metrics
+    )
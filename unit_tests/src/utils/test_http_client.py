@@ -0,0 +1,129 @@
+import asyncio
+import gzip
+import json
+import zlib
+from typing import Any
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from src.utils.http_client import (
+    ACCEPT_ENCODING,
+    SharedClientSession,
+    StreamDecompressor,
+    client_session,
+    create_client_session,
+    iter_body,
+    read_json,
+)
+from src.utils.metrics import METRICS
+
+RAW_BLOCK: dict[str, Any] = {"id": 1, "result": {"transactions": [{"input": "0x" + "00" * 4_096}]}}
+
+
+async def serve_and_fetch(provider: str, streaming: bool) -> tuple[Any, str]:
+    """
+    serves RAW_BLOCK gzip compressed from a local server, and reads it back with the compression aware client
+    """
+    received_accept_encoding: list[str] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        received_accept_encoding.append(request.headers.get("Accept-Encoding", ""))
+        return web.Response(
+            body=gzip.compress(json.dumps(RAW_BLOCK).encode("utf-8")),
+            headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+        )
+
+    app: web.Application = web.Application()
+    app.router.add_get("/", handler)
+    runner: web.AppRunner = web.AppRunner(app)
+    await runner.setup()
+    site: web.TCPSite = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port: int = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    try:
+        async with create_client_session() as client:
+            async with client.get(f"http://127.0.0.1:{port}/") as response:
+                if streaming:
+                    body: bytes = b"".join(
+                        [chunk async for chunk in iter_body(response, provider, chunk_size=64)]
+                    )
+                    return json.loads(body), received_accept_encoding[0]
+                return await read_json(response, provider), received_accept_encoding[0]
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_compressed_response_is_decoded_and_metered(streaming: bool) -> None:
+    provider: str = f"test_provider_streaming_{streaming}"
+
+    body, accept_encoding = asyncio.run(serve_and_fetch(provider, streaming))
+
+    assert body == RAW_BLOCK
+    assert accept_encoding == ACCEPT_ENCODING
+    assert "gzip" in accept_encoding
+    metrics: str = METRICS.render_prometheus()
+    decoded_bytes: int = len(json.dumps(RAW_BLOCK).encode("utf-8"))
+    assert f'pipeline_http_decoded_bytes_total{{provider="{provider}"}} {decoded_bytes}' in metrics
+    assert f'pipeline_http_wire_bytes_total{{provider="{provider}"}}' in metrics
+
+
+def test_raw_deflate_is_decoded() -> None:
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    payload: bytes = compressor.compress(b'{"id": 1}') + compressor.flush()
+    decompressor: StreamDecompressor = StreamDecompressor("deflate", "test_provider")
+
+    assert decompressor.decompress(payload) + decompressor.flush() == b'{"id": 1}'
+
+
+def test_unsupported_encoding_raises_a_client_error() -> None:
+    with pytest.raises(aiohttp.ClientError):
+        StreamDecompressor("compress", "test_provider")
+
+
+def test_corrupt_body_raises_a_client_payload_error() -> None:
+    """
+    a corrupt body is retried by the fetchers, like any other aiohttp.ClientError
+    """
+    decompressor: StreamDecompressor = StreamDecompressor("gzip", "test_provider")
+
+    with pytest.raises(aiohttp.ClientPayloadError, match="gzip body from test_provider"):
+        decompressor.decompress(b"not gzip at all")
+
+
+async def fetch_client_ports(shared_session: SharedClientSession, requests: int) -> set[int]:
+    """
+    the client ports of requests made through shared_session; one port per TCP connection
+    """
+    client_ports: set[int] = set()
+
+    async def handler(request: web.Request) -> web.Response:
+        client_ports.add(request.transport.get_extra_info("peername")[1])  # type: ignore[union-attr]
+        return web.Response(body=b'{"id": 1}', headers={"Content-Type": "application/json"})
+
+    app: web.Application = web.Application()
+    app.router.add_get("/", handler)
+    runner: web.AppRunner = web.AppRunner(app)
+    await runner.setup()
+    site: web.TCPSite = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port: int = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    try:
+        for _ in range(requests):
+            async with client_session(shared_session) as client:
+                async with client.get(f"http://127.0.0.1:{port}/") as response:
+                    assert await read_json(response, "test_provider") == {"id": 1}
+        return client_ports
+    finally:
+        await shared_session.close()
+        await runner.cleanup()
+
+
+def test_shared_session_reuses_its_connection() -> None:
+    shared_session: SharedClientSession = SharedClientSession()
+
+    assert len(asyncio.run(fetch_client_ports(shared_session, requests=5))) == 1
+    # closed sessions and sessions of a finished event loop are replaced
+    assert len(asyncio.run(fetch_client_ports(shared_session, requests=5))) == 1
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import logging
+import os
+import urllib.request
+
+import pytest
+
+from src.utils.logging_utils import setup_logging
+from src.utils import metrics
+from src.utils.metrics import METRICS, MetricsRegistry, MetricsServer, StageStats
+
+
+@pytest.fixture
+def registry() -> MetricsRegistry:
+    return MetricsRegistry(buckets=(0.1, 1.0))
+
+
+class TestStageStats:
+    def test_percentiles(self) -> None:
+        stats: StageStats = StageStats(buckets=(1.0,), max_samples=1_000)
+        for seconds in range(1, 101):
+            stats.observe(seconds / 100)
+
+        assert stats.count == 100
+        assert stats.percentile(50) == 0.5
+        assert stats.percentile(99) == 0.99
+        assert stats.bucket_counts == [100]
+
+
+class TestMetricsRegistry:
+    def test_timed_async_function_records_duration_even_when_it_raises(
+        self, registry: MetricsRegistry
+    ) -> None:
+        @registry.timed("insert")
+        async def failing_insert() -> None:
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            asyncio.run(failing_insert())
+
+        assert 'pipeline_stage_duration_seconds_count{stage="insert"} 1' in registry.render_prometheus()
+
+    def test_run_summary_only_counts_its_own_run(
+        self, registry: MetricsRegistry, tmp_path
+    ) -> None:
+        """
+        GIVEN: 2 runs on the same event loop, concurrently
+        WHEN: each counts its own blocks
+        THEN: each run summary only holds its own blocks, while the process wide counter holds both
+        """
+
+        async def pipeline(name: str, blocks: int) -> None:
+            with registry.run(name, summary_dir=str(tmp_path)):
+                with registry.timer("extract"):
+                    await asyncio.sleep(0.01)
+                registry.increment("blocks", blocks)
+
+        async def run_both() -> None:
+            await asyncio.gather(pipeline("first", 100), pipeline("second", 5))
+
+        asyncio.run(run_both())
+
+        summaries: dict[str, dict] = {}
+        for file_name in os.listdir(tmp_path):
+            with open(tmp_path / file_name) as summary_file:
+                summary: dict = json.load(summary_file)
+                summaries[summary["pipeline_name"]] = summary
+
+        assert summaries["first"]["counters"] == {"blocks": 100}
+        assert summaries["second"]["counters"] == {"blocks": 5}
+        assert summaries["first"]["stages"]["extract"]["count"] == 1
+        assert summaries["first"]["rates_per_second"]["blocks_per_second"] > 0
+        assert "pipeline_blocks_total 105" in registry.render_prometheus()
+
+    def test_counter_labels_are_rendered(self, registry: MetricsRegistry) -> None:
+        registry.increment("rows", 3, table="eth_blocks")
+        registry.increment("rows", 2, table="eth_blocks")
+
+        assert 'pipeline_rows_total{table="eth_blocks"} 5' in registry.render_prometheus()
+
+
+def test_metrics_server_serves_prometheus_text(registry: MetricsRegistry) -> None:
+    registry.increment("blocks", 7)
+    server: MetricsServer = MetricsServer(registry, port=0)
+    server.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            body: str = response.read().decode("utf-8")
+    finally:
+        server.stop()
+
+    assert "pipeline_blocks_total 7" in body
+
+
+def test_run_starts_the_metrics_server_if_metrics_port_is_set(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    """
+    GIVEN: METRICS_PORT is set, as for a standalone pipeline
+    WHEN: a run counts its blocks
+    THEN: they are served on /metrics, by a single server for every run of the process
+    """
+    monkeypatch.setenv("METRICS_PORT", "0")
+    monkeypatch.setattr(metrics, "_metrics_server", None)
+    with METRICS.run("standalone", summary_dir=str(tmp_path)):
+        METRICS.increment("standalone_blocks", 3)
+    server: MetricsServer | None = metrics._metrics_server
+    assert server is not None
+    try:
+        with METRICS.run("standalone", summary_dir=str(tmp_path)):
+            pass
+        assert metrics._metrics_server is server
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            body: str = response.read().decode("utf-8")
+    finally:
+        server.stop()
+
+    assert "pipeline_standalone_blocks_total 3" in body
+
+
+def test_setup_logging_attaches_a_single_handler() -> None:
+    logger: logging.Logger = logging.getLogger("test_setup_logging_attaches_a_single_handler")
+    setup_logging(logger)
+    setup_logging(logger)
+
+    assert len(logger.handlers) == 1
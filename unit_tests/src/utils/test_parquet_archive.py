@@ -0,0 +1,155 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+
+import hashlib
+from typing import Generator
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from database_management.binance.binance_table import binance_klines_prices_table
+from database_management.chainstack.tables import eth_transaction_access_list_table
+from src.cold_storage_archiver import (
+    ColdStorageArchiver,
+    eth_transactions_archive_range,
+    kline_month_archive_range,
+)
+from src.dao.archive_dao import ArchiveVerificationError
+from src.models.binance_models.binance_klines_arrow import KLINE_ARROW_SCHEMA
+from src.utils.parquet_archive import (
+    PARQUET_FOOTER_READ_SIZE,
+    archive_s3_path,
+    arrow_schema_of,
+    parquet_metadata_of_footer,
+    rows_to_record_batch,
+)
+
+
+def test_kline_archive_schema_matches_the_ingestion_schema() -> None:
+    archive_schema: pa.Schema = arrow_schema_of(binance_klines_prices_table)
+
+    assert archive_schema.names == KLINE_ARROW_SCHEMA.names
+    for archive_field, kline_field in zip(archive_schema, KLINE_ARROW_SCHEMA):
+        # postgres timestamps are archived at their own (microsecond) precision
+        if not pa.types.is_timestamp(kline_field.type):
+            assert archive_field.type == kline_field.type
+
+
+def test_access_list_rows_round_trip_through_parquet() -> None:
+    schema: pa.Schema = arrow_schema_of(eth_transaction_access_list_table)
+    access_list_id: uuid.UUID = uuid.uuid4()
+    created_at: datetime.datetime = datetime.datetime(2025, 1, 6, 12, 0, 0)
+    record_batch: pa.RecordBatch = rows_to_record_batch(
+        schema, [(access_list_id, "0xt1", 0, "0xa1", ["0x01", "0x02"], created_at)]
+    )
+    buffer: io.BytesIO = io.BytesIO()
+    pq.write_table(pa.Table.from_batches([record_batch]), buffer)
+    buffer.seek(0)
+
+    assert pq.read_table(buffer).to_pylist() == [
+        {
+            "id": str(access_list_id),
+            "transaction_hash": "0xt1",
+            "position": 0,
+            "address": "0xa1",
+            "storagekeys": ["0x01", "0x02"],
+            "created_at": created_at,
+        }
+    ]
+
+
+def test_decimals_keep_their_scale() -> None:
+    schema: pa.Schema = pa.schema([pa.field("price", pa.decimal128(38, 18))])
+
+    assert rows_to_record_batch(schema, [(Decimal("0.01634790"),)]).column(0).to_pylist() == [
+        Decimal("0.016347900000000000")
+    ]
+
+
+def test_archive_ranges_are_hive_partitions() -> None:
+    assert archive_s3_path(
+        "eth_transactions", eth_transactions_archive_range(100, 199).partition_key
+    ) == "archive/eth_transactions/block_range=100-199/eth_transactions.parquet"
+    assert kline_month_archive_range(2024, 1).partition_key == "month=2024-01"
+
+
+def test_eth_archive_range_deletes_access_lists_before_their_transactions() -> None:
+    archive_range = eth_transactions_archive_range(16, 17)
+
+    assert [archive_slice.table.name for archive_slice in archive_range.slices] == [
+        "eth_transaction_access_list",
+        "eth_transactions",
+    ]
+    assert archive_range.slices[1].params == {"block_numbers": ["0x10", "0x11"]}
+
+
+def test_december_archive_range_ends_in_january() -> None:
+    assert kline_month_archive_range(2024, 12).slices[0].params == {
+        "month_start": datetime.datetime(2024, 12, 1),
+        "next_month_start": datetime.datetime(2025, 1, 1),
+    }
+
+
+def parquet_bytes(row_count: int, row_group_size: int) -> bytes:
+    buffer: io.BytesIO = io.BytesIO()
+    pq.write_table(pa.table({"number": list(range(row_count))}), buffer, row_group_size=row_group_size)
+    return buffer.getvalue()
+
+
+class InMemoryObjectStore:
+    """
+    the download calls of S3Explorer, from memory; records the size of every chunk and tail read
+    """
+
+    def __init__(self, objects: dict[str, bytes]) -> None:
+        self.objects: dict[str, bytes] = objects
+        self.chunk_reads: list[int] = []
+        self.tail_reads: list[int] = []
+
+    def iter_object(self, s3_path: str, chunk_size: int = 1024 * 1024) -> Generator[bytes, None, None]:
+        for start in range(0, len(self.objects[s3_path]), chunk_size):
+            chunk: bytes = self.objects[s3_path][start : start + chunk_size]
+            self.chunk_reads.append(len(chunk))
+            yield chunk
+
+    def read_tail(self, s3_path: str, size: int) -> bytes:
+        tail: bytes = self.objects[s3_path][-size:]
+        self.tail_reads.append(len(tail))
+        return tail
+
+
+def test_row_count_is_read_from_the_parquet_footer() -> None:
+    data: bytes = parquet_bytes(row_count=10_000, row_group_size=100)
+
+    assert parquet_metadata_of_footer(data[-PARQUET_FOOTER_READ_SIZE:]).num_rows == 10_000
+
+
+@pytest.mark.parametrize("row_group_size", [10_000, 10])
+def test_archived_files_are_verified_in_chunks_and_from_their_footer(row_group_size: int) -> None:
+    """
+    GIVEN: an archived parquet file of 100 000 rows; with 10 rows per row group, its footer is larger than
+           PARQUET_FOOTER_READ_SIZE
+    WHEN: it is verified
+    THEN: it is hashed a chunk at a time, then only its footer is read again; a second time if it is that large
+    """
+    data: bytes = parquet_bytes(row_count=100_000, row_group_size=row_group_size)
+    store: InMemoryObjectStore = InMemoryObjectStore({"archive/numbers.parquet": data})
+    archiver: ColdStorageArchiver = ColdStorageArchiver(archive_dao=None, s3_explorer=store)  # type: ignore[arg-type]
+    footer_size: int = int.from_bytes(data[-8:-4], "little") + 8
+
+    archiver._verify("archive/numbers.parquet", 100_000, hashlib.sha256(data).hexdigest())
+
+    assert max(store.chunk_reads) <= 1024 * 1024
+    assert sum(store.chunk_reads) == len(data)
+    assert store.tail_reads == (
+        [PARQUET_FOOTER_READ_SIZE]
+        if footer_size <= PARQUET_FOOTER_READ_SIZE
+        else [PARQUET_FOOTER_READ_SIZE, footer_size]
+    )
+    with pytest.raises(ArchiveVerificationError, match="99999 were exported"):
+        archiver._verify("archive/numbers.parquet", 99_999, hashlib.sha256(data).hexdigest())
+    with pytest.raises(ArchiveVerificationError, match="sha256"):
+        archiver._verify("archive/numbers.parquet", 100_000, hashlib.sha256(b"").hexdigest())
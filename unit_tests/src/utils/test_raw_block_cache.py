@@ -0,0 +1,83 @@
+import os
+from typing import Any, Generator
+
+import pytest
+
+from src.utils.raw_block_cache import RawBlockCache
+
+
+def make_raw_block(block_number: int, size: int = 16) -> dict[str, Any]:
+    # random hex, so zlib can't shrink payloads below their expected size
+    return {
+        "id": 1,
+        "jsonrpc": "2.0",
+        "result": {"number": hex(block_number), "extraData": os.urandom(size).hex()},
+    }
+
+
+@pytest.fixture
+def raw_block_cache(tmp_path) -> Generator[RawBlockCache, None, None]:
+    cache: RawBlockCache = RawBlockCache(str(tmp_path / "raw_blocks.sqlite3"))
+    yield cache
+    cache.close()
+
+
+class TestRawBlockCache:
+    def test_put_and_get(self, raw_block_cache: RawBlockCache) -> None:
+        raw_block: dict[str, Any] = make_raw_block(1)
+        raw_block_cache.put("ethereum", "chainstack", 1, raw_block)
+
+        assert raw_block_cache.get("ethereum", "chainstack", 1) == raw_block
+        assert raw_block_cache.get("ethereum", "quicknode", 1) is None
+        assert raw_block_cache.get("ethereum", "chainstack", 2) is None
+
+    def test_identical_payloads_are_stored_once(self, raw_block_cache: RawBlockCache) -> None:
+        """
+        GIVEN: the same block response from 2 providers
+        WHEN: both are cached
+        THEN: both can be read, but the payload is only stored once
+        """
+        raw_block: dict[str, Any] = make_raw_block(1)
+        raw_block_cache.put("ethereum", "chainstack", 1, raw_block)
+        size_after_first_provider: int = raw_block_cache.total_bytes()
+        raw_block_cache.put("ethereum", "quicknode", 1, raw_block)
+
+        assert raw_block_cache.total_bytes() == size_after_first_provider
+        assert raw_block_cache.get("ethereum", "quicknode", 1) == raw_block
+
+    def test_least_recently_used_blocks_are_evicted(self, tmp_path) -> None:
+        """
+        GIVEN: a cache which fits 3 blocks, holding blocks 1 to 3, where block 1 was read last
+        WHEN: block 4 is cached
+        THEN: block 2, the least recently used, is evicted
+        """
+        block_size: int = len(
+            RawBlockCache._encode(make_raw_block(0, size=4_096))[1]
+        )
+        cache: RawBlockCache = RawBlockCache(
+            str(tmp_path / "raw_blocks.sqlite3"), max_bytes=int(block_size * 3.5)
+        )
+        for block_number in (1, 2, 3):
+            cache.put("ethereum", "chainstack", block_number, make_raw_block(block_number, size=4_096))
+        assert cache.get("ethereum", "chainstack", 1) is not None
+
+        cache.put("ethereum", "chainstack", 4, make_raw_block(4, size=4_096))
+
+        assert cache.total_bytes() <= int(block_size * 3.5)
+        assert cache.get("ethereum", "chainstack", 2) is None
+        assert cache.get("ethereum", "chainstack", 1) is not None
+        assert cache.get("ethereum", "chainstack", 4) is not None
+        cache.close()
+
+    def test_cache_persists_across_instances(self, tmp_path) -> None:
+        path: str = str(tmp_path / "raw_blocks.sqlite3")
+        raw_block: dict[str, Any] = make_raw_block(1)
+        first_cache: RawBlockCache = RawBlockCache(path)
+        first_cache.put("ethereum", "chainstack", 1, raw_block)
+        first_cache.close()
+
+        second_cache: RawBlockCache = RawBlockCache(path)
+        assert second_cache.get("ethereum", "chainstack", 1) == raw_block
+        assert second_cache.total_bytes() > 0
+        assert [block_number for block_number, _ in second_cache.iter_blocks("ethereum", "chainstack", 0, 5)] == [1]
+        second_cache.close()
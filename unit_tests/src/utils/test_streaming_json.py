@@ -0,0 +1,73 @@
+import json
+from typing import Any
+
+import pytest
+
+from src.utils.streaming_json import StreamingJsonArraySplitter
+
+
+def make_raw_block() -> dict[str, Any]:
+    return {
+        "id": 1,
+        "jsonrpc": "2.0",
+        "result": {
+            "number": "0x1",
+            # strings holding structural characters and escapes must not confuse the splitter
+            "transactions": [
+                {"hash": "0xa", "input": '0x"[{,}]\\' + "ab" * 100, "accessList": [{"storageKeys": ["0x1"]}]},
+                {"hash": "0xb", "to": None, "value": 1.5e3},
+            ],
+            "withdrawals": [{"index": "0x1"}],
+        },
+    }
+
+
+def split(raw: bytes, chunk_size: int) -> tuple[list[Any], Any]:
+    splitter: StreamingJsonArraySplitter = StreamingJsonArraySplitter(
+        array_path=("result", "transactions")
+    )
+    elements: list[Any] = []
+    for start in range(0, len(raw), chunk_size):
+        elements.extend(splitter.feed(raw[start : start + chunk_size]))
+    return elements, splitter.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1_000_000])
+def test_transactions_are_split_from_the_rest_of_the_block(chunk_size: int) -> None:
+    """
+    GIVEN: a block response, fed in chunks of any size
+    WHEN: it is split on result.transactions
+    THEN: every transaction is emitted in order, and the rest of the response is kept with transactions = []
+    """
+    raw_block: dict[str, Any] = make_raw_block()
+
+    transactions, header = split(json.dumps(raw_block).encode("utf-8"), chunk_size)
+
+    assert transactions == raw_block["result"]["transactions"]
+    assert header == {**raw_block, "result": {**raw_block["result"], "transactions": []}}
+
+
+def test_only_completed_transactions_are_buffered() -> None:
+    splitter: StreamingJsonArraySplitter = StreamingJsonArraySplitter(
+        array_path=("result", "transactions")
+    )
+
+    assert splitter.feed(b'{"result": {"transactions": [{"hash": "0xa"}, {"hash"') == [{"hash": "0xa"}]
+    assert len(splitter._buffer) < len(b'{"hash"') + 2
+    assert splitter.feed(b': "0xb"}]}}') == [{"hash": "0xb"}]
+    assert splitter.close() == {"result": {"transactions": []}}
+
+
+def test_missing_array_and_incomplete_documents() -> None:
+    splitter: StreamingJsonArraySplitter = StreamingJsonArraySplitter(
+        array_path=("result", "transactions")
+    )
+    assert splitter.feed(b'{"id": 1, "result": null}') == []
+    assert splitter.close() == {"id": 1, "result": None}
+
+    incomplete: StreamingJsonArraySplitter = StreamingJsonArraySplitter(
+        array_path=("result", "transactions")
+    )
+    incomplete.feed(b'{"result": {"transactions": [')
+    with pytest.raises(ValueError):
+        incomplete.close()
@@ -0,0 +1,84 @@
+import pytest
+
+from src.utils.ttl_cache import TTLCache, make_query_cache_key
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+class TestTTLCache:
+    def test_get_returns_value_before_ttl_expires(self, clock: FakeClock) -> None:
+        cache: TTLCache[str] = TTLCache(max_entries=2, ttl_seconds=10, clock=clock)
+        cache.put("key", "value")
+        clock.now = 9.9
+        assert cache.get("key") == "value"
+
+    def test_get_returns_none_after_ttl_expires(self, clock: FakeClock) -> None:
+        cache: TTLCache[str] = TTLCache(max_entries=2, ttl_seconds=10, clock=clock)
+        cache.put("key", "value")
+        clock.now = 10
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self, clock: FakeClock) -> None:
+        cache: TTLCache[str] = TTLCache(max_entries=2, ttl_seconds=10, clock=clock)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        # touching "a" makes "b" the least recently used entry
+        assert cache.get("a") == "1"
+        cache.put("c", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+
+    def test_entries_are_evicted_once_max_bytes_is_exceeded(
+        self, clock: FakeClock
+    ) -> None:
+        cache: TTLCache[str] = TTLCache(
+            max_entries=10, ttl_seconds=10, max_bytes=5, sizer=len, clock=clock
+        )
+        cache.put("a", "abc")
+        cache.put("b", "de")
+        assert cache.total_bytes == 5
+        cache.put("c", "f")
+        assert cache.get("a") is None
+        assert cache.total_bytes == 3
+
+    def test_value_larger_than_max_bytes_is_not_cached(self, clock: FakeClock) -> None:
+        cache: TTLCache[str] = TTLCache(
+            max_entries=10, ttl_seconds=10, max_bytes=2, sizer=len, clock=clock
+        )
+        cache.put("a", "abc")
+        assert cache.get("a") is None
+        assert cache.total_bytes == 0
+
+    def test_invalidate_clears_every_entry(self, clock: FakeClock) -> None:
+        cache: TTLCache[str] = TTLCache(max_entries=10, ttl_seconds=10, clock=clock)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.invalidate()
+        assert len(cache) == 0
+
+
+class TestMakeQueryCacheKey:
+    def test_whitespace_and_param_order_do_not_change_the_key(self) -> None:
+        assert make_query_cache_key(
+            "SELECT *\n  FROM eth_blocks WHERE a = :a AND b = :b", {"a": 1, "b": [2]}
+        ) == make_query_cache_key(
+            "SELECT * FROM eth_blocks WHERE a = :a AND b = :b", {"b": [2], "a": 1}
+        )
+
+    def test_different_params_produce_different_keys(self) -> None:
+        assert make_query_cache_key("SELECT :a", {"a": 1}) != make_query_cache_key(
+            "SELECT :a", {"a": 2}
+        )